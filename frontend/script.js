@@ -11,6 +11,7 @@ const MAX_RECONNECT_ATTEMPTS = 10;
 let isAwake = false;
 let currentMode = 'voice';
 let commandHistory = [];
+let searches = {};  // search_id -> history item of a running file search
 
 // DOM Elements
 const elements = {
@@ -125,7 +126,7 @@ function handleBackendMessage(data) {
 
         case 'command':
             addToHistory('voice', data.command);
-            showResponse(data.response || `Executed: ${data.command}`);
+            showResponse(data.response || `Executed: ${data.command}`, data.success === false);
             break;
 
         case 'gesture':
@@ -139,6 +140,14 @@ function handleBackendMessage(data) {
         case 'error':
             showResponse(data.message, true);
             break;
+
+        case 'backend_status':
+            updateBackendStatus(data);
+            break;
+
+        case 'search_result':
+            updateSearch(data);
+            break;
     }
 }
 
@@ -153,6 +162,56 @@ function updateConnectionStatus(connected) {
     text.textContent = connected ? 'Connected' : 'Disconnected';
 }
 
+function updateBackendStatus(data) {
+    const labels = {
+        closed: 'available',
+        half_open: 'recovering',
+        open: 'unavailable, using local commands'
+    };
+    const label = labels[data.state] || data.state;
+    addToHistory('system', `${data.backend} ${label}${data.reason ? ` (${data.reason})` : ''}`);
+    if (data.state === 'open') {
+        showResponse('Language model offline - only built-in commands will work', true);
+    }
+}
+
+function updateSearch(data) {
+    // Matches arrive one by one while the backend is still searching
+    if (data.event === 'start') {
+        const item = addToHistory('search', `Searching for ${data.query}...`);
+        const content = item.querySelector('.history-content');
+        content.insertAdjacentHTML('beforeend', `
+            <div class="search-results"></div>
+            <button class="search-cancel">Cancel</button>
+        `);
+        content.querySelector('.search-cancel').addEventListener('click', () => {
+            sendCommand('cancel_search', { search_id: data.search_id });
+        });
+        searches[data.search_id] = item;
+        return;
+    }
+
+    const item = searches[data.search_id];
+    if (!item) return;
+
+    if (data.event === 'hit') {
+        item.querySelector('.search-results').insertAdjacentHTML('beforeend', `
+            <div class="search-hit">
+                <span class="search-rank">#${data.rank}</span>
+                <span class="search-path" title="${escapeHtml(data.path)}">${escapeHtml(data.path)}</span>
+                <span class="search-time">${data.elapsed_ms} ms</span>
+            </div>
+        `);
+    } else if (data.event === 'done') {
+        const summary = data.cancelled
+            ? `Search cancelled after ${data.count} result${data.count === 1 ? '' : 's'}`
+            : `Found ${data.count} result${data.count === 1 ? '' : 's'} in ${data.elapsed_ms} ms`;
+        item.querySelector('.history-command').textContent = summary;
+        item.querySelector('.search-cancel').remove();
+        delete searches[data.search_id];
+    }
+}
+
 function updateAssistantStatus(status, mode = null) {
     isAwake = status === 'awake';
 
@@ -236,7 +295,8 @@ function addToHistory(type, message) {
     const typeIcons = {
         voice: '🎤',
         gesture: '✋',
-        system: '⚙️'
+        system: '⚙️',
+        search: '🔍'
     };
 
     const time = new Date().toLocaleTimeString('en-US', {
@@ -265,6 +325,8 @@ function addToHistory(type, message) {
     // Store in array
     commandHistory.unshift({ type, message, time: Date.now() });
     if (commandHistory.length > 50) commandHistory.pop();
+
+    return item;
 }
 
 function clearHistory() {
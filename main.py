@@ -6,11 +6,15 @@ import pyautogui
 import threading
 import time
 import os
+import re
 import sys
 import pywhatkit
+from concurrent.futures import CancelledError
 from datetime import datetime
 from queue import Queue, Empty
 
+from src.commands.fuzzy_vocabulary import FuzzyVocabulary
+
 # Optional non-PyAudio audio capture fallback
 try:
     import sounddevice as _sd  # used only if PyAudio/sr.Microphone fails
@@ -41,7 +45,7 @@ try:
 except Exception:
 	# Fallback HybridRecognizer using speech_recognition's Google API
 	class HybridRecognizer:
-		def __init__(self, use_whisper=False, whisper_model="base"):
+		def __init__(self, use_whisper=False, whisper_model="base", decoding="free"):
 			import speech_recognition as sr
 			self.recognizer = sr.Recognizer()
 			self.use_whisper = False  # fallback doesn't use Whisper
@@ -72,13 +76,14 @@ except Exception as e:
 
 
 class VoiceGestureControl:
-    def __init__(self, use_whisper=True, whisper_model="base", headless=False):
+    def __init__(self, use_whisper=True, whisper_model="base", headless=False, vocab_decoding=False):
         # ---------------- Initialization ----------------
         # Headless mode: no camera window (works when minimized)
         self.headless = headless
         
         # Initialize Whisper-based hybrid recognizer
-        self.hybrid_recognizer = HybridRecognizer(use_whisper=use_whisper, whisper_model=whisper_model)
+        self.hybrid_recognizer = HybridRecognizer(use_whisper=use_whisper, whisper_model=whisper_model,
+                                                  decoding="vocab" if vocab_decoding else "free")
         self.recognizer = self.hybrid_recognizer.recognizer
         
         # Audio configuration for better noise filtering
@@ -127,7 +132,14 @@ class VoiceGestureControl:
         # --- Windows Automation (SmolLM2/Pattern Matching) ---
         if WINDOWS_AUTOMATION_AVAILABLE:
             self.win_command_generator = WindowsCommandGenerator(use_fallback=True)
+            self.win_command_generator.preload_model()  # background; warms Ollama before the first command
             self.win_executor = CommandExecutor()
+            self.win_executor.add_path_listener(self.win_command_generator.on_fs_events)
+            if self.win_executor.shells is not None:
+                if os.name == "nt":
+                    self.win_executor.shells.warm()  # background; PowerShell is ready for the first query
+                if self.system_monitor:
+                    self.system_monitor.shells = self.win_executor.shells
             print("✅ Windows Automation enabled (voice commands → system actions)")
         else:
             self.win_command_generator = None
@@ -156,6 +168,39 @@ class VoiceGestureControl:
             "mom": "+919988776655",
             "dad": "+112233445566"
         }
+        # Other names for the same contacts; these send as the name itself does
+        self.contact_aliases = {
+            "mum": "mom",
+            "mother": "mom",
+            "father": "dad",
+        }
+        # Misheard names ("jon", "rishy") are found too, but are confirmed before sending
+        self.contact_index = FuzzyVocabulary()
+        self.contact_index.add_all(self.contacts, "contact")
+        for alias, name in self.contact_aliases.items():
+            self.contact_index.add(alias, self.contacts[name], "contact")
+
+        # A command heard only approximately waits for a yes or no here:
+        # (action to run on yes, monotonic time the question lapses)
+        self.pending_confirmation = None
+        self.confirmation_window = 15.0
+        # An answer is a short utterance of only these words ("yes", "no thanks",
+        # "yes please do it"); "okay" only counts said on its own
+        self.yes_words = {"yes", "yeah", "yep", "sure", "correct", "confirm"}
+        self.no_words = {"no", "nope", "cancel", "wrong"}
+        self.answer_fillers = {"please", "do", "it", "that", "thanks", "thank", "you", "zentrax"}
+        self.answer_max_words = 3
+
+        # Bias speech decoding towards the phrases we actually act on
+        if hasattr(self.hybrid_recognizer, "set_command_vocabulary"):
+            self.hybrid_recognizer.set_command_vocabulary(self._command_vocabulary())
+
+    def _command_vocabulary(self):
+        """Known command phrases: predefined voice commands plus pattern-matcher app/folder names."""
+        phrases = list(self.voice_commands)
+        if self.win_command_generator and self.win_command_generator.pattern_matcher:
+            phrases += self.win_command_generator.pattern_matcher.vocabulary_phrases()
+        return phrases
 
     # ---------------- Hill Climb Integration ----------------
     def start_hill_climb(self):
@@ -318,6 +363,8 @@ class VoiceGestureControl:
             return
 
         if self.active_mode == "voice":
+            if self.pending_confirmation is not None and self._answer_confirmation(text):
+                return
             if text.startswith("play music"):
                 song = text.replace("play music", "").strip()
                 if song: self.play_music(song)
@@ -347,38 +394,13 @@ class VoiceGestureControl:
             command = self.win_command_generator.generate_command(text)
             
             if command:
-                action = command.get("action", "")
-                
-                # Handle special FRIDAY personality commands
-                if action == "help" and self.assistant:
-                    self.assistant.help_message()
-                    return
-                elif action == "thanks" and self.assistant:
-                    self.assistant.respond_to_thanks()
-                    return
-                elif action == "introduce" and self.assistant:
-                    self.assistant.introduce()
+                # Corrected names and keywords ("open world" -> Word) run only once confirmed
+                corrected = command.pop("corrected", None)
+                if corrected:
+                    self._ask_confirmation(f"Did you mean {corrected}?",
+                                           lambda: self._run_windows_command(text, command))
                     return
-                elif action == "system_info" and self.assistant and self.system_monitor:
-                    # Get and speak system info
-                    self._handle_system_info(command)
-                    return
-                
-                # Acknowledge before executing
-                if self.assistant:
-                    self.assistant.acknowledge()
-                
-                # Execute the command
-                success, message = self.win_executor.execute(command)
-                
-                if success:
-                    print(f"✅ {message}")
-                    if self.assistant:
-                        self.assistant.confirm()
-                else:
-                    print(f"❌ {message}")
-                    if self.assistant:
-                        self.assistant.report_error(message)
+                self._run_windows_command(text, command)
             else:
                 print(f"🤷 Could not understand: {text}")
                 if self.assistant:
@@ -388,6 +410,64 @@ class VoiceGestureControl:
             if self.assistant:
                 self.assistant.report_error(str(e))
     
+    def _run_windows_command(self, text, command):
+        """Carry out a generated command for what the user said."""
+        try:
+            action = command.get("action", "")
+            
+            # Handle special FRIDAY personality commands
+            if action == "help" and self.assistant:
+                self.assistant.help_message()
+                return
+            elif action == "thanks" and self.assistant:
+                self.assistant.respond_to_thanks()
+                return
+            elif action == "introduce" and self.assistant:
+                self.assistant.introduce()
+                return
+            elif action == "system_info" and self.assistant and self.system_monitor:
+                # Get and speak system info; the queries run on the executor's pool
+                future = self.win_executor.pool.submit(
+                    self._handle_system_info, command, name="system_info",
+                    timeout=self.win_executor.ACTIONS.get("system_info").timeout, concurrent=True)
+                future.add_done_callback(lambda done: self._report_windows_result(text, None, done))
+                return
+            
+            # Start file lookups, then acknowledge while they run
+            self.win_executor.prepare(command)
+            if self.assistant:
+                self.assistant.acknowledge()
+            
+            # Execute the command on the executor's pool; listening resumes
+            # right away and the result is reported when it is done
+            future = self.win_executor.submit(command)
+            future.add_done_callback(lambda done: self._report_windows_result(text, command, done))
+        except Exception as e:
+            print(f"❌ Windows automation error: {e}")
+            if self.assistant:
+                self.assistant.report_error(str(e))
+    
+    def _report_windows_result(self, text, command, future):
+        """Announce a finished Windows command (called on the executor's worker thread)."""
+        try:
+            result = future.result()
+        except CancelledError:
+            result = (False, "Command cancelled")
+        except Exception as e:
+            result = (False, f"Windows automation error: {e}")
+        if result is None:
+            return  # _handle_system_info speaks for itself
+        success, message = result
+        if success:
+            print(f"✅ {message}")
+            self.win_command_generator.confirm(text, command)
+            if self.assistant:
+                self.assistant.confirm()
+        else:
+            print(f"❌ {message}")
+            if self.assistant:
+                self.assistant.report_error(message)
+    
     def _handle_system_info(self, command):
         """Handle system info requests with FRIDAY voice."""
         extra = command.get("extra", {})
@@ -422,6 +502,44 @@ class VoiceGestureControl:
             network = self.system_monitor.get_network_status()
             self.assistant.report_status("wifi", f"{network['status']}, connected to {network['wifi_name']}")
 
+    # ---------------- Confirmation ----------------
+    def _ask_confirmation(self, question, action):
+        """Ask a yes/no question; action() runs if the next thing said is yes."""
+        self.pending_confirmation = (action, time.monotonic() + self.confirmation_window)
+        print(f"❓ {question}")
+        if self.assistant:
+            self.assistant.speak(question)
+
+    def _answer_confirmation(self, text):
+        """
+        Settle the pending question with what was just said.
+
+        Returns:
+            True if text answered it; False if the question lapsed or text
+            is something else, which is then handled as a new command
+        """
+        action, expires_at = self.pending_confirmation
+        self.pending_confirmation = None
+        if time.monotonic() > expires_at:
+            return False
+        words = re.sub(r"[^\w\s]", " ", text.lower()).split()
+        if words in (["ok"], ["okay"]):
+            action()
+            return True
+        if not words or len(words) > self.answer_max_words:
+            return False
+        if not set(words) <= self.yes_words | self.no_words | self.answer_fillers:
+            return False
+        if set(words) & self.no_words:
+            print("🚫 Cancelled")
+            if self.assistant:
+                self.assistant.speak("Okay, cancelled.")
+            return True
+        if set(words) & self.yes_words:
+            action()
+            return True
+        return False
+
     # ---------------- WhatsApp ----------------
     def handle_whatsapp(self, text):
         try:
@@ -429,10 +547,26 @@ class VoiceGestureControl:
             if len(parts) != 2: return
             contact_phrase = parts[0].replace("send whatsapp message to", "").strip()
             message = parts[1].strip()
-            for name, number in self.contacts.items():
-                if name in contact_phrase:
-                    now = datetime.now()
-                    pywhatkit.sendwhatmsg(number, message, now.hour, (now.minute + 1) % 60)
+            match = self.contact_index.find(contact_phrase, "contact")
+            if match is None:
+                print(f"📇 No contact matches '{contact_phrase}'")
+                if self.assistant:
+                    self.assistant.speak(f"I don't have a contact called {contact_phrase}.")
+                return
+            if match.distance == 0:
+                # The name or one of its aliases, as spoken
+                self._send_whatsapp(match.value, message)
+                return
+            # A misheard name sends only once the user confirms who was meant
+            print(f"📇 '{contact_phrase}' -> {match.term}? (edit distance {match.distance})")
+            self._ask_confirmation(f"Send it to {match.term}?", lambda: self._send_whatsapp(match.value, message))
+        except Exception as e:
+            print(f"WhatsApp error: {e}")
+
+    def _send_whatsapp(self, number, message):
+        try:
+            now = datetime.now()
+            pywhatkit.sendwhatmsg(number, message, now.hour, (now.minute + 1) % 60)
         except Exception as e:
             print(f"WhatsApp error: {e}")
 
@@ -563,6 +697,11 @@ class VoiceGestureControl:
         self.process_gestures()
         self.running = False
         voice_thread.join(timeout=2)
+        if self.win_command_generator:
+            print(self.win_command_generator.metrics.format_report())
+            print(self.win_executor.metrics.format_report())
+            self.win_command_generator.close()
+            self.win_executor.close()
         print("Shutdown complete.")
 
 
@@ -573,10 +712,13 @@ if __name__ == "__main__":
                         help="Run without camera window (works when minimized)")
     parser.add_argument("--no-whisper", action="store_true",
                         help="Disable Whisper, use Google Speech Recognition only")
+    parser.add_argument("--vocab-decoding", action="store_true",
+                        help="Bias Whisper towards known command phrases and stop decoding early")
     args = parser.parse_args()
     
     controller = VoiceGestureControl(
         use_whisper=not args.no_whisper,
-        headless=args.headless
+        headless=args.headless,
+        vocab_decoding=args.vocab_decoding
     )
     controller.run()
@@ -0,0 +1,164 @@
+"""
+Action Registry Benchmark
+Replays the commands of the intent corpus, plus malformed variants of them
+of the kind a small model produces (a required field dropped, a number sent
+as a string, "extra" as a string), through the executor's dispatch:
+  before:  action -> handler dict lookup and getattr; arguments reach the
+           handler unchecked
+  after:   the registry's precompiled per-action validation, then the
+           handler, with per-action metrics recorded
+Handlers are replaced by a stub that only records that it ran, so this
+measures dispatch itself and works on any platform. Also reports the size
+of the JSON schema generated for the LLM, before (one enum of action names)
+and after (per-signature branches with required fields and extra types).
+
+Run this from the project root:
+    python scripts/bench_action_registry.py [--rounds 20]
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.command_executor import CommandExecutor
+
+CORPUS_FILE = os.path.join("training_data", "intents", "corpus_v1.jsonl")
+
+
+def load_commands():
+    commands = []
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                expected = json.loads(line).get("expected")
+                if isinstance(expected, dict) and expected.get("action") in CommandExecutor.ACTIONS:
+                    commands.append(expected)
+    return commands
+
+
+def malformed(command, rng):
+    """A broken copy of a command, or None if there is nothing to break."""
+    spec = CommandExecutor.ACTIONS.get(command["action"])
+    broken = copy.deepcopy(command)
+    options = []
+    if spec.requires:
+        options.append("drop")
+    if spec.extra:
+        options.append("retype")
+    options.append("extra")
+    choice = rng.choice(options)
+    if choice == "drop":
+        for field in spec.requires[0].split("|"):
+            if field.startswith("extra."):
+                (broken.get("extra") or {}).pop(field[len("extra."):], None)
+            else:
+                broken.pop(field, None)
+    elif choice == "retype":
+        key, kind = rng.choice(sorted(spec.extra.items()))
+        broken.setdefault("extra", {})[key] = "42" if kind in (int, float) else 42
+    else:
+        broken["extra"] = "none"
+    return broken
+
+
+class StubExecutor(CommandExecutor):
+    """CommandExecutor whose handlers only count calls."""
+
+    def __init__(self):
+        super().__init__(use_file_catalog=False, use_app_index=False, use_frecency=False, use_fs_watcher=False)
+        self.handled = 0
+        for spec in self.ACTIONS.specs():
+            setattr(self, spec.handler, self._stub)
+
+    def _stub(self, cmd):
+        self.handled += 1
+        return True, "ok"
+
+
+# The action -> handler table execute() used before the registry
+HANDLERS = {spec.name: spec.handler for spec in CommandExecutor.ACTIONS.specs()}
+
+
+def dispatch_before(executor, command):
+    """CommandExecutor.execute as it was: lookup, getattr, call."""
+    action = command.get("action", "").lower()
+    handler_name = HANDLERS.get(action)
+    if not handler_name:
+        return False, f"Unknown action: {action}"
+    try:
+        return getattr(executor, handler_name)(command)
+    except Exception as e:
+        return False, f"Error executing {action}: {str(e)}"
+
+
+def schema_before(actions):
+    """The LLM's "format" as it was: one enum of action names, no per-action fields."""
+    return {
+        "type": "object",
+        "properties": {
+            "action": {"type": "string", "enum": sorted(actions)},
+            "target": {"type": "string"},
+            "path": {"type": "string"},
+            "extra": {"type": "object"},
+        },
+        "required": ["action"],
+    }
+
+
+def run(executor, commands, dispatch, rounds):
+    executor.handled = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            dispatch(command)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1e6 / (rounds * len(commands)), executor.handled // rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure validated dispatch against plain handler lookup")
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over the command set")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    good = load_commands()
+    bad = [malformed(command, rng) for command in good]
+    executor = StubExecutor()
+
+    print("=" * 100)
+    print(f"Action registry: {len(CommandExecutor.ACTIONS)} actions, {len(good)} corpus commands, "
+          f"{len(bad)} malformed variants")
+    print("=" * 100)
+    for name, commands in (("valid", good), ("malformed", bad)):
+        before_us, before_handled = run(executor, commands, lambda c: dispatch_before(executor, c), args.rounds)
+        after_us, after_handled = run(executor, commands, executor.execute, args.rounds)
+        print(f"  {name:>9}: before {before_us:6.2f} us/command, {before_handled} reached a handler | "
+              f"after {after_us:6.2f} us/command, {after_handled} reached a handler")
+
+    snapshot = executor.get_metrics()
+    invalid = sum(stats["invalid"] for stats in snapshot["actions"].values())
+    print(f"  metrics: {snapshot['total']} commands over {len(snapshot['actions'])} actions, "
+          f"{invalid} rejected before their handler")
+    examples = [(command, executor.ACTIONS.validate(command)) for command in bad[:200]]
+    for command, error in [example for example in examples if example[1]][:3]:
+        print(f"           {json.dumps(command)[:60]:<60} -> {error}")
+
+    old_schema = json.dumps(schema_before(CommandExecutor.ACTIONS))
+    new_schema = json.dumps(CommandExecutor.ACTIONS.json_schema())
+    print(f"  schema: {len(old_schema)} bytes (action enum only) -> {len(new_schema)} bytes "
+          f"({len(CommandExecutor.ACTIONS.json_schema()['anyOf'])} branches with required fields and extra types)")
+    print("=" * 100)
+    executor.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
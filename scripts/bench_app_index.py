@@ -0,0 +1,132 @@
+"""
+Executable Index Benchmark
+Compares CommandExecutor._find_app_path's per-call walk of the install
+folders with the persisted executable index (src/commands/app_index.py), on
+a generated Program Files / AppData tree: vendor folders full of DLLs and
+resources, some programs installed deep (vendor\\product\\version\\bin\\x64).
+  before:  os.walk of every install folder on each unknown app; the depth
+           limiter broke out of the whole walk at the first deep folder,
+           so later and deeper installs were never found
+  after:   one background crawl (incremental afterwards), then dictionary
+           lookups by exe name or Start Menu display name
+
+Run this from the project root:
+    python scripts/bench_app_index.py [--vendors 300] [--files 40]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.app_index import AppIndex
+
+
+def make_tree(root, vendors, files):
+    """Program Files + AppData\\Local + a Start Menu; returns {exe name: path} of the installed programs."""
+    program_files = os.path.join(root, "Program Files")
+    local = os.path.join(root, "AppData", "Local")
+    start_menu = os.path.join(root, "Start Menu", "Programs")
+    os.makedirs(start_menu)
+    installed = {}
+    for v in range(vendors):
+        base = program_files if v % 3 else local
+        if v % 4 == 0:
+            folder = os.path.join(base, f"Vendor{v}", f"Product{v}", f"app-1.{v}.0", "bin", "x64")
+        else:
+            folder = os.path.join(base, f"Vendor{v}", f"Product{v}")
+        os.makedirs(os.path.join(folder, "resources"))
+        for f in range(files):
+            open(os.path.join(folder, f"lib{f}.dll"), "w").close()
+            open(os.path.join(folder, "resources", f"asset{f}.pak"), "w").close()
+        exe = os.path.join(folder, f"tool{v}.exe")
+        open(exe, "w").close()
+        open(os.path.join(folder, "unins000.exe"), "w").close()
+        installed[f"tool{v}.exe"] = exe
+    with open(os.path.join(start_menu, "Tool Suite 7.lnk"), "w") as f:
+        f.write(installed["tool7.exe"])
+    return [start_menu, program_files, local], installed
+
+
+def old_find(roots, app_name):
+    """The walk _find_app_path used to do, including its early break."""
+    for pf in roots:
+        for walk_root, dirs, files in os.walk(pf):
+            if app_name in [f.lower() for f in files]:
+                return os.path.join(walk_root, app_name)
+            if walk_root.count(os.sep) - pf.count(os.sep) > 3:
+                break
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the executable index against walking install folders")
+    parser.add_argument("--vendors", type=int, default=300)
+    parser.add_argument("--files", type=int, default=40)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="zentrax_apps_")
+    try:
+        roots, installed = make_tree(root, args.vendors, args.files)
+        install_roots = roots[1:]
+        names = sorted(installed)
+        print(f"Generated install tree: {args.vendors} programs, {args.files * 2} files each, at {root}")
+        print("=" * 100)
+
+        start = time.perf_counter()
+        found = sum(old_find(install_roots, name) == installed[name] for name in names[:50])
+        before_ms = (time.perf_counter() - start) * 1000 / 50
+        start = time.perf_counter()
+        old_find(install_roots, "notinstalled.exe")
+        miss_ms = (time.perf_counter() - start) * 1000
+        print(f"   before: {before_ms:8.1f} ms per lookup, found {found}/50 installed programs; "
+              f"unknown app {miss_ms:.1f} ms")
+
+        db_dir = tempfile.mkdtemp(prefix="zentrax_app_index_")
+        db_path = os.path.join(db_dir, "app_index.sqlite3")
+        index = AppIndex(path=db_path, roots=roots, refresh_interval=0)
+        start = time.perf_counter()
+        index.refresh()
+        crawl_ms = (time.perf_counter() - start) * 1000
+        print(f"    crawl: {crawl_ms:8.1f} ms once ({len(index)} programs and shortcuts indexed)")
+
+        index.lookup("warmup.exe")
+        start = time.perf_counter()
+        found = sum(index.lookup(name) == installed[name] for name in names)
+        after_us = (time.perf_counter() - start) * 1e6 / len(names)
+        print(f"    after: {after_us:8.2f} µs per lookup, found {found}/{len(names)} installed programs "
+              f"(display name 'tool suite 7' -> {os.path.basename(index.lookup('Tool Suite 7') or '-')}, "
+              f"'tool12' -> {os.path.basename(index.lookup('tool12') or '-')}, "
+              f"uninstaller indexed: {index.lookup('unins000.exe') is not None})")
+
+        new_folder = os.path.join(install_roots[0], "NewVendor", "NewApp")
+        os.makedirs(new_folder)
+        open(os.path.join(new_folder, "newapp.exe"), "w").close()
+        start = time.perf_counter()
+        listed = index.refresh()
+        refresh_ms = (time.perf_counter() - start) * 1000
+        print(f"  rescan: {refresh_ms:8.1f} ms after installing one app ({listed} folders listed; "
+              f"found={index.lookup('newapp') is not None})")
+        index.close()
+
+        start = time.perf_counter()
+        reopened = AppIndex(path=db_path, roots=roots, refresh_interval=0)
+        path = reopened.lookup("tool1.exe")
+        print(f"  reopen: {(time.perf_counter() - start) * 1000:8.1f} ms to the first lookup in a new session "
+              f"(ready={reopened.ready}, found={path == installed['tool1.exe']})")
+        reopened.close()
+        shutil.rmtree(db_dir, ignore_errors=True)
+        print("=" * 100)
+        print(f"Unknown-app lookup: {before_ms:.1f} ms -> {after_us / 1000:.4f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
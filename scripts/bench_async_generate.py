@@ -0,0 +1,80 @@
+"""
+Async Command Generation Benchmark
+Compares how an asyncio server (like src/core/websocket_server.py) copes with
+a burst of text commands that all need the LLM, using the mock Ollama server
+(scripts/mock_ollama.py):
+  before: generate_command() called on the event loop; each request blocks
+          the loop until Ollama answers, so commands queue up one by one
+  after:  generate_command_async(); requests overlap on the asyncio HTTP
+          client and the loop stays free
+A ticker coroutine measures the worst event-loop stall during each run.
+
+Run this from the project root:
+    python scripts/bench_async_generate.py [--commands 20] [--token-ms 10]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+
+async def ticker(stop, interval=0.005):
+    """Worst lateness of a 5 ms timer while the loop is busy."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def run(generator, texts, use_async):
+    stop = asyncio.Event()
+    lag = asyncio.create_task(ticker(stop))
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    if use_async:
+        results = await asyncio.gather(*[generator.generate_command_async(text) for text in texts])
+    else:
+        async def blocking(text):
+            return generator.generate_command(text)
+        results = await asyncio.gather(*[blocking(text) for text in texts])
+    elapsed = (time.perf_counter() - start) * 1000
+    stop.set()
+    return elapsed, await lag, sum(result is not None for result in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark async vs blocking command generation on an event loop")
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = start_server(token_ms=args.token_ms, prompt_ms=50, trailing_tokens=40)
+    generator = WindowsCommandGenerator(ollama_url=f"{server.url}/api/generate", use_cache=False, use_classifier=False)
+    generator.confidence_threshold = 1.1  # every command goes to the LLM
+    print(f"Mock Ollama at {server.url}: {args.token_ms} ms/token; {args.commands} concurrent text commands")
+    print("=" * 100)
+
+    texts = [f"fire up the program number {i}" for i in range(args.commands)]
+    for name, use_async in (("before", False), ("after", True)):
+        elapsed, lag, ok = asyncio.run(run(generator, texts, use_async))
+        print(f"{name:>7}: {elapsed:8.1f} ms for {ok}/{len(texts)} commands "
+              f"({elapsed / len(texts):6.1f} ms each), worst loop stall {lag:7.1f} ms")
+    print("=" * 100)
+    generator.close()
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
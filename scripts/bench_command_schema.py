@@ -0,0 +1,102 @@
+"""
+Command Schema Benchmark
+Measures what validating streamed LLM output saves when a model drifts to an
+action the executor does not have, using the mock Ollama server
+(scripts/mock_ollama.py):
+  before:    stream until the JSON object closes, then parse and find the
+             action unknown (a wasted round trip)
+  validated: CommandStreamValidator rejects the action at its first wrong
+             character and the stream is dropped
+Also reports the validator's per-token cost, the size of the "format"
+schema sent with each request, and the generator's parse-failure rate over
+a mix of good and drifted answers.
+
+Run this from the project root:
+    python scripts/bench_command_schema.py [--calls 20] [--token-ms 10]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.command_schema import CommandStreamValidator, InvalidCommandError, validate_command
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+GOOD = '{"action": "open_app", "target": "excel.exe"}'
+DRIFTED = '{"action": "launch_application", "target": "C:/Program Files/Microsoft Office/root/Office16/EXCEL.EXE"}'
+
+
+def timed_calls(generator, calls, validated):
+    latencies, rejected = [], 0
+    for _ in range(calls):
+        payload = generator._ollama_payload("fire up the spreadsheet program")
+        validator = CommandStreamValidator(generator.actions) if validated else None
+        start = time.perf_counter()
+        try:
+            text = generator.ollama.generate_json(payload, timeout=30, validator=validator)
+            if validate_command(json.loads(text), generator.actions):
+                rejected += 1
+        except InvalidCommandError:
+            rejected += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sum(latencies) / len(latencies), rejected
+
+
+def validator_cost(actions, rounds=2000):
+    good_tokens = [GOOD[i:i + 4] for i in range(0, len(GOOD), 4)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        validator = CommandStreamValidator(actions)
+        for token in good_tokens:
+            validator.feed(token)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(good_tokens)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark early rejection of invalid streamed commands")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = start_server(token_ms=args.token_ms, prompt_ms=20, trailing_tokens=40, answer=DRIFTED)
+    print(f"Mock Ollama at {server.url}: {args.token_ms} ms/token, drifted answer {DRIFTED[:40]}...")
+    print("=" * 100)
+
+    generator = WindowsCommandGenerator(ollama_url=f"{server.url}/api/generate", use_cache=False)
+    schema_bytes = len(json.dumps(generator.command_schema))
+    per_token_us = validator_cost(generator.actions)
+    print(f"format schema: {len(generator.actions)} actions, {schema_bytes} bytes per request; "
+          f"validator {per_token_us:.2f} us per token")
+
+    timed_calls(generator, 1, False)  # warm-up
+    before, before_rejected = timed_calls(generator, args.calls, False)
+    after, after_rejected = timed_calls(generator, args.calls, True)
+    print(f"   before: {before:7.1f} ms per drifted answer  ({before_rejected}/{args.calls} rejected after the object closed)")
+    print(f"validated: {after:7.1f} ms per drifted answer  ({after_rejected}/{args.calls} rejected mid-stream)")
+
+    # Parse-failure rate as the generator reports it: one drifted answer in four
+    generator.confidence_threshold = 1.1  # always ask the LLM
+    generator.metrics.reset()
+    for i in range(args.calls):
+        server.answer = DRIFTED if i % 4 == 0 else GOOD
+        generator.resolve_intent("fire up the spreadsheet program")
+    output = generator.get_metrics()["llm_output"]
+    print(f"generator: {output['failures']}/{output['responses']} LLM answers invalid "
+          f"({output['failure_rate']:.1%}), last: {output['last_failure']}")
+    print("=" * 100)
+    print(f"Early rejection: {before - after:.1f} ms saved per drifted answer")
+    generator.close()
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Directory Scanner Benchmark
+Compares the recursive glob that _search_and_open used when the file catalog
+could not answer with DirScanner (src/commands/dir_scanner.py), on a
+generated home folder with documents, source checkouts (node_modules, .git)
+and cache folders:
+  before:  list(glob.glob(home/**/pattern, recursive=True))[:10], which walks
+           the whole tree (including node_modules) before keeping ten
+  after:   parallel os.scandir walk that skips node_modules, .git and caches
+           and stops as soon as ten matches were found
+Also reports the time to the first match, a full scan against glob's result
+(minus the excluded folders), and a scan that hits its deadline.
+
+Run this from the project root:
+    python scripts/bench_dir_scanner.py [--projects 20] [--docs 400]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.dir_scanner import DirScanner
+
+
+def make_home(root, projects, docs):
+    """Documents with PDFs, plus source checkouts full of dependency files."""
+    for i in range(docs):
+        folder = os.path.join(root, "Documents", f"folder{i % 20}")
+        os.makedirs(folder, exist_ok=True)
+        open(os.path.join(folder, f"report{i}.pdf" if i % 4 == 0 else f"notes{i}.txt"), "w").close()
+    for p in range(projects):
+        project = os.path.join(root, "source", f"project{p}")
+        for m in range(40):
+            module = os.path.join(project, "node_modules", f"pkg{m}", "lib")
+            os.makedirs(module)
+            for f in range(10):
+                open(os.path.join(module, f"file{f}.js"), "w").close()
+            open(os.path.join(module, "README.pdf"), "w").close()
+        objects = os.path.join(project, ".git", "objects")
+        os.makedirs(objects)
+        for f in range(100):
+            open(os.path.join(objects, f"{f:038x}"), "w").close()
+        open(os.path.join(project, "design.pdf"), "w").close()
+    cache = os.path.join(root, "AppData", "Local", "cache")
+    os.makedirs(cache)
+    for f in range(500):
+        open(os.path.join(cache, f"blob{f}.pdf"), "w").close()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DirScanner against a recursive glob")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--docs", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="zentrax_scan_")
+    try:
+        make_home(home, args.projects, args.docs)
+        scanner = DirScanner()
+        print(f"Generated home folder: {args.docs} documents, {args.projects} checkouts with node_modules and .git")
+        print("=" * 100)
+
+        def before():
+            return list(glob.glob(os.path.join(home, "**", "*.pdf"), recursive=True))[:10]
+
+        def after():
+            return list(scanner.scan([home], "*.pdf", max_results=10, deadline=3.0))
+
+        def first():
+            return next(iter(scanner.scan([home], "*.pdf", deadline=3.0)), None)
+
+        for name, func in (("before", before), ("after", after), ("first", first)):
+            times = []
+            for _ in range(args.rounds):
+                ms, result = timed(func)
+                times.append(ms)
+            count = len(result) if isinstance(result, list) else int(result is not None)
+            print(f"  {name:>6}: {min(times):8.1f} ms (best of {args.rounds}), {count} matches")
+
+        everything = {p for p in glob.glob(os.path.join(home, "**", "*.pdf"), recursive=True)
+                      if not any(part in ("node_modules", "appdata", "cache") for part in p.lower().split(os.sep))}
+        ms, full = timed(lambda: set(scanner.scan([home], "*.pdf")))
+        print(f"    full: {ms:8.1f} ms, {len(full)} matches outside excluded folders, same as glob's: {full == everything}")
+
+        unfiltered = DirScanner(excluded=())
+        total_ms, total = timed(lambda: list(unfiltered.scan([home], "*.js")))
+        ms, partial = timed(lambda: list(unfiltered.scan([home], "*.js", deadline=0.02)))
+        print(f"deadline: {ms:8.1f} ms for a 20 ms deadline inside node_modules ({len(partial)}/{len(total)} "
+              f"matches; the whole walk takes {total_ms:.1f} ms)")
+        print("=" * 100)
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
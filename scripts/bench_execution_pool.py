@@ -0,0 +1,169 @@
+"""
+Execution Pool Benchmark
+Runs slow commands through the executor the way the voice loop does and
+measures what the caller waits for:
+  before:  executor.execute(command) on the caller's thread; the next
+           utterance is not handled until the command returns
+  after:   executor.submit(command); the future resolves on the pool
+Then checks how the pool stops commands: a child process that outlives its
+action's timeout, a command cancelled while it runs, a handler that ignores
+cancellation (abandoned after the grace period), and how many child
+processes run at once under the cap.
+
+Slow commands are shell "sleep"s through run_command; quick ones are
+media_next with its key press stubbed out, so this works on any platform
+with a POSIX shell.
+
+Run this from the project root:
+    python scripts/bench_execution_pool.py [--slow 1.0] [--burst 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands import execution_pool
+from src.commands.command_executor import CommandExecutor
+
+
+def sleep_command(seconds):
+    return {"action": "run_command", "extra": {"command": f"sleep {seconds}"}}
+
+
+def new_executor():
+    executor = CommandExecutor(use_file_catalog=False, use_app_index=False, use_frecency=False,
+                               use_fs_watcher=False)
+    executor._media_next = lambda command: (True, "Next track")
+    return executor
+
+
+def caller_wait(executor, args):
+    """ms the caller is blocked with execute() and submit(), and until results are in."""
+    commands = [sleep_command(args.slow)] + [{"action": "media_next"}] * args.quick
+    start = time.perf_counter()
+    for command in commands:
+        executor.execute(command)
+    before = (time.perf_counter() - start) * 1000
+
+    waited = 0.0
+    start = time.perf_counter()
+    futures = []
+    for command in commands:
+        submitted = time.perf_counter()
+        futures.append(executor.submit(command))
+        waited = max(waited, (time.perf_counter() - submitted) * 1000)
+    for future in futures[1:]:
+        future.result()
+    quick_done = (time.perf_counter() - start) * 1000
+    futures[0].result()
+    after = (time.perf_counter() - start) * 1000
+    return before, waited, quick_done, after
+
+
+def stopped(executor, args):
+    """ms and result of a timeout, a cancel and a cancel the handler ignores."""
+    spec = executor.ACTIONS.get("run_command")
+    original = spec.timeout
+    spec.timeout = args.timeout
+    try:
+        start = time.perf_counter()
+        timed_out = executor.submit(sleep_command(30)).result()
+        timeout_ms = (time.perf_counter() - start) * 1000
+    finally:
+        spec.timeout = original
+
+    future = executor.submit(sleep_command(30))
+    time.sleep(0.2)
+    start = time.perf_counter()
+    future.cancel()
+    cancelled = future.result()
+    cancel_ms = (time.perf_counter() - start) * 1000
+
+    # A handler that never checks for cancellation
+    release = threading.Event()
+    executor._mute = lambda command: (release.wait(30), (True, "late"))[1]
+    future = executor.submit({"action": "mute"})
+    time.sleep(0.1)
+    start = time.perf_counter()
+    future.cancel()
+    abandoned = future.result()
+    abandon_ms = (time.perf_counter() - start) * 1000
+    release.set()
+    return timeout_ms, timed_out, cancel_ms, cancelled, abandon_ms, abandoned
+
+
+def capped(executor, args):
+    """ms for a burst of sleeps, and the most children seen at once."""
+    running = [0, 0]
+    lock = threading.Lock()
+    popen = subprocess.Popen
+
+    class CountingPopen(popen):
+        def __init__(self, *a, **kw):
+            super().__init__(*a, **kw)
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+
+        def __exit__(self, *exc):
+            with lock:
+                running[0] -= 1
+            return super().__exit__(*exc)
+
+    # Children are counted between start and exit, so this sees what the cap lets through
+    execution_pool.subprocess.Popen = CountingPopen
+    try:
+        start = time.perf_counter()
+        futures = [executor.submit(sleep_command(args.burst_sleep)) for _ in range(args.burst)]
+        for future in futures:
+            future.result()
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        execution_pool.subprocess.Popen = popen
+    return elapsed, running[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure caller blocking and command stopping on the execution pool")
+    parser.add_argument("--slow", type=float, default=1.0, help="Seconds the slow command sleeps")
+    parser.add_argument("--quick", type=int, default=5, help="Quick commands after the slow one")
+    parser.add_argument("--timeout", type=float, default=0.5, help="run_command timeout for the timeout check")
+    parser.add_argument("--burst", type=int, default=8, help="Commands submitted at once for the cap check")
+    parser.add_argument("--burst-sleep", type=float, default=0.3, help="Seconds each burst command sleeps")
+    args = parser.parse_args()
+
+    executor = new_executor()
+    print("=" * 100)
+    print(f"Execution pool: {executor.pool.max_workers} workers, {executor.pool.max_processes} process slots, "
+          f"cancel grace {executor.pool.CANCEL_GRACE:g} s")
+    print("=" * 100)
+
+    before, waited, quick_done, after = caller_wait(executor, args)
+    print(f"  caller: 1 x sleep {args.slow:g} + {args.quick} quick commands")
+    print(f"          before: execute() blocked the caller for {before:8.1f} ms")
+    print(f"          after:  submit() blocked it for at most {waited:8.3f} ms; quick results in "
+          f"{quick_done:.1f} ms, all in {after:.1f} ms")
+
+    timeout_ms, timed_out, cancel_ms, cancelled, abandon_ms, abandoned = stopped(executor, args)
+    print(f"  stop:   timeout {args.timeout:g} s on sleep 30 -> {timeout_ms:7.1f} ms  {timed_out}")
+    print(f"          cancel while running        -> {cancel_ms:7.1f} ms  {cancelled}")
+    print(f"          cancel, handler ignores it  -> {abandon_ms:7.1f} ms  {abandoned}")
+
+    elapsed, peak = capped(executor, args)
+    serial = args.burst * args.burst_sleep * 1000
+    print(f"  cap:    {args.burst} x sleep {args.burst_sleep:g}: {elapsed:.0f} ms, at most {peak} children at once "
+          f"(serial {serial:.0f} ms)")
+    print(f"  stats:  {executor.pool.stats}")
+    print("=" * 100)
+    executor.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
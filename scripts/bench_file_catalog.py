@@ -0,0 +1,121 @@
+"""
+File Catalog Benchmark
+Compares answering spoken file commands from the SQLite file catalog
+(src/commands/file_catalog.py) with walking the home folder per request, on a
+generated home folder (nested project folders of dummy files):
+  before:  PathResolver without a catalog (listing + recursive walk) and the
+           recursive glob _search_and_open used for "find my pdfs"
+  after:   catalog lookups by stem, misheard name and glob pattern
+Also times the first crawl, an incremental crawl after one file is added
+(only the changed folder is listed again), and reopening the catalog.
+
+Run this from the project root:
+    python scripts/bench_file_catalog.py [--dirs 3000] [--files 20] [--workers 4]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.file_catalog import FileCatalog
+from src.commands.path_resolver import PathResolver
+
+KINDS = (".txt", ".pdf", ".docx", ".py")
+
+
+def make_tree(root, dirs, files):
+    """Desktop/Documents/Downloads plus `dirs` nested project folders of files."""
+    for name in ("Desktop", "Documents", "Downloads"):
+        os.makedirs(os.path.join(root, name))
+    for d in range(dirs):
+        folder = os.path.join(root, "projects", f"group{d % 40}", f"project{d}")
+        os.makedirs(folder)
+        for f in range(files):
+            open(os.path.join(folder, f"notes{d}_{f}{KINDS[f % len(KINDS)]}"), "w").close()
+    open(os.path.join(folder, "quarterly_report.pdf"), "w").close()
+    open(os.path.join(root, "Documents", "linux_handbook.pdf"), "w").close()
+
+
+def timed(fn, repeat=1):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return result, timings[len(timings) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the persistent file catalog")
+    parser.add_argument("--dirs", type=int, default=3000)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="zentrax_home_")
+    try:
+        make_tree(root, args.dirs, args.files)
+        roots = [os.path.join(root, n) for n in ("Desktop", "Documents", "Downloads")] + [root]
+        print(f"Generated home folder: {args.dirs} folders x {args.files} files at {root}")
+        print("=" * 100)
+
+        walker = PathResolver(search_locations=roots, root=root)
+        path, walk_ms = timed(lambda: walker.find("quarterly", ".pdf"))
+        print(f"   before: 'open quarterly pdf' walk        {walk_ms:9.1f} ms (found={path is not None})")
+        matches, glob_ms = timed(lambda: glob.glob(os.path.join(root, "**", "*.pdf"), recursive=True)[:10])
+        print(f"   before: 'find my pdfs' recursive glob    {glob_ms:9.1f} ms ({len(matches)} shown)")
+        _, miss_ms = timed(lambda: walker.find("nonexistent", ".pdf"))
+        print(f"   before: a name that does not exist       {miss_ms:9.1f} ms")
+        walker.close()
+
+        db_path = os.path.join(tempfile.mkdtemp(prefix="zentrax_catalog_"), "file_catalog.sqlite3")
+        catalog = FileCatalog(path=db_path, roots=roots, max_workers=args.workers, refresh_interval=0)
+        listed, crawl_ms = timed(catalog.refresh)
+        print(f"    crawl: first crawl ({args.workers} workers)         {crawl_ms:9.1f} ms "
+              f"({listed} folders, {len(catalog)} files)")
+
+        resolver = PathResolver(search_locations=roots, root=root, catalog=catalog)
+        path, find_ms = timed(lambda: resolver.find("quarterly", ".pdf"), repeat=50)
+        print(f"    after: 'open quarterly pdf'             {find_ms:9.3f} ms (found={path is not None})")
+        path, fuzzy_ms = timed(lambda: catalog.fuzzy_find("lenux", ".pdf", limit=1), repeat=50)
+        print(f"    after: 'open lenux pdf' (misheard)      {fuzzy_ms:9.3f} ms (found={path[:1]})")
+        matches, search_ms = timed(lambda: catalog.search("*.pdf", root, limit=10), repeat=50)
+        print(f"    after: 'find my pdfs'                   {search_ms:9.3f} ms ({len(matches)} shown)")
+        matches, glob2_ms = timed(lambda: catalog.search("*report*", root, limit=10), repeat=50)
+        print(f"    after: 'find report files'              {glob2_ms:9.3f} ms ({len(matches)} shown)")
+        _, stem_ms = timed(lambda: catalog.find("notes1500_3", limit=1), repeat=50)
+        print(f"    after: stem lookup                      {stem_ms:9.3f} ms")
+
+        time.sleep(0.01)
+        new_file = os.path.join(root, "Desktop", "fresh_invoice.pdf")
+        open(new_file, "w").close()
+        listed, incremental_ms = timed(catalog.refresh)
+        print(f"  rescan: after adding one file            {incremental_ms:9.1f} ms "
+              f"({listed} folder listed, {catalog.stats['unchanged']} unchanged; "
+              f"found={catalog.find('fresh_invoice') == [new_file]})")
+        resolver.close()
+        catalog.close()
+
+        reopened, reopen_ms = timed(lambda: FileCatalog(path=db_path, roots=roots, refresh_interval=0))
+        print(f"  reopen: catalog from disk                {reopen_ms:9.1f} ms (ready={reopened.ready}, "
+              f"{len(reopened)} files)")
+        reopened.close()
+        shutil.rmtree(os.path.dirname(db_path), ignore_errors=True)
+        print("=" * 100)
+        print(f"'open quarterly pdf': {walk_ms:.1f} ms -> {find_ms:.3f} ms; "
+              f"'find my pdfs': {glob_ms:.1f} ms -> {search_ms:.3f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
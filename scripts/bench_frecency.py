@@ -0,0 +1,155 @@
+"""
+Frecency Ranking Benchmark
+Replays a month of voice opens on a generated home folder where every
+spoken name is ambiguous ("report" names a Report.pdf in several folders,
+next to Q3 Report.pdf, Report Draft.pdf, ...), then asks for each name:
+  before:  PathResolver over the file catalog, no history; the first match
+           by folder priority and depth wins
+  disk:    PathResolver with a FrecencyStore holding the history on disk
+           only (nothing in memory)
+  after:   PathResolver with a FrecencyStore; names opened before are
+           answered from its in-memory top entries without a search
+A pick is right when it is the file named so that the user opened most in
+the last two weeks (one of the names has a stale favourite from three months
+ago). Files whose name only contains the spoken one are opened too, and
+must not win over it.
+
+Run this from the project root:
+    python scripts/bench_frecency.py [--dirs 500] [--opens 400]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.file_catalog import FileCatalog
+from src.commands.frecency import FrecencyStore
+from src.commands.path_resolver import PathResolver
+
+TOPICS = ["report", "budget", "invoice", "resume", "slides", "notes", "contract", "syllabus"]
+VARIANTS = ["{t} final", "q3 {t}", "{t} draft", "old {t}", "{t} 2023", "team {t}", "{t} copy"]
+COPIES = 3  # files named exactly as spoken, in different folders
+DAY = 24 * 3600.0
+
+
+def make_home(root, dirs, rng):
+    """Folders of filler files, with the copies and every variant of every topic somewhere inside."""
+    folders = []
+    for i in range(dirs):
+        folder = os.path.join(root, ["Desktop", "Documents", "Downloads", "Projects"][i % 4],
+                              f"area{i % 25}", f"folder{i}")
+        os.makedirs(folder)
+        folders.append(folder)
+        for f in range(10):
+            open(os.path.join(folder, f"file{i}_{f}.txt"), "w").close()
+    files, named = {}, {}
+    for topic in TOPICS:
+        files[topic], named[topic] = [], []
+        for variant in ["{t}"] * COPIES + VARIANTS:
+            path = os.path.join(rng.choice(folders), variant.format(t=topic).title() + ".pdf")
+            while os.path.exists(path):
+                path = os.path.join(rng.choice(folders), os.path.basename(path))
+            open(path, "w").close()
+            files[topic].append(path)
+            if variant == "{t}":
+                named[topic].append(path)
+    return files, named
+
+
+def replay(store, files, named, opens, rng, now):
+    """Zipf-ish opens over the last 30 days; returns the expected pick per topic."""
+    expected = {}
+    history = []
+    for topic, paths in files.items():
+        favourite = rng.choice(named[topic])
+        expected[topic] = favourite
+        # Partial matches are opened as often as the favourite in total
+        weights = [8 if p == favourite else 8 / (len(paths) - 1) for p in paths]
+        for _ in range(opens // len(files)):
+            history.append((now - rng.uniform(0, 14) * DAY, rng.choices(paths, weights)[0]))
+    # A favourite from three months ago that was opened far more often back then
+    stale_topic = TOPICS[0]
+    stale = next(p for p in named[stale_topic] if p != expected[stale_topic])
+    history += [(now - rng.uniform(90, 100) * DAY, stale) for _ in range(60)]
+    history.sort()
+    for at, path in history:
+        store.record(path, "file", at=at)
+    return expected
+
+
+def evaluate(resolver, expected, rounds):
+    right, times = 0, []
+    for topic, favourite in expected.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            path = resolver.find(topic, ".pdf")
+        times.append((time.perf_counter() - start) / rounds * 1000)
+        right += path == favourite
+    return right, sum(times) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frecency ranking of ambiguous spoken file names")
+    parser.add_argument("--dirs", type=int, default=500)
+    parser.add_argument("--opens", type=int, default=400)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=45)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    home = tempfile.mkdtemp(prefix="zentrax_frecency_")
+    try:
+        files, named = make_home(home, args.dirs, rng)
+        roots = [os.path.join(home, name) for name in ("Desktop", "Documents", "Downloads")] + [home]
+        catalog = FileCatalog(path=None, roots=roots, refresh_interval=0)
+        catalog.refresh()
+        store = FrecencyStore(path=None)
+        expected = replay(store, files, named, args.opens, rng, time.time())
+        print(f"{len(TOPICS)} ambiguous names x {COPIES + len(VARIANTS)} files each, {args.dirs} folders; "
+              f"{len(store)} files in the history")
+        print("=" * 100)
+
+        walk = PathResolver(search_locations=roots, root=home)
+        before = PathResolver(search_locations=roots, root=home, catalog=catalog)
+        after = PathResolver(search_locations=roots, root=home, catalog=catalog, frecency=store)
+        # The same history on disk with nothing in memory
+        disk = FrecencyStore(path=os.path.join(home, "frecency.sqlite3"), capacity=0)
+        for path, (kind, name, score, last) in store._memory.items():
+            disk.record(path, kind, name, at=last)
+            disk._db.execute("UPDATE frecency SET score = ? WHERE path = ?", (score, path))
+        ranked = PathResolver(search_locations=roots, root=home, catalog=catalog, frecency=disk)
+        for name, resolver in (("walk", walk), ("before", before), ("disk", ranked), ("after", after)):
+            right, ms = evaluate(resolver, expected, args.rounds)
+            print(f"  {name:>6}: {right}/{len(expected)} picks are the file the user actually opens, "
+                  f"{ms:8.3f} ms per lookup")
+        stale = files[TOPICS[0]]
+        print(f"   stale: '{TOPICS[0]}' -> {os.path.relpath(after.find(TOPICS[0], '.pdf'), home)} "
+              f"(recent favourite {os.path.relpath(expected[TOPICS[0]], home)}; "
+              f"{len(stale)} candidates, one opened 60 times three months ago)")
+        once = FrecencyStore(path=None)
+        opened = files[TOPICS[1]][COPIES]
+        once.record(opened, "file")
+        print(f" partial: '{TOPICS[1]}' after one open of {os.path.basename(opened)} -> "
+              f"{once.best(TOPICS[1], 'file', '.pdf')} (names that only contain it need "
+              f"{FrecencyStore.MIN_PARTIAL_SCORE:g} recent opens)")
+        print(f"  memory: {store.stats['memory_hits']} lookups answered from the in-memory top entries, "
+              f"{disk.stats['disk_hits']} from the table on disk")
+        print("=" * 100)
+        for resolver in (walk, before, ranked, after):
+            resolver.close()
+        disk.close()
+        catalog.close()
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
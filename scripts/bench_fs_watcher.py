@@ -0,0 +1,170 @@
+"""
+File System Watcher Benchmark
+Builds a home folder of generated files, indexes it with a FileCatalog and
+measures how a change on disk reaches the catalog:
+  refresh:  the incremental crawl the catalog ran every few minutes
+            (only folders whose mtime changed are listed again, but every
+            folder is stat-ed)
+  watch:    FsWatcher events applied with FileCatalog.apply_events, with
+            the inotify backend where available and the polling backend
+For each backend it reports the time from the change to a catalog lookup
+finding it (create, delete, rename of a folder), how a burst of thousands
+of files is coalesced into batches, the cost of one polling tick and what
+happens when a root has more folders than max_dirs.
+
+Run this from the project root:
+    python scripts/bench_fs_watcher.py [--dirs 2000] [--burst 3000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.file_catalog import FileCatalog
+from src.commands.fs_watcher import FsWatcher, _InotifyBackend
+
+
+def make_home(root, dirs):
+    """dirs folders of ten filler files each, below a few top-level folders."""
+    for i in range(dirs):
+        folder = os.path.join(root, ["Desktop", "Documents", "Downloads", "Projects"][i % 4],
+                              f"area{i % 25}", f"folder{i}")
+        os.makedirs(folder)
+        for f in range(10):
+            open(os.path.join(folder, f"file{i}_{f}.txt"), "w").close()
+
+
+def wait_for(check, timeout=10.0):
+    """Milliseconds until check() is true, or None on timeout."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if check():
+            return (time.perf_counter() - start) * 1000
+        time.sleep(0.002)
+    return None
+
+
+def fmt(ms):
+    return f"{ms:9.1f} ms" if ms is not None else "  timeout"
+
+
+def latencies(home, catalog):
+    """(create, delete, rename) ms until the catalog reflects each change."""
+    target = os.path.join(home, "Documents", "area1", "folder1")
+    created = os.path.join(target, "Quarterly Forecast.xlsx")
+    open(created, "w").close()
+    create = wait_for(lambda: catalog.find("quarterly forecast", ".xlsx"))
+    os.remove(created)
+    delete = wait_for(lambda: not catalog.find("quarterly forecast", ".xlsx"))
+    moved = os.path.join(home, "Documents", "area1", "renamed1")
+    os.rename(target, moved)
+    rename = wait_for(lambda: (catalog.find("file1_0", ".txt") or [""])[0].startswith(moved))
+    os.rename(moved, target)
+    wait_for(lambda: (catalog.find("file1_0", ".txt") or [""])[0].startswith(target))
+    return create, delete, rename
+
+
+def run_watch(home, catalog, use_inotify, args):
+    watcher = FsWatcher([home], excluded=catalog.excluded, use_inotify=use_inotify,
+                        poll_interval=args.poll_interval, poll_budget=args.poll_budget)
+    batches = []
+    watcher.add_listener(batches.append)
+    watcher.add_listener(catalog.apply_events)
+    start = time.perf_counter()
+    watcher.start()
+    watcher.wait_ready()
+    setup = (time.perf_counter() - start) * 1000
+    print(f"  {watcher.backend:>8}: watching {watcher.watched} folders, set up in {setup:.0f} ms")
+
+    create, delete, rename = latencies(home, catalog)
+    print(f"            create {fmt(create)}   delete {fmt(delete)}   rename folder {fmt(rename)}")
+
+    # A burst: an archive unpacked into a new folder
+    wait_for(lambda: not watcher._pending, timeout=5)
+    before, events = len(batches), watcher.stats["events"]
+    unpacked = os.path.join(home, "Downloads", "unpacked")
+    os.makedirs(unpacked)
+    for i in range(args.burst):
+        open(os.path.join(unpacked, f"part{i}.dat"), "w").close()
+    last = os.path.join(unpacked, f"part{args.burst - 1}.dat")
+    burst = wait_for(lambda: catalog.find(f"part{args.burst - 1}", ".dat"), timeout=30)
+    time.sleep(watcher.settle + 0.2)
+    print(f"            burst of {args.burst} files: {watcher.stats['events'] - events} events in "
+          f"{len(batches) - before} batch(es), last file findable after {fmt(burst).strip()}"
+          f"{'' if os.path.exists(last) else ' (missing)'}")
+    shutil.rmtree(unpacked)
+    wait_for(lambda: not catalog.find(f"part{args.burst - 1}", ".dat"), timeout=30)
+
+    watcher.close()
+
+    if watcher.backend == "polling":
+        # A quiet tick: poll_budget folders are stat-ed, none has changed
+        folders = list(watcher._backend.folders)
+        tick_start = time.perf_counter()
+        for _ in range(5):
+            for folder in folders[:watcher.poll_budget]:
+                os.stat(folder)
+        tick = (time.perf_counter() - tick_start) * 1000 / 5
+        full = len(folders) / max(1, watcher.poll_budget) * watcher.poll_interval
+        print(f"            one tick stats {min(watcher.poll_budget, len(folders))} folders in "
+              f"{tick:.2f} ms; every folder is checked every {full:.1f} s")
+
+
+def run_cap(home, args):
+    """A watcher capped below the tree size marks the root truncated."""
+    cap = max(10, args.dirs // 4)
+    watcher = FsWatcher([home], max_dirs=cap, use_inotify=False, poll_interval=3600)
+    watcher.start()
+    watcher.wait_ready()
+    print(f"     cap: max_dirs={cap}: {watcher.watched} folders tracked, truncated={bool(watcher.truncated)}, "
+          f"{sum(watcher._backend.names.values())} names remembered")
+    watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure catalog freshness with and without a file watcher")
+    parser.add_argument("--dirs", type=int, default=2000, help="Folders in the generated home folder")
+    parser.add_argument("--burst", type=int, default=3000, help="Files created in one burst")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between polls")
+    parser.add_argument("--poll-budget", type=int, default=1000, help="Folders checked per poll")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="zentrax_watch_")
+    try:
+        make_home(home, args.dirs)
+        catalog = FileCatalog(path=None, roots=[home], refresh_interval=0)
+        catalog.refresh()
+
+        print("=" * 100)
+        print(f"File watcher: {args.dirs} folders, {args.dirs * 10} files")
+        print("=" * 100)
+        target = os.path.join(home, "Desktop", "area0", "folder0", "Quarterly Forecast.xlsx")
+        open(target, "w").close()
+        start = time.perf_counter()
+        catalog.refresh()
+        refresh = (time.perf_counter() - start) * 1000
+        found = bool(catalog.find("quarterly forecast", ".xlsx"))
+        os.remove(target)
+        catalog.refresh()
+        print(f"  refresh: one incremental crawl takes {refresh:.1f} ms (found={found}); "
+              f"a change waits up to the refresh interval (300 s) for it")
+
+        backends = [True, False] if _InotifyBackend.available() else [False]
+        for use_inotify in backends:
+            run_watch(home, catalog, use_inotify, args)
+        run_cap(home, args)
+        print("=" * 100)
+        catalog.close()
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
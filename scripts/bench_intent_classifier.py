@@ -0,0 +1,122 @@
+"""
+Intent Classifier Benchmark
+Evaluates the nearest-neighbour classifier tier (src/commands/intent_classifier.py)
+trained from training_data/voice_commands:
+  - leave-one-out accuracy over the recorded transcripts
+  - paraphrases it should answer, and other commands it must leave alone
+  - per-utterance latency
+  - incremental learning: a confirmed phrasing is answered straight away
+
+Run this from the project root:
+    python scripts/bench_intent_classifier.py [--threshold 0.7]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.intent_classifier import IntentClassifier
+from src.commands.windows_command_generator import PatternMatcher, WindowsCommandGenerator
+
+# Paraphrases of the recorded commands, with the action they should resolve to
+PARAPHRASES = [
+    ("minimise the current", "minimize_window"),
+    ("minimise everything", "minimize_window"),
+    ("maximise", "maximize_window"),
+    ("maximise this window", "maximize_window"),
+    ("close the window", "close_window"),
+    ("closing this window", "close_window"),
+    ("close it", "close_window"),
+    ("scroll down a bit", "scroll"),
+    ("please scroll up", "scroll"),
+    ("scroll the page down", "scroll"),
+    ("grab a screenshot", "screenshot"),
+    ("take a screen shot", "screenshot"),
+    ("its too loud", "volume_down"),
+    ("volume up please", "volume_up"),
+    ("make it louder", "volume_up"),
+    ("increase the sound", "volume_up"),
+    ("lower the volume a bit", "volume_down"),
+    ("make the window bigger", "maximize_window"),
+]
+
+# Other commands: the classifier must abstain so later tiers handle them
+OTHERS = [
+    "open chrome", "open notepad", "exit", "delete report.docx", "shut down the computer",
+    "mute", "increase brightness", "open downloads folder", "move report.docx to documents",
+    "close chrome", "search for pdf files", "lock the screen", "next track", "open settings",
+    "turn on wifi", "what time is it", "create a folder called projects", "type hello world",
+    "restart the computer", "open youtube", "switch to chrome", "kill zoom", "show desktop",
+    "new tab", "close tab", "open",
+]
+
+
+def build(threshold, matcher, skip=None):
+    classifier = IntentClassifier(threshold=threshold)
+    if skip is None:
+        classifier.load_transcripts(WindowsCommandGenerator.TRANSCRIPTS_DIR, matcher.match)
+        return classifier
+    reference = build(threshold, matcher)
+    for index, (text, command) in enumerate(zip(reference.texts, reference.commands)):
+        if index != skip:
+            classifier.add(text, command)
+    return classifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the nearest-neighbour intent classifier")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    matcher = PatternMatcher()
+    start = time.perf_counter()
+    classifier = build(args.threshold, matcher)
+    print(f"Trained on {len(classifier)} transcripts in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(threshold {args.threshold})")
+    print("=" * 100)
+
+    # Leave-one-out over the transcripts: abstaining is allowed, answering wrongly is not
+    correct = answered = 0
+    for index, expected in enumerate(classifier.commands):
+        command, _ = build(args.threshold, matcher, skip=index).predict(classifier.texts[index])
+        answered += command is not None
+        correct += command == expected if command is not None else 0
+    print(f"Leave-one-out: answered {answered}/{len(classifier)}, correct {correct}/{answered}")
+
+    hits = 0
+    for text, action in PARAPHRASES:
+        command, score = classifier.predict(text)
+        if command and command["action"] == action:
+            hits += 1
+        else:
+            print(f"   left to the LLM: {text!r} ({score:.2f}) -> {command}")
+    print(f"Paraphrases: {hits}/{len(PARAPHRASES)} resolved locally")
+    false_positives = [(text, classifier.predict(text)) for text in OTHERS]
+    false_positives = [(text, command) for text, (command, _) in false_positives if command]
+    for text, command in false_positives:
+        print(f"   wrongly answered: {text!r} -> {command}")
+    print(f"Other commands: {len(false_positives)}/{len(OTHERS)} wrongly answered")
+
+    timings = []
+    for _ in range(50):
+        for text, _ in PARAPHRASES:
+            begin = time.perf_counter()
+            classifier.predict(text)
+            timings.append((time.perf_counter() - begin) * 1e6)
+    timings.sort()
+    print(f"Latency: p50 {timings[len(timings) // 2]:.0f} us  p95 {timings[int(len(timings) * 0.95)]:.0f} us")
+
+    before, _ = classifier.predict("make it a bit louder")
+    classifier.confirm("make it louder", {"action": "volume_up", "extra": {"amount": 10}})
+    after, _ = classifier.predict("make it a bit louder")
+    print(f"Incremental: 'make it a bit louder' -> {before} before, {after} after confirming 'make it louder'")
+    print("=" * 100)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
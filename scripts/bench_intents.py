@@ -0,0 +1,218 @@
+"""
+Intent Corpus Benchmark
+Scores intent resolution against the versioned corpus
+(training_data/intents/corpus_v1.jsonl, built by scripts/build_intent_corpus.py)
+and fails when accuracy or latency regresses from the recorded baseline.
+
+  default      PatternMatcher.match on every utterance (no I/O, thousands of
+               utterances in a few seconds); reports which rule answered
+  --generator  WindowsCommandGenerator.resolve_intent with the cache off, so
+               every tier runs (classifier, LLM); reports which tier answered.
+               Point --url at a real Ollama server to measure the LLM path;
+               use --sample to keep the run short
+
+A command is correct when it contains every key of the expected command
+with the same value. The run fails (exit 1) if accuracy drops, a case that
+passed in the baseline now fails, or mean/p99 latency exceeds the baseline
+by more than --latency-tolerance.
+
+Run this from the project root:
+    python scripts/bench_intents.py                    # check against the baseline
+    python scripts/bench_intents.py --update-baseline  # after an intended change
+    python scripts/bench_intents.py --generator --url http://localhost:11434/api/generate --sample 300
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from build_intent_corpus import corpus_path
+from src.commands.windows_command_generator import PatternMatcher, WindowsCommandGenerator
+
+BASELINE_FILE = os.path.join(PROJECT_ROOT, "training_data", "intents", "corpus_v1_baseline.json")
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def portable(value, home):
+    """Commands as the corpus writes them: {home} placeholder, forward slashes."""
+    if isinstance(value, dict):
+        return {k: portable(v, home) for k, v in value.items()}
+    if isinstance(value, str):
+        return value.replace(home, "{home}").replace("\\", "/").replace("C:/Users/{username}", "{home}")
+    return value
+
+
+def contains(actual, expected):
+    """True if every key of expected is in actual with the same value (recursively for dicts)."""
+    if expected is None or actual is None:
+        return expected is None and actual is None
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(k in actual and contains(actual[k], v) for k, v in expected.items())
+    return actual == expected
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_matcher(cases, rounds):
+    """(command, rule, µs) per case through the PatternMatcher."""
+    matcher = PatternMatcher()
+    results = []
+    for case in cases:
+        text = case["text"]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            rule, command = matcher.match_rule(text)
+        micros = (time.perf_counter() - start) / rounds * 1e6
+        results.append((portable(command, matcher.user_home), rule or "none", micros))
+    return results
+
+
+def run_generator(cases, url):
+    """(command, tier, µs) per case through every tier of the generator, cache off."""
+    generator = WindowsCommandGenerator(ollama_url=url, use_cache=False)
+    home = generator.pattern_matcher.user_home if generator.pattern_matcher else os.path.expanduser("~")
+    results = []
+    try:
+        for case in cases:
+            start = time.perf_counter()
+            command, tier = generator.resolve_intent(case["text"])
+            micros = (time.perf_counter() - start) * 1e6
+            results.append((portable(command, home), tier, micros))
+    finally:
+        generator.close()
+    return results
+
+
+def summarize(cases, results):
+    failures = [case["id"] for case, (command, _, _) in zip(cases, results) if not contains(command, case["expected"])]
+    actions = sum(1 for case, (command, _, _) in zip(cases, results)
+                  if (command or {}).get("action") == (case["expected"] or {}).get("action"))
+    timings = sorted(micros for _, _, micros in results)
+    return {
+        "utterances": len(cases),
+        "accuracy": round(1 - len(failures) / len(cases), 4),
+        "action_accuracy": round(actions / len(cases), 4),
+        "mean_us": round(sum(timings) / len(timings), 2),
+        "p99_us": round(percentile(timings, 99), 2),
+        "failures": failures,
+    }
+
+
+def print_report(cases, results, summary, hits_label, show):
+    print(f"Accuracy:        {summary['accuracy']:.2%}  ({summary['utterances'] - len(summary['failures'])}"
+          f"/{summary['utterances']} commands right; action alone {summary['action_accuracy']:.2%})")
+    print(f"Latency:         mean {summary['mean_us']:.1f} µs  p99 {summary['p99_us']:.1f} µs")
+
+    by_source = {}
+    for case, (command, _, _) in zip(cases, results):
+        right, total = by_source.get(case["source"], (0, 0))
+        by_source[case["source"]] = (right + contains(command, case["expected"]), total + 1)
+    print("By source:       " + ", ".join(f"{s} {r}/{t}" for s, (r, t) in by_source.items()))
+
+    hits = {}
+    for case, (command, hit, _) in zip(cases, results):
+        right, total = hits.get(hit, (0, 0))
+        hits[hit] = (right + contains(command, case["expected"]), total + 1)
+    print(f"{hits_label} hits (count, share, correct):")
+    for hit, (right, total) in sorted(hits.items(), key=lambda item: -item[1][1]):
+        print(f"  {hit:<24} {total:>6}  {total / len(cases):6.1%}  {right / total:6.1%}")
+
+    if show:
+        print(f"First {show} failures:")
+        for case, (command, hit, _) in list(zip(cases, results)):
+            if not contains(command, case["expected"]):
+                print(f"  ❌ [{case['id']}] {case['text']!r} ({hit})")
+                print(f"     expected: {json.dumps(case['expected'])}")
+                print(f"     actual:   {json.dumps(command)}")
+                show -= 1
+                if not show:
+                    break
+
+
+def regressions(summary, baseline, latency_tolerance):
+    """Reasons the run is worse than the baseline (empty if it is not)."""
+    problems = []
+    if summary["accuracy"] < baseline["accuracy"]:
+        problems.append(f"accuracy {summary['accuracy']:.2%} < baseline {baseline['accuracy']:.2%}")
+    newly_failing = sorted(set(summary["failures"]) - set(baseline["failures"]))
+    if newly_failing:
+        problems.append(f"{len(newly_failing)} cases that passed in the baseline now fail: "
+                        + ", ".join(newly_failing[:10]) + (" ..." if len(newly_failing) > 10 else ""))
+    for key in ("mean_us", "p99_us"):
+        limit = baseline[key] * (1 + latency_tolerance)
+        if summary[key] > limit:
+            problems.append(f"{key} {summary[key]:.1f} > {limit:.1f} (baseline {baseline[key]:.1f} "
+                            f"+ {latency_tolerance:.0%})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intent corpus accuracy and latency regression check")
+    parser.add_argument("--corpus", default=corpus_path(), help="JSONL corpus (default: the current version)")
+    parser.add_argument("--generator", action="store_true", help="resolve through WindowsCommandGenerator (all tiers)")
+    parser.add_argument("--url", default=WindowsCommandGenerator.OLLAMA_URL, help="Ollama generate URL for --generator")
+    parser.add_argument("--sample", type=int, default=0, help="score a random sample of this many utterances")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--rounds", type=int, default=5, help="matches per utterance when timing the PatternMatcher")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="allowed mean/p99 slowdown over the baseline (default: 0.5 = 50%%)")
+    parser.add_argument("--show-failures", type=int, default=0, metavar="N", help="print the first N wrong commands")
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the baseline")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    if args.sample and args.sample < len(cases):
+        cases = random.Random(args.seed).sample(cases, args.sample)
+    mode = "generator" if args.generator else "pattern"
+    if args.sample:
+        mode += f"@{args.sample}"
+    print(f"{len(cases)} utterances from {os.path.relpath(args.corpus, PROJECT_ROOT)} ({mode})")
+    print("=" * 100)
+
+    if args.generator:
+        results = run_generator(cases, args.url)
+    else:
+        results = run_matcher(cases, args.rounds)
+    summary = summarize(cases, results)
+    print_report(cases, results, summary, "Tier" if args.generator else "Rule", args.show_failures)
+    print("=" * 100)
+
+    baselines = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+    if args.update_baseline:
+        baselines[mode] = summary
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=1)
+        print(f"Recorded the {mode} baseline")
+        return 0
+    if mode not in baselines:
+        print(f"No {mode} baseline yet; record one with --update-baseline")
+        return 0
+    problems = regressions(summary, baselines[mode], args.latency_tolerance)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print(f"✅ No regression against the {mode} baseline")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
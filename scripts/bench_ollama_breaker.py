@@ -0,0 +1,107 @@
+"""
+Ollama Circuit Breaker Demo
+Drives WindowsCommandGenerator through an outage on the mock Ollama server
+(scripts/mock_ollama.py) and reports what each command cost:
+  healthy:  normal answers; the request timeout adapts to the observed p95
+  hung:     the server accepts requests but never answers; before, every
+            command waited the fixed 30 s timeout
+  recover:  the server answers again; the probe announces half_open and the
+            next command closes the circuit
+  down:     the server is gone; before, one connection error disabled the
+            LLM until restart
+
+The breaker's reset timeout and probe interval are shortened so the demo
+finishes in a few seconds.
+
+Run this from the project root:
+    python scripts/bench_ollama_breaker.py [--commands 6] [--reset-timeout 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+# Phrasings the pattern matcher does not answer confidently, so they reach the LLM tier
+UTTERANCES = [
+    "fire up the spreadsheet program",
+    "bring up my downloads",
+    "which apps are hogging the processor",
+    "make everything a bit louder",
+    "grab an image of my screen",
+    "skip to the next track",
+]
+
+
+def run_phase(label, generator, commands):
+    latencies, tiers = [], []
+    for i in range(commands):
+        start = time.perf_counter()
+        _, tier = generator.resolve_intent(UTTERANCES[i % len(UTTERANCES)])
+        latencies.append((time.perf_counter() - start) * 1000)
+        tiers.append(tier)
+    status = generator.get_backend_status()
+    print(f"{label:>8}: per command {' '.join(f'{ms:6.0f}' for ms in latencies)} ms  "
+          f"tiers {','.join(sorted(set(tiers)))}  -> {status['state']}, timeout {status['timeout_s']}s")
+    return latencies
+
+
+def wait_for(generator, state, limit):
+    start = time.perf_counter()
+    while generator.breaker.state != state and time.perf_counter() - start < limit:
+        time.sleep(0.05)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the Ollama circuit breaker through a hang and an outage")
+    parser.add_argument("--commands", type=int, default=6)
+    parser.add_argument("--reset-timeout", type=float, default=2.0)
+    parser.add_argument("--probe-interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = start_server(token_ms=2, prompt_ms=20, trailing_tokens=0)
+    print(f"Mock Ollama at {server.url}")
+    print("=" * 100)
+
+    generator = WindowsCommandGenerator(ollama_url=f"{server.url}/api/generate", use_cache=False)
+    generator.confidence_threshold = 1.1  # always take the LLM tier while it is available
+    generator.breaker.reset_timeout = args.reset_timeout
+    generator.health_probe.interval = args.probe_interval
+    generator.health_probe.open_interval = args.probe_interval
+    origin = time.perf_counter()
+    generator.breaker.add_listener(lambda old, new, reason: print(
+        f"          [{time.perf_counter() - origin:6.2f}s] {old} -> {new} ({reason})"))
+
+    run_phase("healthy", generator, args.commands)
+
+    server.prompt_ms = 600_000  # accepts the request, never answers
+    hung = run_phase("hung", generator, args.commands)
+    print(f"          before: {args.commands} x 30 s = {args.commands * 30} s; "
+          f"now {sum(hung) / 1000:.1f} s")
+
+    server.prompt_ms = 20
+    waited = wait_for(generator, generator.breaker.HALF_OPEN, args.reset_timeout + 5)
+    print(f"          half_open {waited:.2f}s after the server recovered")
+    run_phase("recover", generator, args.commands)
+
+    server.shutdown()
+    server.server_close()
+    down = run_phase("down", generator, args.commands)
+    print(f"          before: LLM disabled until restart; now {sum(down):.0f} ms total, "
+          f"retried after {args.reset_timeout}s of quiet")
+
+    generator.close()
+    print("=" * 100)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Ollama Client Benchmark
+Compares three ways of calling /api/generate against the mock server in
+scripts/mock_ollama.py (no model needed):
+  legacy:   new connection per call, stream=False, wait for the full generation
+  pooled:   keep-alive session, stream=False
+  stream:   OllamaClient - keep-alive session, streamed, stops at the first complete JSON object
+
+Run this from the project root:
+    python scripts/bench_ollama_client.py [--calls 30] [--token-ms 10] [--trailing-tokens 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.ollama_client import OllamaClient
+
+PAYLOAD = {
+    "model": "smollm2",
+    "prompt": "User: open notepad\nOutput:",
+    "options": {"temperature": 0.1, "num_predict": 500},
+}
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def legacy_call(url):
+    response = requests.post(f"{url}/api/generate", json=dict(PAYLOAD, stream=False), timeout=30)
+    response.raise_for_status()
+    return response.json().get("response", "").strip()
+
+
+def make_pooled_call(url):
+    session = requests.Session()
+
+    def call(_url):
+        response = session.post(f"{url}/api/generate", json=dict(PAYLOAD, stream=False), timeout=30)
+        response.raise_for_status()
+        return response.json().get("response", "").strip()
+    return call
+
+
+def make_stream_call(url):
+    client = OllamaClient(url)
+    return lambda _url: client.generate_json(PAYLOAD, timeout=30)
+
+
+def run(label, call, server, calls):
+    server.reset_counters()
+    call(server.url)  # warm-up
+    server.reset_counters()
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        text = call(server.url)
+        timings.append((time.perf_counter() - start) * 1000)
+    # Let cancelled generations notice the disconnect before reading counters
+    time.sleep(0.1)
+    ordered = sorted(timings)
+    counters = server.counters
+    print(f"{label:>7}: mean {sum(ordered) / len(ordered):7.1f} ms  p50 {percentile(ordered, 50):7.1f} ms  "
+          f"p95 {percentile(ordered, 95):7.1f} ms  connections {counters['connections']:>3}  "
+          f"tokens/call {counters['tokens'] / calls:5.1f}  answer {text[:40]!r}")
+    return sum(ordered) / len(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled streaming Ollama calls against a mock server")
+    parser.add_argument("--calls", type=int, default=30)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--prompt-ms", type=float, default=20.0)
+    parser.add_argument("--trailing-tokens", type=int, default=60)
+    args = parser.parse_args()
+
+    server = start_server(token_ms=args.token_ms, prompt_ms=args.prompt_ms, trailing_tokens=args.trailing_tokens)
+    print(f"Mock Ollama at {server.url}: {args.token_ms} ms/token, {args.prompt_ms} ms prompt, "
+          f"{args.trailing_tokens} trailing tokens")
+    print("=" * 100)
+    legacy = run("legacy", legacy_call, server, args.calls)
+    run("pooled", make_pooled_call(server.url), server, args.calls)
+    stream = run("stream", make_stream_call(server.url), server, args.calls)
+    print("=" * 100)
+    print(f"Streaming early exit: {legacy / stream:.1f}x faster than the legacy call")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Ollama Prompt-Eval Benchmark
+Reports Ollama's own timing fields (load_duration, prompt_eval_count,
+prompt_eval_duration) for a sequence of commands separated by idle gaps:
+  before: SYSTEM_PROMPT inlined into every prompt, default keep_alive
+  after:  model preloaded, system prompt primed once and sent in the "system"
+          field, keep_alive=WindowsCommandGenerator.KEEP_ALIVE
+
+By default it runs against scripts/mock_ollama.py, whose default keep_alive is
+shortened to --mock-keep-alive so an idle gap can outlast it within the benchmark.
+Pass --url http://localhost:11434 to measure a real Ollama server instead.
+
+Run this from the project root:
+    python scripts/bench_ollama_prompt.py [--commands 5] [--idle 1.5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.ollama_client import OllamaClient
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+UTTERANCES = [
+    "open the quarterly report spreadsheet",
+    "make a folder for my holiday photos",
+    "what processes are eating memory",
+    "rename notes.txt to ideas.txt on the desktop",
+    "open the settings for my display",
+]
+
+
+def legacy_payload(generator, utterance):
+    """The request body _call_ollama sent before prompt prefix reuse."""
+    return {
+        "model": generator.model_name,
+        "prompt": f"{generator.SYSTEM_PROMPT}\n\nUser: {utterance}\nOutput:",
+        "options": {"temperature": 0.1, "num_predict": 16},
+    }
+
+
+def after_payload(generator, utterance):
+    payload = generator._ollama_payload(utterance)
+    payload["options"] = dict(payload["options"], num_predict=16)
+    return payload
+
+
+def run(label, client, generator, build_payload, commands, idle):
+    rows = []
+    for i in range(commands):
+        if i:
+            time.sleep(idle)
+        start = time.perf_counter()
+        event = client.generate(build_payload(generator, UTTERANCES[i % len(UTTERANCES)]), timeout=300)
+        wall_ms = (time.perf_counter() - start) * 1000
+        rows.append(dict(OllamaClient.timings(event), wall_ms=wall_ms))
+    count = len(rows)
+    print(f"{label:>6}: load {sum(r['load_ms'] for r in rows) / count:8.1f} ms  "
+          f"prompt tokens {sum(r['prompt_eval_count'] for r in rows) / count:7.1f}  "
+          f"prompt eval {sum(r['prompt_eval_ms'] for r in rows) / count:8.1f} ms  "
+          f"wall {sum(r['wall_ms'] for r in rows) / count:8.1f} ms   (mean over {count} commands)")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Ollama prompt-eval cost before/after prefix reuse and preload")
+    parser.add_argument("--url", help="Real Ollama server (default: start a mock server)")
+    parser.add_argument("--model", default=WindowsCommandGenerator.MODEL_NAME)
+    parser.add_argument("--commands", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=1.5, help="Seconds between commands")
+    parser.add_argument("--mock-keep-alive", default="1s", help="Mock server's default keep_alive")
+    parser.add_argument("--mock-load-ms", type=float, default=800.0)
+    parser.add_argument("--mock-prompt-token-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server = start_server(token_ms=2, prompt_ms=5, trailing_tokens=0, load_ms=args.mock_load_ms,
+                              prompt_token_ms=args.mock_prompt_token_ms, keep_alive=args.mock_keep_alive)
+        url = server.url
+        print(f"Mock Ollama at {url}: default keep_alive {args.mock_keep_alive}, load {args.mock_load_ms} ms, "
+              f"{args.mock_prompt_token_ms} ms per prompt token")
+    print(f"{args.commands} commands, {args.idle}s idle between them")
+    print("=" * 100)
+
+    generator = WindowsCommandGenerator(model_name=args.model, ollama_url=f"{url}/api/generate", use_cache=False)
+    client = OllamaClient(url)
+
+    if server:
+        server.unload()
+    before = run("before", client, generator, legacy_payload, args.commands, args.idle)
+
+    if server:
+        server.unload()
+    generator.ollama = client
+    generator.preload_model(background=False)
+    after = run("after", client, generator, after_payload, args.commands, args.idle)
+
+    print("=" * 100)
+    before_eval = sum(r["prompt_eval_ms"] + r["load_ms"] for r in before) / len(before)
+    after_eval = sum(r["prompt_eval_ms"] + r["load_ms"] for r in after) / len(after)
+    print(f"Load + prompt eval per command: {before_eval:.1f} ms -> {after_eval:.1f} ms")
+    if server:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Path Resolver Benchmark
+Shows what moving file lookups out of intent parsing buys, on a generated
+home folder (a deep tree of dummy files in a temp directory):
+  before:   "open report pdf" globbed the home folder inside PatternMatcher,
+            so nothing could be acknowledged until the search finished
+  after:    parsing returns the symbolic open_file_by_name intent at once;
+            the PathResolver search runs in the background with a deadline
+Also checks that a lookup past its deadline or cancelled stops early, and
+that concurrent requests for the same name share one search.
+
+Run this from the project root:
+    python scripts/bench_path_resolver.py [--dirs 2000] [--files 20] [--deadline 3]
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.path_resolver import PathResolver
+from src.commands.windows_command_generator import PatternMatcher
+
+
+def make_tree(root, dirs, files):
+    """Desktop/Documents/Downloads plus `dirs` nested project folders; the target sits in the last one."""
+    for name in ("Desktop", "Documents", "Downloads"):
+        os.makedirs(os.path.join(root, name))
+    for d in range(dirs):
+        folder = os.path.join(root, "projects", f"group{d % 40}", f"project{d}")
+        os.makedirs(folder)
+        for f in range(files):
+            open(os.path.join(folder, f"notes{f}.txt"), "w").close()
+    target = os.path.join(folder, "quarterly_report.pdf")
+    open(target, "w").close()
+    return target
+
+
+def inline_glob(root, name, extension):
+    """The lookup PatternMatcher used to run while parsing."""
+    locations = [os.path.join(root, "Desktop"), os.path.join(root, "Documents"), os.path.join(root, "Downloads"), root]
+    pattern = f"*{name}*{extension}"
+    for location in locations:
+        matches = glob.glob(os.path.join(location, pattern))
+        if matches:
+            return matches[0]
+    matches = glob.glob(os.path.join(root, "**", pattern), recursive=True)
+    return matches[0] if matches else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark asynchronous file-name resolution")
+    parser.add_argument("--dirs", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="zentrax_home_")
+    try:
+        target = make_tree(root, args.dirs, args.files)
+        print(f"Generated home folder: {args.dirs} folders x {args.files} files at {root}")
+        print("=" * 100)
+
+        start = time.perf_counter()
+        found = inline_glob(root, "report", ".pdf")
+        before = (time.perf_counter() - start) * 1000
+        print(f"   before: first response after {before:8.1f} ms (glob inside parsing, found={found == target})")
+
+        matcher = PatternMatcher()
+        resolver = PathResolver(search_locations=[os.path.join(root, n) for n in ("Desktop", "Documents", "Downloads")] + [root],
+                                root=root, deadline=args.deadline)
+        start = time.perf_counter()
+        command = matcher.match("open report pdf")
+        extra = command["extra"]
+        lookup = resolver.resolve(command["target"], extra["extension"])
+        acknowledged = (time.perf_counter() - start) * 1000
+        path = lookup.result()
+        resolved = (time.perf_counter() - start) * 1000
+        print(f"    after: acknowledged after {acknowledged:8.3f} ms ({command['action']}), "
+              f"path after {resolved:.1f} ms (found={path == target})")
+
+        # Deadline: a name that does not exist, with a tight budget
+        budget = max(before / 4000, 0.01)
+        start = time.perf_counter()
+        missing = resolver.resolve("nonexistent", ".pdf", deadline=budget).result()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f" deadline: {budget * 1000:.0f} ms budget -> gave up after {elapsed:.1f} ms (result={missing})")
+
+        start = time.perf_counter()
+        lookup = resolver.resolve("alsomissing", ".docx")
+        time.sleep(0.005)
+        lookup.cancel()
+        cancelled = lookup.result()
+        print(f"   cancel: stopped {(time.perf_counter() - start) * 1000:.1f} ms after starting (result={cancelled})")
+
+        first = resolver.resolve("quarterly", ".pdf")
+        second = resolver.resolve("quarterly", ".pdf")
+        print(f"   shared: concurrent requests for one name share a search: {first is second}, "
+              f"found={second.result() == target}")
+        resolver.close()
+        print("=" * 100)
+        print(f"Time to acknowledgement: {before:.1f} ms -> {acknowledged:.3f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+PatternMatcher Regression & Micro-Benchmark
+Replays the golden utterances in training_data/intents/pattern_matcher_golden.json,
+fails if any output differs from the recorded one, and reports per-utterance latency.
+The matcher never touches the disk (file names stay symbolic), so each file
+intent is also run the way the executor runs it, against a generated home
+folder with files in it (HOME_FILES): the file the resolver finds, else the
+fallback command, else the created file. That outcome is recorded as "opens".
+The home folder is replaced by a placeholder.
+
+Run this from the project root:
+    python scripts/bench_pattern_matcher.py            # check + benchmark
+    python scripts/bench_pattern_matcher.py --update   # re-record after an intended change
+    python scripts/bench_pattern_matcher.py --no-prefilter   # time without the keyword prefilter
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from src.commands.path_resolver import PathResolver
+from src.commands.windows_command_generator import PatternMatcher
+
+GOLDEN_FILE = os.path.join("training_data", "intents", "pattern_matcher_golden.json")
+
+# Files of the generated home folder; some golden utterances name them, others do not
+HOME_FILES = [
+    "Desktop/linux notes.txt",
+    "Desktop/todo.txt",
+    "Documents/report.docx",
+    "Documents/resume.pdf",
+    "Documents/budget.xlsx",
+    "Documents/projects/readme.md",
+    "Downloads/blender-4.1-windows-x64.zip",
+    "Downloads/youtube-dl.exe",
+    "notes.txt",
+]
+
+
+def make_home():
+    """A home folder with HOME_FILES, made the user's home for this process."""
+    home = tempfile.mkdtemp(prefix="zentrax_golden_")
+    for folder in ("Desktop", "Documents", "Downloads", "Pictures", "Music", "Videos"):
+        os.makedirs(os.path.join(home, folder))
+    for relative in HOME_FILES:
+        path = os.path.join(home, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home
+    return home
+
+
+def make_matcher(use_prefilter=True):
+    return PatternMatcher(use_prefilter=use_prefilter)
+
+
+def opens(command, resolver):
+    """What CommandExecutor._open_file_by_name does with a file intent."""
+    extra = command.get("extra") or {}
+    extension = extra.get("extension") or None
+    path = resolver.resolve(command["target"], extension).result()
+    if path:
+        return {"action": "open_file", "path": path}
+    fallback = extra.get("fallback")
+    if isinstance(fallback, dict) and fallback.get("action") != "open_file_by_name":
+        return fallback
+    if extra.get("create"):
+        name = command["target"]
+        filename = name if "." in name else f"{name}{extension or '.txt'}"
+        return {"action": "create_and_open_file", "path": os.path.join(resolver.root, "Desktop", filename),
+                "extra": {"app": extra.get("app", "notepad.exe")}}
+    return None
+
+
+def record(matcher, resolver, text):
+    """The golden entry for an utterance: the command and, for file intents, what it opens."""
+    command = matcher.match(text)
+    entry = {"expected": portable(command, matcher.user_home)}
+    if command and command.get("action") == "open_file_by_name":
+        entry["opens"] = portable(opens(command, resolver), matcher.user_home)
+    return entry
+
+
+def portable(value, home):
+    """Make a command comparable across machines: {home} placeholder, forward slashes."""
+    if isinstance(value, dict):
+        return {k: portable(v, home) for k, v in value.items()}
+    if isinstance(value, str):
+        return value.replace(home, "{home}").replace("\\", "/")
+    return value
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def check(matcher, resolver, cases):
+    failures = 0
+    for case in cases:
+        actual = record(matcher, resolver, case["text"])
+        recorded = {key: case[key] for key in ("expected", "opens") if key in case}
+        if actual != recorded:
+            failures += 1
+            print(f"❌ {case['text']!r}")
+            print(f"   expected: {json.dumps(recorded)}")
+            print(f"   actual:   {json.dumps(actual)}")
+    return failures
+
+
+def benchmark(matcher, cases, rounds):
+    timings = []
+    for case in cases:
+        text = case["text"]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            matcher.match(text)
+        timings.append((time.perf_counter() - start) / rounds * 1e6)
+    ordered = sorted(timings)
+    print(f"Per-utterance latency over {len(cases)} utterances x {rounds} rounds:")
+    print(f"  mean {sum(ordered) / len(ordered):8.1f} µs")
+    print(f"  p50  {percentile(ordered, 50):8.1f} µs")
+    print(f"  p99  {percentile(ordered, 99):8.1f} µs")
+    print(f"  max  {ordered[-1]:8.1f} µs")
+    # Misses walk the whole table without the prefilter, so report them separately
+    misses = [micros for micros, case in zip(timings, cases) if case["expected"] is None]
+    if misses:
+        print(f"  miss {sum(misses) / len(misses):8.1f} µs mean over {len(misses)} utterances with no match")
+    slowest = sorted(zip(timings, (c["text"] for c in cases)), reverse=True)[:5]
+    print("Slowest:")
+    for micros, text in slowest:
+        print(f"  {micros:8.1f} µs  {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PatternMatcher regression check and micro-benchmark")
+    parser.add_argument("--update", action="store_true", help="Re-record golden outputs from the current matcher")
+    parser.add_argument("--rounds", type=int, default=200, help="Matches per utterance when timing (default: 200)")
+    parser.add_argument("--no-prefilter", action="store_true", help="Evaluate every rule instead of only keyword candidates")
+    args = parser.parse_args()
+
+    with open(GOLDEN_FILE, "r", encoding="utf-8") as f:
+        golden = json.load(f)
+    cases = golden["cases"]
+    home = make_home()
+    try:
+        matcher = make_matcher(use_prefilter=not args.no_prefilter)
+        resolver = PathResolver()
+
+        if args.update:
+            for case in cases:
+                case.pop("opens", None)
+                case.update(record(matcher, resolver, case["text"]))
+            with open(GOLDEN_FILE, "w", encoding="utf-8") as f:
+                json.dump(golden, f, indent=1)
+            print(f"Re-recorded {len(cases)} golden outputs")
+            return 0
+
+        failures = check(matcher, resolver, cases)
+        print(f"{len(cases) - failures}/{len(cases)} golden outputs match")
+        benchmark(matcher, cases, args.rounds)
+        resolver.close()
+        return 1 if failures else 0
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Prompt Builder Benchmark
+Compares the monolithic SYSTEM_PROMPT with the retrieval prompt builder on
+the mock Ollama server (scripts/mock_ollama.py):
+  - prompt size per request (estimated tokens, system + prompt)
+  - prompt tokens Ollama evaluates, cold (no prompt cache) and warm
+  - end-to-end latency of the generator's streamed call
+  - retrieval recall: how often the expected action is among those offered
+
+Run this from the project root:
+    python scripts/bench_prompt_builder.py [--prompt-token-ms 0.5] [--k-actions 6] [--k-examples 4]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts"))
+
+from mock_ollama import start_server
+from src.commands.prompt_builder import PromptBuilder, estimate_tokens
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+# (utterance, expected action) - phrasings the pattern matcher does not cover
+LABELED = [
+    ("fire up the spreadsheet program", "open_app"),
+    ("bring up my downloads", "open_folder"),
+    ("get rid of the old drafts folder on the desktop", "delete"),
+    ("put report.docx into the archive folder", "move"),
+    ("call the file plan.txt roadmap.txt instead", "rename"),
+    ("duplicate budget.xlsx into backup", "copy"),
+    ("make everything a bit louder", "volume_up"),
+    ("quieter please", "volume_down"),
+    ("grab an image of my screen", "screenshot"),
+    ("dim the display a little", "brightness_down"),
+    ("disconnect from the wireless network", "wifi_toggle"),
+    ("stop zoom from running", "kill_process"),
+    ("which apps are hogging the processor", "list_processes"),
+    ("skip to the next track", "media_next"),
+    ("open the wifi settings page", "open_settings"),
+    ("press control shift escape", "keyboard_action"),
+    ("how full is my disk", "system_info"),
+    ("look up the weather in paris online", "web_search"),
+    ("visit wikipedia.org", "open_url"),
+    ("reload this page", "refresh_page"),
+    ("clear out the recycle bin", "empty_recycle_bin"),
+    ("enter the text good morning team", "type_text"),
+    ("run the ipconfig command", "run_command"),
+    ("create a new folder named Taxes in documents", "create_folder"),
+    ("find every spreadsheet i have", "search"),
+]
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(label, generator, server, cold):
+    sizes, evaluated, latencies = [], [], []
+    # Pass 1: end-to-end latency of the streamed call the generator makes
+    for utterance, _ in LABELED:
+        if cold:
+            server.unload()
+        system, prompt = generator._prompt_parts(utterance)
+        sizes.append(estimate_tokens(system) + estimate_tokens(prompt))
+        start = time.perf_counter()
+        generator.ollama.generate_json(generator._ollama_payload(utterance), timeout=60)
+        latencies.append((time.perf_counter() - start) * 1000)
+    # Pass 2: the same sequence non-streamed, for Ollama's prompt_eval_count
+    # (timing fields only arrive with the final event, which streaming skips)
+    if not cold:
+        server.unload()
+    for utterance, _ in LABELED:
+        if cold:
+            server.unload()
+        payload = generator._ollama_payload(utterance)
+        event = generator.ollama.generate(dict(payload, options=dict(payload["options"], num_predict=1)))
+        evaluated.append(event.get("prompt_eval_count", 0))
+    if not cold:
+        # The first warm request fills the cache; steady state is the rest
+        latencies, evaluated = latencies[1:], evaluated[1:]
+    ordered = sorted(latencies)
+    mode = "cold" if cold else "warm"
+    print(f"{label:>10} {mode}: prompt {sum(sizes) / len(sizes):7.1f} tok  "
+          f"evaluated {sum(evaluated) / len(evaluated):7.1f} tok  "
+          f"latency mean {sum(ordered) / len(ordered):7.1f} ms  p95 {percentile(ordered, 95):7.1f} ms")
+    return sum(ordered) / len(ordered)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark retrieval prompts against the monolithic system prompt")
+    parser.add_argument("--prompt-token-ms", type=float, default=0.5, help="Mock cost per evaluated prompt token")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="Mock cost per generated token")
+    parser.add_argument("--k-actions", type=int, default=6)
+    parser.add_argument("--k-examples", type=int, default=4)
+    args = parser.parse_args()
+
+    builder = PromptBuilder(k_actions=args.k_actions, k_examples=args.k_examples)
+    hits = 0
+    for utterance, expected in LABELED:
+        names, _ = builder.retrieve(utterance)
+        if expected in names:
+            hits += 1
+        else:
+            print(f"   miss: {utterance!r} -> {names}")
+    print(f"Retrieval recall: {hits}/{len(LABELED)} utterances offered their expected action")
+
+    server = start_server(token_ms=args.token_ms, prompt_ms=2, trailing_tokens=0, load_ms=0,
+                          prompt_token_ms=args.prompt_token_ms, keep_alive="-1")
+    url = f"{server.url}/api/generate"
+    print(f"Mock Ollama at {server.url}: {args.prompt_token_ms} ms per prompt token, {args.token_ms} ms per generated token")
+    print("=" * 100)
+
+    monolithic = WindowsCommandGenerator(ollama_url=url, use_cache=False, retrieval_prompt=False)
+    retrieval = WindowsCommandGenerator(ollama_url=url, use_cache=False, retrieval_prompt=True)
+    retrieval.prompt_builder = builder
+
+    results = {}
+    for cold in (True, False):
+        server.unload()
+        results[("monolithic", cold)] = measure("monolithic", monolithic, server, cold)
+        results[("retrieval", cold)] = measure("retrieval", retrieval, server, cold)
+    print("=" * 100)
+    for cold in (True, False):
+        mode = "cold" if cold else "warm"
+        print(f"{mode}: {results[('monolithic', cold)]:.1f} ms -> {results[('retrieval', cold)]:.1f} ms per call")
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Streaming Search Benchmark
+Measures when the UI hears about search_and_open matches on a generated
+home folder too large to scan quickly (the file catalog is off, as before
+its first crawl):
+  before:  CommandExecutor.execute(); one message once the whole search has
+           finished
+  after:   CommandExecutor.execute_search(); each match is reported as it is
+           found (what the WebSocket server forwards as search_result
+           messages), and a cancel stops the scan
+Opening the file is stubbed out; nothing is launched.
+
+Run this from the project root:
+    python scripts/bench_search_stream.py [--dirs 4000] [--files 20]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import src.commands.command_executor as command_executor
+from src.commands.command_executor import CommandExecutor
+
+
+def make_home(root, dirs, files):
+    """Filler folders, with budget spreadsheets: one near the top, four deep inside."""
+    for i in range(dirs):
+        folder = os.path.join(root, f"area{i % 8}", f"group{i % 97}", f"folder{i}")
+        os.makedirs(folder, exist_ok=True)
+        for f in range(files):
+            open(os.path.join(folder, f"file{f}.txt"), "w").close()
+        if i % (dirs // 4) == i // (dirs // 4):
+            open(os.path.join(folder, f"budget {i}.xlsx"), "w").close()
+    open(os.path.join(root, "area3", "budget summary.xlsx"), "w").close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed vs blocking search results")
+    parser.add_argument("--dirs", type=int, default=4000)
+    parser.add_argument("--files", type=int, default=20)
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="zentrax_stream_")
+    command_executor.os.startfile = lambda path: None
+    executor = CommandExecutor(use_file_catalog=False, use_app_index=False, use_frecency=False)
+    try:
+        make_home(home, args.dirs, args.files)
+        command = {"action": "search_and_open", "target": "*budget*", "path": home}
+        print(f"Generated home folder: {args.dirs} folders x {args.files} files, 5 matches for '*budget*'")
+        print("=" * 100)
+
+        start = time.perf_counter()
+        success, message = executor.execute(command)
+        before_ms = (time.perf_counter() - start) * 1000
+        print(f"  before: first (and only) message after {before_ms:8.1f} ms: {message[:60]}")
+
+        hits = []
+        start = time.perf_counter()
+        executor.execute_search(command, lambda rank, path, elapsed_ms: hits.append(
+            (rank, (time.perf_counter() - start) * 1000)))
+        after_ms = (time.perf_counter() - start) * 1000
+        print(f"   after: first result after {hits[0][1]:8.1f} ms; results at "
+              + ", ".join(f"#{rank} {ms:.1f} ms" for rank, ms in hits) + f"; done after {after_ms:.1f} ms")
+
+        cancel = threading.Event()
+        timer = threading.Timer(0.05, cancel.set)
+        timer.start()
+        start = time.perf_counter()
+        success, message = executor.execute_search(
+            {"action": "search_and_open", "target": "*.none", "path": "/" if os.name != "nt" else "C:\\"},
+            lambda *hit: None, cancel)
+        cancelled_ms = (time.perf_counter() - start) * 1000
+        print(f"  cancel: a whole-disk scan cancelled at 50 ms returned after {cancelled_ms:.1f} ms ({message})")
+        print("=" * 100)
+    finally:
+        executor.close()
+        shutil.rmtree(home, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Shell Session Pool Benchmark
+Runs the system monitor's kind of queries (load, memory, disk, processes)
+and measures the latency of each:
+  before:  a new shell per query (`powershell -Command <query>`, as the
+           executor and SystemMonitor did)
+  after:   ShellPool.run(query) on long-lived sessions
+Outputs of the two are compared (the process list changes between runs).
+Also reports the cold first query (the session starting), queries from
+several threads at once, and how long a query takes when its session died
+in between (a new one is started for it). The saving per query is
+the shell's start-up time: about a millisecond for bash, hundreds for
+PowerShell.
+
+On Linux bash stands in for PowerShell and the queries read /proc; on
+Windows pass --shell powershell to time the real WMI queries.
+
+Run this from the project root:
+    python scripts/bench_shell_pool.py [--rounds 30] [--shell bash]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.shell_pool import ShellPool
+
+QUERIES = {
+    "bash": {
+        "cpu": "cut -d' ' -f1 /proc/loadavg",
+        "memory": "awk '/MemFree|MemTotal/ {print $2}' /proc/meminfo",
+        "disk": "df -k / | tail -1",
+        "processes": "ps -eo comm,rss --sort=-rss | head -6",
+    },
+    "powershell": {
+        "battery": "$battery = Get-WmiObject Win32_Battery | Select-Object -First 1; "
+                   "$battery.EstimatedChargeRemaining; $battery.BatteryStatus",
+        "cpu": "(Get-WmiObject Win32_Processor).LoadPercentage",
+        "memory": "Get-WmiObject Win32_OperatingSystem | Select-Object FreePhysicalMemory,TotalVisibleMemorySize | "
+                  "ForEach-Object { $_.FreePhysicalMemory, $_.TotalVisibleMemorySize }",
+        "disk": "Get-WmiObject Win32_LogicalDisk -Filter 'DeviceID=\"C:\"' | Select-Object FreeSpace,Size | "
+                "ForEach-Object { $_.FreeSpace, $_.Size }",
+        "processes": "Get-Process | Sort-Object WorkingSet64 -Descending | Select-Object -First 5 Name",
+    },
+}
+
+# How each shell was started per query before the pool
+SPAWN = {"bash": ["bash", "-c"], "powershell": ["powershell", "-Command"]}
+
+
+def timed(fn, rounds):
+    """(median ms, p95 ms, last result) of fn() over rounds calls."""
+    samples, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))], result
+
+
+def concurrent(fn, threads, per_thread):
+    """ms for threads x per_thread calls of fn() from separate threads."""
+    start = time.perf_counter()
+    workers = [threading.Thread(target=lambda: [fn() for _ in range(per_thread)]) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure pooled shell queries against a shell per query")
+    parser.add_argument("--shell", choices=sorted(QUERIES), default="powershell" if os.name == "nt" else "bash")
+    parser.add_argument("--rounds", type=int, default=30, help="Queries of each kind")
+    parser.add_argument("--size", type=int, default=2, help="Sessions in the pool")
+    parser.add_argument("--threads", type=int, default=4, help="Threads querying at once")
+    args = parser.parse_args()
+
+    queries = QUERIES[args.shell]
+    spawn = SPAWN[args.shell]
+    shells = ShellPool(args.shell, size=args.size)
+
+    print("=" * 100)
+    print(f"Shell pool: {args.shell}, {args.size} sessions, {args.rounds} rounds per query")
+    print("=" * 100)
+    start = time.perf_counter()
+    shells.run(next(iter(queries.values())), timeout=30)
+    print(f"  cold: first query, starting a session: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for name, query in queries.items():
+        before_p50, before_p95, before = timed(
+            lambda: subprocess.run(spawn + [query], capture_output=True, text=True, timeout=30), args.rounds)
+        after_p50, after_p95, after = timed(lambda: shells.run(query, timeout=30), args.rounds)
+        same = "same output" if before.stdout.split() == after.stdout.split() else "output differs"
+        print(f"  {name:>9}: spawn p50 {before_p50:7.2f} ms  p95 {before_p95:7.2f} ms | "
+              f"pool p50 {after_p50:6.2f} ms  p95 {after_p95:6.2f} ms | {before_p50 / after_p50:5.1f}x  ({same})")
+
+    query = queries["cpu"]
+    per_thread = max(1, args.rounds // args.threads)
+    total = args.threads * per_thread
+    before = concurrent(lambda: subprocess.run(spawn + [query], capture_output=True, text=True, timeout=30),
+                        args.threads, per_thread)
+    after = concurrent(lambda: shells.run(query, timeout=30), args.threads, per_thread)
+    print(f"  threads: {total} queries from {args.threads} threads: spawn {before:.1f} ms, pool {after:.1f} ms")
+
+    # Sessions that died while idle are replaced when a query finds them
+    for session in list(shells._idle):
+        session.process.kill()
+        session.process.wait()
+    start = time.perf_counter()
+    result = shells.run(query, timeout=30)
+    print(f"  restart: query after its session died: {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(status {result.returncode})")
+    print(f"  stats: {shells.stats}")
+    print("=" * 100)
+    shells.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
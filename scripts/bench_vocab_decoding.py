@@ -0,0 +1,95 @@
+"""
+Vocabulary-Biased Decoding Benchmark
+Compares free Whisper decoding against command-vocabulary biased decoding
+on the recorded samples in training_data/voice_commands.
+Reports accuracy, decoder steps, steps saved and latency for both modes.
+Run this from the project root: python scripts/bench_vocab_decoding.py [--model base]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+import speech_recognition as sr
+
+from src.assistant.whisper_handler import WhisperHandler
+from src.commands.windows_command_generator import PatternMatcher
+
+
+def load_samples():
+    """Load (wav path, expected command) pairs from the recorded metadata."""
+    samples = []
+    for meta_file in sorted(glob.glob(os.path.join("training_data", "voice_commands", "*_metadata.json"))):
+        with open(meta_file, "r") as f:
+            for entry in json.load(f):
+                # Metadata was recorded on Windows
+                audio_file = entry["audio_file"].replace("\\", os.sep)
+                if os.path.exists(audio_file):
+                    samples.append((audio_file, entry["expected_command"]))
+    return samples
+
+
+def normalize(text):
+    return re.sub(r"[^\w\s]", "", text.lower()).strip()
+
+
+def run(handler, samples, label):
+    correct = 0
+    start = time.perf_counter()
+    for audio_file, expected in samples:
+        with sr.AudioFile(audio_file) as source:
+            audio = sr.Recognizer().record(source)
+        text = handler.transcribe_audio(audio)
+        if expected in normalize(text):
+            correct += 1
+    elapsed = time.perf_counter() - start
+    accuracy = correct / max(1, len(samples))
+    print(f"{label:>6}: accuracy {accuracy:6.1%}  ({correct}/{len(samples)})  "
+          f"avg latency {elapsed / max(1, len(samples)) * 1000:7.1f} ms")
+    return accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vocabulary-biased Whisper decoding")
+    parser.add_argument("--model", default="base", help="Whisper model name (default: base)")
+    args = parser.parse_args()
+
+    samples = load_samples()
+    if not samples:
+        print("No recorded samples found in training_data/voice_commands")
+        return 1
+
+    vocabulary = sorted({expected for _, expected in samples}) + PatternMatcher().vocabulary_phrases()
+
+    print(f"Samples: {len(samples)}, vocabulary: {len(vocabulary)} phrases")
+    print("=" * 60)
+
+    free = WhisperHandler(model_name=args.model, decoding="free")
+    free_accuracy = run(free, samples, "free")
+
+    vocab = WhisperHandler(model_name=args.model, decoding="vocab")
+    vocab.set_command_vocabulary(vocabulary)
+    vocab_accuracy = run(vocab, samples, "vocab")
+
+    stats = vocab.get_decoding_stats() or {}
+    print("=" * 60)
+    print(f"Accuracy change:      {(vocab_accuracy - free_accuracy) * 100:+.1f} points")
+    print(f"Shortcut hits:        {stats.get('shortcut_hits', 0)}/{stats.get('utterances', 0)} "
+          f"({stats.get('verify_failures', 0)} verification failures)")
+    print(f"Handed to Whisper:    {stats.get('handoffs', 0)} utterances left the phrase list")
+    print(f"Decoder steps:        {stats.get('avg_steps', 0)} per utterance")
+    print(f"Token steps saved:    {stats.get('steps_saved', 0)} total, "
+          f"{stats.get('avg_steps_saved', 0)} per utterance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
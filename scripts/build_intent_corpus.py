@@ -0,0 +1,396 @@
+"""
+Intent Corpus Builder
+Writes the versioned intent corpus (training_data/intents/corpus_v<N>.jsonl)
+that scripts/bench_intents.py scores PatternMatcher and the full
+WindowsCommandGenerator against. One JSON object per line:
+    {"id": "readme-00003", "text": "open chrome", "source": "readme",
+     "expected": {"action": "open_app", "target": "chrome.exe"}}
+
+"expected" is the part of the command that must be right; a command matches
+when it contains every expected key with the same value (extra keys, such as
+a volume step, are left to the implementation). Home folders are written as
+{home}. Negative cases ("goodbye") expect null: no command at all.
+
+Seeds, in order:
+  readme         the demo commands and voice-command tables of README.md
+  system_prompt  the User/Output examples of WindowsCommandGenerator.SYSTEM_PROMPT
+  transcripts    recognized_text of training_data/voice_commands/*_metadata.json
+  template       templated variants per intent, with spoken prefixes/suffixes
+
+The output is deterministic for a seed. Bump CORPUS_VERSION (so a new file is
+written next to the old one) when expectations change, rather than editing
+a corpus that baselines were recorded against.
+
+Run this from the project root:
+    python scripts/build_intent_corpus.py [--seed 41] [--variants 3]
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.windows_command_generator import WindowsCommandGenerator
+
+CORPUS_VERSION = 1
+INTENTS_DIR = os.path.join(PROJECT_ROOT, "training_data", "intents")
+TRANSCRIPTS_DIR = os.path.join(PROJECT_ROOT, "training_data", "voice_commands")
+
+
+def corpus_path(version=CORPUS_VERSION):
+    return os.path.join(INTENTS_DIR, f"corpus_v{version}.jsonl")
+
+
+# ---------------------------------------------------------------- expectations
+
+def app(exe):
+    if exe.endswith(":"):
+        return {"action": "run_command", "extra": {"command": f"start {exe}"}}
+    return {"action": "open_app", "target": exe}
+
+
+def folder(name):
+    return {"action": "open_folder", "path": f"{{home}}/{name}"}
+
+
+def web(query):
+    return {"action": "web_search", "target": query}
+
+
+def info(kind):
+    return {"action": "system_info", "extra": {"type": kind}}
+
+
+BATTERY = {"action": "system_info", "target": "battery"}
+DATETIME = {"action": "system_info", "target": "datetime"}
+CLOSE = {"action": "close_window", "target": "current"}
+MINIMIZE = {"action": "minimize_window", "target": "current"}
+MAXIMIZE = {"action": "maximize_window", "target": "current"}
+SWITCH = {"action": "switch_window", "target": "next"}
+
+
+def simple(action):
+    return {"action": action}
+
+
+def scroll(direction):
+    return {"action": "scroll", "extra": {"direction": direction}}
+
+
+# README.md: the "Say This" column, with what the row describes
+README_SEEDS = {
+    "open chrome": app("chrome.exe"),
+    "what's my battery percentage?": BATTERY,
+    "search for python tutorials": web("python tutorials"),
+    "play next song": simple("media_next"),
+    "turn up the brightness": simple("brightness_up"),
+    "show me running processes": simple("list_processes"),
+    "take a screenshot": simple("screenshot"),
+    "what time is it?": DATETIME,
+    "thank you zentrax": simple("thanks"),
+    "goodbye": None,
+    "open notepad": app("notepad.exe"),
+    "open vs code": app("code.exe"),
+    "open calculator": app("calc.exe"),
+    "open file explorer": app("explorer.exe"),
+    "open task manager": app("taskmgr.exe"),
+    "close window": CLOSE,
+    "minimize": MINIMIZE,
+    "maximize": MAXIMIZE,
+    "switch window": SWITCH,
+    "show desktop": simple("show_desktop"),
+    "open my documents folder": folder("Documents"),
+    "open desktop": folder("Desktop"),
+    "create a file called notes.txt": {"action": "create_and_open_file", "path": "{home}/Desktop/notes.txt"},
+    "create a folder called projects": {"action": "create_folder", "path": "{home}/Desktop/projects"},
+    "search for pdfs": {"action": "search_and_open", "target": "*.pdf"},
+    "search for linux": {"action": "search", "target": "*linux*"},
+    "open linux pdf": {"action": "open_file_by_name", "target": "linux", "extra": {"extension": ".pdf"}},
+    "search for python tutorials in chrome": web("python tutorials"),
+    "google machine learning": web("machine learning"),
+    "open youtube": {"action": "open_url", "target": "youtube.com"},
+    "open github": {"action": "open_url", "target": "github.com"},
+    "new tab": simple("new_tab"),
+    "close tab": simple("close_tab"),
+    "refresh page": simple("refresh_page"),
+    "what is battery percentage?": BATTERY,
+    "what's the date?": DATETIME,
+    "cpu usage": info("cpu"),
+    "memory status": info("memory"),
+    "disk space": info("disk"),
+    "wifi status": info("network"),
+    "system status": info("all"),
+    "play": simple("media_play_pause"),
+    "pause": simple("media_play_pause"),
+    "next song": simple("media_next"),
+    "skip": simple("media_next"),
+    "previous song": simple("media_previous"),
+    "stop music": simple("media_stop"),
+    "turn down brightness": simple("brightness_down"),
+    "turn on wifi": {"action": "wifi_toggle", "extra": {"state": "on"}},
+    "turn off wifi": {"action": "wifi_toggle", "extra": {"state": "off"}},
+    "open bluetooth settings": simple("bluetooth_toggle"),
+    "kill chrome": {"action": "kill_process", "target": "chrome"},
+    "list running processes": simple("list_processes"),
+    "empty recycle bin": simple("empty_recycle_bin"),
+    "night light": simple("night_light_toggle"),
+    "airplane mode": simple("airplane_mode_toggle"),
+    "volume up": simple("volume_up"),
+    "volume down": simple("volume_down"),
+    "mute": simple("mute"),
+    "lock screen": simple("lock_screen"),
+    "scroll up": scroll("up"),
+    "scroll down": scroll("down"),
+    "shutdown": simple("shutdown"),
+    "restart": simple("restart"),
+    "help": simple("help"),
+    "who are you?": simple("introduce"),
+}
+
+# training_data/voice_commands: expected_command -> command
+TRANSCRIPT_COMMANDS = {
+    "close window": CLOSE,
+    "exit program": CLOSE,
+    "maximize": MAXIMIZE,
+    "minimize": MINIMIZE,
+    "open browser": app("chrome.exe"),
+    "scroll down": scroll("down"),
+    "scroll up": scroll("up"),
+    "take screenshot": simple("screenshot"),
+    "volume down": simple("volume_down"),
+    "volume up": simple("volume_up"),
+}
+
+# ------------------------------------------------------------------- templates
+
+APPS = {
+    "chrome": "chrome.exe", "google chrome": "chrome.exe", "the browser": "chrome.exe", "firefox": "firefox.exe",
+    "edge": "msedge.exe", "notepad": "notepad.exe", "calculator": "calc.exe", "file explorer": "explorer.exe",
+    "command prompt": "cmd.exe", "the terminal": "cmd.exe", "powershell": "powershell.exe",
+    "control panel": "control.exe", "settings": "ms-settings:", "paint": "mspaint.exe", "word": "winword.exe",
+    "excel": "excel.exe", "powerpoint": "powerpnt.exe", "vs code": "code.exe", "visual studio code": "code.exe",
+    "spotify": "spotify.exe", "discord": "discord.exe", "slack": "slack.exe", "teams": "teams.exe",
+    "zoom": "zoom.exe", "vlc": "vlc.exe", "the camera": "microsoft.windows.camera:", "photos": "ms-photos:",
+    "snipping tool": "snippingtool.exe",
+}
+FOLDERS = {"downloads": "Downloads", "documents": "Documents", "desktop": "Desktop", "pictures": "Pictures",
+           "videos": "Videos", "music": "Music"}
+SITES = {"youtube": "youtube.com", "github": "github.com", "gmail": "gmail.com", "facebook": "facebook.com",
+         "twitter": "twitter.com", "instagram": "instagram.com", "linkedin": "linkedin.com", "reddit": "reddit.com"}
+DOMAINS = ["stackoverflow.com", "wikipedia.org", "python.org", "amazon.in", "news.ycombinator.com", "openai.com"]
+FILE_NAMES = ["linux", "report", "resume", "budget", "notes", "invoice", "thesis", "syllabus", "harish", "todo"]
+FILE_TYPES = {"pdf": ".pdf", "txt": ".txt", "docx": ".docx"}
+SEARCH_TYPES = {"pdf": "*.pdf", "word": "*.docx", "text": "*.txt", "python": "*.py"}
+QUERIES = ["python tutorials", "machine learning", "cheap flights", "best pizza nearby", "weather tomorrow",
+           "rust ownership", "cricket scores", "quantum computing", "react hooks", "tax deadlines"]
+TOPICS = ["photosynthesis", "a black hole", "kubernetes", "the french revolution", "inflation", "dns"]
+PROCESSES = ["chrome", "notepad", "spotify", "discord", "excel", "zoom"]
+PHRASES = ["hello world", "meeting at five", "see you tomorrow", "the quick brown fox", "thanks for the update"]
+LEVELS = [10, 25, 40, 50, 75, 100]
+
+# (intent, phrasings, slot name, slot values -> expected); {x} is the slot
+TEMPLATES = [
+    ("open_app", ["open {x}", "launch {x}", "start {x}", "open up {x}", "fire up {x}", "run {x}"], APPS, app),
+    ("open_folder", ["open {x}", "open my {x} folder", "open the {x} folder", "show my {x}", "go to {x} folder"],
+     FOLDERS, folder),
+    ("open_website", ["open {x}", "go to {x}", "open {x} website", "take me to {x}"], SITES,
+     lambda url: {"action": "open_url", "target": url}),
+    ("open_url", ["open {x}", "go to {x}", "visit {x}", "navigate to {x}"], {d: d for d in DOMAINS},
+     lambda url: {"action": "open_url", "target": url}),
+    ("web_search", ["search for {x} in chrome", "google {x}", "look up {x} on google", "search {x} on the web",
+                    "find {x} using browser", "research {x}", "search the web for {x}"], {q: q for q in QUERIES}, web),
+    ("what_is", ["what is {x}", "tell me about {x}", "explain {x}", "define {x}"], {t: t for t in TOPICS}, web),
+    ("search_type", ["search for {x} files", "find all my {x} files", "look for {x} files", "locate {x} files"],
+     SEARCH_TYPES, lambda pattern: {"action": "search_and_open", "target": pattern}),
+    ("search_name", ["search for {x}", "find {x} files", "locate {x}", "look for my {x} file"],
+     {n: n for n in FILE_NAMES}, lambda name: {"action": "search", "target": f"*{name}*"}),
+    ("kill_process", ["kill {x}", "terminate {x}", "end {x}", "force close {x}", "kill the process {x}"],
+     {p: p for p in PROCESSES}, lambda name: {"action": "kill_process", "target": name}),
+    ("type_text", ["type {x}", "write {x}", "type in notepad: {x}"], {p: p for p in PHRASES},
+     lambda phrase: {"action": "type_text", "extra": {"text": phrase}}),
+    ("set_brightness", ["set brightness to {x}", "set the brightness to {x} percent", "make the screen brightness {x}"],
+     {str(level): level for level in LEVELS}, lambda level: {"action": "set_brightness", "extra": {"level": level}}),
+]
+
+# File intents take two slots
+OPEN_FILE_PHRASINGS = ["open {name} {kind}", "open the {name} {kind}", "open {name}.{kind}", "open file {name}.{kind}"]
+OPEN_IN_APP_PHRASINGS = ["open {name}.txt in {app}", "open file {name}.txt with {app}", "open {name}.txt using {app}"]
+OPEN_IN_APPS = {"notepad": "notepad.exe", "vs code": "code.exe", "word": "winword.exe"}
+CREATE_PHRASINGS = ["create a file called {name}.{kind}", "make a file named {name}.{kind}", "new file {name}.{kind}"]
+
+# Fixed-result intents
+PHRASINGS = [
+    (simple("volume_up"), ["volume up", "turn up the volume", "increase the volume", "raise the volume",
+                           "make it louder", "sound up", "turn the sound up", "crank it up", "louder"]),
+    (simple("volume_down"), ["volume down", "turn down the volume", "decrease the volume", "lower the volume",
+                             "make it quieter", "sound down", "reduce the volume", "quieter"]),
+    (simple("mute"), ["mute", "mute the sound", "unmute", "silence", "mute audio"]),
+    (simple("brightness_up"), ["increase brightness", "raise the brightness", "brightness up", "make the screen brighter",
+                               "turn up the brightness"]),
+    (simple("brightness_down"), ["decrease brightness", "lower the brightness", "brightness down", "dim the screen",
+                                 "turn down the brightness"]),
+    (CLOSE, ["close window", "close this window", "close the current window", "close this app", "close"]),
+    (MINIMIZE, ["minimize", "minimize this window", "minimize the window", "minimise the window"]),
+    (MAXIMIZE, ["maximize", "maximize this window", "full screen", "make it full screen", "maximise the window"]),
+    (SWITCH, ["switch window", "switch to the next window", "alt tab", "next window"]),
+    (simple("screenshot"), ["take a screenshot", "screenshot", "capture the screen", "grab a screenshot",
+                            "take a snap of the screen"]),
+    (simple("lock_screen"), ["lock screen", "lock the computer", "lock my pc", "lock the screen"]),
+    (simple("shutdown"), ["shutdown", "shut down the computer", "power off", "shut down"]),
+    (simple("restart"), ["restart", "restart the computer", "reboot", "reboot my pc"]),
+    (simple("sleep"), ["sleep", "go to sleep", "put the computer to sleep", "hibernate"]),
+    (BATTERY, ["battery", "what's my battery", "battery percentage", "how much charge is left", "battery status",
+               "is the battery charging"]),
+    (DATETIME, ["what time is it", "what's the date today", "current time", "what is the date", "current date"]),
+    (info("cpu"), ["cpu usage", "processor usage", "cpu status", "show cpu info"]),
+    (info("memory"), ["memory usage", "ram usage", "memory status", "how much ram is in use"]),
+    (info("disk"), ["disk usage", "disk space left", "storage available", "storage status"]),
+    (info("network"), ["wifi status", "network status", "am i connected to the internet", "internet status"]),
+    (info("all"), ["system status", "computer health", "pc status", "system info", "status"]),
+    ({"action": "wifi_toggle", "extra": {"state": "on"}}, ["turn on wifi", "enable wifi", "switch on the wifi",
+                                                           "connect to wifi", "turn the wireless on"]),
+    ({"action": "wifi_toggle", "extra": {"state": "off"}}, ["turn off wifi", "disable wifi", "switch off the wifi",
+                                                            "disconnect wifi", "turn the wireless off"]),
+    ({"action": "wifi_toggle", "extra": {"state": "toggle"}}, ["toggle wifi", "toggle the wireless"]),
+    (simple("bluetooth_toggle"), ["turn on bluetooth", "toggle bluetooth", "open bluetooth settings", "disable bluetooth"]),
+    (simple("list_processes"), ["list running processes", "show running apps", "what programs are running",
+                                "show me running processes", "running apps"]),
+    (simple("media_play_pause"), ["play", "pause", "pause the music", "resume the song", "play music", "pause video"]),
+    (simple("media_next"), ["next song", "skip", "skip this track", "play next song", "next track"]),
+    (simple("media_previous"), ["previous song", "previous track", "go back a song", "last track"]),
+    (simple("media_stop"), ["stop music", "stop the media", "stop playing"]),
+    (simple("new_tab"), ["new tab", "open a new tab", "open new tab"]),
+    (simple("close_tab"), ["close tab", "close this tab", "close the tab"]),
+    (simple("refresh_page"), ["refresh", "refresh page", "reload the page", "reload tab"]),
+    (simple("show_desktop"), ["show desktop", "minimize all", "go to desktop", "show the desktop"]),
+    (simple("empty_recycle_bin"), ["empty recycle bin", "empty the trash", "clear the recycle bin", "clean the trash"]),
+    (simple("open_emoji_picker"), ["open emoji picker", "show emoji", "open emojis"]),
+    (simple("open_clipboard_history"), ["open clipboard", "show clipboard history", "show paste history"]),
+    (simple("night_light_toggle"), ["night light", "turn on night light", "blue light filter", "night mode",
+                                    "eye comfort mode"]),
+    (simple("airplane_mode_toggle"), ["airplane mode", "turn on airplane mode", "flight mode"]),
+    (scroll("up"), ["scroll up", "scroll up the page", "scroll the page up", "scroll upwards"]),
+    (scroll("down"), ["scroll down", "scroll down the page", "scroll the page down", "scroll downwards"]),
+    (simple("help"), ["help", "what can you do", "help me", "commands"]),
+    (simple("thanks"), ["thank you", "thanks", "thanks a lot", "thank you so much"]),
+    (simple("introduce"), ["who are you", "what is your name", "introduce yourself"]),
+    (simple("voice_typing"), ["voice typing", "start dictation", "dictate", "activate voice typing", "voice input"]),
+    (app("taskmgr.exe"), ["task manager", "open task manager", "show the task manager"]),
+    (None, ["goodbye", "good morning", "hmm", "never mind", "how are you", "that's all"]),
+]
+
+# How people pad a command when speaking to an assistant
+PREFIXES = ["please ", "can you ", "could you ", "hey ", "zentrax ", "hey zentrax ", "okay ", "i want to ",
+            "um ", "zentrax please "]
+SUFFIXES = [" please", " now", " for me", " right now", " zentrax", "."]
+
+
+def system_prompt_examples():
+    """(utterance, command) pairs from the SYSTEM_PROMPT examples, home as {home}."""
+    pairs = re.findall(r'User: "([^"]+)"\nOutput: (\{.*\})', WindowsCommandGenerator.SYSTEM_PROMPT)
+    examples = []
+    for text, output in pairs:
+        output = output.replace("C:/Users/{username}", "{home}")
+        examples.append((text, json.loads(output)))
+    return examples
+
+
+def transcript_examples():
+    """(recognized_text, command) pairs from the recorded voice commands."""
+    examples = []
+    for metadata in sorted(glob.glob(os.path.join(TRANSCRIPTS_DIR, "*_metadata.json"))):
+        with open(metadata, "r", encoding="utf-8") as f:
+            for sample in json.load(f):
+                expected = TRANSCRIPT_COMMANDS.get(sample.get("expected_command", "").lower())
+                text = sample.get("recognized_text", "").strip()
+                if expected is not None and text:
+                    examples.append((text, expected))
+    return examples
+
+
+def template_examples(rng, variants):
+    """Every templated phrasing, plus `variants` padded copies of each."""
+    base = []
+    for intent, phrasings, slots, expected in TEMPLATES:
+        for phrasing in phrasings:
+            for spoken, value in slots.items():
+                base.append((phrasing.format(x=spoken), expected(value)))
+    for phrasing in OPEN_FILE_PHRASINGS:
+        for name in FILE_NAMES:
+            for kind, extension in FILE_TYPES.items():
+                base.append((phrasing.format(name=name, kind=kind),
+                             {"action": "open_file_by_name", "target": name, "extra": {"extension": extension}}))
+    for phrasing in OPEN_IN_APP_PHRASINGS:
+        for name in FILE_NAMES:
+            for spoken, exe in OPEN_IN_APPS.items():
+                base.append((phrasing.format(name=name, app=spoken),
+                             {"action": "open_file_by_name", "target": f"{name}.txt", "extra": {"app": exe}}))
+    for phrasing in CREATE_PHRASINGS:
+        for name in FILE_NAMES:
+            for kind in FILE_TYPES:
+                base.append((phrasing.format(name=name, kind=kind),
+                             {"action": "create_and_open_file", "path": f"{{home}}/Desktop/{name}.{kind}"}))
+    for expected, phrasings in PHRASINGS:
+        base.extend((phrasing, expected) for phrasing in phrasings)
+
+    examples = []
+    for text, expected in base:
+        examples.append((text, expected))
+        for _ in range(variants):
+            padded = text
+            if rng.random() < 0.7:
+                padded = rng.choice(PREFIXES) + padded
+            if padded == text or rng.random() < 0.4:
+                padded += rng.choice(SUFFIXES)
+            examples.append((padded, expected))
+    return examples
+
+
+def build(seed, variants):
+    rng = random.Random(seed)
+    sources = [
+        ("readme", list(README_SEEDS.items())),
+        ("system_prompt", system_prompt_examples()),
+        ("transcripts", transcript_examples()),
+        ("template", template_examples(rng, variants)),
+    ]
+    cases, seen = [], set()
+    for source, examples in sources:
+        count = 0
+        for text, expected in examples:
+            key = text.lower().strip()
+            if key in seen:
+                continue
+            seen.add(key)
+            cases.append({"id": f"{source}-{count:05d}", "text": text, "source": source, "expected": expected})
+            count += 1
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the versioned intent corpus")
+    parser.add_argument("--seed", type=int, default=41)
+    parser.add_argument("--variants", type=int, default=3, help="padded copies of each templated phrasing")
+    parser.add_argument("--output", default=corpus_path(), help="JSONL file to write")
+    args = parser.parse_args()
+
+    cases = build(args.seed, args.variants)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for case in cases:
+            f.write(json.dumps(case) + "\n")
+    by_source = {}
+    for case in cases:
+        by_source[case["source"]] = by_source.get(case["source"], 0) + 1
+    print(f"Wrote {len(cases)} utterances to {os.path.relpath(args.output, PROJECT_ROOT)}: "
+          + ", ".join(f"{source} {count}" for source, count in by_source.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
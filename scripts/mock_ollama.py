@@ -0,0 +1,239 @@
+"""
+Mock Ollama Server
+A small stand-in for the Ollama HTTP API (/api/tags and /api/generate) used to
+benchmark the client side without a model. Generation is simulated: a fixed
+prompt-processing delay, then one token every --token-ms milliseconds. The
+reply is a JSON command followed by trailing chatter, like a small model that
+keeps talking after the answer. Streaming stops when the client disconnects.
+
+Model residency and prompt caching are simulated too: the model unloads after
+keep_alive (default 5m) and costs --load-ms to load again, and prompt
+evaluation (--prompt-token-ms per token) only covers the part of the rendered
+prompt that differs from the previous request's prefix. The final event
+carries Ollama's timing fields (load_duration, prompt_eval_count, ...).
+
+Run standalone (then point the generator at it):
+    python scripts/mock_ollama.py --port 11435
+Or import start_server() from a benchmark.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_ANSWER = '{"action": "open_app", "target": "notepad.exe"}'
+CHATTER = " This command opens Notepad, the default Windows text editor, so you can start typing right away."
+
+
+def tokenize(text, size=4):
+    """Split text into pseudo-tokens of a few characters."""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def parse_keep_alive(value, default):
+    """Ollama keep_alive: seconds as a number, or a duration like "30m"/"1h"; negative = forever."""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        units = {"s": 1, "m": 60, "h": 3600}
+        text = str(value).strip()
+        seconds = float(text[:-1]) * units[text[-1]] if text[-1] in units else float(text)
+    return float("inf") if seconds < 0 else seconds
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, chunked streaming
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def _send_json(self, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": f"{self.server.model}:latest"}]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+        self.server.count("requests")
+
+        config = self.server
+        start = time.perf_counter()
+        load_ns = config.ensure_loaded(request.get("keep_alive"))
+
+        if not request.get("prompt") and not request.get("system"):
+            # Load-only request (preload)
+            self._send_json({"model": request.get("model"), "response": "", "done": True,
+                             "done_reason": "load", "load_duration": load_ns,
+                             "total_duration": int((time.perf_counter() - start) * 1e9)})
+            return
+
+        prompt_eval_count = config.evaluate_prompt(request.get("system", ""), request.get("prompt", ""))
+        prompt_start = time.perf_counter()
+        time.sleep((config.prompt_ms + prompt_eval_count * config.prompt_token_ms) / 1000)
+        timings = {"load_duration": load_ns, "prompt_eval_count": prompt_eval_count,
+                   "prompt_eval_duration": int((time.perf_counter() - prompt_start) * 1e9)}
+
+        num_predict = request.get("options", {}).get("num_predict", 500)
+        answer = tokenize(config.answer)
+        chatter = tokenize(CHATTER)
+        total = min(num_predict, len(answer) + config.trailing_tokens)
+        tokens = answer + [chatter[i % len(chatter)] for i in range(max(0, total - len(answer)))]
+
+        if not request.get("stream", True):
+            time.sleep(len(tokens) * config.token_ms / 1000)
+            self.server.count("tokens", len(tokens))
+            self._send_json(dict(timings, model=request.get("model"), response="".join(tokens), done=True,
+                                 eval_count=len(tokens), total_duration=int((time.perf_counter() - start) * 1e9)))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                time.sleep(config.token_ms / 1000)
+                self._write_chunk({"model": request.get("model"), "response": token, "done": False})
+                self.server.count("tokens")
+            self._write_chunk(dict(timings, model=request.get("model"), response="", done=True, eval_count=len(tokens),
+                                   total_duration=int((time.perf_counter() - start) * 1e9)))
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Client hung up: stop generating, like Ollama does
+            self.server.count("cancelled")
+            self.close_connection = True
+
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class MockOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # like a real server; the default 5 drops bursts of concurrent clients
+
+    def __init__(self, address, model="smollm2", answer=DEFAULT_ANSWER, token_ms=10.0,
+                 prompt_ms=20.0, trailing_tokens=60, prompt_token_ms=0.0, load_ms=0.0,
+                 keep_alive="5m"):
+        super().__init__(address, MockOllamaHandler)
+        self.model = model
+        self.answer = answer
+        self.token_ms = token_ms
+        self.prompt_ms = prompt_ms
+        self.trailing_tokens = trailing_tokens
+        self.prompt_token_ms = prompt_token_ms
+        self.load_ms = load_ms
+        self.default_keep_alive = parse_keep_alive(keep_alive, 300)
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._loaded_until = 0.0
+        self._cached_prompt = ""
+        self.counters = {"connections": 0, "requests": 0, "tokens": 0, "cancelled": 0}
+
+    def ensure_loaded(self, keep_alive):
+        """Load the model if it has been unloaded; returns the load time in ns."""
+        with self._model_lock:
+            now = time.monotonic()
+            load_ns = 0
+            if now >= self._loaded_until:
+                time.sleep(self.load_ms / 1000)
+                load_ns = int(self.load_ms * 1e6)
+                self._cached_prompt = ""  # the KV cache went with the model
+                now = time.monotonic()
+            self._loaded_until = now + parse_keep_alive(keep_alive, self.default_keep_alive)
+            return load_ns
+
+    def evaluate_prompt(self, system, prompt):
+        """Tokens that need evaluating after reusing the cached prefix of the last prompt."""
+        rendered = (f"<|system|>{system}<|end|>" if system else "") + f"<|user|>{prompt}<|end|><|assistant|>"
+        with self._model_lock:
+            cached = self._cached_prompt
+            shared = 0
+            for a, b in zip(cached, rendered):
+                if a != b:
+                    break
+                shared += 1
+            self._cached_prompt = rendered
+        return len(tokenize(rendered[shared:]))
+
+    def unload(self):
+        """Force the next request to reload the model (simulates an idle timeout)."""
+        with self._model_lock:
+            self._loaded_until = 0.0
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def reset_counters(self):
+        with self._lock:
+            for name in self.counters:
+                self.counters[name] = 0
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(port=0, **config):
+    """
+    Start a mock server on a background thread.
+
+    Returns:
+        The MockOllamaServer (use .url, .counters, .shutdown())
+    """
+    server = MockOllamaServer(("127.0.0.1", port), **config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ollama API server")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Delay per generated token")
+    parser.add_argument("--prompt-ms", type=float, default=20.0, help="Delay before the first token")
+    parser.add_argument("--trailing-tokens", type=int, default=60, help="Tokens of chatter after the JSON answer")
+    parser.add_argument("--prompt-token-ms", type=float, default=0.5, help="Delay per evaluated prompt token")
+    parser.add_argument("--load-ms", type=float, default=1500.0, help="Model load time after an unload")
+    parser.add_argument("--keep-alive", default="5m", help="Default keep_alive when a request sends none")
+    args = parser.parse_args()
+
+    server = MockOllamaServer(("127.0.0.1", args.port), token_ms=args.token_ms,
+                              prompt_ms=args.prompt_ms, trailing_tokens=args.trailing_tokens,
+                              prompt_token_ms=args.prompt_token_ms, load_ms=args.load_ms,
+                              keep_alive=args.keep_alive)
+    print(f"Mock Ollama listening on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.counters))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Action Order Check
+Submits commands through executor.submit() the way the voice loop does and
+checks the order their handlers ran in:
+  - "open notepad" then "type hello": the typing starts only after the
+    launch has returned, even when the launch is the slower of the two
+  - a slow system_info query submitted in between runs beside them, and
+    does not hold the typing up
+  - a launch that hangs past its timeout is abandoned, and the typing
+    queued behind it still runs, after it
+
+Handlers are stubbed (the launch sleeps, the query sleeps, the typing only
+records itself), so this works on any platform.
+
+Run this from the project root:
+    python scripts/test_action_order.py [--launch 0.3] [--rounds 20]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.commands.command_executor import CommandExecutor
+
+
+def new_executor(events, launch, query):
+    """An executor whose open_app, type_text and system_info only record when they ran."""
+    lock = threading.Lock()
+
+    def record(name, seconds):
+        def handler(command):
+            with lock:
+                events.append(("start", name))
+            time.sleep(seconds)
+            with lock:
+                events.append(("end", name))
+            return True, name
+        return handler
+
+    executor = CommandExecutor(use_file_catalog=False, use_app_index=False, use_frecency=False,
+                               use_fs_watcher=False, use_shell_pool=False)
+    executor._open_app = record("open_app", launch)
+    executor._type_text = record("type_text", 0)
+    executor._system_info = record("system_info", query)
+    return executor
+
+
+def ordered(events, first, then):
+    """True if then started after first ended."""
+    return events.index(("end", first)) < events.index(("start", then))
+
+
+def check_order(args):
+    """Failures over rounds of open_app, system_info, type_text."""
+    failures = 0
+    for _ in range(args.rounds):
+        events = []
+        executor = new_executor(events, args.launch, args.launch * 2)
+        futures = [
+            executor.submit({"action": "open_app", "target": "notepad.exe"}),
+            executor.submit({"action": "system_info", "extra": {"type": "battery"}}),
+            executor.submit({"action": "type_text", "target": "hello"}),
+        ]
+        results = [future.result() for future in futures]
+        executor.close()
+        if not ordered(events, "open_app", "type_text"):
+            failures += 1
+            print(f"❌ type_text ran before open_app finished: {events}")
+        elif events.index(("end", "type_text")) > events.index(("end", "system_info")):
+            failures += 1
+            print(f"❌ type_text waited for system_info: {events}")
+        elif not all(success for success, _ in results):
+            failures += 1
+            print(f"❌ {results}")
+    return failures
+
+
+def check_abandoned(args):
+    """Failures when the launch hangs past its timeout."""
+    events = []
+    executor = new_executor(events, 30, 0)
+    release = threading.Event()
+    executor._open_app = lambda command: (events.append(("start", "open_app")), release.wait(30),
+                                          events.append(("end", "open_app")), (True, "late"))[-1]
+    spec = executor.ACTIONS.get("open_app")
+    original = spec.timeout
+    spec.timeout = args.timeout
+    try:
+        start = time.perf_counter()
+        launch = executor.submit({"action": "open_app", "target": "hangs.exe"})
+        typing = executor.submit({"action": "type_text", "target": "hello"})
+        launched = launch.result()
+        typed = typing.result(timeout=args.timeout + 5)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        spec.timeout = original
+        release.set()
+        executor.close()
+    print(f"  hung launch: {launched} | typing after it: {typed} in {elapsed:.0f} ms")
+    if launched[0] or not typed[0] or events.index(("start", "open_app")) > events.index(("start", "type_text")):
+        print(f"❌ {events}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that UI actions run in the order they were submitted")
+    parser.add_argument("--launch", type=float, default=0.3, help="Seconds the stubbed launch takes")
+    parser.add_argument("--rounds", type=int, default=20, help="open_app/system_info/type_text rounds")
+    parser.add_argument("--timeout", type=float, default=0.5, help="open_app timeout for the hung launch")
+    args = parser.parse_args()
+
+    print("=" * 100)
+    print(f"Action order: open_app ({args.launch:g} s), system_info ({args.launch * 2:g} s), type_text")
+    print("=" * 100)
+    failures = check_order(args)
+    print(f"  {args.rounds - failures}/{args.rounds} rounds in order")
+    failures += check_abandoned(args)
+    print("=" * 100)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
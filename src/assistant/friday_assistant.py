@@ -374,25 +374,33 @@ class SystemMonitor:
     """
     System monitoring capabilities for FRIDAY.
     Provides real-time system information.
+    
+    Args:
+        shells: A ShellPool of PowerShell sessions to run queries on (the
+            executor's); without one, each query starts PowerShell
     """
     
-    @staticmethod
-    def get_battery_info() -> dict:
+    def __init__(self, shells=None):
+        self.shells = shells
+    
+    def _powershell(self, script: str, timeout: float) -> subprocess.CompletedProcess:
+        """Run a PowerShell query."""
+        if self.shells is not None:
+            return self.shells.run(script, timeout=timeout)
+        return subprocess.run(["powershell", "-Command", script], capture_output=True, text=True, timeout=timeout)
+    
+    def get_battery_info(self) -> dict:
         """Get battery information."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command", 
-                 "(Get-WmiObject Win32_Battery).EstimatedChargeRemaining"],
-                capture_output=True, text=True, timeout=5
-            )
-            percent = result.stdout.strip()
-            
-            result2 = subprocess.run(
-                ["powershell", "-Command",
-                 "(Get-WmiObject Win32_Battery).BatteryStatus"],
-                capture_output=True, text=True, timeout=5
+            # Charge, then status, from one query
+            result = self._powershell(
+                "$battery = Get-WmiObject Win32_Battery | Select-Object -First 1; "
+                "$battery.EstimatedChargeRemaining; $battery.BatteryStatus",
+                timeout=5
             )
-            status_code = result2.stdout.strip()
+            lines = result.stdout.split()
+            percent = lines[0] if lines else ""
+            status_code = lines[1] if len(lines) > 1 else ""
             
             status = "Unknown"
             if status_code == "1":
@@ -410,29 +418,25 @@ class SystemMonitor:
         except Exception:
             return {"percent": None, "status": "Unknown", "is_charging": False}
     
-    @staticmethod
-    def get_cpu_usage() -> float:
+    def get_cpu_usage(self) -> float:
         """Get CPU usage percentage."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 "(Get-WmiObject Win32_Processor).LoadPercentage"],
-                capture_output=True, text=True, timeout=5
+            result = self._powershell(
+                "(Get-WmiObject Win32_Processor).LoadPercentage",
+                timeout=5
             )
             return float(result.stdout.strip())
         except Exception:
             return 0.0
     
-    @staticmethod
-    def get_memory_info() -> dict:
+    def get_memory_info(self) -> dict:
         """Get memory/RAM information."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 "Get-WmiObject Win32_OperatingSystem | "
-                 "Select-Object FreePhysicalMemory,TotalVisibleMemorySize | "
-                 "ForEach-Object { $_.FreePhysicalMemory, $_.TotalVisibleMemorySize }"],
-                capture_output=True, text=True, timeout=5
+            result = self._powershell(
+                "Get-WmiObject Win32_OperatingSystem | "
+                "Select-Object FreePhysicalMemory,TotalVisibleMemorySize | "
+                "ForEach-Object { $_.FreePhysicalMemory, $_.TotalVisibleMemorySize }",
+                timeout=5
             )
             lines = result.stdout.strip().split('\n')
             if len(lines) >= 2:
@@ -450,16 +454,14 @@ class SystemMonitor:
             pass
         return {"total_gb": 0, "used_gb": 0, "free_gb": 0, "percent_used": 0}
     
-    @staticmethod
-    def get_disk_info(drive: str = "C:") -> dict:
+    def get_disk_info(self, drive: str = "C:") -> dict:
         """Get disk space information."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 f"Get-WmiObject Win32_LogicalDisk -Filter 'DeviceID=\"{drive}\"' | "
-                 "Select-Object FreeSpace,Size | "
-                 "ForEach-Object { $_.FreeSpace, $_.Size }"],
-                capture_output=True, text=True, timeout=5
+            result = self._powershell(
+                f"Get-WmiObject Win32_LogicalDisk -Filter 'DeviceID=\"{drive}\"' | "
+                "Select-Object FreeSpace,Size | "
+                "ForEach-Object { $_.FreeSpace, $_.Size }",
+                timeout=5
             )
             lines = result.stdout.strip().split('\n')
             if len(lines) >= 2:
@@ -478,16 +480,14 @@ class SystemMonitor:
             pass
         return {"drive": drive, "total_gb": 0, "used_gb": 0, "free_gb": 0, "percent_used": 0}
     
-    @staticmethod
-    def get_running_processes(top_n: int = 10) -> list:
+    def get_running_processes(self, top_n: int = 10) -> list:
         """Get top running processes by memory usage."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 f"Get-Process | Sort-Object WorkingSet64 -Descending | "
-                 f"Select-Object -First {top_n} Name,@{{Name='MemoryMB';Expression={{[math]::Round($_.WorkingSet64/1MB,0)}}}} | "
-                 "Format-Table -HideTableHeaders"],
-                capture_output=True, text=True, timeout=10
+            result = self._powershell(
+                f"Get-Process | Sort-Object WorkingSet64 -Descending | "
+                f"Select-Object -First {top_n} Name,@{{Name='MemoryMB';Expression={{[math]::Round($_.WorkingSet64/1MB,0)}}}} | "
+                "Format-Table -HideTableHeaders",
+                timeout=10
             )
             processes = []
             for line in result.stdout.strip().split('\n'):
@@ -501,15 +501,13 @@ class SystemMonitor:
         except Exception:
             return []
     
-    @staticmethod
-    def get_network_status() -> dict:
+    def get_network_status(self) -> dict:
         """Get network/WiFi status."""
         try:
             # Check if connected to internet
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 "Test-Connection google.com -Count 1 -Quiet"],
-                capture_output=True, text=True, timeout=10
+            result = self._powershell(
+                "Test-Connection google.com -Count 1 -Quiet",
+                timeout=10
             )
             is_connected = result.stdout.strip().lower() == "true"
             
@@ -532,14 +530,12 @@ class SystemMonitor:
         except Exception:
             return {"connected": False, "wifi_name": "Unknown", "status": "Unknown"}
     
-    @staticmethod  
-    def get_bluetooth_status() -> dict:
+    def get_bluetooth_status(self) -> dict:
         """Get Bluetooth status."""
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 "Get-PnpDevice -Class Bluetooth | Where-Object {$_.Status -eq 'OK'} | Select-Object -First 1"],
-                capture_output=True, text=True, timeout=5
+            result = self._powershell(
+                "Get-PnpDevice -Class Bluetooth | Where-Object {$_.Status -eq 'OK'} | Select-Object -First 1",
+                timeout=5
             )
             is_enabled = len(result.stdout.strip()) > 0
             return {
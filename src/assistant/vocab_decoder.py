@@ -0,0 +1,260 @@
+"""
+Command-vocabulary biased decoding for Whisper.
+
+Most utterances Zentrax hears are one of a few dozen known phrases
+("volume up", "open chrome", "open downloads", ...). This module builds a
+token-level prefix trie of those phrases and runs a small greedy decoder
+that, once the decoded prefix sits on a trie path with high probability,
+verifies the rest of the phrase in a single teacher-forced forward pass
+and terminates early. Its steps run on Whisper's KV cache. Anything that
+leaves the trie (or fails the verification) is handed to whisper.decode()
+with the tokens decoded so far as its prefix.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+
+class PhraseTrie:
+    """Prefix trie over token-id sequences of known command phrases."""
+
+    def __init__(self):
+        self.root: Dict = {}
+        self.size = 0
+
+    def add(self, token_ids: List[int], phrase: str):
+        node = self.root
+        for token in token_ids:
+            node = node.setdefault(token, {})
+        node[None] = phrase  # terminal marker
+        self.size += 1
+
+    def walk(self, token_ids: Iterable[int]) -> Optional[Dict]:
+        """Return the node reached by following token_ids, or None if it leaves the trie."""
+        node = self.root
+        for token in token_ids:
+            node = node.get(token)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def unique_completion(node: Dict) -> Optional[Tuple[List[int], str]]:
+        """
+        Return (remaining tokens, phrase) if exactly one phrase is reachable
+        from node, otherwise None.
+        """
+        completion = []
+        while True:
+            children = [key for key in node if key is not None]
+            if None in node:
+                # A phrase ends here; only unique if nothing continues it
+                return (completion, node[None]) if not children else None
+            if len(children) != 1:
+                return None
+            completion.append(children[0])
+            node = node[children[0]]
+
+
+class VocabularyBiasedDecoder:
+    """
+    Greedy Whisper decoder with trie-guided early completion.
+
+    Args:
+        model: A loaded whisper model
+        language: Decoding language (default: "en")
+        prefix_threshold: Minimum joint probability of the free-decoded
+            prefix before a trie completion is attempted
+        completion_threshold: Minimum per-token probability for the
+            verified completion to be accepted
+    """
+
+    END_PUNCTUATION = (".", "!", "?")
+
+    def __init__(self, model, language="en", prefix_threshold=0.6, completion_threshold=0.5):
+        import whisper  # model is already loaded, so the import is cheap
+
+        self._whisper = whisper
+        self.model = model
+        self.language = language
+        self.prefix_threshold = prefix_threshold
+        self.completion_threshold = completion_threshold
+
+        tokenizer_kwargs = {"language": language, "task": "transcribe"}
+        if hasattr(model, "num_languages"):
+            tokenizer_kwargs["num_languages"] = model.num_languages
+        self.tokenizer = whisper.tokenizer.get_tokenizer(model.is_multilingual, **tokenizer_kwargs)
+        self.eot = self.tokenizer.eot
+        self.end_tokens = {self.eot}
+        for mark in self.END_PUNCTUATION:
+            encoded = self.tokenizer.encode(mark)
+            if len(encoded) == 1:
+                self.end_tokens.add(encoded[0])
+
+        self.trie = PhraseTrie()
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self.stats = {
+            "utterances": 0,
+            "shortcut_hits": 0,
+            "verify_failures": 0,
+            "handoffs": 0,
+            "steps_taken": 0,
+            "steps_saved": 0,
+        }
+
+    # ---------------- Vocabulary ----------------
+    def set_vocabulary(self, phrases: Iterable[str]):
+        """(Re)build the phrase trie. Whisper emits a leading space and often capitalises."""
+        trie = PhraseTrie()
+        for phrase in sorted({p.strip().lower() for p in phrases if p and p.strip()}):
+            for variant in (phrase, phrase.capitalize()):
+                trie.add(self.tokenizer.encode(" " + variant), phrase)
+        with self._lock:
+            self.trie = trie
+
+    # ---------------- Decoding ----------------
+    def _forward(self, cache: Optional[Dict], tokens: List[int], start: int, audio_features) -> torch.Tensor:
+        """
+        One decoder forward pass over tokens[start:]; the earlier tokens are
+        read from the KV cache, which must hold exactly tokens[:start]
+        (without a cache, start is 0). Returns log-probs for every position fed.
+        """
+        tokens_tensor = torch.tensor([tokens[start:]], device=audio_features.device)
+        logits = self.model.decoder(tokens_tensor, audio_features, kv_cache=cache)[0].float()
+        # Never emit timestamps or other special tokens except end-of-text
+        logits[:, self.tokenizer.timestamp_begin:] = -np.inf
+        logits[:, self.eot + 1:self.tokenizer.timestamp_begin] = -np.inf
+        return torch.log_softmax(logits, dim=-1)
+
+    def _verify_completion(self, tokens: List[int], completion: List[int],
+                           audio_features) -> Optional[List[int]]:
+        """
+        Score the whole completion in one teacher-forced pass. It runs without
+        the KV cache: Whisper's causal mask only lines up with a cache when a
+        single token is fed, and a rejected completion must not stay cached.
+
+        Returns the accepted tail (completion + end tokens) or None.
+        """
+        log_probs = self._forward(None, tokens + completion, 0, audio_features)
+        offset = len(tokens) - 1
+        for i, token in enumerate(completion):
+            if log_probs[offset + i, token].exp().item() < self.completion_threshold:
+                return None
+
+        # The model must want to stop (optionally after punctuation) right after the phrase
+        last = log_probs[offset + len(completion)]
+        ending = int(last.argmax().item())
+        if ending not in self.end_tokens or last[ending].exp().item() < self.completion_threshold:
+            return None
+        return completion + ([ending] if ending == self.eot else [ending, self.eot])
+
+    def _continue_freely(self, audio_features, prefix: List[int]) -> List[int]:
+        """
+        Tokens whisper.decode() produces after prefix: the text decoded so
+        far is kept, and the rest gets Whisper's own filters and KV cache.
+        The audio features are passed as they are, so the encoder is not run again.
+        """
+        whisper = self._whisper
+        options = whisper.DecodingOptions(task="transcribe", language=self.language, without_timestamps=True,
+                                          prefix=prefix, fp16=audio_features.dtype == torch.float16)
+        return list(whisper.decode(self.model, audio_features, options)[0].tokens)
+
+    def decode(self, audio_np: np.ndarray, fp16: bool = False) -> str:
+        """
+        Decode 16 kHz float32 audio into text.
+
+        Steps stay on the phrase trie, with a KV cache so each one feeds a
+        single token. Once the text leaves the trie, or the model rejects the
+        only phrase it can still be, whisper.decode() finishes it from the
+        tokens decoded so far.
+
+        Args:
+            audio_np: Mono audio samples in [-1, 1]
+            fp16: Run the encoder in half precision
+
+        Returns:
+            The transcribed text
+        """
+        whisper = self._whisper
+        audio = whisper.pad_or_trim(torch.from_numpy(audio_np))
+        n_mels = getattr(self.model.dims, "n_mels", 80)
+        mel = whisper.log_mel_spectrogram(audio, n_mels=n_mels).to(self.model.device)
+        mel = mel.half() if fp16 else mel.float()
+
+        with self._lock:
+            trie = self.trie
+
+        # The hooks are installed on the shared model, so one utterance at a time
+        with self._model_lock, torch.no_grad():
+            audio_features = self.model.embed_audio(mel.unsqueeze(0))
+            sot = list(self.tokenizer.sot_sequence_including_notimestamps)
+            tokens = list(sot)
+            node = trie.root
+            prefix_log_prob = 0.0
+            steps = 0
+            saved = 0
+            handoff = False
+
+            cache, hooks = self.model.install_kv_cache_hooks()
+            try:
+                fed = 0  # tokens in the KV cache
+                while True:
+                    log_probs = self._forward(cache, tokens, fed, audio_features)[-1]
+                    fed = len(tokens)
+                    steps += 1
+                    token = int(log_probs.argmax().item())
+                    if token == self.eot:
+                        break
+                    child = node.get(token)
+                    if child is None:
+                        tokens.append(token)
+                        if token in self.end_tokens and None in node:
+                            break  # a whole phrase, then punctuation
+                        handoff = True  # left the vocabulary
+                        break
+                    tokens.append(token)
+                    node = child
+                    prefix_log_prob += log_probs[token].item()
+
+                    if np.exp(prefix_log_prob) < self.prefix_threshold:
+                        continue
+                    found = PhraseTrie.unique_completion(node)
+                    if found is None:
+                        continue
+
+                    completion, _phrase = found
+                    tail = self._verify_completion(tokens, completion, audio_features)
+                    steps += 1
+                    if tail is None:
+                        self.stats["verify_failures"] += 1
+                        handoff = True
+                        break
+                    tokens.extend(tail[:-1])  # drop EOT
+                    saved = len(tail) - 1
+                    self.stats["shortcut_hits"] += 1
+                    break
+            finally:
+                for hook in hooks:
+                    hook.remove()
+
+            if handoff:
+                self.stats["handoffs"] += 1
+                tokens.extend(self._continue_freely(audio_features, tokens[len(sot):]))
+
+        self.stats["utterances"] += 1
+        self.stats["steps_taken"] += steps
+        self.stats["steps_saved"] += saved
+        return self.tokenizer.decode(tokens[len(sot):]).strip()
+
+    def get_stats(self) -> dict:
+        """Decoding statistics, including the average number of steps saved per utterance."""
+        stats = dict(self.stats)
+        utterances = max(1, stats["utterances"])
+        stats["avg_steps"] = round(stats["steps_taken"] / utterances, 2)
+        stats["avg_steps_saved"] = round(stats["steps_saved"] / utterances, 2)
+        stats["vocabulary_size"] = self.trie.size
+        return stats
@@ -5,16 +5,28 @@ import concurrent.futures
 import time
 import threading
 
+try:
+    from .vocab_decoder import VocabularyBiasedDecoder
+except ImportError:
+    from vocab_decoder import VocabularyBiasedDecoder
+
 
 class WhisperHandler:
     """
     Lightweight, safer Whisper wrapper with lazy model loading,
     proper 16k conversion from speech_recognition AudioData,
     optional async transcription and reduced memory footprint.
+
+    decoding="vocab" enables command-vocabulary biased decoding: utterances
+    that match a known command phrase terminate early, everything else
+    falls back to free decoding.
     """
     
-    def __init__(self, model_name="base", device=None, max_workers=2):
+    def __init__(self, model_name="base", device=None, max_workers=2, decoding="free"):
         self.model_name = model_name
+        self.decoding = decoding
+        self._vocab_decoder = None
+        self._vocabulary = []
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         self._model = None
         self._whisper_module = None
@@ -62,6 +74,23 @@ class WhisperHandler:
             self._load_model()
         return self._model
 
+    def set_command_vocabulary(self, phrases):
+        """Set the known command phrases used by vocabulary-biased decoding."""
+        self._vocabulary = list(phrases)
+        if self._vocab_decoder is not None:
+            self._vocab_decoder.set_vocabulary(self._vocabulary)
+
+    def _get_vocab_decoder(self):
+        # Built lazily once the model is loaded
+        if self._vocab_decoder is None and self._model is not None and self._vocabulary:
+            self._vocab_decoder = VocabularyBiasedDecoder(self._model)
+            self._vocab_decoder.set_vocabulary(self._vocabulary)
+        return self._vocab_decoder
+
+    def get_decoding_stats(self):
+        """Token steps taken/saved by vocabulary-biased decoding (None when unused)."""
+        return self._vocab_decoder.get_stats() if self._vocab_decoder else None
+
     def transcribe_audio(self, audio_data: sr.AudioData, language="en", fp16=None):
         """
         Synchronous transcription. Forces conversion to 16k and int16 -> float32.
@@ -80,6 +109,15 @@ class WhisperHandler:
                 return ""
 
             fp16 = (self.device == "cuda") if fp16 is None else fp16
+
+            if self.decoding == "vocab" and language == "en":
+                decoder = self._get_vocab_decoder()
+                if decoder is not None:
+                    try:
+                        return decoder.decode(audio_np, fp16=fp16)
+                    except Exception as e:
+                        print(f"Vocabulary decoding failed, using free decoding: {e}")
+
             with torch.no_grad():
                 # whisper expects either a numpy array or file path
                 result = self._model.transcribe(audio_np, language=language, fp16=fp16, task="transcribe")
@@ -124,14 +162,14 @@ class HybridRecognizer:
     Falls back to Google if Whisper fails.
     """
     
-    def __init__(self, use_whisper=True, whisper_model="base"):
+    def __init__(self, use_whisper=True, whisper_model="base", decoding="free"):
         self.use_whisper = use_whisper
         self.recognizer = sr.Recognizer()
 
         if use_whisper:
             try:
                 # constructor of WhisperHandler no longer imports whisper at module import
-                self.whisper = WhisperHandler(model_name=whisper_model)
+                self.whisper = WhisperHandler(model_name=whisper_model, decoding=decoding)
                 print("✅ Hybrid mode: Whisper (primary) + Google (fallback)")
             except Exception as e:
                 print(f"⚠️ Whisper initialization failed: {e}")
@@ -142,6 +180,11 @@ class HybridRecognizer:
             self.whisper = None
             print("✅ Using Google Speech API only")
 
+    def set_command_vocabulary(self, phrases):
+        """Forward known command phrases to Whisper for vocabulary-biased decoding."""
+        if self.whisper:
+            self.whisper.set_command_vocabulary(phrases)
+
     def recognize(self, audio_data, language="en", timeout=None):
         """
         Try Whisper first (sync). If it's still empty, fallback to Google.
@@ -0,0 +1,121 @@
+"""
+Action Execution Metrics
+Counts calls, failures and rejected arguments per executor action and keeps
+a latency histogram for each, so slow or failing actions show up at runtime
+(an action that routinely exceeds its declared timeout, a handler that keeps
+raising).
+"""
+
+import bisect
+import threading
+from typing import Any, Dict
+
+
+class ActionMetrics:
+    """
+    Thread-safe per-action outcome counter and latency histogram.
+
+    Outcomes:
+        ok        the handler reported success
+        failed    the handler reported failure (app not found, ...)
+        error     the handler raised
+        timeout   a child process outlived the action's timeout and was killed
+        cancelled the action was cancelled while it ran
+        invalid   rejected by validation; the handler did not run
+    """
+
+    OUTCOMES = ("ok", "failed", "error", "timeout", "cancelled", "invalid")
+    # Upper bounds of the latency buckets in milliseconds; one more bucket above the last
+    BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters and histograms."""
+        with self._lock:
+            self._actions: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, action: str, outcome: str, latency_ms: float = 0.0, slow: bool = False):
+        """
+        Record one executed (or rejected) command.
+
+        Args:
+            action: Action name
+            outcome: One of OUTCOMES
+            latency_ms: Time the handler took in milliseconds
+            slow: It took longer than the action's declared timeout
+        """
+        with self._lock:
+            stats = self._actions.get(action)
+            if stats is None:
+                stats = self._actions[action] = {
+                    "outcomes": dict.fromkeys(self.OUTCOMES, 0),
+                    "slow": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "histogram": [0] * (len(self.BUCKETS_MS) + 1),
+                }
+            stats["outcomes"][outcome] = stats["outcomes"].get(outcome, 0) + 1
+            if outcome == "invalid":
+                return
+            stats["slow"] += slow
+            stats["total_ms"] += latency_ms
+            stats["max_ms"] = max(stats["max_ms"], latency_ms)
+            stats["histogram"][bisect.bisect_left(self.BUCKETS_MS, latency_ms)] += 1
+
+    def _percentile(self, histogram, count: int, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile (inf for the last bucket)."""
+        rank = pct / 100 * count
+        seen = 0
+        for index, bucket in enumerate(histogram):
+            seen += bucket
+            if seen >= rank and bucket:
+                return float(self.BUCKETS_MS[index]) if index < len(self.BUCKETS_MS) else float("inf")
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict with the total count and, per action, calls (handler runs),
+            the count of each outcome, how many exceeded the timeout,
+            mean/max latency, p50/p95 as histogram bucket bounds and the
+            histogram itself ({"<=1": n, ..., ">30000": n})
+        """
+        labels = [f"<={bound}" for bound in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}"]
+        with self._lock:
+            actions = {}
+            for action, stats in sorted(self._actions.items()):
+                calls = sum(stats["outcomes"].values()) - stats["outcomes"]["invalid"]
+                histogram = stats["histogram"]
+                p50, p95 = (min(self._percentile(histogram, calls, pct), round(stats["max_ms"], 2))
+                            for pct in (50, 95))
+                actions[action] = {
+                    "calls": calls,
+                    **stats["outcomes"],
+                    "slow": stats["slow"],
+                    "mean_ms": round(stats["total_ms"] / calls, 2) if calls else 0.0,
+                    "max_ms": round(stats["max_ms"], 2),
+                    "p50_ms": p50,
+                    "p95_ms": p95,
+                    "histogram": dict(zip(labels, histogram)),
+                }
+        total = sum(stats["calls"] + stats["invalid"] for stats in actions.values())
+        return {"total": total, "actions": actions}
+
+    def format_report(self) -> str:
+        """Human-readable one-line-per-action summary."""
+        snapshot = self.snapshot()
+        lines = [f"📊 Command execution: {snapshot['total']} commands"]
+        for action, stats in snapshot["actions"].items():
+            line = (f"   {action:<22} {stats['calls']:>5} run  {stats['failed']:>3} failed  "
+                    f"{stats['error']:>3} errors  {stats['invalid']:>3} invalid  "
+                    f"mean {stats['mean_ms']:8.2f} ms  p95 <= {stats['p95_ms']:g} ms")
+            stopped = stats["timeout"] + stats["cancelled"]
+            if stats["slow"] or stopped:
+                line += f"  ({stats['slow']} over timeout, {stopped} stopped)"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,195 @@
+"""
+Action Registry
+Declares every action the executor can run: the handler method, the
+arguments it needs, how long it may take and whether it may run alongside
+other actions. The table
+is built once at import (CommandExecutor.ACTIONS), and everything that
+needs to know about actions is derived from it:
+    validate(command)   per-action checks compiled up front, so a command
+                        without a path or with "delay": "now; calc" is
+                        rejected before a handler sees it
+    json_schema()       the structured-output "format" sent to the LLM
+    get(name)           dispatch, timeout and lane for the executor
+
+    ActionSpec("system_info", "_system_info", extra={"type": str}, timeout=15.0, concurrent=True)
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .command_schema import validate_command
+except ImportError:
+    from command_schema import validate_command
+
+
+# Python type -> (JSON schema type, accepted Python types, readable name)
+_TYPES = {
+    str: ("string", (str,), "a string"),
+    int: ("integer", (int,), "an integer"),
+    float: ("number", (int, float), "a number"),
+    bool: ("boolean", (bool,), "true or false"),
+    list: ("array", (list,), "a list"),
+    dict: ("object", (dict,), "an object"),
+}
+
+# Top-level fields besides "action" and "extra"
+_FIELDS = ("target", "path")
+
+
+class ActionSpec:
+    """
+    One executor action.
+
+    Args:
+        name: Action name the model emits ("open_app")
+        handler: CommandExecutor method that runs it
+        requires: Fields that must be present and non-empty: "target", "path"
+            or "extra.<key>"; "target|extra.url" accepts either
+        extra: Types of the extra keys the handler reads (str, int, float,
+            bool, list, dict); other keys are ignored
+        timeout: Seconds the action normally finishes within
+        concurrent: True for an independent query (system info, a search, a
+            shell command) that may run alongside other actions; False (UI,
+            input, files, settings) runs one at a time in submission order
+    """
+
+    __slots__ = ("name", "handler", "requires", "extra", "timeout", "concurrent", "_required", "_types")
+
+    def __init__(self, name: str, handler: str, requires: Iterable[str] = (), extra: Dict[str, type] = None,
+                 timeout: float = 5.0, concurrent: bool = False):
+        self.name = name
+        self.handler = handler
+        self.requires = tuple(requires)
+        self.extra = dict(extra or {})
+        self.timeout = timeout
+        self.concurrent = concurrent
+        # Compiled once: ((section, key), ...) alternatives per requirement, and
+        # (key, accepted types, rejects bool, readable name) per typed extra key
+        self._required: Tuple[Tuple[Tuple[Optional[str], str], ...], ...] = tuple(
+            tuple(self._field(option) for option in requirement.split("|")) for requirement in self.requires
+        )
+        self._types = tuple(
+            (key, _TYPES[kind][1], kind is not bool, _TYPES[kind][2]) for key, kind in self.extra.items()
+        )
+
+    @staticmethod
+    def _field(option: str) -> Tuple[Optional[str], str]:
+        if option.startswith("extra."):
+            return "extra", option[len("extra."):]
+        if option not in _FIELDS:
+            raise ValueError(f"unknown field '{option}'")
+        return None, option
+
+    def validate(self, command: Dict[str, Any]) -> Optional[str]:
+        """
+        Check a command's arguments (its action is already known to match).
+
+        Returns:
+            None if valid, otherwise the reason it is not
+        """
+        extra = command.get("extra")
+        if extra is None:
+            extra = {}
+        elif not isinstance(extra, dict):
+            return "'extra' must be an object"
+        for field in _FIELDS:
+            value = command.get(field)
+            if value is not None and not isinstance(value, str):
+                return f"'{field}' must be a string"
+        for key, types, rejects_bool, kind in self._types:
+            value = extra.get(key)
+            if value is not None and (not isinstance(value, types) or (rejects_bool and isinstance(value, bool))):
+                return f"'extra.{key}' must be {kind}"
+        for alternatives in self._required:
+            if not any((extra if section else command).get(key) not in (None, "", [])
+                       for section, key in alternatives):
+                return "missing " + " or ".join(f"'{section}.{key}'" if section else f"'{key}'"
+                                                for section, key in alternatives)
+        return None
+
+    def _schema_signature(self) -> Tuple:
+        """Actions with the same signature share one branch of the JSON schema."""
+        required = tuple(alternatives[0] for alternatives in self._required if len(alternatives) == 1)
+        return required, tuple(sorted((key, _TYPES[kind][0]) for key, kind in self.extra.items()))
+
+    def __repr__(self) -> str:
+        return f"ActionSpec({self.name!r}, {self.handler!r}, timeout={self.timeout}, concurrent={self.concurrent})"
+
+
+class ActionRegistry:
+    """
+    The executor's actions by name.
+
+    Args:
+        specs: One ActionSpec per action
+    """
+
+    def __init__(self, specs: Iterable[ActionSpec]):
+        self._specs: Dict[str, ActionSpec] = {}
+        for spec in specs:
+            if spec.name in self._specs:
+                raise ValueError(f"action '{spec.name}' declared twice")
+            self._specs[spec.name] = spec
+        self._schema: Optional[Dict[str, Any]] = None
+
+    def get(self, name: str) -> Optional[ActionSpec]:
+        return self._specs.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def specs(self) -> List[ActionSpec]:
+        return list(self._specs.values())
+
+    def validate(self, command: Any) -> Optional[str]:
+        """
+        Check a parsed command: a known action, and the arguments it needs.
+
+        Returns:
+            None if valid, otherwise the reason it is not
+        """
+        error = validate_command(command, self._specs)
+        if error is not None:
+            return error
+        return self._specs[command["action"].lower()].validate(command)
+
+    def json_schema(self) -> Dict[str, Any]:
+        """
+        JSON schema for commands, usable as Ollama's "format". Actions that
+        need the same fields share one branch, which lists those fields as
+        required and gives the types of the extra keys; either-or
+        requirements are left to validate().
+        """
+        if self._schema is None:
+            groups: Dict[Tuple, List[str]] = {}
+            for spec in self._specs.values():
+                groups.setdefault(spec._schema_signature(), []).append(spec.name)
+            branches = []
+            for (required, extra_types), names in groups.items():
+                extra: Dict[str, Any] = {"type": "object"}
+                if extra_types:
+                    extra["properties"] = {key: {"type": kind} for key, kind in extra_types}
+                extra_required = sorted(key for section, key in required if section)
+                if extra_required:
+                    extra["required"] = extra_required
+                top_required = ["action"] + [key for section, key in required if not section]
+                if extra_required:
+                    top_required.append("extra")
+                branches.append({
+                    "type": "object",
+                    "properties": {
+                        "action": {"type": "string", "enum": sorted(names)},
+                        "target": {"type": "string"},
+                        "path": {"type": "string"},
+                        "extra": extra,
+                    },
+                    "required": top_required,
+                })
+            self._schema = {"anyOf": branches}
+        return self._schema
@@ -0,0 +1,128 @@
+"""
+Executable Index
+Maps application names to the program that launches them, so "open
+spotify" does not walk Program Files and AppData on every request.
+
+The .exe files under Program Files, Program Files (x86), AppData and the
+Start Menu shortcuts (.lnk) are kept in a FileCatalog: persisted in SQLite,
+crawled once in the background and refreshed incrementally (only folders
+whose mtime changed are listed again). Lookups go through an in-memory
+dictionary built from the catalog, rebuilt only after a crawl changed it:
+    "spotify.exe" / "spotify"   -> ...\\AppData\\Roaming\\Spotify\\Spotify.exe
+    "visual studio code"        -> ...\\Start Menu\\Programs\\Visual Studio Code.lnk
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+try:
+    from .file_catalog import EXCLUDED_DIRS, FileCatalog
+except ImportError:
+    from file_catalog import EXCLUDED_DIRS, FileCatalog
+
+
+# Large folders below AppData / Program Files that hold no launchable programs
+APP_EXCLUDED_DIRS = EXCLUDED_DIRS - {"appdata"} | {
+    "temp", "tmp", "cache", "caches", "code cache", "gpucache", "crashpad", "crashdumps", "logs",
+    "packages", "windowsapps", "installer", "package cache", "user data", "locales", "resources",
+}
+
+
+def default_app_roots() -> List[str]:
+    """Start Menu folders first (display names), then install locations."""
+    home = os.path.expanduser("~")
+    program_data = os.environ.get("ProgramData", r"C:\ProgramData")
+    roaming = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
+    local = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+    return [
+        os.path.join(program_data, "Microsoft", "Windows", "Start Menu", "Programs"),
+        os.path.join(roaming, "Microsoft", "Windows", "Start Menu", "Programs"),
+        os.environ.get("ProgramFiles", r"C:\Program Files"),
+        os.environ.get("ProgramFiles(x86)", r"C:\Program Files (x86)"),
+        os.path.join(local, "Programs"),
+        local,
+        roaming,
+    ]
+
+
+class AppIndex:
+    """
+    Lowercase exe names and shortcut display names -> paths.
+
+    Args:
+        path: SQLite file for the underlying catalog, or None for memory only
+        roots: Folders to index (default: default_app_roots())
+        max_depth: Folders deeper than this below a root are skipped; deep
+            enough for vendor\\product\\version\\bin layouts
+        refresh_interval: Seconds between background incremental crawls
+    """
+
+    # Installers and uninstallers share folders with the real program
+    IGNORED_PREFIXES = ("unins", "uninstall", "setup", "update")
+
+    def __init__(self, path: Optional[str] = None, roots: List[str] = None, max_depth: int = 8,
+                 refresh_interval: float = 3600.0):
+        self.catalog = FileCatalog(path=path, roots=roots or default_app_roots(), extensions=(".exe", ".lnk"),
+                                   excluded=APP_EXCLUDED_DIRS, max_depth=max_depth,
+                                   refresh_interval=refresh_interval)
+        self._lock = threading.Lock()
+        self._names: Dict[str, str] = {}
+        self._version = -1
+
+    @property
+    def ready(self) -> bool:
+        """True once the first crawl has completed (possibly in an earlier session)."""
+        return self.catalog.ready
+
+    def start(self):
+        """Crawl in the background (incrementally if the index was persisted)."""
+        self.catalog.start()
+
+    def refresh(self) -> int:
+        """Crawl now; returns the number of folders that had to be listed."""
+        return self.catalog.refresh()
+
+    def apply_events(self, events) -> int:
+        """Follow installs and uninstalls reported by an FsWatcher (see FileCatalog.apply_events)."""
+        return self.catalog.apply_events(events)
+
+    def _table(self) -> Dict[str, str]:
+        with self._lock:
+            if self._version != self.catalog.version:
+                names: Dict[str, str] = {}
+                for path, name, ext in self.catalog.files():
+                    if name.startswith(self.IGNORED_PREFIXES):
+                        continue
+                    # Shortcuts are known by their display name, programs by file name
+                    key = name[:-len(ext)] if ext == ".lnk" else name
+                    names.setdefault(key, path)
+                self._names = names
+                self._version = self.catalog.version
+            return self._names
+
+    def lookup(self, name: str) -> Optional[str]:
+        """
+        Path of the program for an exe name or display name.
+
+        Args:
+            name: "chrome.exe", "chrome", "Visual Studio Code", ...
+
+        Returns:
+            The .exe (or Start Menu .lnk) path, or None if it is not indexed
+        """
+        key = name.lower().strip()
+        if not key:
+            return None
+        names = self._table()
+        path = names.get(key)
+        if path is None and not key.endswith(".exe"):
+            path = names.get(key + ".exe")
+        return path
+
+    def __len__(self) -> int:
+        return len(self._table())
+
+    def close(self):
+        """Stop the background crawler."""
+        self.catalog.close()
@@ -0,0 +1,241 @@
+"""
+Backend Circuit Breaker
+Keeps a flaky or hung Ollama server from stalling every command.
+
+CircuitBreaker tracks the backend as closed (healthy), open (failing, calls
+skipped) or half_open (one trial call allowed to test recovery).
+AdaptiveTimeout sizes request timeouts from the observed p95 latency instead
+of a fixed 30 s. HealthProbe checks the server on a daemon thread, so
+recovery and outages are noticed without a user command paying for it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CircuitBreaker:
+    """
+    Thread-safe closed / open / half_open circuit breaker.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open after the last failure
+            before one trial call is let through
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 2, reset_timeout: float = 10.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, str, str], Any]] = []
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started = None
+        self.last_reason = ""
+
+    def add_listener(self, callback: Callable[[str, str, str], Any]):
+        """
+        Call callback(old_state, new_state, reason) on every state change.
+
+        Listeners run on the thread that caused the change, outside the lock.
+        """
+        self._listeners.append(callback)
+
+    def allow_request(self) -> bool:
+        """
+        Whether a call to the backend should be attempted now.
+
+        In half_open only one trial call is in flight at a time; its
+        record_success/record_failure decides the next state.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    return False
+                change = self._transition(self.HALF_OPEN, "reset timeout elapsed")
+            else:
+                change = None
+                # A trial that never reported back must not block recovery forever
+                if self.trial_started is not None and now - self.trial_started < self.reset_timeout:
+                    return False
+            self.trial_started = now
+        self._notify(change)
+        return True
+
+    def record_success(self, reason: str = "request succeeded"):
+        """Report a successful call or probe; closes the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.trial_started = None
+            change = self._transition(self.CLOSED, reason)
+        self._notify(change)
+
+    def record_failure(self, reason: str = "request failed"):
+        """
+        Report a failed call or probe; opens the circuit at the threshold or
+        after a failed trial. While open, a failure restarts the reset timeout.
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_reason = reason
+            change = None
+            if self.state != self.CLOSED or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.trial_started = None
+                change = self._transition(self.OPEN, reason)
+        self._notify(change)
+
+    def probe_succeeded(self):
+        """
+        Health probe reached the server: once the reset timeout has passed,
+        move open to half_open so the next command becomes the trial.
+
+        A reachable /api/tags does not prove generation works (a hung model
+        still answers it), so the probe never closes the circuit by itself.
+        """
+        with self._lock:
+            if self.state != self.OPEN or time.monotonic() - self.opened_at < self.reset_timeout:
+                return
+            self.trial_started = None
+            change = self._transition(self.HALF_OPEN, "health probe succeeded")
+        self._notify(change)
+
+    def _transition(self, new_state: str, reason: str):
+        """Change state (lock held); returns the change to notify, or None."""
+        if new_state == self.state:
+            return None
+        old_state, self.state = self.state, new_state
+        return old_state, new_state, reason
+
+    def _notify(self, change):
+        if change is None:
+            return
+        for callback in list(self._listeners):
+            try:
+                callback(*change)
+            except Exception as e:
+                print(f"⚠️  Circuit breaker listener failed: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state, consecutive failures and the last failure reason."""
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "last_reason": self.last_reason}
+
+
+class AdaptiveTimeout:
+    """
+    Request timeout derived from recent successful latencies.
+
+    Until min_samples calls have succeeded the initial timeout is used; after
+    that it is multiplier x p95, clamped to [minimum, maximum].
+
+    Args:
+        initial: Timeout in seconds before enough samples exist
+        minimum: Lower bound in seconds
+        maximum: Upper bound in seconds
+        multiplier: Headroom over the observed p95
+        window: Number of recent latencies kept
+        min_samples: Samples needed before adapting
+    """
+
+    def __init__(self, initial: float = 15.0, minimum: float = 2.0, maximum: float = 30.0,
+                 multiplier: float = 3.0, window: int = 50, min_samples: int = 5):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, latency_s: float):
+        """Add the latency of a successful call in seconds."""
+        with self._lock:
+            self._samples.append(latency_s)
+
+    def p95(self) -> Optional[float]:
+        """p95 of the recent latencies, or None without any samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))]
+
+    def current(self) -> float:
+        """The timeout to use for the next call, in seconds."""
+        with self._lock:
+            count = len(self._samples)
+        if count < self.min_samples:
+            return self.initial
+        return min(self.maximum, max(self.minimum, self.multiplier * self.p95()))
+
+
+class HealthProbe:
+    """
+    Background health check feeding a CircuitBreaker.
+
+    Runs check() once immediately and then every interval seconds (every
+    open_interval seconds while the circuit is not closed or has recent
+    failures). A check that returns counts as healthy; one that raises
+    counts as a failure.
+
+    Args:
+        check: Callable that raises when the backend is unhealthy
+        breaker: The circuit breaker to update
+        interval: Seconds between probes while closed
+        open_interval: Seconds between probes while open or half_open
+    """
+
+    def __init__(self, check: Callable[[], Any], breaker: CircuitBreaker,
+                 interval: float = 30.0, open_interval: float = 3.0):
+        self.check = check
+        self.breaker = breaker
+        self.interval = interval
+        self.open_interval = open_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start probing on a daemon thread; no-op if already running."""
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-health-probe", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop probing (returns without waiting for an in-flight check)."""
+        self._stop.set()
+
+    def probe_once(self) -> bool:
+        """Run one check and update the breaker; returns True if healthy."""
+        try:
+            self.check()
+        except Exception as e:
+            self.breaker.record_failure(f"health probe failed: {type(e).__name__}")
+            return False
+        if self.breaker.state == CircuitBreaker.OPEN:
+            self.breaker.probe_succeeded()
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.probe_once()
+            healthy = self.breaker.state == CircuitBreaker.CLOSED and self.breaker.failures == 0
+            self._stop.wait(self.interval if healthy else self.open_interval)
@@ -8,7 +8,9 @@ import subprocess
 import shutil
 import json
 import ctypes
-from typing import Dict, Any, Optional, Tuple
+import threading
+import time
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
 from datetime import datetime
 
 # Try to import pyautogui for keyboard/mouse actions
@@ -27,15 +29,142 @@ try:
 except ImportError:
     WIN32_AVAILABLE = False
 
+try:
+    from .action_metrics import ActionMetrics
+    from .action_registry import ActionRegistry, ActionSpec
+    from .path_resolver import PathResolver
+    from .file_catalog import FileCatalog
+    from .app_index import APP_EXCLUDED_DIRS, AppIndex
+    from .dir_scanner import DirScanner
+    from .execution_pool import ExecutionPool, TaskCancelled, TaskFuture, current_task
+    from .frecency import FrecencyStore
+    from .fs_watcher import FsWatcher
+    from .shell_pool import ShellPool
+    from .storage import data_path
+except ImportError:
+    from action_metrics import ActionMetrics
+    from action_registry import ActionRegistry, ActionSpec
+    from path_resolver import PathResolver
+    from file_catalog import FileCatalog
+    from app_index import APP_EXCLUDED_DIRS, AppIndex
+    from dir_scanner import DirScanner
+    from execution_pool import ExecutionPool, TaskCancelled, TaskFuture, current_task
+    from frecency import FrecencyStore
+    from fs_watcher import FsWatcher
+    from shell_pool import ShellPool
+    from storage import data_path
+
 
 class CommandExecutor:
     """
     Executes structured Windows commands.
     """
     
-    def __init__(self):
+    # Every action: handler, required arguments, extra key types, timeout and
+    # lane: concurrent=True only for independent queries; UI, input and file
+    # actions keep their order. Commands are validated against this before
+    # dispatch, and the generator builds the LLM's JSON schema from it
+    ACTIONS = ActionRegistry([
+        ActionSpec("open_app", "_open_app", requires=["target"], timeout=10.0),
+        ActionSpec("open_file", "_open_file", requires=["path"]),
+        ActionSpec("open_file_by_name", "_open_file_by_name", requires=["target"],
+                   extra={"extension": str, "fallback": dict, "create": bool, "app": str},
+                   timeout=10.0),
+        ActionSpec("open_folder", "_open_folder", requires=["path"]),
+        ActionSpec("search", "_search", timeout=10.0, concurrent=True),
+        ActionSpec("search_and_open", "_search_and_open", timeout=10.0),
+        ActionSpec("create_file", "_create_file", requires=["path"], extra={"content": str}),
+        ActionSpec("create_and_open_file", "_create_and_open_file", requires=["path"], extra={"app": str}),
+        ActionSpec("create_folder", "_create_folder", requires=["path"]),
+        ActionSpec("delete", "_delete", requires=["path"], timeout=30.0),
+        ActionSpec("move", "_move", requires=["path", "extra.destination"], extra={"destination": str},
+                   timeout=60.0),
+        ActionSpec("rename", "_rename", requires=["path", "extra.new_name"], extra={"new_name": str}),
+        ActionSpec("copy", "_copy", requires=["path", "extra.destination"], extra={"destination": str},
+                   timeout=60.0),
+        ActionSpec("maximize_window", "_maximize_window", timeout=2.0),
+        ActionSpec("minimize_window", "_minimize_window", timeout=2.0),
+        ActionSpec("close_window", "_close_window", timeout=2.0),
+        ActionSpec("switch_window", "_switch_window", requires=["target"], timeout=2.0),
+        ActionSpec("run_command", "_run_command", requires=["extra.command"], extra={"command": str},
+                   timeout=30.0, concurrent=True),
+        ActionSpec("open_control_panel", "_open_control_panel"),
+        ActionSpec("open_settings", "_open_settings"),
+        ActionSpec("task_manager", "_task_manager"),
+        ActionSpec("keyboard_action", "_keyboard_action", requires=["extra.keys"], extra={"keys": list},
+                   timeout=2.0),
+        ActionSpec("mouse_action", "_mouse_action", extra={"action": str, "x": float, "y": float}, timeout=2.0),
+        ActionSpec("volume_up", "_volume_up", extra={"amount": int}, timeout=2.0),
+        ActionSpec("volume_down", "_volume_down", extra={"amount": int}, timeout=2.0),
+        ActionSpec("mute", "_mute", timeout=2.0),
+        ActionSpec("screenshot", "_screenshot", extra={"save_path": str}),
+        ActionSpec("lock_screen", "_lock_screen"),
+        ActionSpec("shutdown", "_shutdown", extra={"delay": int}),
+        ActionSpec("restart", "_restart", extra={"delay": int}),
+        ActionSpec("sleep", "_sleep"),
+        ActionSpec("system_info", "_system_info", extra={"type": str}, timeout=15.0, concurrent=True),
+        ActionSpec("web_search", "_web_search", requires=["target|extra.query"],
+                   extra={"query": str, "browser": str}),
+        # Advanced FRIDAY controls
+        ActionSpec("brightness_up", "_brightness_up", extra={"amount": float}, timeout=10.0),
+        ActionSpec("brightness_down", "_brightness_down", extra={"amount": float}, timeout=10.0),
+        ActionSpec("set_brightness", "_set_brightness", extra={"level": float}, timeout=10.0),
+        ActionSpec("wifi_toggle", "_wifi_toggle", extra={"state": str}, timeout=10.0),
+        ActionSpec("bluetooth_toggle", "_bluetooth_toggle", extra={"state": str}),
+        ActionSpec("kill_process", "_kill_process", requires=["target"], timeout=10.0),
+        ActionSpec("list_processes", "_list_processes", extra={"count": int}, timeout=15.0, concurrent=True),
+        ActionSpec("media_play_pause", "_media_play_pause", timeout=2.0),
+        ActionSpec("media_next", "_media_next", timeout=2.0),
+        ActionSpec("media_previous", "_media_previous", timeout=2.0),
+        ActionSpec("media_stop", "_media_stop", timeout=2.0),
+        ActionSpec("open_url", "_open_url", requires=["target|extra.url"], extra={"url": str}),
+        ActionSpec("new_tab", "_new_tab", timeout=2.0),
+        ActionSpec("close_tab", "_close_tab", timeout=2.0),
+        ActionSpec("refresh_page", "_refresh_page", timeout=2.0),
+        ActionSpec("empty_recycle_bin", "_empty_recycle_bin", timeout=30.0),
+        ActionSpec("show_desktop", "_show_desktop", timeout=2.0),
+        ActionSpec("open_emoji_picker", "_open_emoji_picker", timeout=2.0),
+        ActionSpec("open_clipboard_history", "_open_clipboard_history", timeout=2.0),
+        ActionSpec("night_light_toggle", "_night_light_toggle"),
+        ActionSpec("airplane_mode_toggle", "_airplane_mode_toggle"),
+        ActionSpec("type_text", "_type_text", requires=["target|extra.text"], extra={"text": str},
+                   timeout=30.0),
+        ActionSpec("voice_typing", "_voice_typing", timeout=2.0),
+        ActionSpec("scroll", "_scroll", extra={"direction": str, "amount": int}, timeout=2.0),
+        ActionSpec("click", "_click", extra={"button": str, "clicks": int, "x": float, "y": float}, timeout=2.0),
+    ])
+    
+    # Seconds a disk walk may take before falling back / giving up
+    FILE_SEARCH_DEADLINE = 3.0
+    APP_SEARCH_DEADLINE = 3.0
+    # Seconds between the catalogs' safety-net crawls while the file watcher keeps them current
+    WATCHED_REFRESH_INTERVAL = 3600.0
+    # Threads for concurrent actions, and child processes they may run at once
+    MAX_WORKERS = 4
+    MAX_PROCESSES = 2
+    
+    def __init__(self, use_file_catalog: bool = True, use_app_index: bool = True, use_frecency: bool = True,
+                 use_fs_watcher: bool = True, use_shell_pool: bool = True):
+        """
+        Args:
+            use_file_catalog: Index the home folder in the background so file
+                lookups and searches are answered from the catalog
+            use_app_index: Index installed programs in the background so
+                unknown apps are found without walking Program Files
+            use_frecency: Remember what is opened, so ambiguous names go to
+                the files, folders and apps the user opens most
+            use_fs_watcher: Watch the indexed folders, so created, deleted and
+                moved files reach the catalogs and frecency as they happen
+            use_shell_pool: Answer PowerShell queries from long-lived
+                sessions instead of starting PowerShell for each one
+        """
         self.username = os.environ.get("USERNAME", "User")
         self.user_home = os.path.expanduser("~")
+        self.metrics = ActionMetrics()
+        # submit() runs commands here; handlers start child processes through it
+        self.pool = ExecutionPool(max_workers=self.MAX_WORKERS, max_processes=self.MAX_PROCESSES)
+        # PowerShell sessions, started on first use (or by shells.warm())
+        self.shells = ShellPool("powershell", size=self.MAX_PROCESSES) if use_shell_pool else None
         
         # Common application paths
         self.app_paths = {
@@ -77,6 +206,98 @@ class CommandExecutor:
             "osk.exe": "osk",  # On-screen keyboard
         }
         
+        # Persistent file index, crawled in the background; until its first
+        # crawl finishes, lookups walk the disk as before
+        self.file_catalog = None
+        if use_file_catalog:
+            try:
+                self.file_catalog = FileCatalog(path=data_path("file_catalog.sqlite3"))
+            except OSError as e:
+                print(f"⚠️  File catalog disabled: {e}")
+            else:
+                self.file_catalog.start()
+        
+        # Files, folders and apps opened before, ranked by frequency and recency
+        self.frecency = None
+        if use_frecency:
+            try:
+                self.frecency = FrecencyStore(path=data_path("frecency.sqlite3"))
+            except OSError as e:
+                print(f"⚠️  Frecency ranking disabled: {e}")
+        
+        # File-name lookups run off the parsing thread, with a deadline
+        self.path_resolver = PathResolver(catalog=self.file_catalog, frecency=self.frecency)
+        
+        # Installed programs by exe and display name, crawled in the background
+        self.app_index = None
+        if use_app_index:
+            try:
+                self.app_index = AppIndex(path=data_path("app_index.sqlite3"))
+            except OSError as e:
+                print(f"⚠️  App index disabled: {e}")
+            else:
+                self.app_index.start()
+        
+        # Bounded parallel walks for when neither index can answer yet
+        self.file_scanner = DirScanner()
+        self.app_scanner = DirScanner(excluded=APP_EXCLUDED_DIRS)
+        
+        # Changes below the indexed folders, applied to the path caches as
+        # they happen; the periodic crawls only catch what the watcher missed
+        self.fs_watcher = None
+        self._path_listeners = []
+        if use_fs_watcher and (self.file_catalog is not None or self.app_index is not None):
+            self.fs_watcher = FsWatcher()
+            app_catalog = self.app_index.catalog if self.app_index is not None else None
+            for catalog in (self.file_catalog, app_catalog):
+                if catalog is not None:
+                    for root in catalog.roots:
+                        self.fs_watcher.add_root(root, catalog.excluded)
+                    catalog.refresh_interval = max(catalog.refresh_interval, self.WATCHED_REFRESH_INTERVAL)
+            self.fs_watcher.add_listener(self._on_fs_events)
+            self.fs_watcher.start()
+    
+    def prepare(self, command: Dict[str, Any]):
+        """
+        Start any slow lookups a command needs, so they overlap with the
+        spoken acknowledgement; execute() then picks up the running search.
+        """
+        if command and command.get("action") == "open_file_by_name" and command.get("target"):
+            extra = command.get("extra") or {}
+            self.path_resolver.resolve(command["target"], extra.get("extension") or None)
+    
+    def add_path_listener(self, listener):
+        """
+        Also pass the file watcher's batches of FsEvents to listener (e.g. to
+        drop cached commands that name a deleted file). Called on the
+        watcher thread, after the executor's own caches were updated.
+        """
+        self._path_listeners.append(listener)
+    
+    def _on_fs_events(self, events):
+        """Apply a batch of file system changes to the catalogs and frecency."""
+        caches = [cache for cache in (self.file_catalog, self.app_index, self.frecency) if cache is not None]
+        for update in [cache.apply_events for cache in caches] + self._path_listeners:
+            try:
+                update(events)
+            except Exception as e:
+                print(f"⚠️  Could not apply file changes: {e}")
+    
+    def close(self):
+        """Cancel pending lookups and stop the catalog crawler."""
+        self.pool.close()
+        if self.shells is not None:
+            self.shells.close()
+        self.path_resolver.close()
+        if self.fs_watcher is not None:
+            self.fs_watcher.close()
+        if self.file_catalog is not None:
+            self.file_catalog.close()
+        if self.app_index is not None:
+            self.app_index.close()
+        if self.frecency is not None:
+            self.frecency.close()
+        
     def execute(self, command: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Execute a structured command.
@@ -90,87 +311,100 @@ class CommandExecutor:
         if not command or "action" not in command:
             return False, "Invalid command: missing 'action' field"
         
-        action = command.get("action", "").lower()
-        
-        # Map actions to handler methods
-        handlers = {
-            "open_app": self._open_app,
-            "open_file": self._open_file,
-            "open_folder": self._open_folder,
-            "search": self._search,
-            "search_and_open": self._search_and_open,
-            "create_file": self._create_file,
-            "create_and_open_file": self._create_and_open_file,
-            "create_folder": self._create_folder,
-            "delete": self._delete,
-            "move": self._move,
-            "rename": self._rename,
-            "copy": self._copy,
-            "maximize_window": self._maximize_window,
-            "minimize_window": self._minimize_window,
-            "close_window": self._close_window,
-            "switch_window": self._switch_window,
-            "run_command": self._run_command,
-            "open_control_panel": self._open_control_panel,
-            "open_settings": self._open_settings,
-            "task_manager": self._task_manager,
-            "keyboard_action": self._keyboard_action,
-            "mouse_action": self._mouse_action,
-            "volume_up": self._volume_up,
-            "volume_down": self._volume_down,
-            "mute": self._mute,
-            "screenshot": self._screenshot,
-            "lock_screen": self._lock_screen,
-            "shutdown": self._shutdown,
-            "restart": self._restart,
-            "sleep": self._sleep,
-            "system_info": self._system_info,
-            "web_search": self._web_search,
-            # Advanced FRIDAY controls
-            "brightness_up": self._brightness_up,
-            "brightness_down": self._brightness_down,
-            "set_brightness": self._set_brightness,
-            "wifi_toggle": self._wifi_toggle,
-            "bluetooth_toggle": self._bluetooth_toggle,
-            "kill_process": self._kill_process,
-            "list_processes": self._list_processes,
-            "media_play_pause": self._media_play_pause,
-            "media_next": self._media_next,
-            "media_previous": self._media_previous,
-            "media_stop": self._media_stop,
-            "open_url": self._open_url,
-            "new_tab": self._new_tab,
-            "close_tab": self._close_tab,
-            "refresh_page": self._refresh_page,
-            "empty_recycle_bin": self._empty_recycle_bin,
-            "show_desktop": self._show_desktop,
-            "open_emoji_picker": self._open_emoji_picker,
-            "open_clipboard_history": self._open_clipboard_history,
-            "night_light_toggle": self._night_light_toggle,
-            "airplane_mode_toggle": self._airplane_mode_toggle,
-            "type_text": self._type_text,
-            "voice_typing": self._voice_typing,
-            "scroll": self._scroll,
-            "click": self._click,
-        }
+        action = str(command.get("action") or "").lower()
         
-        handler = handlers.get(action)
-        if not handler:
+        spec = self.ACTIONS.get(action)
+        if spec is None:
             return False, f"Unknown action: {action}"
         
+        return self._dispatch(spec, command, getattr(self, spec.handler))
+    
+    def submit(self, command: Dict[str, Any],
+               on_result: Callable[[int, str, float], None] = None) -> TaskFuture:
+        """
+        Execute a command on the execution pool without waiting for it.
+        UI, input and file actions run one at a time in submission order;
+        independent queries (ActionSpec.concurrent) run in parallel. Each
+        runs within its declared timeout.
+        
+        Args:
+            command: The command dict with action, target, path, extra
+            on_result: For search_and_open, called with (rank, path, elapsed_ms)
+                for every match, as in execute_search()
+            
+        Returns:
+            Future of (success: bool, message: str); future.cancel() stops a
+            running command at its next cancellation point
+        """
+        action = str((command or {}).get("action") or "").lower()
+        spec = self.ACTIONS.get(action)
+        if spec is None:
+            future = TaskFuture(self.pool, action, None, None)
+            future.set_result(self.execute(command))
+            return future
+        
+        if on_result is not None and action == "search_and_open":
+            task = lambda: self.execute_search(command, on_result)
+        else:
+            task = lambda: self.execute(command)
+        return self.pool.submit(task, name=action, timeout=spec.timeout, concurrent=spec.concurrent,
+                                on_stop=lambda reason: (False, f"{action} {reason}"))
+    
+    def _dispatch(self, spec: ActionSpec, command: Dict[str, Any],
+                  handler: Callable[[Dict[str, Any]], Tuple[bool, str]]) -> Tuple[bool, str]:
+        """Validate a command's arguments, run its handler and record the outcome."""
+        error = spec.validate(command)
+        if error is not None:
+            self.metrics.record(spec.name, "invalid")
+            return False, f"Invalid {spec.name} command: {error}"
+        
+        start = time.perf_counter()
         try:
-            return handler(command)
+            success, message = handler(command)
+            outcome = "ok" if success else "failed"
+        except TaskCancelled:
+            success, message = False, f"{spec.name} cancelled"
+            outcome = "cancelled"
+        except subprocess.TimeoutExpired as e:
+            success, message = False, f"{spec.name} timed out after {e.timeout:g}s"
+            outcome = "timeout"
         except Exception as e:
-            return False, f"Error executing {action}: {str(e)}"
+            success, message = False, f"Error executing {spec.name}: {str(e)}"
+            outcome = "error"
+        elapsed = time.perf_counter() - start
+        self.metrics.record(spec.name, outcome, elapsed * 1000, slow=elapsed > spec.timeout)
+        return success, message
     
-    def _find_app_path(self, app_name: str) -> Optional[str]:
-        """Find the full path to an application."""
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-action calls, failures, rejected commands and latency (see ActionMetrics.snapshot)."""
+        return self.metrics.snapshot()
+    
+    def _find_app_path(self, app_name: str, search: bool = True) -> Optional[str]:
+        """
+        Find the full path to an application.
+        
+        Args:
+            app_name: Exe name ("chrome.exe") or display name
+            search: Walk the install folders if the app index is not ready yet
+        """
         app_name_lower = app_name.lower()
         
         # Check if it's a system app
         if app_name_lower in self.system_apps:
             return self.system_apps[app_name_lower]
         
+        # The program this name opened before
+        if self.frecency is not None:
+            path = self.frecency.best(app_name_lower, "app")
+            if path and os.path.exists(path):
+                return path
+        
+        # Installed programs and Start Menu shortcuts
+        if self.app_index is not None:
+            path = self.app_index.lookup(app_name_lower)
+            if path and os.path.exists(path):
+                return path
+        
         # Check known paths
         if app_name_lower in self.app_paths:
             for path in self.app_paths[app_name_lower]:
@@ -182,6 +416,10 @@ class CommandExecutor:
         if result:
             return result
         
+        # The index has seen every install location; walk only until it is ready
+        if not search or (self.app_index is not None and self.app_index.ready):
+            return None
+        
         # Try common install locations
         program_files = [
             os.environ.get("ProgramFiles", r"C:\Program Files"),
@@ -190,16 +428,18 @@ class CommandExecutor:
             os.path.join(self.user_home, "AppData", "Local", "Programs"),
         ]
         
-        for pf in program_files:
-            for root, dirs, files in os.walk(pf):
-                if app_name_lower in [f.lower() for f in files]:
-                    return os.path.join(root, app_name)
-                # Limit depth to avoid long searches
-                if root.count(os.sep) - pf.count(os.sep) > 3:
-                    break
+        # Limit depth to avoid long searches; the first match ends the walk
+        for path in self.app_scanner.scan(program_files, app_name_lower, max_results=1,
+                                          deadline=self.APP_SEARCH_DEADLINE, max_depth=4):
+            return path
         
         return None
     
+    def _remember(self, path: str, kind: str, name: str = None):
+        """Count an open towards frecency (programs only when they are real paths)."""
+        if self.frecency is not None and os.path.exists(path):
+            self.frecency.record(path, kind, name)
+    
     def _open_app(self, cmd: Dict) -> Tuple[bool, str]:
         """Open an application."""
         target = cmd.get("target", "")
@@ -217,6 +457,7 @@ class CommandExecutor:
         
         if app_path:
             subprocess.Popen([app_path], shell=True)
+            self._remember(app_path, "app", target)
             return True, f"Opened {target}"
         else:
             # Try running directly (might work for some apps)
@@ -240,8 +481,36 @@ class CommandExecutor:
             return False, f"File not found: {path}"
         
         os.startfile(path)
+        self._remember(path, "file")
         return True, f"Opened {path}"
     
+    def _open_file_by_name(self, cmd: Dict) -> Tuple[bool, str]:
+        """
+        Open a file known only by its spoken name (target, extra.extension).
+        If no file matches before the deadline, extra.fallback (a command)
+        is executed instead, or with extra.create the file is created on the
+        Desktop and opened in extra.app.
+        """
+        name = cmd.get("target", "")
+        extra = cmd.get("extra") or {}
+        extension = extra.get("extension") or None
+        
+        if not name:
+            return False, "No file name specified"
+        
+        path = self.path_resolver.resolve(name, extension).result()
+        if path:
+            return self._open_file({"path": path})
+        
+        fallback = extra.get("fallback")
+        if isinstance(fallback, dict) and fallback.get("action") != "open_file_by_name":
+            return self.execute(fallback)
+        if extra.get("create"):
+            filename = name if "." in name else f"{name}{extension or '.txt'}"
+            path = os.path.join(self.user_home, "Desktop", filename)
+            return self._create_and_open_file({"path": path, "extra": {"app": extra.get("app", "notepad.exe")}})
+        return False, f"File not found: {name}{extension or ''}"
+    
     def _open_folder(self, cmd: Dict) -> Tuple[bool, str]:
         """Open a folder in Explorer."""
         path = cmd.get("path", "")
@@ -255,6 +524,7 @@ class CommandExecutor:
             return False, f"Folder not found: {path}"
         
         subprocess.Popen(["explorer", path])
+        self._remember(path, "folder")
         return True, f"Opened folder: {path}"
     
     def _search(self, cmd: Dict) -> Tuple[bool, str]:
@@ -267,21 +537,76 @@ class CommandExecutor:
         subprocess.Popen(search_cmd, shell=True)
         return True, f"Searching for '{target}' in {path}"
     
-    def _search_and_open(self, cmd: Dict) -> Tuple[bool, str]:
+    def search_files(self, target: str, path: str = None, max_results: int = 10,
+                     cancel: Optional[threading.Event] = None) -> Iterator[Tuple[int, str, float]]:
+        """
+        Files matching a glob pattern, as they are found.
+        
+        Args:
+            target: Glob pattern for the name ("*.pdf", "*report*")
+            path: Folder to search below (default: home)
+            max_results: Stop after this many matches
+            cancel: Setting this event stops the search
+            
+        Yields:
+            Tuples of (rank, path, milliseconds since the search started);
+            rank is 1 for the first match found
+        """
+        path = path or self.user_home
+        start = time.perf_counter()
+        if self.file_catalog is not None and self.file_catalog.ready and self.file_catalog.covers(path):
+            matches = (m for m in self.file_catalog.search(target, path, limit=max_results) if os.path.exists(m))
+        else:
+            matches = self.file_scanner.scan([path], target, max_results=max_results,
+                                             deadline=self.FILE_SEARCH_DEADLINE, cancel=cancel)
+        for rank, match in enumerate(matches, 1):
+            if cancel is not None and cancel.is_set():
+                break
+            yield rank, match, (time.perf_counter() - start) * 1000
+    
+    def execute_search(self, command: Dict[str, Any], on_result: Callable[[int, str, float], None],
+                       cancel: Optional[threading.Event] = None) -> Tuple[bool, str]:
+        """
+        Execute a search_and_open command, reporting matches as they are found.
+        
+        Args:
+            command: The search_and_open command
+            on_result: Called with (rank, path, elapsed_ms) for every match,
+                on the thread running the search
+            cancel: Setting this event stops the search; nothing is opened
+                (default: the cancel event of the pool task running it)
+            
+        Returns:
+            Tuple of (success: bool, message: str)
+        """
+        return self._dispatch(self.ACTIONS.get("search_and_open"), command,
+                              lambda cmd: self._search_and_open(cmd, on_result, cancel))
+    
+    def _search_and_open(self, cmd: Dict, on_result: Callable[[int, str, float], None] = None,
+                         cancel: Optional[threading.Event] = None) -> Tuple[bool, str]:
         """Search for files and open the first match."""
-        import glob
+        if cancel is None and current_task() is not None:
+            cancel = current_task().cancel_event
         target = cmd.get("target", "*")
         path = cmd.get("path", self.user_home)
         
         # Search for files
-        search_pattern = os.path.join(path, "**", target)
         try:
-            matches = list(glob.glob(search_pattern, recursive=True))[:10]  # Limit to 10
+            matches = []
+            for rank, match, elapsed_ms in self.search_files(target, path, max_results=10, cancel=cancel):  # Limit to 10
+                matches.append(match)
+                if on_result is not None:
+                    on_result(rank, match, elapsed_ms)
+            if cancel is not None and cancel.is_set():
+                return False, f"Search for '{target}' cancelled ({len(matches)} found)"
             
             if matches:
-                # Open the first match
+                # Open the match the user opens most
+                if self.frecency is not None:
+                    matches = self.frecency.rank(matches)
                 first_match = matches[0]
                 os.startfile(first_match)
+                self._remember(first_match, "folder" if os.path.isdir(first_match) else "file")
                 
                 if len(matches) > 1:
                     return True, f"Opened: {first_match} (found {len(matches)} matches)"
@@ -493,13 +818,21 @@ class CommandExecutor:
         if not command:
             return False, "No command specified"
         
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        result = self.pool.run_process(command, shell=True, capture_output=True, text=True,
+                                       timeout=self.ACTIONS.get("run_command").timeout)
         
         if result.returncode == 0:
             return True, f"Command executed: {command}"
         else:
             return False, f"Command failed: {result.stderr}"
-    
+
+    def _powershell(self, script: str, timeout: float) -> subprocess.CompletedProcess:
+        """Run a PowerShell query on a pooled session, or in a new PowerShell process without the pool."""
+        if self.shells is not None:
+            return self.shells.run(script, timeout=timeout)
+        return self.pool.run_process(["powershell", "-Command", script], capture_output=True, text=True,
+                                     timeout=timeout)
+
     def _open_control_panel(self, cmd: Dict) -> Tuple[bool, str]:
         """Open Control Panel."""
         target = cmd.get("target", "main")
@@ -672,24 +1005,19 @@ class CommandExecutor:
         results = []
         
         if info_type in ["battery", "general", "all"]:
-            # Get battery info using PowerShell
+            # Get battery info using PowerShell: charge, then whether it is plugged in
             try:
-                result = subprocess.run(
-                    ["powershell", "-Command", 
-                     "(Get-WmiObject Win32_Battery).EstimatedChargeRemaining"],
-                    capture_output=True, text=True, timeout=5
+                result = self._powershell(
+                    "$battery = Get-WmiObject Win32_Battery | Select-Object -First 1; "
+                    "$battery.EstimatedChargeRemaining; $battery.BatteryStatus",
+                    timeout=5
                 )
-                battery_percent = result.stdout.strip()
+                lines = result.stdout.split()
+                battery_percent = lines[0] if lines else ""
                 if battery_percent:
                     results.append(f"🔋 Battery: {battery_percent}%")
                     
-                    # Check if plugged in
-                    result2 = subprocess.run(
-                        ["powershell", "-Command",
-                         "(Get-WmiObject Win32_Battery).BatteryStatus"],
-                        capture_output=True, text=True, timeout=5
-                    )
-                    status = result2.stdout.strip()
+                    status = lines[1] if len(lines) > 1 else ""
                     if status == "2":
                         results.append("⚡ Status: Charging")
                     elif status == "1":
@@ -706,10 +1034,9 @@ class CommandExecutor:
         
         if info_type in ["memory", "ram", "all"]:
             try:
-                result = subprocess.run(
-                    ["powershell", "-Command",
-                     "Get-WmiObject Win32_OperatingSystem | Select-Object -Property FreePhysicalMemory,TotalVisibleMemorySize"],
-                    capture_output=True, text=True, timeout=5
+                result = self._powershell(
+                    "Get-WmiObject Win32_OperatingSystem | Select-Object -Property FreePhysicalMemory,TotalVisibleMemorySize",
+                    timeout=5
                 )
                 results.append(f"💾 Memory info retrieved")
             except Exception:
@@ -717,10 +1044,9 @@ class CommandExecutor:
         
         if info_type in ["disk", "storage", "all"]:
             try:
-                result = subprocess.run(
-                    ["powershell", "-Command",
-                     "Get-WmiObject Win32_LogicalDisk -Filter 'DeviceID=\"C:\"' | Select-Object -Property FreeSpace,Size"],
-                    capture_output=True, text=True, timeout=5
+                result = self._powershell(
+                    "Get-WmiObject Win32_LogicalDisk -Filter 'DeviceID=\"C:\"' | Select-Object -Property FreeSpace,Size",
+                    timeout=5
                 )
                 results.append(f"💿 Disk info retrieved")
             except Exception:
@@ -755,21 +1081,7 @@ class CommandExecutor:
         search_url = f"https://www.google.com/search?q={encoded_query}"
         
         # Try to find browser
-        browser_paths = {
-            "chrome": [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                os.path.join(self.user_home, r"AppData\Local\Google\Chrome\Application\chrome.exe"),
-            ],
-            "edge": [
-                r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-                r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-            ],
-            "firefox": [
-                r"C:\Program Files\Mozilla Firefox\firefox.exe",
-                r"C:\Program Files (x86)\Mozilla Firefox\firefox.exe",
-            ],
-        }
+        browser_exes = {"chrome": "chrome.exe", "edge": "msedge.exe", "firefox": "firefox.exe"}
         
         browser_key = browser.lower().replace("google", "").strip()
         if "chrome" in browser_key or browser_key == "":
@@ -779,12 +1091,13 @@ class CommandExecutor:
         elif "firefox" in browser_key:
             browser_key = "firefox"
         
-        paths = browser_paths.get(browser_key, browser_paths["chrome"])
+        browser_key = browser_key if browser_key in browser_exes else "chrome"
         
-        for path in paths:
-            if os.path.exists(path):
-                subprocess.Popen([path, search_url])
-                return True, f"Searching for '{query}' in {browser_key}"
+        # App index, then the known install paths; never walk the disk here
+        path = self._find_app_path(browser_exes[browser_key], search=False)
+        if path:
+            subprocess.Popen([path, search_url])
+            return True, f"Searching for '{query}' in {browser_key}"
         
         # Fallback to default browser
         os.startfile(search_url)
@@ -797,11 +1110,10 @@ class CommandExecutor:
         extra = cmd.get("extra", {})
         amount = extra.get("amount", 10) if isinstance(extra, dict) else 10
         try:
-            subprocess.run(
-                ["powershell", "-Command",
-                 f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, "
-                 f"[Math]::Min(100, (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness).CurrentBrightness + {amount}))"],
-                capture_output=True, timeout=5
+            self._powershell(
+                f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, "
+                f"[Math]::Min(100, (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness).CurrentBrightness + {amount}))",
+                timeout=5
             )
             return True, f"Brightness increased by {amount}%"
         except Exception as e:
@@ -813,11 +1125,10 @@ class CommandExecutor:
         extra = cmd.get("extra", {})
         amount = extra.get("amount", 10) if isinstance(extra, dict) else 10
         try:
-            subprocess.run(
-                ["powershell", "-Command",
-                 f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, "
-                 f"[Math]::Max(0, (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness).CurrentBrightness - {amount}))"],
-                capture_output=True, timeout=5
+            self._powershell(
+                f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, "
+                f"[Math]::Max(0, (Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightness).CurrentBrightness - {amount}))",
+                timeout=5
             )
             return True, f"Brightness decreased by {amount}%"
         except Exception as e:
@@ -829,10 +1140,9 @@ class CommandExecutor:
         level = extra.get("level", 50) if isinstance(extra, dict) else 50
         level = max(0, min(100, level))
         try:
-            subprocess.run(
-                ["powershell", "-Command",
-                 f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {level})"],
-                capture_output=True, timeout=5
+            self._powershell(
+                f"(Get-WmiObject -Namespace root/WMI -Class WmiMonitorBrightnessMethods).WmiSetBrightness(1, {level})",
+                timeout=5
             )
             return True, f"Brightness set to {level}%"
         except Exception as e:
@@ -845,24 +1155,24 @@ class CommandExecutor:
         
         try:
             if state == "on":
-                subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"], 
-                             capture_output=True, timeout=5)
+                self.pool.run_process(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"], 
+                                    capture_output=True, timeout=5)
                 return True, "WiFi enabled"
             elif state == "off":
-                subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"],
-                             capture_output=True, timeout=5)
+                self.pool.run_process(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"],
+                                    capture_output=True, timeout=5)
                 return True, "WiFi disabled"
             else:
                 # Toggle - check current state first
-                result = subprocess.run(["netsh", "interface", "show", "interface", "Wi-Fi"],
-                                       capture_output=True, text=True, timeout=5)
+                result = self.pool.run_process(["netsh", "interface", "show", "interface", "Wi-Fi"],
+                                              capture_output=True, text=True, timeout=5)
                 if "Enabled" in result.stdout:
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"],
-                                 capture_output=True, timeout=5)
+                    self.pool.run_process(["netsh", "interface", "set", "interface", "Wi-Fi", "disabled"],
+                                        capture_output=True, timeout=5)
                     return True, "WiFi disabled"
                 else:
-                    subprocess.run(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"],
-                                 capture_output=True, timeout=5)
+                    self.pool.run_process(["netsh", "interface", "set", "interface", "Wi-Fi", "enabled"],
+                                        capture_output=True, timeout=5)
                     return True, "WiFi enabled"
         except Exception as e:
             return False, f"Could not toggle WiFi: {e}"
@@ -890,8 +1200,8 @@ class CommandExecutor:
             target += ".exe"
         
         try:
-            result = subprocess.run(["taskkill", "/IM", target, "/F"],
-                                   capture_output=True, text=True, timeout=5)
+            result = self.pool.run_process(["taskkill", "/IM", target, "/F"],
+                                          capture_output=True, text=True, timeout=5)
             if result.returncode == 0:
                 return True, f"Process {target} terminated"
             else:
@@ -905,12 +1215,11 @@ class CommandExecutor:
         top_n = extra.get("count", 10) if isinstance(extra, dict) else 10
         
         try:
-            result = subprocess.run(
-                ["powershell", "-Command",
-                 f"Get-Process | Sort-Object WorkingSet64 -Descending | "
-                 f"Select-Object -First {top_n} Name,@{{Name='MemMB';Expression={{[math]::Round($_.WorkingSet64/1MB,0)}}}} | "
-                 "Format-Table -AutoSize"],
-                capture_output=True, text=True, timeout=10
+            result = self._powershell(
+                f"Get-Process | Sort-Object WorkingSet64 -Descending | "
+                f"Select-Object -First {top_n} Name,@{{Name='MemMB';Expression={{[math]::Round($_.WorkingSet64/1MB,0)}}}} | "
+                "Format-Table -AutoSize",
+                timeout=10
             )
             processes = result.stdout.strip()
             print(f"\n📊 Top {top_n} Running Processes:\n{processes}")
@@ -0,0 +1,121 @@
+"""
+Command Schema
+Validation of model output against the executor's action table.
+
+The structured-output schema sent as Ollama's "format" is generated by the
+action registry (ActionRegistry.json_schema()). CommandStreamValidator
+checks the streamed text as it arrives and rejects an unknown action as
+soon as its first wrong character shows up (for servers that ignore
+"format"), instead of waiting for a full round trip that would then fail
+to execute.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+
+class InvalidCommandError(ValueError):
+    """Model output that cannot become an executable command."""
+
+
+def validate_command(command: Any, actions) -> Optional[str]:
+    """
+    Check a parsed command against the action table.
+
+    Returns:
+        None if valid, otherwise the reason it is not
+    """
+    if not isinstance(command, dict):
+        return f"expected an object, got {type(command).__name__}"
+    action = command.get("action")
+    if not isinstance(action, str):
+        return "missing 'action'"
+    if action.lower() not in actions:
+        return f"unknown action '{action}'"
+    extra = command.get("extra")
+    if extra is not None and not isinstance(extra, dict):
+        return "'extra' must be an object"
+    return None
+
+
+@lru_cache(maxsize=8)
+def _action_prefixes(actions: FrozenSet[str]) -> FrozenSet[str]:
+    """Every prefix of every action name (a validator is built per request)."""
+    return frozenset(action[:i] for action in actions for i in range(len(action) + 1))
+
+
+class CommandStreamValidator:
+    """
+    Incremental check of streamed model output.
+
+    Follows the top level of the first JSON object and watches the value of
+    its "action" key character by character. feed() raises
+    InvalidCommandError once that value can no longer become a known action.
+
+    Args:
+        actions: Valid action names
+    """
+
+    def __init__(self, actions: Iterable[str]):
+        self.actions = frozenset(action.lower() for action in actions)
+        self._prefixes = _action_prefixes(self.actions)
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.expect_key = False
+        self.string = []
+        self.key = None
+        self.in_action = False
+        self.action = None
+
+    def feed(self, chunk: str):
+        """
+        Consume a chunk of generated text.
+
+        Raises:
+            InvalidCommandError as soon as the action is known to be invalid
+        """
+        for char in chunk:
+            if self.in_string:
+                self._string_char(char)
+            elif char == '"':
+                self.in_string = True
+                self.string = []
+                self.in_action = self.depth == 1 and not self.expect_key and self.key == "action"
+            elif char == "{":
+                self.depth += 1
+                if self.depth == 1:
+                    self.expect_key = True
+            elif char == "}":
+                self.depth -= 1
+            elif self.depth == 1:
+                if char == ",":
+                    self.expect_key = True
+                elif char == ":":
+                    self.expect_key = False
+                elif not char.isspace() and not self.expect_key and self.key == "action" and self.action is None:
+                    raise InvalidCommandError("'action' is not a string")
+
+    def _string_char(self, char: str):
+        if self.escaped:
+            self.escaped = False
+            self.string.append(char)
+            return
+        if char == "\\":
+            self.escaped = True
+            return
+        if char != '"':
+            self.string.append(char)
+            if self.in_action and "".join(self.string).lower() not in self._prefixes:
+                raise InvalidCommandError(f"unknown action '{''.join(self.string)}...'")
+            return
+        # Closing quote
+        self.in_string = False
+        text = "".join(self.string)
+        if self.depth == 1 and self.expect_key:
+            self.key = text
+        elif self.in_action:
+            if text.lower() not in self.actions:
+                raise InvalidCommandError(f"unknown action '{text}'")
+            self.action = text.lower()
+            self.in_action = False
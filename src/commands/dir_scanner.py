@@ -0,0 +1,190 @@
+"""
+Directory Scanner
+A bounded, parallel replacement for recursive globs when no index can
+answer: `list(glob.glob(path/**/*.pdf, recursive=True))[:10]` lists the
+whole tree before the first ten matches are kept, and a home folder with a
+few source checkouts can take many seconds to walk.
+
+DirScanner lists the roots and the folders directly below them itself, so
+matches near the top (Desktop\report.pdf) are yielded within milliseconds,
+then walks the deeper subtrees with os.scandir on a thread pool and yields
+matches as they are found. The scan ends as soon as max_results matches were yielded, the
+deadline passed, the cancel event was set or the caller stops iterating;
+the workers stop at their next folder. Folders that never hold what a
+spoken command looks for (node_modules, .git, caches, virtualenvs) are not
+entered.
+
+    scanner = DirScanner()
+    for path in scanner.scan([home], "*.pdf", max_results=10, deadline=3.0):
+        ...
+"""
+
+import fnmatch
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from .file_catalog import EXCLUDED_DIRS
+except ImportError:
+    from file_catalog import EXCLUDED_DIRS
+
+
+# Lowercase folder names that are never entered
+SCAN_EXCLUDED_DIRS = EXCLUDED_DIRS | {
+    ".git", ".svn", ".hg", ".cache", "cache", "caches", ".tox", ".mypy_cache", ".pytest_cache",
+    ".gradle", ".m2", ".npm", ".nuget", "bower_components", "dist-packages",
+}
+
+# Posted by a worker when its subtree is done
+_DONE = object()
+
+
+class DirScanner:
+    """
+    Parallel os.scandir walk yielding names that match a glob pattern.
+
+    Args:
+        max_workers: Subtrees walked in parallel
+        excluded: Lowercase folder names that are never entered
+        skip_hidden: Skip dot-folders, and dot-files unless the pattern
+            starts with a dot (as glob does)
+    """
+
+    # Seconds between checks of the cancel event while no match arrives
+    CANCEL_POLL = 0.05
+    # Levels below the roots listed on the calling thread before the pool starts
+    INLINE_DEPTH = 1
+
+    def __init__(self, max_workers: int = 4, excluded: Iterable[str] = SCAN_EXCLUDED_DIRS,
+                 skip_hidden: bool = True):
+        self.max_workers = max_workers
+        self.excluded = set(excluded)
+        self.skip_hidden = skip_hidden
+
+    def scan(self, roots: List[str], pattern: str, max_results: Optional[int] = None,
+             deadline: Optional[float] = None, max_depth: Optional[int] = None,
+             cancel: Optional[threading.Event] = None) -> Iterator[str]:
+        """
+        Paths of files and folders whose name matches pattern, below roots.
+
+        Matches in a root or the folders directly below it come first, in
+        listing order; matches deeper down arrive in the order the workers
+        find them.
+
+        Args:
+            roots: Folders to scan
+            pattern: Glob pattern for the name ("*.pdf", "*linux*", "spotify.exe"),
+                matched case-insensitively
+            max_results: Stop after this many matches (default: no limit)
+            deadline: Seconds the scan may run before giving up (default: no limit)
+            max_depth: Folders deeper than this below a root are not entered
+                (default: no limit)
+            cancel: Setting this event ends the scan within CANCEL_POLL seconds
+                (e.g. the user cancelled it in the UI)
+
+        Yields:
+            Matching paths
+        """
+        if max_results is not None and max_results <= 0:
+            return
+        match = re.compile(fnmatch.translate(pattern.lower())).match
+        hidden_ok = pattern.startswith(".")
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        found = 0
+
+        # The top levels are listed here, breadth-first, so shallow matches come first
+        subtrees = [(root, 0) for root in roots]
+        for _ in range(self.INLINE_DEPTH + 1):
+            level, subtrees = subtrees, []
+            for directory, depth in level:
+                if (cancel is not None and cancel.is_set()) or (
+                        deadline_at is not None and time.monotonic() > deadline_at):
+                    return
+                entries, folders = self._list(directory, match, hidden_ok, max_depth is None or depth < max_depth)
+                for path in entries:
+                    yield path
+                    found += 1
+                    if max_results is not None and found >= max_results:
+                        return
+                subtrees.extend((folder, depth + 1) for folder in folders)
+        if not subtrees:
+            return
+
+        stop = threading.Event()
+        results: "queue.Queue" = queue.Queue()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dir-scan")
+        try:
+            for folder, depth in subtrees:
+                pool.submit(self._walk, folder, depth, match, hidden_ok, max_depth, deadline_at, stop, cancel,
+                            results)
+            pending = len(subtrees)
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    return
+                timeout = None if cancel is None else self.CANCEL_POLL
+                if deadline_at is not None:
+                    remaining = deadline_at - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                try:
+                    item = results.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    pending -= 1
+                    continue
+                yield item
+                found += 1
+                if max_results is not None and found >= max_results:
+                    return
+        finally:
+            # Also runs when the caller stops iterating early
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _list(self, directory: str, match: Callable[[str], object], hidden_ok: bool,
+              descend: bool) -> Tuple[List[str], List[str]]:
+        """(matching paths, folders to enter) in one directory; both empty if it cannot be read."""
+        matches, folders = [], []
+        hidden_ok = hidden_ok or not self.skip_hidden
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    hidden = name.startswith(".")
+                    if hidden and not hidden_ok:
+                        continue
+                    if match(name):
+                        matches.append(entry.path)
+                    if descend and name not in self.excluded and not (hidden and self.skip_hidden):
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                folders.append(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+        return matches, folders
+
+    def _walk(self, top: str, top_depth: int, match: Callable[[str], object], hidden_ok: bool,
+              max_depth: Optional[int], deadline_at: Optional[float], stop: threading.Event,
+              cancel: Optional[threading.Event], results: "queue.Queue"):
+        """Depth-first walk of one subtree, posting matches until told to stop."""
+        try:
+            stack = [(top, top_depth)]
+            while stack and not stop.is_set() and not (cancel is not None and cancel.is_set()):
+                if deadline_at is not None and time.monotonic() > deadline_at:
+                    break
+                directory, depth = stack.pop()
+                matches, folders = self._list(directory, match, hidden_ok, max_depth is None or depth < max_depth)
+                for path in matches:
+                    results.put(path)
+                stack.extend((folder, depth + 1) for folder in reversed(folders))
+        finally:
+            results.put(_DONE)
@@ -0,0 +1,367 @@
+"""
+Execution Pool
+Runs executor actions off the caller's thread, so a slow action (a
+PowerShell query, a disk walk, a shell command that never exits) does not
+stall voice recognition or the commands after it.
+
+    future = executor.submit({"action": "system_info", "extra": {"type": "battery"}})
+    future.add_done_callback(lambda f: print(f.result()))   # (success, message)
+
+Each executor (one per session) has one ordered lane: every UI and input
+action (launches, opening files, typing, keys, windows, media, settings,
+file changes) runs on it one at a time, in the order it was submitted, so
+"open notepad" then "type hello" types into Notepad. Only independent
+queries (system info, searches, shell commands; ActionSpec.concurrent) run
+beside it, on a bounded set of worker threads.
+
+Each task has a timeout, counted from when it starts. Handlers stop
+cooperatively: at the deadline, or once the task is cancelled,
+run_process() kills its child process, and disk scans watch the task's
+cancel event. A handler that has not stopped CANCEL_GRACE seconds later is
+abandoned: its future resolves anyway, and its late result is discarded.
+An abandoned ordered task leaves its thread to a new one, which goes on
+with the tasks queued behind it.
+run_process() also caps how many child processes run at once.
+"""
+
+import heapq
+import itertools
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, InvalidStateError, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+# The task running on the current thread, if any
+_context = threading.local()
+
+
+class TaskCancelled(BaseException):
+    """
+    Raised inside a task that was cancelled (by run_process and
+    check_cancelled). Like asyncio.CancelledError it is not an Exception, so
+    handlers' own `except Exception` blocks let it through.
+    """
+
+
+class TaskFuture(Future):
+    """
+    Future of one pool task. Also carries the task's cancel event, which
+    cooperative handlers check.
+    """
+
+    def __init__(self, pool: "ExecutionPool", name: str, timeout: Optional[float],
+                 on_stop: Optional[Callable[[str], Any]]):
+        super().__init__()
+        self.name = name
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+        self.deadline: Optional[float] = None  # monotonic; set when the task starts
+        self._pool = pool
+        self._on_stop = on_stop
+
+    def cancel(self) -> bool:
+        """
+        Cancel the task. A queued task never runs. A running one is asked to
+        stop, and it is abandoned if it has not stopped after CANCEL_GRACE seconds.
+
+        Returns:
+            False if the task had already finished
+        """
+        if self.done():
+            return False
+        self.cancel_event.set()
+        self._pool._count("cancelled")
+        if super().cancel():
+            return True
+        self._pool._watch(self, time.monotonic() + self._pool.CANCEL_GRACE, "cancelled")
+        return True
+
+    def _finish(self, result: Any = None, error: BaseException = None) -> bool:
+        """Resolve unless already resolved (a late result of an abandoned task is dropped)."""
+        try:
+            if error is not None:
+                self.set_exception(error)
+            else:
+                self.set_result(result)
+            return True
+        except InvalidStateError:
+            return False
+
+    def _stop(self, reason: str):
+        """Resolve a task that was abandoned at its deadline."""
+        if self.done():
+            return
+        self.cancel_event.set()
+        if self._on_stop is not None:
+            self._finish(self._on_stop(reason))
+        elif reason == "cancelled":
+            self._finish(error=CancelledError())
+        else:
+            self._finish(error=TimeoutError(f"{self.name} {reason}"))
+
+
+class _OrderedLane:
+    """
+    Runs tasks one at a time, in submission order, on a thread of its own.
+    When the running task is abandoned, a new thread takes the queue over;
+    the stuck one exits once its handler returns.
+    """
+
+    def __init__(self, run: Callable[[TaskFuture, Callable[..., Any], tuple], None], name: str):
+        self._run = run
+        self._name = name
+        self._queue: "deque[Tuple[TaskFuture, Callable[..., Any], tuple]]" = deque()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None  # the thread draining the queue
+        self._current: Optional[TaskFuture] = None
+        self._closed = False
+
+    def submit(self, future: TaskFuture, fn: Callable[..., Any], args: tuple):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("execution pool is closed")
+            self._queue.append((future, fn, args))
+            if self._worker is None:
+                self._start()
+
+    def _start(self):
+        self._worker = threading.Thread(target=self._drain, name=self._name, daemon=True)
+        self._worker.start()
+
+    def _drain(self):
+        me = threading.current_thread()
+        while True:
+            with self._lock:
+                if self._worker is not me:
+                    return  # replaced while its task hung
+                if self._closed or not self._queue:
+                    self._worker = None
+                    return
+                future, fn, args = self._queue.popleft()
+                self._current = future
+            self._run(future, fn, args)
+
+    def abandoned(self, future: TaskFuture):
+        """Hand the queue to a new thread if future is the task holding it up."""
+        with self._lock:
+            if self._current is future and self._worker is not None and not self._closed:
+                self._current = None
+                self._start()
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            self._queue.clear()
+
+
+def kill_process_tree(process: subprocess.Popen, grace: float = 0.5):
+    """Kill a child process and whatever it started (the commands of a shell)."""
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True, timeout=5)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)  # started with start_new_session
+    except (OSError, subprocess.SubprocessError):
+        pass
+    process.kill()
+    try:
+        process.communicate(timeout=grace)
+    except subprocess.TimeoutExpired:
+        pass  # a grandchild outside the group still holds the pipes
+
+
+def current_task() -> Optional[TaskFuture]:
+    """The pool task running on this thread, or None outside the pool."""
+    return getattr(_context, "task", None)
+
+
+def cancel_requested() -> bool:
+    """True if the task running on this thread was cancelled or timed out."""
+    task = current_task()
+    return task is not None and task.cancel_event.is_set()
+
+
+def check_cancelled():
+    """Raise TaskCancelled if the task running on this thread should stop."""
+    if cancel_requested():
+        raise TaskCancelled(f"{current_task().name} cancelled")
+
+
+class ExecutionPool:
+    """
+    Two-lane thread pool (ordered and concurrent) with per-task timeouts,
+    cooperative cancellation and a cap on concurrent child processes.
+
+    Args:
+        max_workers: Threads for concurrent tasks
+        max_processes: Child processes run_process() allows at once
+    """
+
+    # Seconds between checks of cancel events and deadlines while waiting
+    POLL = 0.05
+    # Seconds a cancelled or timed-out task may take to stop before it is abandoned
+    CANCEL_GRACE = 0.5
+
+    def __init__(self, max_workers: int = 4, max_processes: int = 2):
+        self.max_workers = max_workers
+        self.max_processes = max_processes
+        self._concurrent = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="action")
+        self._ordered = _OrderedLane(self._run, "action-ordered")
+        self._processes = threading.BoundedSemaphore(max_processes)
+        self._deadlines: List[Tuple[float, int, TaskFuture, str]] = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._watchdog: Optional[threading.Thread] = None
+        self._live = set()  # submitted futures not yet resolved
+        self._closed = False
+        self.stats = {"submitted": 0, "cancelled": 0, "abandoned": 0, "processes_killed": 0}
+
+    def submit(self, fn: Callable[..., Any], *args, name: str = None, timeout: float = None,
+               concurrent: bool = False, on_stop: Callable[[str], Any] = None) -> TaskFuture:
+        """
+        Run fn(*args) on the pool.
+
+        Args:
+            fn: The task
+            name: For messages ("system_info timed out after 15s")
+            timeout: Seconds the task may run (default: no limit)
+            concurrent: True runs it beside other tasks; False (the default)
+                runs it on the ordered lane, after the tasks submitted before it
+            on_stop: Called with "timed out after Ns" or "cancelled" to produce
+                the result of a task that was abandoned; without it, such a
+                future raises TimeoutError or CancelledError
+
+        Returns:
+            A TaskFuture of fn's result
+        """
+        if self._closed:
+            raise RuntimeError("execution pool is closed")
+        future = TaskFuture(self, name or getattr(fn, "__name__", "task"), timeout, on_stop)
+        self._count("submitted")
+        self._live.add(future)
+        future.add_done_callback(self._live.discard)
+        if concurrent:
+            self._concurrent.submit(self._run, future, fn, args)
+        else:
+            self._ordered.submit(future, fn, args)
+        return future
+
+    def _run(self, future: TaskFuture, fn: Callable[..., Any], args: tuple):
+        if not future.set_running_or_notify_cancel():
+            return
+        if future.timeout is not None:
+            future.deadline = time.monotonic() + future.timeout
+            self._watch(future, future.deadline + self.CANCEL_GRACE, f"timed out after {future.timeout:g}s")
+        _context.task = future
+        try:
+            result = fn(*args)
+        except (Exception, TaskCancelled) as e:
+            future._finish(error=e)
+        else:
+            future._finish(result)
+        finally:
+            _context.task = None
+
+    def _count(self, key: str):
+        # Callers run on the voice loop, the lanes and the watchdog at once
+        with self._condition:
+            self.stats[key] += 1
+
+    # ---------------- Deadlines ----------------
+    def _watch(self, future: TaskFuture, deadline: float, reason: str):
+        with self._condition:
+            heapq.heappush(self._deadlines, (deadline, next(self._order), future, reason))
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch_loop, name="action-watchdog", daemon=True)
+                self._watchdog.start()
+            self._condition.notify()
+
+    def _watch_loop(self):
+        with self._condition:
+            while not self._closed:
+                # Finished tasks leave the heap as they come up
+                while self._deadlines and self._deadlines[0][2].done():
+                    heapq.heappop(self._deadlines)
+                if not self._deadlines:
+                    self._condition.wait()
+                    continue
+                deadline, _, future, reason = self._deadlines[0]
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                heapq.heappop(self._deadlines)
+                self.stats["abandoned"] += 1
+                future._stop(reason)
+                self._ordered.abandoned(future)
+
+    # ---------------- Child processes ----------------
+    def run_process(self, args, timeout: float = None, input: Any = None, capture_output: bool = False,
+                    **popen_kwargs) -> subprocess.CompletedProcess:
+        """
+        subprocess.run() for tasks: waits for one of max_processes slots,
+        and kills the process when the running task is cancelled or reaches
+        its deadline, or after timeout seconds.
+
+        Raises:
+            subprocess.TimeoutExpired: timeout or the task's deadline passed
+            TaskCancelled: the task was cancelled
+        """
+        task = current_task()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if task is not None and task.deadline is not None:
+            deadline = task.deadline if deadline is None else min(deadline, task.deadline)
+
+        while not self._processes.acquire(timeout=self.POLL):
+            self._check(task, deadline, args, timeout)
+        try:
+            if capture_output:
+                popen_kwargs["stdout"] = popen_kwargs["stderr"] = subprocess.PIPE
+            if input is not None:
+                popen_kwargs["stdin"] = subprocess.PIPE
+            if os.name != "nt":
+                # Its own process group, so a shell's children are killed with it
+                popen_kwargs.setdefault("start_new_session", True)
+            with subprocess.Popen(args, **popen_kwargs) as process:
+                pending_input = input
+                while True:
+                    try:
+                        stdout, stderr = process.communicate(pending_input, timeout=self.POLL)
+                        break
+                    except subprocess.TimeoutExpired:
+                        pending_input = None  # already handed over; retrying keeps it
+                        try:
+                            self._check(task, deadline, args, timeout)
+                        except (subprocess.TimeoutExpired, TaskCancelled):
+                            self._kill(process)
+                            raise
+            return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+        finally:
+            self._processes.release()
+
+    def _kill(self, process: subprocess.Popen):
+        kill_process_tree(process, self.CANCEL_GRACE)
+        self._count("processes_killed")
+
+    @staticmethod
+    def _check(task: Optional[TaskFuture], deadline: Optional[float], args, timeout: Optional[float]):
+        if task is not None and task.cancel_event.is_set():
+            raise TaskCancelled(f"{task.name} cancelled")
+        if deadline is not None and time.monotonic() > deadline:
+            raise subprocess.TimeoutExpired(args, timeout if timeout is not None else task.timeout)
+
+    def close(self):
+        """Cancel queued and running tasks and stop the threads."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        for future in list(self._live):
+            future.cancel_event.set()
+            if not Future.cancel(future):
+                future._stop("cancelled")  # running; nothing waits for it any more
+        self._concurrent.shutdown(wait=False, cancel_futures=True)
+        self._ordered.shutdown()
@@ -0,0 +1,472 @@
+"""
+File Catalog
+A persistent index of the files under the user's Desktop, Documents,
+Downloads and home folder, so spoken "open report pdf" / "find my pdfs"
+commands are answered from SQLite in milliseconds instead of re-walking the
+home folder with a recursive glob on every request.
+
+The catalog is built by a background crawler that lists directories with
+os.scandir on a thread pool. Later crawls are incremental: a directory whose
+mtime has not changed has the same entries, so it is not listed again and
+its known subdirectories are visited straight from the index. Only the
+directories where something was added, removed or renamed are re-listed.
+
+With an FsWatcher, apply_events() keeps the catalog current between crawls:
+only the folders an event touched are listed again.
+
+Lookups:
+    find(name, extension)   stem match: exact, then prefix, then substring
+    fuzzy_find(name, ...)   a misheard name ("lenux" -> linux.pdf)
+    search(pattern, root)   glob pattern ("*.pdf", "*linux*") below a folder
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .fuzzy_vocabulary import FuzzyVocabulary
+except ImportError:
+    from fuzzy_vocabulary import FuzzyVocabulary
+
+
+# Directories that hold no user documents, or too many files to be worth indexing
+EXCLUDED_DIRS = {"appdata", "node_modules", "__pycache__", "site-packages", "$recycle.bin", "venv", ".venv"}
+
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+class FileCatalog:
+    """
+    SQLite-backed name index over a set of folders.
+
+    Args:
+        path: SQLite file, or None for a memory-only catalog
+        roots: Folders to index, in priority order; results from an earlier
+            root rank first (default: Desktop, Documents, Downloads, home)
+        max_workers: Directories listed in parallel while crawling
+        refresh_interval: Seconds between background incremental crawls
+            (0 = only when refresh() is called)
+        extensions: Only index files with these extensions (default: all)
+        excluded: Lowercase folder names that are never entered
+        max_depth: Folders deeper than this below a root are not entered
+            (default: no limit)
+    """
+
+    # Listed directories written per transaction while crawling
+    COMMIT_EVERY = 200
+
+    def __init__(self, path: Optional[str] = None, roots: List[str] = None, max_workers: int = 4,
+                 refresh_interval: float = 300.0, extensions: Iterable[str] = None,
+                 excluded: Iterable[str] = EXCLUDED_DIRS, max_depth: int = None):
+        home = os.path.expanduser("~")
+        self.roots = [os.path.normpath(root) for root in (roots or [
+            os.path.join(home, "Desktop"),
+            os.path.join(home, "Documents"),
+            os.path.join(home, "Downloads"),
+            home,
+        ])]
+        self.max_workers = max_workers
+        self.refresh_interval = refresh_interval
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.excluded = set(excluded)
+        self.max_depth = max_depth
+        # Bumped whenever a crawl changes the index, so derived tables know to rebuild
+        self.version = 0
+        self._lock = threading.RLock()
+        self._crawl_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._vocabulary: Optional[FuzzyVocabulary] = None
+        self.stats = {"crawls": 0, "listed": 0, "unchanged": 0, "last_crawl_s": 0.0}
+
+        try:
+            self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+            self._create_schema()
+        except sqlite3.Error as e:
+            print(f"⚠️  File catalog kept in memory only: {e}")
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._create_schema()
+
+    def _create_schema(self):
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            " path TEXT PRIMARY KEY, parent TEXT, mtime REAL NOT NULL, rank INTEGER NOT NULL, depth INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);"
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, dir TEXT NOT NULL, name TEXT NOT NULL, stem TEXT NOT NULL, ext TEXT NOT NULL,"
+            " mtime REAL NOT NULL, rank INTEGER NOT NULL, depth INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS files_stem ON files (stem, rank, depth, path);"
+            "CREATE INDEX IF NOT EXISTS files_ext ON files (ext, rank, depth, path);"
+            "CREATE INDEX IF NOT EXISTS files_dir ON files (dir);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self._db.commit()
+
+    # ---------------- State ----------------
+    @property
+    def ready(self) -> bool:
+        """True once a full crawl has completed (possibly in an earlier session)."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'crawled'").fetchone()
+        return row is not None
+
+    def covers(self, path: str) -> bool:
+        """True if a folder is one of the roots or below one."""
+        path = os.path.normcase(os.path.normpath(path))
+        for root in self.roots:
+            root = os.path.normcase(root)
+            if path == root or path.startswith(os.path.join(root, "")):
+                return True
+        return False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # ---------------- Crawling ----------------
+    def start(self):
+        """Crawl in a background thread now and every refresh_interval seconds."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._background, name="file-catalog", daemon=True)
+        self._thread.start()
+
+    def _background(self):
+        while not self._stop.is_set():
+            self._refresh_logged()
+            if not self.refresh_interval or self._stop.wait(self.refresh_interval):
+                return
+
+    def _refresh_logged(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"⚠️  File catalog crawl failed: {e}")
+
+    def refresh_soon(self):
+        """Start refresh() on a background thread, unless a crawl is already running."""
+        if self._crawl_lock.locked() or self._stop.is_set():
+            return
+        threading.Thread(target=self._refresh_logged, name="file-catalog-refresh", daemon=True).start()
+
+    def refresh(self) -> int:
+        """
+        Bring the catalog up to date (incrementally after the first crawl).
+        Concurrent calls share one crawl.
+
+        Returns:
+            Number of directories that had to be listed
+        """
+        if not self._crawl_lock.acquire(blocking=False):
+            # Someone else is crawling: wait for them instead of starting another
+            with self._crawl_lock:
+                return 0
+        try:
+            return self._crawl()
+        finally:
+            self._crawl_lock.release()
+
+    def _crawl(self) -> int:
+        start = time.perf_counter()
+        with self._lock:
+            known = {row[0]: row[1] for row in self._db.execute("SELECT path, mtime FROM dirs")}
+        visited = set()
+        listed = unchanged = committed = 0
+        changed = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-catalog") as pool:
+            pending = {}
+
+            def visit(directory, parent, rank, depth):
+                if directory in visited or self._stop.is_set():
+                    return
+                visited.add(directory)
+                future = pool.submit(self._scan, directory, known.get(directory))
+                pending[future] = (directory, parent, rank, depth)
+
+            for rank, root in enumerate(self.roots):
+                if os.path.isdir(root):
+                    visit(root, None, rank, 0)
+                    # Finish higher-priority roots first, so they own their files
+                    while pending:
+                        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            directory, parent, rank_, depth = pending.pop(future)
+                            mtime, entries = future.result()
+                            if mtime is None:
+                                continue
+                            if entries is None:
+                                unchanged += 1
+                                children = self._known_children(directory)
+                            else:
+                                listed += 1
+                                changed = True
+                                children = self._store(directory, parent, mtime, rank_, depth, entries)
+                            if self.max_depth is None or depth < self.max_depth:
+                                for child in children:
+                                    visit(child, directory, rank_, depth + 1)
+                        if listed - committed >= self.COMMIT_EVERY:
+                            committed = listed
+                            with self._lock:
+                                self._db.commit()
+
+        with self._lock:
+            # Directories not reached any more (deleted, excluded, root removed)
+            gone = [path for path in known if path not in visited]
+            for path in gone:
+                self._db.execute("DELETE FROM dirs WHERE path = ?", (path,))
+                self._db.execute("DELETE FROM files WHERE dir = ?", (path,))
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('crawled', ?)", (str(time.time()),))
+            self._db.commit()
+            if changed or gone:
+                self._vocabulary = None
+                self.version += 1
+
+        self.stats["crawls"] += 1
+        self.stats["listed"] = listed
+        self.stats["unchanged"] = unchanged
+        self.stats["last_crawl_s"] = round(time.perf_counter() - start, 3)
+        return listed
+
+    def apply_events(self, events) -> int:
+        """
+        Update the catalog for a batch of file system changes (FsEvents from
+        an FsWatcher): the folders they touched are listed again, new
+        folders are crawled and deleted or moved-away folders are dropped.
+
+        Returns:
+            Number of directories that had to be listed
+        """
+        if not self.ready:
+            return 0  # the first crawl picks everything up
+        if any(event.kind == "overflow" and self.covers(event.path) for event in events):
+            return self.refresh()
+        stale, gone = set(), set()
+        for event in events:
+            for path in (event.path, event.dest):
+                if path:
+                    stale.add(os.path.dirname(path))
+            if event.is_dir:
+                if event.kind in ("deleted", "moved"):
+                    gone.add(event.path)
+                if event.kind in ("created", "moved"):
+                    stale.add(event.dest or event.path)
+        stale = {path for path in stale if self._place(path) is not None}
+        if not stale and not gone:
+            return 0
+
+        listed = 0
+        with self._crawl_lock:
+            with self._lock:
+                for path in gone:
+                    prefix = os.path.join(path, "")
+                    self._db.execute("DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?",
+                                     (path, len(prefix), prefix))
+                    self._db.execute("DELETE FROM files WHERE dir = ? OR substr(dir, 1, ?) = ?",
+                                     (path, len(prefix), prefix))
+                known = {row[0] for row in self._db.execute("SELECT path FROM dirs")}
+            queue = sorted(stale)
+            while queue:
+                directory = queue.pop()
+                rank, depth = self._place(directory)
+                mtime, entries = self._scan(directory, None)
+                if mtime is None:
+                    continue  # deleted since; its parent's event drops it
+                listed += 1
+                parent = None if depth == 0 else os.path.dirname(directory)
+                for child in self._store(directory, parent, mtime, rank, depth, entries):
+                    if child not in known and (self.max_depth is None or depth < self.max_depth):
+                        known.add(child)
+                        queue.append(child)
+            with self._lock:
+                self._db.commit()
+                self._vocabulary = None
+                self.version += 1
+        return listed
+
+    def _place(self, path: str) -> Optional[Tuple[int, int]]:
+        """(rank, depth) of a folder inside the catalog, or None if it is outside or excluded."""
+        path = os.path.normpath(path)
+        for rank, root in enumerate(self.roots):
+            if path == root:
+                return rank, 0
+            if path.startswith(os.path.join(root, "")):
+                parts = path[len(root):].strip(os.sep).split(os.sep)
+                if any(part.startswith(".") or part.lower() in self.excluded for part in parts):
+                    return None
+                if self.max_depth is not None and len(parts) > self.max_depth:
+                    return None
+                return rank, len(parts)
+        return None
+
+    def _scan(self, directory: str, known_mtime: Optional[float]):
+        """
+        List one directory (on a worker thread).
+
+        Returns:
+            (mtime, entries) where entries is None if the directory is
+            unchanged since known_mtime, or (None, None) if it is gone
+        """
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return None, None
+        if known_mtime is not None and mtime == known_mtime:
+            return mtime, None
+        entries = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in self.excluded:
+                                entries.append((entry.name, True, 0.0))
+                        elif self.extensions is not None and os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                            continue
+                        elif entry.is_file():
+                            entries.append((entry.name, False, entry.stat().st_mtime))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return mtime, entries
+
+    def _known_children(self, directory: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT path FROM dirs WHERE parent = ?", (directory,))]
+
+    def _store(self, directory, parent, mtime, rank, depth, entries) -> List[str]:
+        """Replace one directory's rows; returns its subdirectories."""
+        subdirs, rows = [], []
+        for name, is_dir, file_mtime in entries:
+            path = os.path.join(directory, name)
+            if is_dir:
+                subdirs.append(path)
+                continue
+            stem, ext = os.path.splitext(name)
+            rows.append((path, directory, name.lower(), stem.lower(), ext.lower(), file_mtime, rank, depth))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO dirs (path, parent, mtime, rank, depth) VALUES (?, ?, ?, ?, ?)",
+                             (directory, parent, mtime, rank, depth))
+            self._db.execute("DELETE FROM files WHERE dir = ?", (directory,))
+            self._db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            # Subdirectories that disappeared are dropped at the end of the crawl
+        return sorted(subdirs)
+
+    # ---------------- Lookups ----------------
+    def find(self, name: str, extension: str = None, limit: int = 10, first_stage: bool = False) -> List[str]:
+        """
+        Files whose name contains a spoken name, best first: exact stem,
+        then stems starting with the name, then any stem containing it;
+        within each, earlier roots and shallower folders first.
+
+        Args:
+            name: Spoken file name ("linux", "harish.txt")
+            extension: Extension with or without the dot, or None for any
+            limit: Maximum results
+            first_stage: Stop at the first stage that matched, so a few exact
+                matches do not cost a substring scan to fill up the limit
+
+        Returns:
+            Paths (empty if nothing matches)
+        """
+        name = name.lower().strip()
+        if not name:
+            return []
+        stem, ext = os.path.splitext(name)
+        if ext and not extension and " " not in ext:
+            name, extension = stem, ext
+        ext_params = []
+        if extension:
+            ext_params = [extension.lower() if extension.startswith(".") else "." + extension.lower()]
+        # Exact and prefix matches come from the stem index ("+ext" keeps the
+        # planner off the extension index); only a miss scans for substrings
+        stages = [
+            ("stem = ?", [name], " AND +ext = ?"),
+            ("stem > ? AND stem < ?", [name, name + "\uffff"], " AND +ext = ?"),
+            ("instr(stem, ?) > 1", [name], " AND ext = ?"),
+        ]
+        paths = []
+        with self._lock:
+            for clause, params, ext_clause in stages:
+                if ext_params:
+                    clause += ext_clause
+                query = f"SELECT path FROM files WHERE {clause} ORDER BY rank, depth, path LIMIT ?"
+                paths += [row[0] for row in self._db.execute(query, params + ext_params + [limit - len(paths)])]
+                if len(paths) >= limit or (paths and first_stage):
+                    break
+        return paths
+
+    def fuzzy_find(self, name: str, extension: str = None, limit: int = 10, first_stage: bool = False) -> List[str]:
+        """
+        Like find(), but a misheard name is first corrected to the closest
+        word that occurs in an indexed file name.
+        """
+        paths = self.find(name, extension, limit, first_stage)
+        if paths:
+            return paths
+        match = self._words().lookup(name.lower().strip(), "word")
+        if match is None or match.distance == 0:
+            return []
+        return self.find(match.term, extension, limit, first_stage)
+
+    def _words(self) -> FuzzyVocabulary:
+        """Fuzzy index of the words in file names, rebuilt after a crawl changed something."""
+        with self._lock:
+            if self._vocabulary is None:
+                vocabulary = FuzzyVocabulary()
+                for (stem,) in self._db.execute("SELECT DISTINCT stem FROM files"):
+                    for word in _TOKEN_RE.findall(stem):
+                        if len(word) >= 3:
+                            vocabulary.add(word, word, "word")
+                self._vocabulary = vocabulary
+            return self._vocabulary
+
+    def files(self) -> List[Tuple[str, str, str]]:
+        """Every indexed file as (path, lowercase name, lowercase extension), best-ranked first."""
+        with self._lock:
+            return self._db.execute("SELECT path, name, ext FROM files ORDER BY rank, depth, path").fetchall()
+
+    def search(self, pattern: str, root: str = None, limit: int = 10) -> List[str]:
+        """
+        Files whose name matches a glob pattern (case-insensitive).
+
+        Args:
+            pattern: "*.pdf", "*linux*", "report*.docx", ...
+            root: Only files below this folder (default: all roots)
+            limit: Maximum results
+
+        Returns:
+            Paths, earlier roots and shallower folders first
+        """
+        pattern = pattern.lower()
+        clauses, params = [], []
+        extension_only = re.fullmatch(r'\*(\.[^*?\[\]]+)', pattern)
+        if extension_only:
+            clauses.append("ext = ?")
+            params.append(extension_only.group(1))
+        else:
+            clauses.append("name GLOB ?")
+            params.append(pattern)
+        if root:
+            prefix = os.path.join(os.path.normpath(root), "")
+            clauses.append("substr(path, 1, ?) = ?")
+            params += [len(prefix), prefix]
+        query = "SELECT path FROM files WHERE " + " AND ".join(clauses) + " ORDER BY rank, depth, path LIMIT ?"
+        with self._lock:
+            return [row[0] for row in self._db.execute(query, params + [limit])]
+
+    def close(self):
+        """Stop the background crawler and close the database."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,291 @@
+"""
+Frecency Store
+Remembers the files, folders and apps the user opened by voice, so an
+ambiguous name ("open report") goes to the report they actually use instead
+of whichever match a search happens to return first.
+
+Each open adds 1 to an entry's score after decaying the old score with a
+half-life (a week by default), so the score combines how often and how
+recently something was opened. Entries live in SQLite; the highest-scoring
+ones are also kept in memory, so the most common opens are resolved without
+searching the disk at all.
+
+    best("report", "file", ".pdf")   frecent report.pdf, else a well-used file
+                                     whose name contains "report"
+    rank(paths)                      candidates from a catalog or scan, most frecent first
+"""
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+_CLEAN_RE = re.compile(r'[^\w]')
+
+
+def _clean(name: str) -> str:
+    """Lowercase, without spaces and punctuation ("Q3 Report" -> "q3report")."""
+    return _CLEAN_RE.sub('', name.lower())
+
+
+class FrecencyStore:
+    """
+    Frequency x recency scores for opened paths.
+
+    Args:
+        path: SQLite file, or None for a memory-only store
+        capacity: Highest-scoring entries kept in memory
+        half_life: Seconds after which an open counts half as much
+    """
+
+    HALF_LIFE = 7 * 24 * 3600.0
+    # Score a file or folder needs to be returned for a name it only contains
+    # (about three recent opens): one open of "New Document" must not
+    # capture every later "open new ..."
+    MIN_PARTIAL_SCORE = 3.0
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 256, half_life: float = HALF_LIFE):
+        self.path = path
+        self.capacity = capacity
+        self.half_life = half_life
+        self._lock = threading.Lock()
+        # path -> (kind, name, score at `last`, last)
+        self._memory: Dict[str, Tuple[str, str, float, float]] = {}
+        self._db = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS frecency ("
+                    " path TEXT PRIMARY KEY, kind TEXT NOT NULL, name TEXT NOT NULL,"
+                    " score REAL NOT NULL, last REAL NOT NULL, visits INTEGER NOT NULL)"
+                )
+                self._db.commit()
+                rows = self._db.execute("SELECT path, kind, name, score, last FROM frecency").fetchall()
+            except sqlite3.Error as e:
+                print(f"⚠️  Frecency store disabled on disk: {e}")
+                self._db = None
+            else:
+                now = time.time()
+                rows.sort(key=lambda row: -self._decayed(row[3], row[4], now))
+                self._memory = {row[0]: (row[1], row[2], row[3], row[4]) for row in rows[:capacity]}
+
+    def _decayed(self, score: float, last: float, now: float) -> float:
+        return score * math.pow(0.5, max(0.0, now - last) / self.half_life)
+
+    # ---------------- Recording ----------------
+    def record(self, path: str, kind: str, name: str = None, at: float = None):
+        """
+        Count one open.
+
+        Args:
+            path: What was opened (file, folder or program path)
+            kind: "file", "folder" or "app"
+            name: Name it is looked up by (default: the file name); apps use
+                the spoken app name ("spotify")
+            at: When it was opened (default: now), for importing history
+        """
+        path = os.path.normpath(path)
+        name = (name or os.path.basename(path)).lower()
+        now = time.time() if at is None else at
+        with self._lock:
+            entry = self._memory.get(path)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT kind, name, score, last FROM frecency WHERE path = ?",
+                                       (path,)).fetchone()
+                entry = tuple(row) if row else None
+            # Scores are kept as of the latest open; an older one counts decayed
+            last = max(now, entry[3]) if entry else now
+            score = (self._decayed(entry[2], entry[3], last) if entry else 0.0) + self._decayed(1.0, now, last)
+            self._memory[path] = (kind, name, score, last)
+            if len(self._memory) > self.capacity:
+                weakest = min(self._memory, key=lambda p: self._decayed(self._memory[p][2], self._memory[p][3], now))
+                del self._memory[weakest]
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO frecency (path, kind, name, score, last, visits) VALUES (?, ?, ?, ?, ?, 1)"
+                    " ON CONFLICT(path) DO UPDATE SET kind = excluded.kind, name = excluded.name,"
+                    " score = excluded.score, last = excluded.last, visits = visits + 1",
+                    (path, kind, name, score, last),
+                )
+                self._db.commit()
+
+    def forget(self, path: str):
+        """Drop an entry (e.g. the file no longer exists)."""
+        path = os.path.normpath(path)
+        with self._lock:
+            self._memory.pop(path, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM frecency WHERE path = ?", (path,))
+                self._db.commit()
+
+    def apply_events(self, events):
+        """
+        Follow file system changes (FsEvents from an FsWatcher): deleted
+        paths are forgotten, moved ones keep their history under the new path.
+        """
+        with self._lock:
+            for event in events:
+                if event.kind not in ("deleted", "moved"):
+                    continue
+                old = os.path.normpath(event.path)
+                prefix = os.path.join(old, "")
+                affected = [p for p in self._memory if p == old or p.startswith(prefix)]
+                if self._db is not None:
+                    rows = self._db.execute("SELECT path FROM frecency WHERE path = ? OR substr(path, 1, ?) = ?",
+                                            (old, len(prefix), prefix)).fetchall()
+                    affected = list(dict.fromkeys(affected + [row[0] for row in rows]))
+                for path in affected:
+                    entry = self._memory.pop(path, None)
+                    if event.kind == "deleted":
+                        if self._db is not None:
+                            self._db.execute("DELETE FROM frecency WHERE path = ?", (path,))
+                        continue
+                    new = os.path.normpath(event.dest) + path[len(old):]
+                    if entry is not None:
+                        name = os.path.basename(new).lower() if entry[0] != "app" else entry[1]
+                        self._memory[new] = (entry[0], name, entry[2], entry[3])
+                    if self._db is not None:
+                        self._db.execute("DELETE FROM frecency WHERE path = ?", (new,))
+                        self._db.execute(
+                            "UPDATE frecency SET path = ?,"
+                            " name = CASE kind WHEN 'app' THEN name ELSE ? END WHERE path = ?",
+                            (new, os.path.basename(new).lower(), path),
+                        )
+            if self._db is not None:
+                self._db.commit()
+
+    # ---------------- Lookup ----------------
+    def score(self, path: str) -> float:
+        """Current frecency of a path (0 if it was never opened)."""
+        return self.scores([path]).get(os.path.normpath(path), 0.0)
+
+    def scores(self, paths: List[str]) -> Dict[str, float]:
+        """Current frecency of each normalized path that was opened before."""
+        now = time.time()
+        wanted = {os.path.normpath(p) for p in paths}
+        result = {}
+        with self._lock:
+            missing = []
+            for path in wanted:
+                entry = self._memory.get(path)
+                if entry is not None:
+                    result[path] = self._decayed(entry[2], entry[3], now)
+                else:
+                    missing.append(path)
+            if missing and self._db is not None:
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT path, score, last FROM frecency WHERE path IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for path, score, last in rows:
+                        result[path] = self._decayed(score, last, now)
+        return result
+
+    def rank(self, paths: List[str]) -> List[str]:
+        """
+        Order candidates by frecency.
+
+        Args:
+            paths: Candidates in the order a catalog or scan returned them
+
+        Returns:
+            The same paths, most frecent first; paths never opened keep
+            their relative order after the ones that were
+        """
+        if len(paths) < 2:
+            return list(paths)
+        scores = self.scores(paths)
+        if not scores:
+            return list(paths)
+        return sorted(paths, key=lambda p: -scores.get(os.path.normpath(p), 0.0))
+
+    def best(self, name: str, kind: str, extension: str = None, partial: bool = True) -> Optional[str]:
+        """
+        The most frecent entry for a spoken name. The in-memory top entries
+        are tried first; the table on disk is scanned unless they hold an
+        exact match.
+
+        Args:
+            name: Spoken name ("report", "spotify")
+            kind: "file", "folder" or "app"
+            extension: For files, the extension including the dot (optional)
+            partial: Also consider files and folders whose name only
+                contains the spoken one
+
+        Returns:
+            Its path, or None. Apps must match by name exactly. A file or
+            folder named exactly so (ignoring case, spaces and punctuation)
+            wins; one whose name only contains the spoken one is returned
+            only if none is, and if its score reaches MIN_PARTIAL_SCORE.
+        """
+        key = name.lower().strip()
+        cleaned = _clean(key)
+        if not cleaned:
+            return None
+        extension = extension.lower() if extension else None
+        with self._lock:
+            entries = [(path, entry[1], entry[2], entry[3]) for path, entry in self._memory.items()
+                       if entry[0] == kind]
+            exact, contains = self._best(entries, kind, key, cleaned, extension)
+            source = "memory_hits"
+            if exact is None and self._db is not None:
+                rows = self._db.execute("SELECT path, name, score, last FROM frecency WHERE kind = ?",
+                                        (kind,)).fetchall()
+                disk_exact, disk_contains = self._best([row for row in rows if row[0] not in self._memory],
+                                                       kind, key, cleaned, extension)
+                if disk_exact is not None or contains is None:
+                    exact, contains, source = disk_exact, disk_contains, "disk_hits"
+        path = exact or (contains if partial else None)
+        self.stats[source if path else "misses"] += 1
+        return path
+
+    def _best(self, entries, kind: str, key: str, cleaned: str,
+              extension: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Highest-scoring matching (path, name, score, last) entries: the one
+        named exactly so, and the one whose name contains the spoken one
+        with a score of at least MIN_PARTIAL_SCORE.
+        """
+        now = time.time()
+        exact, exact_score = None, 0.0
+        contains, contains_score = None, self.MIN_PARTIAL_SCORE
+        for path, entry_name, score, last in entries:
+            if kind == "app":
+                if entry_name != key and os.path.splitext(entry_name)[0] != key:
+                    continue
+                named = True
+            else:
+                stem, ext = os.path.splitext(entry_name)
+                if extension and ext != extension:
+                    continue
+                entry_cleaned = _clean(entry_name if kind == "folder" else stem)
+                if cleaned not in entry_cleaned:
+                    continue
+                named = entry_cleaned == cleaned
+            decayed = self._decayed(score, last, now)
+            if named:
+                if decayed > exact_score:
+                    exact, exact_score = path, decayed
+            elif decayed >= contains_score:
+                contains, contains_score = path, decayed
+        return exact, contains
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute("SELECT COUNT(*) FROM frecency").fetchone()[0]
+            return len(self._memory)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,493 @@
+"""
+File System Watcher
+Tells the path-holding caches (file catalog, app index, frecency, intent
+cache) what changed on disk, so they are updated as files appear, disappear
+or move instead of by periodic full rescans.
+
+Two backends:
+    inotify   Linux: one watch per folder, events arrive as they happen
+    polling   elsewhere (or if inotify is unavailable): folder mtimes are
+              checked round-robin, at most poll_budget folders every
+              poll_interval seconds, and changed folders are listed and
+              compared with their previous listing; a move shows up as
+              a delete and a create
+
+Each watched root is capped at max_dirs folders (inotify watches or polled
+folders); the polling backend also caps the file names it remembers per
+root. A root that hits its cap is marked truncated, and changes below the
+untracked folders are left to the caches' own periodic refresh.
+
+Events are coalesced: a burst (unpacking an archive, a sync client) is
+collected until it has been quiet for `settle` seconds, or for at most
+`max_delay` seconds, then passed to the listeners as one batch. A create
+followed by a delete of the same path cancels out. If more than max_pending
+paths pile up, the batch is replaced by one "overflow" event per root, and
+listeners refresh instead.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class FsEvent(NamedTuple):
+    """One change below a watched root."""
+    kind: str                   # "created", "deleted", "moved" or "overflow"
+    path: str                   # the path (for "moved", the old one; for "overflow", the root)
+    is_dir: bool
+    dest: Optional[str] = None  # the new path of a "moved" event
+
+
+# inotify(7) constants
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONTFOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+               | IN_ONLYDIR | IN_DONTFOLLOW)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _within(path: str, folder: str) -> bool:
+    return path == folder or path.startswith(os.path.join(folder, ""))
+
+
+class _Backend:
+    """Folder tracking shared by both backends: roots, exclusions and per-root caps."""
+
+    def __init__(self, watcher: "FsWatcher"):
+        self.watcher = watcher
+        self.counts: Dict[str, int] = {root: 0 for root in watcher.roots}
+
+    def root_of(self, path: str) -> Optional[str]:
+        """The innermost root a path is below (roots may be nested)."""
+        best = None
+        for root in self.watcher.roots:
+            if _within(path, root) and (best is None or len(root) > len(best)):
+                best = root
+        return best
+
+    def enterable(self, name: str, root: str) -> bool:
+        return not name.startswith(".") and name.lower() not in self.watcher.roots[root]
+
+    def subdirs(self, folder: str, root: str) -> List[str]:
+        folders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if self.enterable(entry.name, root) and entry.is_dir(follow_symlinks=False):
+                            folders.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return folders
+
+    def add_tree(self, top: str, root: str = None):
+        """Track a folder and everything below it, until its root's cap is reached."""
+        root = root or self.root_of(top)
+        if root is None:
+            return
+        stack = [top]
+        while stack and not self.watcher._stop.is_set():
+            if self.counts[root] >= self.watcher.max_dirs:
+                self.watcher.truncated.add(root)
+                return
+            folder = stack.pop()
+            if folder != top and folder in self.watcher.roots:
+                continue  # a nested root, tracked against its own cap
+            if self.track(folder, root):
+                self.counts[root] += 1
+                stack.extend(self.subdirs(folder, root))
+
+    def track(self, folder: str, root: str) -> bool:
+        raise NotImplementedError
+
+    def poll(self) -> List[FsEvent]:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend(_Backend):
+    """One inotify watch per folder; events are read as they arrive."""
+
+    name = "inotify"
+    _libc = None
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+            except (OSError, AttributeError):
+                return False
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return True
+
+    def __init__(self, watcher: "FsWatcher"):
+        super().__init__(watcher)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: Dict[int, str] = {}   # watch descriptor -> folder
+        self.roots: Dict[int, str] = {}   # watch descriptor -> its root
+
+    def track(self, folder: str, root: str) -> bool:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(folder), _WATCH_MASK)
+        if wd < 0:
+            return False  # gone already, or out of watches (fs.inotify.max_user_watches)
+        if wd in self.paths:
+            return False  # already watched (inotify returns the existing descriptor)
+        self.paths[wd] = folder
+        self.roots[wd] = root
+        return True
+
+    def poll(self) -> List[FsEvent]:
+        try:
+            readable, _, _ = select.select([self.fd], [], [], self.watcher.TICK)
+        except (OSError, ValueError):
+            return []
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        events: List[FsEvent] = []
+        moves: Dict[int, Tuple[str, bool]] = {}  # cookie -> (old path, is_dir)
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events += [FsEvent("overflow", root, True) for root in self.watcher.roots]
+                continue
+            if mask & IN_IGNORED:
+                self._forget(wd)
+                continue
+            folder = self.paths.get(wd)
+            if folder is None or mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                continue  # reported by the parent folder's watch
+            path = os.path.join(folder, name)
+            is_dir = bool(mask & IN_ISDIR)
+            if is_dir and not self.enterable(name, self.roots[wd]):
+                continue
+            if mask & IN_CREATE:
+                events.append(FsEvent("created", path, is_dir))
+                if is_dir:
+                    self.add_tree(path, self.roots[wd])
+            elif mask & IN_DELETE:
+                events.append(FsEvent("deleted", path, is_dir))
+            elif mask & IN_MOVED_FROM:
+                moves[cookie] = (path, is_dir)
+            elif mask & IN_MOVED_TO:
+                if cookie in moves:
+                    old, _ = moves.pop(cookie)
+                    events.append(FsEvent("moved", old, is_dir, path))
+                    if is_dir:
+                        self._rename(old, path)
+                else:  # moved in from outside the watched tree
+                    events.append(FsEvent("created", path, is_dir))
+                    if is_dir:
+                        self.add_tree(path, self.roots[wd])
+        # Moved out of the watched tree
+        events += [FsEvent("deleted", path, is_dir) for path, is_dir in moves.values()]
+        return events
+
+    def _forget(self, wd: int):
+        self.paths.pop(wd, None)
+        root = self.roots.pop(wd, None)
+        if root is not None:
+            self.counts[root] -= 1
+
+    def _rename(self, old: str, new: str):
+        """A watched folder moved: its watches stay, their paths change."""
+        for wd, folder in list(self.paths.items()):
+            if _within(folder, old):
+                self.paths[wd] = new + folder[len(old):]
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class _PollingBackend(_Backend):
+    """Folder mtimes checked round-robin, a bounded number per poll."""
+
+    name = "polling"
+
+    def __init__(self, watcher: "FsWatcher"):
+        super().__init__(watcher)
+        # folder -> (mtime, names of its entries, names that are folders)
+        self.folders: "OrderedDict[str, Tuple[float, frozenset, frozenset]]" = OrderedDict()
+        self.names: Dict[str, int] = {root: 0 for root in watcher.roots}
+        self.owner: Dict[str, str] = {}  # folder -> the root it is counted against
+
+    def _listing(self, folder: str, root: str) -> Optional[Tuple[float, frozenset, frozenset]]:
+        try:
+            mtime = os.stat(folder).st_mtime
+            names, dirs = [], []
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() in self.watcher.roots[root]:
+                                continue
+                            dirs.append(entry.name)
+                    except OSError:
+                        continue
+                    names.append(entry.name)
+        except OSError:
+            return None
+        return mtime, frozenset(names), frozenset(dirs)
+
+    def track(self, folder: str, root: str) -> bool:
+        if folder in self.folders:
+            return False
+        listing = self._listing(folder, root)
+        if listing is None:
+            return False
+        if self.names[root] + len(listing[1]) > self.watcher.max_names:
+            self.watcher.truncated.add(root)
+            return False
+        self.names[root] += len(listing[1])
+        self.folders[folder] = listing
+        self.owner[folder] = root
+        return True
+
+    def add_tree(self, top: str, root: str = None):
+        # Only the listings are needed; subdirs() would list each folder twice
+        root = root or self.root_of(top)
+        if root is None:
+            return
+        stack = [top]
+        while stack and not self.watcher._stop.is_set():
+            if self.counts[root] >= self.watcher.max_dirs:
+                self.watcher.truncated.add(root)
+                return
+            folder = stack.pop()
+            if folder != top and folder in self.watcher.roots:
+                continue  # a nested root, tracked against its own cap
+            if self.track(folder, root):
+                self.counts[root] += 1
+                stack.extend(os.path.join(folder, name) for name in self.folders[folder][2])
+
+    def _untrack(self, top: str):
+        for folder in [f for f in self.folders if _within(f, top)]:
+            _, names, _ = self.folders.pop(folder)
+            root = self.owner.pop(folder)
+            self.counts[root] -= 1
+            self.names[root] -= len(names)
+
+    def poll(self) -> List[FsEvent]:
+        if self.watcher._stop.wait(self.watcher.poll_interval):
+            return []
+        events: List[FsEvent] = []
+        for _ in range(min(self.watcher.poll_budget, len(self.folders))):
+            if not self.folders:
+                break
+            folder, (mtime, names, dirs) = next(iter(self.folders.items()))
+            self.folders.move_to_end(folder)
+            try:
+                changed = os.stat(folder).st_mtime != mtime
+            except OSError:
+                changed = True
+            if not changed:
+                continue
+            root = self.owner[folder]
+            listing = self._listing(folder, root)
+            if listing is None:
+                # The parent reports the folder itself as deleted
+                self._untrack(folder)
+                continue
+            self.folders[folder] = listing
+            self.names[root] += len(listing[1]) - len(names)
+            for name in sorted(names - listing[1]):
+                path = os.path.join(folder, name)
+                events.append(FsEvent("deleted", path, name in dirs))
+                if name in dirs:
+                    self._untrack(path)
+            for name in sorted(listing[1] - names):
+                path = os.path.join(folder, name)
+                events.append(FsEvent("created", path, name in listing[2]))
+                if name in listing[2]:
+                    self.add_tree(path, root)
+        return events
+
+
+class FsWatcher:
+    """
+    Watches folders and passes coalesced batches of FsEvents to listeners.
+
+    Args:
+        roots: Folders to watch recursively; more can be added with
+            add_root() before start()
+        excluded: Lowercase folder names that are not watched below these roots
+        max_dirs: Folders tracked per root
+        max_names: File names the polling backend remembers per root
+        poll_interval: Seconds between polls (polling backend)
+        poll_budget: Folders checked per poll (polling backend)
+        settle: Seconds without new events before a batch is delivered
+        max_delay: Longest a batch waits during a continuous burst
+        max_pending: Distinct paths kept per batch before it overflows
+        use_inotify: Use inotify where available (False forces polling)
+    """
+
+    # Seconds the inotify backend waits for events per loop
+    TICK = 0.1
+
+    def __init__(self, roots: Iterable[str] = (), excluded: Iterable[str] = (), max_dirs: int = 20000,
+                 max_names: int = 500000, poll_interval: float = 2.0, poll_budget: int = 500,
+                 settle: float = 0.3, max_delay: float = 2.0, max_pending: int = 10000,
+                 use_inotify: bool = True):
+        # root -> lowercase folder names not watched below it
+        self.roots: Dict[str, Set[str]] = {}
+        for root in roots:
+            self.add_root(root, excluded)
+        self.max_dirs = max_dirs
+        self.max_names = max_names
+        self.poll_interval = poll_interval
+        self.poll_budget = poll_budget
+        self.settle = settle
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.use_inotify = use_inotify
+        self.truncated: Set[str] = set()
+        self.stats = {"events": 0, "batches": 0, "overflows": 0}
+        self._listeners: List[Callable[[List[FsEvent]], None]] = []
+        self._pending: "OrderedDict[str, FsEvent]" = OrderedDict()
+        self._first_event = self._last_event = 0.0
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backend: Optional[_Backend] = None
+
+    @property
+    def backend(self) -> Optional[str]:
+        """"inotify" or "polling" once started."""
+        return self._backend.name if self._backend else None
+
+    @property
+    def watched(self) -> int:
+        """Folders currently tracked."""
+        return sum(self._backend.counts.values()) if self._backend else 0
+
+    def add_root(self, root: str, excluded: Iterable[str] = ()):
+        """
+        Watch another folder. Roots may be nested, each with its own
+        exclusions (a home folder without AppData, and AppData\\Local\\Programs).
+        """
+        if root:
+            root = os.path.normpath(root)
+            self.roots[root] = self.roots.get(root, set()) | {name.lower() for name in excluded}
+
+    def add_listener(self, listener: Callable[[List[FsEvent]], None]):
+        """Call listener(events) with every coalesced batch (on the watcher thread)."""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start watching in a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="fs-watcher", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """Wait until every root is being watched."""
+        return self._ready.wait(timeout)
+
+    def _run(self):
+        try:
+            if self.use_inotify and _InotifyBackend.available():
+                try:
+                    self._backend = _InotifyBackend(self)
+                except OSError as e:
+                    print(f"⚠️  inotify unavailable, polling instead: {e}")
+            if self._backend is None:
+                self._backend = _PollingBackend(self)
+            for root in self.roots:
+                if os.path.isdir(root):
+                    self._backend.add_tree(root)
+            for root in sorted(self.truncated):
+                print(f"⚠️  Watching only part of {root} (limit of {self.max_dirs} folders reached)")
+        finally:
+            self._ready.set()
+
+        while not self._stop.is_set():
+            try:
+                for event in self._backend.poll():
+                    self._add(event)
+                self._flush()
+            except Exception as e:
+                print(f"⚠️  File watcher error: {e}")
+                self._stop.wait(1.0)
+        self._backend.close()
+
+    def _add(self, event: FsEvent):
+        """Merge an event into the pending batch."""
+        now = time.monotonic()
+        if not self._pending:
+            self._first_event = now
+        self._last_event = now
+        self.stats["events"] += 1
+        previous = self._pending.pop(event.path, None)
+        if previous is not None and previous.kind == "created" and event.kind == "deleted":
+            return  # came and went within one batch
+        if previous is not None and previous.kind == "overflow":
+            event = previous
+        self._pending[event.path] = event
+        if len(self._pending) > self.max_pending:
+            self.stats["overflows"] += 1
+            self._pending = OrderedDict((root, FsEvent("overflow", root, True)) for root in self.roots)
+
+    def _flush(self):
+        if not self._pending:
+            return
+        now = time.monotonic()
+        if now - self._last_event < self.settle and now - self._first_event < self.max_delay:
+            return
+        batch = list(self._pending.values())
+        self._pending = OrderedDict()
+        self.stats["batches"] += 1
+        for listener in list(self._listeners):
+            try:
+                listener(batch)
+            except Exception as e:
+                print(f"⚠️  File watcher listener failed: {e}")
+
+    def close(self):
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,200 @@
+"""
+Fuzzy Vocabulary Index
+Finds the known word or phrase closest to a misheard one ("nodepad" ->
+"notepad", "downlods" -> "downloads", "minimise" -> "minimize") so speech
+recognition errors do not fall through to the LLM.
+
+SymSpell-style deletion index: every term is stored under all strings
+obtained by deleting up to max_distance characters from it. A query
+generates its own deletions and only the terms sharing one are compared with
+a real edit distance, so a lookup costs a few dictionary probes instead of a
+scan over the vocabulary.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+
+class FuzzyMatch(NamedTuple):
+    term: str
+    value: Any
+    category: str
+    distance: int
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or limit + 1 as soon as it must exceed limit.
+
+    Only the diagonal band of width limit is computed, after stripping the
+    common prefix and suffix (most misspellings differ in one place).
+    """
+    if a == b:
+        return 0
+    shared = min(len(a), len(b))
+    start = 0
+    while start < shared and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shared - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    too_far = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return too_far
+    if not a or not b:
+        return min(len(a) + len(b), too_far)
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        char = a[i - 1]
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [too_far] * (len(b) + 1)
+        current[0] = i if i <= limit else too_far
+        row_min = current[0] if low == 1 else too_far
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if previous2 is not None and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1] \
+                    and previous2[j - 2] + 1 < value:
+                value = previous2[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return too_far
+        previous2, previous = previous, current
+    return min(previous[-1], too_far)
+
+
+def deletions(word: str, depth: int) -> Set[str]:
+    """The word and every string made by deleting up to depth characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class FuzzyVocabulary:
+    """
+    Deletion index over named vocabularies ("app", "folder", "contact", ...).
+
+    Args:
+        max_distance: Largest edit distance the index supports
+    """
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._terms: List[FuzzyMatch] = []
+        self._exact: Dict[tuple, int] = {}
+        self._deletes: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @staticmethod
+    def allowed_distance(length: int) -> int:
+        """
+        Edit budget for a query of this length. Two edits turn too many
+        ordinary words into vocabulary words ("reduce" -> "resume"), so they
+        are only allowed on long ones.
+        """
+        if length <= 2:
+            return 0
+        if length <= 7:
+            return 1
+        return 2
+
+    def add(self, term: str, value: Any, category: str):
+        """Index a term (case-insensitive); re-adding a term updates its value."""
+        term = term.lower()
+        key = (category, term)
+        if key in self._exact:
+            index = self._exact[key]
+            self._terms[index] = FuzzyMatch(term, value, category, 0)
+            return
+        index = len(self._terms)
+        self._terms.append(FuzzyMatch(term, value, category, 0))
+        self._exact[key] = index
+        for variant in deletions(term, self.max_distance):
+            self._deletes.setdefault(variant, []).append(index)
+
+    def add_all(self, mapping: Dict[str, Any], category: str):
+        for term, value in mapping.items():
+            self.add(term, value, category)
+
+    def lookup(self, word: str, category: str = None, max_distance: int = None) -> Optional[FuzzyMatch]:
+        """
+        Closest term to a word or phrase.
+
+        Args:
+            word: The (possibly misheard) text
+            category: Only consider terms of this vocabulary
+            max_distance: Edit budget (default: allowed_distance(len(word)))
+
+        Returns:
+            The best FuzzyMatch (lowest distance, then closest length, then
+            first added), or None if nothing is within the budget
+        """
+        word = word.lower().strip()
+        if not word:
+            return None
+        if category is not None:
+            index = self._exact.get((category, word))
+            if index is not None:
+                return self._terms[index]
+        budget = self.allowed_distance(len(word)) if max_distance is None else max_distance
+        budget = min(budget, self.max_distance)
+
+        best, best_rank = None, None
+        seen = set()
+        for variant in deletions(word, budget):
+            for index in self._deletes.get(variant, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                term = self._terms[index]
+                if category is not None and term.category != category:
+                    continue
+                distance = edit_distance(word, term.term, budget)
+                if distance > budget:
+                    continue
+                rank = (distance, abs(len(term.term) - len(word)), index)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = term, rank
+        return best._replace(distance=best_rank[0]) if best else None
+
+    def find(self, text: str, category: str, max_words: int = 3) -> Optional[FuzzyMatch]:
+        """
+        Best term matching any run of up to max_words consecutive words in a
+        longer text (e.g. a contact name inside "send a message to jon").
+        """
+        words = text.lower().split()
+        best = None
+        for size in range(min(max_words, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                match = self.lookup(" ".join(words[start:start + size]), category)
+                if match and (best is None or match.distance < best.distance):
+                    best = match
+                    if match.distance == 0:
+                        return best
+        return best
+
+    def correct_words(self, text: str, category: str, min_length: int = 5) -> str:
+        """
+        Replace each word of at least min_length characters by its closest
+        term in a vocabulary of single words; other words are kept.
+        """
+        words = text.split()
+        for i, word in enumerate(words):
+            if len(word) >= min_length:
+                match = self.lookup(word, category)
+                if match and match.distance:
+                    words[i] = match.term
+        return " ".join(words)
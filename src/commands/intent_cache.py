@@ -0,0 +1,243 @@
+"""
+Intent Cache
+Remembers which command an utterance resolved to, so the handful of phrases
+a user repeats all day are answered without pattern matching or an LLM call.
+
+Two levels: an in-memory LRU in front of a SQLite table on disk. Every entry
+is stamped with a fingerprint of whatever shaped the answer (model name,
+system prompt, app/folder mappings); entries with a different fingerprint
+are dropped when the cache is opened. Concurrent lookups of the same text
+share one resolution through SingleFlight.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def cache_fingerprint(*parts: Any) -> str:
+    """
+    Hash everything that influences resolution into a short stable key.
+
+    Args:
+        *parts: JSON-serialisable values (strings, dicts, lists)
+
+    Returns:
+        A 16-character hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into a single execution.
+
+    The first caller runs the function; callers arriving while it is in
+    flight wait for and share its result (or exception).
+    """
+
+    class _Call:
+        __slots__ = ("done", "result", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key at a time.
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            reused another caller's in-flight result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+
+class IntentCache:
+    """
+    Normalized text -> command cache with an LRU and a SQLite backing store.
+
+    Args:
+        path: SQLite file, or None for a memory-only cache
+        fingerprint: Current resolution fingerprint (see cache_fingerprint)
+        capacity: Maximum entries kept in memory
+        validator: Optional callable(command) -> bool; entries failing it
+            (e.g. a cached file path that no longer exists) are evicted
+            instead of replayed
+    """
+
+    def __init__(self, path: Optional[str] = None, fingerprint: str = "", capacity: int = 256,
+                 validator: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.capacity = capacity
+        self.validator = validator
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._db = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "invalidated": 0}
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS intents ("
+                    " key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, command TEXT NOT NULL,"
+                    " tier TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                # Anything resolved under another model/prompt/mapping is stale
+                self._db.execute("DELETE FROM intents WHERE fingerprint != ?", (fingerprint,))
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️  Intent cache disabled on disk: {e}")
+                self._db = None
+
+    # ---------------- Lookup ----------------
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Look up a normalized utterance.
+
+        Returns:
+            Tuple of (fresh copy of the command, tier that originally resolved it)
+            or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                source = "memory_hits"
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT command, tier FROM intents WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], row[1])
+                    self._remember(key, entry)
+                    source = "disk_hits"
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        command = json.loads(entry[0])
+        if self.validator is not None and not self.validator(command):
+            self.invalidate(key)
+            self.stats["invalidated"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self.stats[source] += 1
+        return command, entry[1]
+
+    def put(self, key: str, command: Dict[str, Any], tier: str):
+        """Store a resolved command in memory and on disk."""
+        entry = (json.dumps(command), tier)
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO intents (key, fingerprint, command, tier, created)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, self.fingerprint, entry[0], tier, time.time()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, entry: Tuple[str, str]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    # ---------------- Invalidation ----------------
+    def invalidate(self, key: str):
+        """Forget one utterance."""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM intents WHERE key = ?", (key,))
+                self._db.commit()
+
+    def invalidate_paths(self, paths: List[str]) -> int:
+        """
+        Forget every entry whose command mentions one of these paths (or a
+        path below them), e.g. after they were deleted or moved.
+
+        Returns:
+            Number of entries dropped from memory and disk
+        """
+        # Paths appear JSON-escaped in the stored commands
+        needles = [json.dumps(path)[1:-1] for path in paths if path]
+        if not needles:
+            return 0
+        dropped = 0
+        with self._lock:
+            for key in [k for k, entry in self._memory.items() if any(n in entry[0] for n in needles)]:
+                del self._memory[key]
+                dropped += 1
+            if self._db is not None:
+                for needle in needles:
+                    dropped += self._db.execute("DELETE FROM intents WHERE instr(command, ?) > 0",
+                                                (needle,)).rowcount
+                self._db.commit()
+        self.stats["invalidated"] += dropped
+        return dropped
+
+    def set_fingerprint(self, fingerprint: str):
+        """Switch to a new fingerprint, dropping every entry made under the old one."""
+        if fingerprint == self.fingerprint:
+            return
+        with self._lock:
+            self.fingerprint = fingerprint
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM intents WHERE fingerprint != ?", (fingerprint,))
+                self._db.commit()
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM intents")
+                self._db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,248 @@
+"""
+Nearest-Neighbour Intent Classifier
+Resolves paraphrases of known commands ("minimise the current", "it's too
+loud") locally, between the pattern matcher and the LLM.
+
+Every example utterance is embedded as a character n-gram TF-IDF vector
+(n-grams hashed into a fixed number of columns, so new examples never resize
+the index) and kept in a NumPy matrix. A query is answered by its single
+nearest example by cosine similarity, in well under a millisecond.
+
+Examples come from the recorded transcripts in training_data/voice_commands
+and from commands the user has confirmed, which are appended to a JSONL file
+and learned immediately, without refitting anything.
+"""
+
+import copy
+import glob
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# British -ise spellings ("minimise", "maximising") map to -ize, as transcribed by Whisper
+BRITISH_ISE = re.compile(r"\b(\w{3,})is(e|es|ed|ing|ation)\b")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation (keeping apostrophes), unify -ise/-ize, collapse whitespace."""
+    text = re.sub(r"[^\w\s']", " ", text.lower())
+    return " ".join(BRITISH_ISE.sub(r"\1iz\2", text).split())
+
+
+def char_ngrams(text: str, sizes=(2, 3, 4)) -> List[str]:
+    """Character n-grams of each word, padded so word starts and ends count."""
+    grams = []
+    for word in text.split():
+        padded = f" {word} "
+        for size in sizes:
+            grams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return grams
+
+
+class IntentClassifier:
+    """
+    Character n-gram TF-IDF nearest-neighbour classifier.
+
+    Args:
+        threshold: Minimum cosine similarity for predict() to answer
+        margin: A runner-up with a different command must be at least this
+            much less similar, otherwise the match is ambiguous
+        dimensions: Number of hashed n-gram columns
+        path: JSONL file of confirmed examples (loaded now, appended to by confirm())
+    """
+
+    def __init__(self, threshold: float = 0.7, margin: float = 0.05, dimensions: int = 4096, path: str = None):
+        self.threshold = threshold
+        self.margin = margin
+        self.dimensions = dimensions
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows = np.zeros((64, dimensions), dtype=np.float32)  # sublinear tf, grown by doubling
+        self._presence = np.zeros((8, dimensions), dtype=bool)  # n-grams seen per class
+        self._gram_columns: Dict[str, int] = {}
+        self._weighted = None  # tf-idf rows, L2-normalised; rebuilt after adds
+        self._idf = None
+        self.texts: List[str] = []
+        self.commands: List[Optional[Dict[str, Any]]] = []
+        self._class_ids: Dict[str, int] = {}  # distinct command -> id
+        self._classes = np.zeros(64, dtype=np.int32)  # class id per row
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        example = json.loads(line)
+                        self.add(example["text"], example["command"])
+                    except (ValueError, KeyError):
+                        continue
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed column indices and sublinear term frequencies of a text."""
+        cache = self._gram_columns
+        if len(cache) > 100_000:
+            cache.clear()
+        counts = {}
+        for gram in char_ngrams(normalize(text)):
+            column = cache.get(gram)
+            if column is None:
+                column = cache[gram] = zlib.crc32(gram.encode("utf-8")) % self.dimensions
+            counts[column] = counts.get(column, 0) + 1
+        columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        return columns, 1.0 + np.log(tf)
+
+    def add(self, text: str, command: Optional[Dict[str, Any]]) -> bool:
+        """
+        Add one example. A None command marks text that is known not to be
+        a command this classifier should answer (predict() abstains on it).
+
+        Returns:
+            False if the text has no usable characters
+        """
+        columns, weights = self._features(text)
+        if not len(columns):
+            return False
+        with self._lock:
+            row = len(self.texts)
+            if row == len(self._rows):
+                grown = np.zeros((2 * len(self._rows), self.dimensions), dtype=np.float32)
+                grown[:row] = self._rows
+                self._rows = grown
+                self._classes = np.resize(self._classes, 2 * len(self._classes))
+            class_id = self._class_ids.setdefault(json.dumps(command, sort_keys=True), len(self._class_ids))
+            if class_id == len(self._presence):
+                self._presence = np.vstack([self._presence, np.zeros_like(self._presence)])
+            self._rows[row, columns] = weights
+            self._classes[row] = class_id
+            self._presence[class_id, columns] = True
+            self.texts.append(normalize(text))
+            self.commands.append(command)
+            self._weighted = None
+        return True
+
+    def load_transcripts(self, directory: str, label_command: Callable[[str], Optional[Dict[str, Any]]]) -> int:
+        """
+        Learn from recorded transcripts (*_metadata.json lists of
+        {"recognized_text", "expected_command"}).
+
+        Args:
+            directory: Folder with the metadata files
+            label_command: Maps an expected_command label to the command it
+                stands for, or None for labels with no executor command
+
+        Returns:
+            Number of examples added
+        """
+        added = 0
+        commands = {}
+        for metadata in sorted(glob.glob(os.path.join(directory, "*_metadata.json"))):
+            try:
+                with open(metadata, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for entry in entries:
+                label = entry.get("expected_command")
+                text = entry.get("recognized_text")
+                if not label or not text:
+                    continue
+                if label not in commands:
+                    commands[label] = label_command(label)
+                added += self.add(text, commands[label])
+        return added
+
+    def _index(self):
+        """
+        tf-idf matrix (lock held); rebuilt lazily so adds stay O(row).
+
+        Document frequency counts classes rather than examples: ten
+        recordings of "minimise" should not make "minimise" a common word.
+        """
+        if self._weighted is None:
+            classes = len(self._class_ids)
+            df = self._presence[:classes].sum(axis=0)
+            self._idf = (np.log((1.0 + classes) / (1.0 + df)) + 1.0).astype(np.float32)
+            weighted = self._rows[:len(self.texts)] * self._idf
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            self._weighted = weighted / np.maximum(norms, 1e-9)
+        return self._weighted, self._idf
+
+    def nearest(self, text: str) -> Tuple[int, float, float]:
+        """
+        Nearest example to a text.
+
+        Returns:
+            (example index or -1, its cosine similarity, similarity of the
+            best example with a different command)
+        """
+        columns, weights = self._features(text)
+        with self._lock:
+            if not len(columns) or not self.texts:
+                return -1, 0.0, 0.0
+            weighted, idf = self._index()
+            query = weights * idf[columns]
+            query /= max(float(np.linalg.norm(query)), 1e-9)
+            # The query is sparse: only its own columns contribute
+            scores = weighted[:, columns] @ query
+            best = int(np.argmax(scores))
+            others = scores[self._classes[:len(scores)] != self._classes[best]]
+        runner_up = float(others.max()) if len(others) else 0.0
+        return best, float(scores[best]), runner_up
+
+    def predict(self, text: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Classify a text.
+
+        Returns:
+            (command, similarity), with command None when the nearest example
+            is not similar enough, is ambiguous, or is a non-command example
+        """
+        best, score, runner_up = self.nearest(text)
+        if best < 0 or score < self.threshold or score - runner_up < self.margin:
+            return None, score
+        command = self.commands[best]
+        return copy.deepcopy(command), score
+
+    @staticmethod
+    def learnable(command: Optional[Dict[str, Any]]) -> bool:
+        """
+        Whether a command can be learned from one utterance. Commands that
+        carry a path or a specific target ("open report.docx", "open zoom")
+        depend on words a neighbour would not share, so they are left to the
+        pattern matcher and the LLM.
+        """
+        if not command or not command.get("action") or command.get("path"):
+            return False
+        return command.get("target") in (None, "", "current")
+
+    def confirm(self, text: str, command: Dict[str, Any]) -> bool:
+        """
+        Learn a confirmed (text, command) pair and persist it.
+
+        Returns:
+            True if it was added; False if the command is not learnable or
+            the classifier already answers the text with it
+        """
+        if not self.learnable(command):
+            return False
+        known, _ = self.predict(text)
+        if known == command:
+            return False
+        if not self.add(text, command):
+            return False
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"text": normalize(text), "command": command}) + "\n")
+            except OSError:
+                pass  # learned for this session only
+        return True
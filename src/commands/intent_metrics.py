@@ -0,0 +1,124 @@
+"""
+Intent Resolution Metrics
+Counts how often each resolution tier (cache, pattern, classifier, llm,
+pattern_low, miss) answers a command and how long it takes, so the effect
+of the tiering can be checked at runtime. Also tracks how often LLM output fails to parse
+or validate.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any
+
+
+class IntentMetrics:
+    """
+    Thread-safe per-tier hit counter and latency recorder.
+
+    Args:
+        window: Number of recent latency samples kept per tier for percentiles
+    """
+
+    TIERS = ("cache", "pattern", "classifier", "llm", "pattern_low", "miss")
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all counters and samples."""
+        with self._lock:
+            self._counts = {tier: 0 for tier in self.TIERS}
+            self._total_ms = {tier: 0.0 for tier in self.TIERS}
+            self._samples = {tier: deque(maxlen=self.window) for tier in self.TIERS}
+            self._llm_outputs = 0
+            self._llm_failures = 0
+            self._last_failure = None
+
+    def record(self, tier: str, latency_ms: float):
+        """
+        Record one resolved utterance.
+
+        Args:
+            tier: The tier that produced the final answer
+            latency_ms: End-to-end resolution time in milliseconds
+        """
+        with self._lock:
+            if tier not in self._counts:
+                self._counts[tier] = 0
+                self._total_ms[tier] = 0.0
+                self._samples[tier] = deque(maxlen=self.window)
+            self._counts[tier] += 1
+            self._total_ms[tier] += latency_ms
+            self._samples[tier].append(latency_ms)
+
+    def record_parse(self, ok: bool, reason: str = None):
+        """
+        Record whether one LLM response became a valid command.
+
+        Args:
+            ok: True if it parsed and validated
+            reason: Why it did not (unparseable JSON, unknown action, ...)
+        """
+        with self._lock:
+            self._llm_outputs += 1
+            if not ok:
+                self._llm_failures += 1
+                self._last_failure = reason
+
+    @staticmethod
+    def _percentile(sorted_values, pct: float) -> float:
+        if not sorted_values:
+            return 0.0
+        index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict with the total count; per tier, count, hit rate and
+            mean/p50/p95 latency in milliseconds; and llm_output with the
+            parse/validation failure rate of LLM responses
+        """
+        with self._lock:
+            total = sum(self._counts.values())
+            tiers = {}
+            for tier, count in self._counts.items():
+                samples = sorted(self._samples[tier])
+                tiers[tier] = {
+                    "count": count,
+                    "hit_rate": round(count / total, 3) if total else 0.0,
+                    "mean_ms": round(self._total_ms[tier] / count, 2) if count else 0.0,
+                    "p50_ms": round(self._percentile(samples, 50), 2),
+                    "p95_ms": round(self._percentile(samples, 95), 2),
+                }
+            llm_output = {
+                "responses": self._llm_outputs,
+                "failures": self._llm_failures,
+                "failure_rate": round(self._llm_failures / self._llm_outputs, 3) if self._llm_outputs else 0.0,
+                "last_failure": self._last_failure,
+            }
+        return {"total": total, "tiers": tiers, "llm_output": llm_output}
+
+    def format_report(self) -> str:
+        """Human-readable one-line-per-tier summary."""
+        snapshot = self.snapshot()
+        lines = [f"📊 Intent resolution: {snapshot['total']} commands"]
+        for tier, stats in snapshot["tiers"].items():
+            if not stats["count"]:
+                continue
+            lines.append(
+                f"   {tier:<12} {stats['count']:>5} ({stats['hit_rate']:6.1%})  "
+                f"mean {stats['mean_ms']:8.2f} ms  p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms"
+            )
+        output = snapshot["llm_output"]
+        if output["responses"]:
+            line = (f"   LLM output: {output['failures']}/{output['responses']} invalid "
+                    f"({output['failure_rate']:.1%})")
+            if output["last_failure"]:
+                line += f", last: {output['last_failure']}"
+            lines.append(line)
+        return "\n".join(lines)
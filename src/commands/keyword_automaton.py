@@ -0,0 +1,88 @@
+"""
+Aho-Corasick keyword automaton.
+
+Finds every keyword occurring in a text in a single left-to-right pass,
+independent of the number of keywords. Each keyword carries an integer
+payload (typically a bitmask); scan() returns the OR of the payloads of all
+keywords found, which lets callers turn "which trigger words are present"
+into "which rules can possibly match" without looping over the rules.
+"""
+
+from collections import deque
+from typing import Dict, Set
+
+
+class KeywordAutomaton:
+    """
+    Multi-pattern substring matcher.
+
+    Args:
+        keywords: Mapping of keyword -> integer payload
+    """
+
+    def __init__(self, keywords: Dict[str, int]):
+        self._goto = [{}]      # state -> {char: next state}
+        self._fail = [0]       # state -> failure link
+        self._payload = [0]    # state -> OR of payloads of keywords ending here (incl. via fail links)
+        self._words = [set()]  # state -> keywords ending here (incl. via fail links)
+
+        for word, payload in keywords.items():
+            if not word:
+                continue
+            state = 0
+            for char in word:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._payload.append(0)
+                    self._words.append(set())
+                    self._goto[state][char] = nxt
+                state = nxt
+            self._payload[state] |= payload
+            self._words[state].add(word)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._payload[nxt] |= self._payload[self._fail[nxt]]
+                self._words[nxt] |= self._words[self._fail[nxt]]
+
+    def _states(self, text: str):
+        goto, fail = self._goto, self._fail
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield state
+
+    def scan(self, text: str) -> int:
+        """Return the OR of the payloads of every keyword found in text."""
+        goto, fail, payload = self._goto, self._fail, self._payload
+        state = 0
+        found = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= payload[state]
+        return found
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords found in text."""
+        words = set()
+        for state in self._states(text):
+            words |= self._words[state]
+        return words
@@ -0,0 +1,444 @@
+"""
+Ollama HTTP Client
+Keeps a pooled keep-alive session to the Ollama server and streams
+generations, stopping as soon as the model has produced one complete JSON
+object. The command generator only ever needs that object; everything the
+model would write after it (up to num_predict tokens) is wasted time.
+
+AsyncOllamaClient does the same for asyncio callers (the WebSocket server):
+it speaks HTTP/1.1 over asyncio streams, so a pending generation never
+blocks the event loop and many can be in flight at once.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+
+
+class JsonObjectScanner:
+    """
+    Incremental detector for the first complete top-level JSON object.
+
+    Feed text chunks as they arrive; once the braces of the first object
+    balance (ignoring braces inside strings), feed() returns the object text.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Consume a chunk of generated text.
+
+        Returns:
+            The complete object text (from its opening brace) once it has
+            closed, otherwise None
+        """
+        begin = 0
+        for index, char in enumerate(chunk):
+            if not self.started:
+                if char != "{":
+                    continue
+                self.started = True
+                begin = index
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.buffer.append(chunk[begin:index + 1])
+                    return "".join(self.buffer)
+        if self.started:
+            self.buffer.append(chunk[begin:])
+        return None
+
+
+class OllamaClient:
+    """
+    Pooled, streaming client for the Ollama HTTP API.
+
+    Args:
+        base_url: Server root (default: http://localhost:11434)
+        pool_size: Maximum keep-alive connections kept open
+    """
+
+    DEFAULT_URL = "http://localhost:11434"
+
+    def __init__(self, base_url: str = None, pool_size: int = 4):
+        self.base_url = (base_url or self.DEFAULT_URL).rstrip("/")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "early_exits": 0,
+            "first_token_ms": 0.0,
+            "total_ms": 0.0,
+        }
+        self.last_timings: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_generate_url(cls, generate_url: str, **kwargs) -> "OllamaClient":
+        """Build a client from a full .../api/generate URL."""
+        base = generate_url.split("/api/")[0] if "/api/" in generate_url else generate_url
+        return cls(base, **kwargs)
+
+    def tags(self, timeout: float = 2) -> Dict[str, Any]:
+        """
+        List installed models (GET /api/tags).
+
+        Raises:
+            requests.exceptions.RequestException on connection or HTTP errors
+        """
+        response = self.session.get(f"{self.base_url}/api/tags", timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def timings(event: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Extract Ollama's timing fields from a final (done) event.
+
+        Returns:
+            Dict with load_ms, prompt_eval_count, prompt_eval_ms, eval_count,
+            eval_ms and total_ms (durations converted from nanoseconds)
+        """
+        return {
+            "load_ms": round(event.get("load_duration", 0) / 1e6, 2),
+            "prompt_eval_count": event.get("prompt_eval_count", 0),
+            "prompt_eval_ms": round(event.get("prompt_eval_duration", 0) / 1e6, 2),
+            "eval_count": event.get("eval_count", 0),
+            "eval_ms": round(event.get("eval_duration", 0) / 1e6, 2),
+            "total_ms": round(event.get("total_duration", 0) / 1e6, 2),
+        }
+
+    def preload(self, model: str, keep_alive: str = "30m", timeout: float = 120) -> Dict[str, float]:
+        """
+        Load a model into memory without generating anything and keep it resident.
+
+        Args:
+            model: Model name
+            keep_alive: How long Ollama keeps the model loaded after the last request
+            timeout: Seconds to wait for the load
+
+        Returns:
+            Timing fields of the load (see timings())
+
+        Raises:
+            requests.exceptions.RequestException on connection, timeout or HTTP errors
+        """
+        response = self.session.post(f"{self.base_url}/api/generate",
+                                     json={"model": model, "keep_alive": keep_alive, "stream": False},
+                                     timeout=timeout)
+        response.raise_for_status()
+        return self.timings(response.json())
+
+    def generate(self, payload: Dict[str, Any], timeout: float = 30) -> Dict[str, Any]:
+        """
+        Run a whole generation without streaming and return the final event,
+        including the response text and timing fields.
+        """
+        response = self.session.post(f"{self.base_url}/api/generate", json=dict(payload, stream=False),
+                                     timeout=timeout)
+        response.raise_for_status()
+        event = response.json()
+        self.last_timings = self.timings(event)
+        return event
+
+    def generate_json(self, payload: Dict[str, Any], timeout: float = 30,
+                      deadline: float = None, validator=None) -> Optional[str]:
+        """
+        Stream a generation and return as soon as one JSON object is complete.
+
+        Closing the response early drops the connection, which makes Ollama
+        stop generating; the pool opens a fresh connection for the next call.
+
+        Args:
+            payload: /api/generate request body ("stream" is forced on)
+            timeout: Connect/read timeout in seconds, or a (connect, read) tuple
+            deadline: Total seconds allowed for the whole call; a server that
+                keeps trickling tokens never trips the read timeout alone
+            validator: Optional object whose feed(token) sees every token and
+                raises to abandon the generation early (see CommandStreamValidator)
+
+        Returns:
+            The JSON object text, or the whole response text if the model
+            finished without producing one
+
+        Raises:
+            requests.exceptions.RequestException on connection, timeout or HTTP errors,
+            and whatever the validator raises
+        """
+        body = dict(payload, stream=True)
+        start = time.perf_counter()
+        first_token_ms = None
+        scanner = JsonObjectScanner()
+        parts = []
+        early = False
+
+        response = self.session.post(f"{self.base_url}/api/generate", json=body, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+            # chunk_size=None yields each chunk as it arrives instead of waiting for 512 bytes
+            for line in response.iter_lines(chunk_size=None):
+                if deadline is not None and time.perf_counter() - start > deadline:
+                    raise requests.exceptions.ReadTimeout(f"No JSON object within {deadline:.1f}s")
+                if not line:
+                    continue
+                event = json.loads(line)
+                token = event.get("response", "")
+                if token:
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - start) * 1000
+                    parts.append(token)
+                    if validator is not None:
+                        validator.feed(token)
+                    found = scanner.feed(token)
+                    if found is not None:
+                        early = not event.get("done", False)
+                        if not early:
+                            self.last_timings = self.timings(event)
+                        return found
+                if event.get("done"):
+                    self.last_timings = self.timings(event)
+                    break
+            return "".join(parts).strip()
+        except requests.exceptions.ConnectionError as e:
+            # requests reports a read timeout mid-stream as a ConnectionError
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                raise requests.exceptions.ReadTimeout(e) from e
+            raise
+        finally:
+            response.close()
+            with self._lock:
+                self.stats["requests"] += 1
+                self.stats["early_exits"] += int(early)
+                self.stats["first_token_ms"] += first_token_ms or 0.0
+                self.stats["total_ms"] += (time.perf_counter() - start) * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request count, early exits and average first-token/total latency."""
+        with self._lock:
+            stats = dict(self.stats)
+        requests_made = max(1, stats["requests"])
+        stats["avg_first_token_ms"] = round(stats.pop("first_token_ms") / requests_made, 2)
+        stats["avg_total_ms"] = round(stats.pop("total_ms") / requests_made, 2)
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+class OllamaHTTPError(Exception):
+    """Non-200 response from the Ollama server."""
+
+
+class AsyncOllamaClient:
+    """
+    asyncio counterpart of OllamaClient.generate_json() and tags().
+
+    Idle keep-alive connections are pooled for the event loop that opened
+    them. Failures surface as OSError (connection), asyncio.TimeoutError
+    (connect/read timeout or deadline) or OllamaHTTPError.
+
+    Args:
+        base_url: Server root (default: http://localhost:11434)
+        pool_size: Maximum idle keep-alive connections kept open
+    """
+
+    def __init__(self, base_url: str = None, pool_size: int = 8):
+        self.base_url = (base_url or OllamaClient.DEFAULT_URL).rstrip("/")
+        parts = urlsplit(self.base_url)
+        if parts.scheme != "http":
+            raise ValueError(f"AsyncOllamaClient only speaks plain http, not {parts.scheme}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.pool_size = pool_size
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._loop = None
+        self.stats = {"requests": 0, "early_exits": 0, "connections": 0}
+        self.last_timings: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_generate_url(cls, generate_url: str, **kwargs) -> "AsyncOllamaClient":
+        """Build a client from a full .../api/generate URL."""
+        base = generate_url.split("/api/")[0] if "/api/" in generate_url else generate_url
+        return cls(base, **kwargs)
+
+    async def _connect(self, connect_timeout: float):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Streams belong to the loop that opened them
+            self._drop_idle()
+            self._loop = loop
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        self.stats["connections"] += 1
+        return await asyncio.wait_for(asyncio.open_connection(self.host, self.port), connect_timeout)
+
+    def _release(self, reader, writer, reusable: bool):
+        if reusable and len(self._idle) < self.pool_size and asyncio.get_running_loop() is self._loop:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    def _drop_idle(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+    async def _request(self, method: str, path: str, body: bytes, connect_timeout: float, read_timeout: float):
+        """Send a request and read the status line and headers; returns (reader, writer, headers)."""
+        reader, writer = await self._connect(connect_timeout)
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), read_timeout)
+            if not status_line:
+                raise ConnectionResetError("Ollama closed the connection")
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), read_timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            status = int(status_line.split()[1])
+        except BaseException:
+            writer.close()
+            raise
+        if status != 200:
+            writer.close()
+            raise OllamaHTTPError(f"HTTP {status} from {path}")
+        return reader, writer, headers
+
+    @staticmethod
+    async def _body_chunks(reader: asyncio.StreamReader, headers: Dict[str, str], read_timeout: float):
+        """Yield the response body as it arrives (chunked or Content-Length)."""
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), read_timeout)
+                if not size_line:
+                    raise asyncio.IncompleteReadError(b"", None)
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    await asyncio.wait_for(reader.readline(), read_timeout)  # trailer end
+                    return
+                data = await asyncio.wait_for(reader.readexactly(size + 2), read_timeout)
+                yield data[:-2]
+        else:
+            remaining = int(headers.get("content-length", "0"))
+            while remaining > 0:
+                data = await asyncio.wait_for(reader.read(min(remaining, 65536)), read_timeout)
+                if not data:
+                    raise asyncio.IncompleteReadError(b"", remaining)
+                remaining -= len(data)
+                yield data
+
+    @staticmethod
+    def _timeouts(timeout) -> Tuple[float, float]:
+        return tuple(timeout) if isinstance(timeout, (tuple, list)) else (timeout, timeout)
+
+    async def tags(self, timeout: float = 2) -> Dict[str, Any]:
+        """List installed models (GET /api/tags)."""
+        connect_timeout, read_timeout = self._timeouts(timeout)
+        reader, writer, headers = await self._request("GET", "/api/tags", b"", connect_timeout, read_timeout)
+        try:
+            body = b"".join([chunk async for chunk in self._body_chunks(reader, headers, read_timeout)])
+        except BaseException:
+            writer.close()
+            raise
+        self._release(reader, writer, headers.get("connection", "").lower() != "close")
+        return json.loads(body)
+
+    async def generate_json(self, payload: Dict[str, Any], timeout=30, deadline: float = None,
+                            validator=None) -> Optional[str]:
+        """
+        Stream a generation and return as soon as one JSON object is complete
+        (see OllamaClient.generate_json; same arguments and result).
+
+        Raises:
+            OSError, asyncio.TimeoutError or OllamaHTTPError, and whatever
+            the validator raises
+        """
+        connect_timeout, read_timeout = self._timeouts(timeout)
+        body = json.dumps(dict(payload, stream=True)).encode("utf-8")
+        start = time.perf_counter()
+        scanner = JsonObjectScanner()
+        parts = []
+        pending = b""
+        finished = False
+        self.stats["requests"] += 1
+
+        async def stream():
+            nonlocal pending, finished
+            reader, writer, headers = await self._request("POST", "/api/generate", body, connect_timeout, read_timeout)
+            try:
+                async for data in self._body_chunks(reader, headers, read_timeout):
+                    pending += data
+                    *lines, pending = pending.split(b"\n")
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        event = json.loads(line)
+                        token = event.get("response", "")
+                        if token:
+                            parts.append(token)
+                            if validator is not None:
+                                validator.feed(token)
+                            found = scanner.feed(token)
+                            if found is not None:
+                                if event.get("done"):
+                                    self.last_timings = OllamaClient.timings(event)
+                                else:
+                                    self.stats["early_exits"] += 1
+                                return found
+                        if event.get("done"):
+                            self.last_timings = OllamaClient.timings(event)
+                            finished = True
+                finished = True
+                return "".join(parts).strip()
+            finally:
+                # An abandoned stream is closed so Ollama stops generating
+                if finished:
+                    self._release(reader, writer, headers.get("connection", "").lower() != "close")
+                else:
+                    writer.close()
+
+        if deadline is None:
+            return await stream()
+        try:
+            return await asyncio.wait_for(stream(), max(0.0, deadline - (time.perf_counter() - start)))
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"No JSON object within {deadline:.1f}s") from None
+
+    async def close(self):
+        """Close idle connections."""
+        self._drop_idle()
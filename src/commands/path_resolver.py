@@ -0,0 +1,276 @@
+"""
+Path Resolver
+Turns a symbolic "open the file named X" intent into a path, off the thread
+that parsed it.
+
+Intent parsing used to glob the whole home directory inline, so a spoken
+"open report" could stall for seconds before anything was said back. Now the
+parser only emits {"action": "open_file_by_name", ...}; the search runs on a
+worker thread with a deadline and can be cancelled, and the assistant
+acknowledges the command while it runs.
+
+The search order matches the old inline lookup: Desktop, Documents,
+Downloads and the home folder first (one level), then a walk of the whole
+home folder, skipping hidden directories as glob does. With a FileCatalog
+that has finished its first crawl, the name is looked up in the catalog
+instead and the walk is skipped. A name the catalog does not know is only
+looked for in those first-level folders (a file saved a moment ago), while
+the catalog refreshes in the background.
+
+With a FrecencyStore, a file the user opened before under that very name
+("report" -> the report.pdf they use, of several) is answered from its
+in-memory entries first, and catalog candidates are ranked by frecency
+before the first one is taken. A file whose name only contains the spoken
+one is taken from the store only without a catalog, and only once it has
+been opened often.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .file_catalog import FileCatalog
+    from .frecency import FrecencyStore
+except ImportError:
+    from file_catalog import FileCatalog
+    from frecency import FrecencyStore
+
+
+class PathLookup:
+    """
+    One in-flight search. Behaves like a future of Optional[str].
+
+    Args:
+        name: Spoken file name (without extension)
+        extension: Extension including the dot, or None for any
+        deadline: Seconds the search may run before giving up
+    """
+
+    def __init__(self, name: str, extension: Optional[str], deadline: float):
+        self.name = name
+        self.extension = extension
+        self.deadline_at = time.monotonic() + deadline
+        self.future: Future = Future()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Stop the search at the next directory; result() then returns None."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def expired(self) -> bool:
+        return self._cancelled.is_set() or time.monotonic() > self.deadline_at
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float = None) -> Optional[str]:
+        """
+        Wait for the path.
+
+        Args:
+            timeout: Seconds to wait (default: until the lookup's deadline)
+
+        Returns:
+            The first matching path, or None if nothing matched in time
+        """
+        if timeout is None:
+            timeout = max(0.0, self.deadline_at - time.monotonic()) + 0.5
+        try:
+            return self.future.result(timeout)
+        except Exception:
+            return None
+
+    def add_done_callback(self, callback):
+        """Call callback(path_or_None) when the search finishes."""
+        self.future.add_done_callback(lambda f: callback(None if f.cancelled() else f.result()))
+
+
+class PathResolver:
+    """
+    Resolves file names to paths on a small thread pool.
+
+    Concurrent requests for the same (name, extension) share one search,
+    so starting a lookup early (at acknowledgement time) and asking again at
+    execution time costs nothing extra.
+
+    Args:
+        search_locations: Folders searched one level deep, in order (default:
+            Desktop, Documents, Downloads, home)
+        root: Folder walked recursively afterwards (default: home)
+        deadline: Default seconds a search may take
+        max_workers: Concurrent searches
+        catalog: FileCatalog consulted instead of walking the disk, once it
+            has finished its first crawl (optional)
+        frecency: FrecencyStore of previously opened files, consulted first
+            and used to rank catalog candidates (optional)
+    """
+
+    DEFAULT_DEADLINE = 3.0
+    # Catalog matches ranked by frecency per lookup
+    CANDIDATES = 10
+
+    def __init__(self, search_locations: List[str] = None, root: str = None,
+                 deadline: float = DEFAULT_DEADLINE, max_workers: int = 2, catalog: FileCatalog = None,
+                 frecency: FrecencyStore = None):
+        home = os.path.expanduser("~")
+        self.root = root or home
+        self.search_locations = search_locations or [
+            os.path.join(home, "Desktop"),
+            os.path.join(home, "Documents"),
+            os.path.join(home, "Downloads"),
+            home,
+        ]
+        self.deadline = deadline
+        self.catalog = catalog
+        self.frecency = frecency
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="path-resolver")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, Optional[str]], PathLookup] = {}
+
+    def resolve(self, name: str, extension: str = None, deadline: float = None) -> PathLookup:
+        """
+        Start (or join) a search for a file.
+
+        Args:
+            name: Spoken file name ("linux", "harish.txt")
+            extension: Extension with or without the dot, or None for any
+            deadline: Seconds the search may run (default: self.deadline)
+
+        Returns:
+            A PathLookup; call result() to wait for the path
+        """
+        if extension and not extension.startswith("."):
+            extension = "." + extension
+        key = (name.lower(), extension)
+        with self._lock:
+            lookup = self._in_flight.get(key)
+            if lookup is not None and not lookup.cancelled:
+                return lookup
+            lookup = self._in_flight[key] = PathLookup(name, extension, self.deadline if deadline is None else deadline)
+        lookup.future.add_done_callback(lambda _: self._forget(key, lookup))
+        try:
+            self._pool.submit(self._run, lookup)
+        except RuntimeError:  # pool shut down
+            lookup.future.set_result(None)
+        return lookup
+
+    def _forget(self, key, lookup):
+        with self._lock:
+            if self._in_flight.get(key) is lookup:
+                del self._in_flight[key]
+
+    def _run(self, lookup: PathLookup):
+        try:
+            lookup.future.set_result(self.find(lookup.name, lookup.extension, lookup))
+        except Exception as e:
+            lookup.future.set_exception(e)
+
+    @staticmethod
+    def patterns(name: str, extension: str = None) -> List[str]:
+        """Glob patterns for a spoken name, tried in order."""
+        suffix = extension or ""
+        name_clean = re.sub(r'[^\w]', '', name)  # Remove special chars
+        patterns = [f"*{name_clean}*{suffix}", f"*{name}*{suffix}"]
+        return list(dict.fromkeys(os.path.normcase(p) for p in patterns))
+
+    def find(self, name: str, extension: str = None, lookup: PathLookup = None) -> Optional[str]:
+        """
+        Search synchronously (on the calling thread).
+
+        Args:
+            name: Spoken file name
+            extension: Extension including the dot, or None for any
+            lookup: Checked between directories; the search stops once it
+                is cancelled or past its deadline
+
+        Returns:
+            The first matching path, or None
+        """
+        catalog_ready = self.catalog is not None and self.catalog.ready
+        if self.frecency is not None:
+            # With a catalog, a file named exactly so beats a frecent partial
+            # match; _find_in_catalog ranks its candidates by frecency instead
+            path = self.frecency.best(name, "file", extension, partial=not catalog_ready)
+            if path and os.path.exists(path):
+                return path
+
+        if catalog_ready:
+            return self._find_in_catalog(name, extension, lookup)
+
+        patterns = self.patterns(name, extension)
+        found = self._find_in_locations(patterns, lookup)
+        if found or (lookup is not None and lookup.expired()):
+            return found
+
+        for directory, subdirs, files in os.walk(self.root):
+            if lookup is not None and lookup.expired():
+                return None
+            subdirs[:] = sorted(d for d in subdirs if not d.startswith("."))
+            found = self._match_in(directory, sorted(subdirs + [f for f in files if not f.startswith(".")]), patterns)
+            if found:
+                return found
+        return None
+
+    def _find_in_locations(self, patterns: List[str], lookup: Optional[PathLookup]) -> Optional[str]:
+        """First match directly inside one of the search locations."""
+        for location in self.search_locations:
+            if lookup is not None and lookup.expired():
+                return None
+            found = self._match_in(location, self._list(location), patterns)
+            if found:
+                return found
+        return None
+
+    def _find_in_catalog(self, name: str, extension: Optional[str], lookup: Optional[PathLookup]) -> Optional[str]:
+        """
+        Catalog lookup (exact, prefix, substring, then misheard names). With
+        a frecency store, the candidates of the first stage that matched are
+        ranked by it. On a miss, only the search locations themselves are
+        listed, within the lookup's deadline, and the catalog is brought up
+        to date in the background for the next lookup: a crawl would not
+        fit the deadline on a large home folder.
+        """
+        names = list(dict.fromkeys([name, re.sub(r'[^\w]', '', name)]))
+        for candidate in names:
+            if self.frecency is None:
+                paths = self.catalog.fuzzy_find(candidate, extension, limit=1)
+            else:
+                paths = self.frecency.rank(self.catalog.fuzzy_find(candidate, extension, limit=self.CANDIDATES,
+                                                                   first_stage=True))
+            for path in paths:
+                if os.path.exists(path):
+                    return path
+        self.catalog.refresh_soon()
+        return self._find_in_locations(self.patterns(name, extension), lookup)
+
+    @staticmethod
+    def _list(directory: str) -> List[str]:
+        try:
+            return sorted(entry for entry in os.listdir(directory) if not entry.startswith("."))
+        except OSError:
+            return []
+
+    @staticmethod
+    def _match_in(directory: str, entries: List[str], patterns: List[str]) -> Optional[str]:
+        for pattern in patterns:
+            for entry in entries:
+                if fnmatch.fnmatchcase(os.path.normcase(entry), pattern):
+                    return os.path.join(directory, entry)
+        return None
+
+    def close(self):
+        """Cancel running searches and stop the workers."""
+        with self._lock:
+            lookups = list(self._in_flight.values())
+        for lookup in lookups:
+            lookup.cancel()
+        self._pool.shutdown(wait=False)
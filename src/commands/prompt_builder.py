@@ -0,0 +1,289 @@
+"""
+Retrieval Prompt Builder
+Builds a small LLM prompt per utterance instead of sending the whole action
+catalog and every example each time.
+
+The compact core prompt (output format and rules) is identical for every
+call, so it goes in the "system" field where Ollama keeps it cached. The
+per-utterance part only carries the k actions and k examples that a BM25
+index over the action catalog and example bank ranks most relevant.
+"""
+
+import json
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Spoken verbs -> the words the catalog uses, so "launch" finds open_app
+SYNONYMS = {
+    "launch": "open", "start": "open", "show": "open", "bring": "open",
+    "find": "search", "locate": "search", "lookup": "search", "google": "search",
+    "erase": "delete", "remove": "delete", "trash": "delete",
+    "louder": "volume", "quieter": "volume", "sound": "volume", "audio": "volume",
+    "terminate": "kill", "end": "kill", "quit": "close", "exit": "close",
+    "snap": "screenshot", "capture": "screenshot",
+    "dim": "brightness", "brighter": "brightness", "dimmer": "brightness",
+    "song": "media", "music": "media", "track": "media",
+    "website": "url", "site": "url", "browse": "url",
+    "reboot": "restart", "hibernate": "sleep", "power": "shutdown",
+    "make": "create", "new": "create", "folders": "folder", "files": "file",
+    "write": "type", "dictate": "type",
+    "image": "screenshot", "picture": "screenshot", "wireless": "wifi", "disconnect": "off",
+    "press": "keyboard", "hotkey": "keyboard", "shortcut": "keyboard",
+    "visit": "url", "com": "url", "org": "url", "net": "url", "io": "url",
+    "online": "web", "internet": "web",
+}
+
+STOPWORDS = {"the", "a", "an", "my", "to", "for", "of", "and", "on", "in", "please", "can", "you", "me", "it", "i", "is", "this"}
+
+# Action catalog: name -> one-line description with its argument convention
+ACTIONS = {
+    "open_app": 'Open an application (target = exe name like "chrome.exe", "notepad.exe", "explorer.exe")',
+    "open_file": "Open a specific file (path = full path to file)",
+    "open_file_by_name": 'Open a file whose folder is unknown (target = file name, extra.extension = ".pdf" etc. or "")',
+    "open_folder": "Open a folder in explorer (path = folder path)",
+    "search": 'Search for files (target = search pattern like "*.pdf", "*.docx", path = where to look)',
+    "search_and_open": "Search for files and open the first match (target = pattern, path = where to look)",
+    "create_file": "Create a new file (path = full path, extra.content = optional content)",
+    "create_and_open_file": "Create a file and open it in an editor (path = full path, extra.app = editor exe)",
+    "create_folder": "Create a new folder (path = folder path)",
+    "delete": "Delete file or folder (path = full path)",
+    "move": "Move file/folder (path = source, extra.destination = target)",
+    "rename": "Rename file/folder (path = full path, extra.new_name = new name)",
+    "copy": "Copy file/folder (path = source, extra.destination = target)",
+    "maximize_window": 'Maximize current/specified window (target = window title or "current")',
+    "minimize_window": 'Minimize current/specified window (target = window title or "current")',
+    "close_window": 'Close current/specified window (target = window title or "current")',
+    "switch_window": "Switch to a window (target = window title or app name)",
+    "run_command": "Run a shell command (extra.command = the command string)",
+    "open_control_panel": 'Open control panel (target = specific panel or "main")',
+    "open_settings": 'Open Windows settings (target = specific setting like "wifi", "display" or "main")',
+    "task_manager": "Open task manager",
+    "keyboard_action": 'Perform keyboard shortcut (extra.keys = list of keys like ["ctrl", "c"])',
+    "mouse_action": 'Perform mouse action (extra.action = "click"/"double_click"/"right_click", extra.x, extra.y)',
+    "volume_up": "Increase volume (extra.amount = optional percentage)",
+    "volume_down": "Decrease volume (extra.amount = optional percentage)",
+    "mute": "Mute/unmute audio",
+    "screenshot": "Take a screenshot (extra.save_path = optional path)",
+    "lock_screen": "Lock the computer",
+    "shutdown": "Shutdown computer (extra.delay = optional seconds)",
+    "restart": "Restart computer (extra.delay = optional seconds)",
+    "sleep": "Put computer to sleep",
+    "system_info": 'Report system status (extra.type = "cpu"/"memory"/"disk"/"network"/"battery"/"all")',
+    "web_search": "Search the web in the browser (target = search query)",
+    "brightness_up": "Increase screen brightness (extra.amount = optional percentage)",
+    "brightness_down": "Decrease screen brightness (extra.amount = optional percentage)",
+    "set_brightness": "Set screen brightness (extra.level = 0-100)",
+    "wifi_toggle": 'Turn wifi on/off (extra.state = "on"/"off"/"toggle")',
+    "bluetooth_toggle": "Toggle bluetooth",
+    "kill_process": 'Kill a running process (target = process name like "chrome")',
+    "list_processes": "List the top running processes (extra.count = how many)",
+    "media_play_pause": "Play or pause music/media",
+    "media_next": "Skip to the next song/track",
+    "media_previous": "Go back to the previous song/track",
+    "media_stop": "Stop music/media playback",
+    "open_url": "Open a website URL in the browser (target = url)",
+    "new_tab": "Open a new browser tab",
+    "close_tab": "Close the current browser tab",
+    "refresh_page": "Refresh/reload the current page",
+    "empty_recycle_bin": "Empty the recycle bin / trash",
+    "show_desktop": "Show the desktop (minimize all windows)",
+    "open_emoji_picker": "Open the emoji picker",
+    "open_clipboard_history": "Open clipboard history",
+    "night_light_toggle": "Toggle night light / blue light filter",
+    "airplane_mode_toggle": "Toggle airplane mode",
+    "type_text": "Type text at the cursor (extra.text = text to type)",
+    "voice_typing": "Start voice typing / dictation",
+    "scroll": 'Scroll the page (extra.direction = "up"/"down", extra.amount = lines)',
+    "click": 'Mouse click (extra.button = "left"/"right", extra.clicks, extra.x, extra.y)',
+}
+
+# Example bank: (utterance, command)
+EXAMPLES: List[Tuple[str, Dict]] = [
+    ("open chrome", {"action": "open_app", "target": "chrome.exe"}),
+    ("launch the calculator", {"action": "open_app", "target": "calc.exe"}),
+    ("search for my pdf files", {"action": "search", "target": "*.pdf", "path": "C:/Users/{username}"}),
+    ("find all word documents", {"action": "search", "target": "*.docx", "path": "C:/Users/{username}"}),
+    ("open the file called report.docx", {"action": "open_file", "path": "C:/Users/{username}/Documents/report.docx"}),
+    ("open my budget spreadsheet", {"action": "open_file_by_name", "target": "budget", "extra": {"extension": ".xlsx"}}),
+    ("open my downloads folder", {"action": "open_folder", "path": "C:/Users/{username}/Downloads"}),
+    ("close this window", {"action": "close_window", "target": "current"}),
+    ("maximize the window", {"action": "maximize_window", "target": "current"}),
+    ("switch to spotify", {"action": "switch_window", "target": "spotify"}),
+    ("create a folder called Projects on desktop", {"action": "create_folder", "path": "C:/Users/{username}/Desktop/Projects"}),
+    ("make a new file notes.txt on the desktop", {"action": "create_and_open_file", "path": "C:/Users/{username}/Desktop/notes.txt", "extra": {"app": "notepad.exe"}}),
+    ("delete the temp folder on my desktop", {"action": "delete", "path": "C:/Users/{username}/Desktop/temp"}),
+    ("move report.docx to documents", {"action": "move", "path": "C:/Users/{username}/Desktop/report.docx", "extra": {"destination": "C:/Users/{username}/Documents"}}),
+    ("rename notes.txt to ideas.txt", {"action": "rename", "path": "C:/Users/{username}/Desktop/notes.txt", "extra": {"new_name": "ideas.txt"}}),
+    ("copy budget.xlsx to my backup folder", {"action": "copy", "path": "C:/Users/{username}/Documents/budget.xlsx", "extra": {"destination": "C:/Users/{username}/Backup"}}),
+    ("take a screenshot", {"action": "screenshot"}),
+    ("open task manager", {"action": "open_app", "target": "taskmgr.exe"}),
+    ("turn up the volume", {"action": "volume_up", "extra": {"amount": 10}}),
+    ("make it quieter", {"action": "volume_down", "extra": {"amount": 10}}),
+    ("mute the sound", {"action": "mute"}),
+    ("lock my computer", {"action": "lock_screen"}),
+    ("shut down the pc in a minute", {"action": "shutdown", "extra": {"delay": 60}}),
+    ("run ipconfig", {"action": "run_command", "extra": {"command": "ipconfig"}}),
+    ("open display settings", {"action": "open_settings", "target": "display"}),
+    ("copy that", {"action": "keyboard_action", "extra": {"keys": ["ctrl", "c"]}}),
+    ("how much memory is in use", {"action": "system_info", "extra": {"type": "memory"}}),
+    ("search the web for python tutorials", {"action": "web_search", "target": "python tutorials"}),
+    ("make the screen brighter", {"action": "brightness_up", "extra": {"amount": 15}}),
+    ("set brightness to 40", {"action": "set_brightness", "extra": {"level": 40}}),
+    ("turn off wifi", {"action": "wifi_toggle", "extra": {"state": "off"}}),
+    ("kill chrome", {"action": "kill_process", "target": "chrome"}),
+    ("what programs are running", {"action": "list_processes", "extra": {"count": 10}}),
+    ("pause the music", {"action": "media_play_pause"}),
+    ("skip this song", {"action": "media_next"}),
+    ("go to github.com", {"action": "open_url", "target": "github.com"}),
+    ("open a new tab", {"action": "new_tab"}),
+    ("empty the trash", {"action": "empty_recycle_bin"}),
+    ("type hello world", {"action": "type_text", "extra": {"text": "hello world"}}),
+    ("scroll down", {"action": "scroll", "extra": {"direction": "down", "amount": 5}}),
+    ("turn on night light", {"action": "night_light_toggle"}),
+]
+
+CORE_PROMPT = """You are the command-generation brain for a Windows-automation system.
+Read the user's natural-language instruction and output one precise, executable command.
+
+Your output must ALWAYS be a single valid JSON object with this structure:
+{"action": "<action_name>", "target": "<file_or_app_or_window>", "path": "<path_if_needed>", "extra": {...}}
+
+Rules:
+- Output ONLY the JSON object, no explanations or markdown
+- Use one of the actions listed with the request
+- Use forward slashes in paths; default folders are C:/Users/{username}/Documents, /Desktop and /Downloads
+- For the current user, use the placeholder {username} which will be replaced
+- If information is missing but can be reasonably inferred, make the inference
+- If the request is unclear, still provide the best possible command
+
+Common executables: chrome.exe, firefox.exe, msedge.exe, notepad.exe, calc.exe, explorer.exe,
+cmd.exe, powershell.exe, taskmgr.exe, control.exe, ms-settings:, code.exe, winword.exe, excel.exe, powerpnt.exe"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with synonyms folded and stopwords dropped."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(SYNONYMS.get(token, token))
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class BM25Index:
+    """
+    Minimal Okapi BM25 over short documents.
+
+    Args:
+        documents: Token lists, one per document
+        k1, b: Standard BM25 parameters
+    """
+
+    def __init__(self, documents: Sequence[List[str]], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = sum(self.lengths) / max(1, len(self.lengths))
+        doc_freq = Counter(term for doc in documents for term in set(doc))
+        count = len(documents)
+        self.idf = {term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def top(self, query: List[str], k: int) -> List[Tuple[int, float]]:
+        """Return up to k (document index, score) pairs with a positive score, best first."""
+        scores = []
+        for index, freqs in enumerate(self.term_freqs):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / self.avg_length)
+            for term in query:
+                tf = freqs.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scores.append((index, score))
+        scores.sort(key=lambda item: -item[1])
+        return scores[:k]
+
+
+class PromptBuilder:
+    """
+    Per-utterance prompt with only the most relevant actions and examples.
+
+    Args:
+        k_actions: Actions retrieved per utterance (actions of the retrieved
+            examples are always added on top)
+        k_examples: Examples retrieved per utterance
+        actions: Action catalog (default: ACTIONS)
+        examples: Example bank (default: EXAMPLES)
+    """
+
+    # Always offered so the model has a safe choice for odd requests
+    DEFAULT_ACTIONS = ("open_app", "run_command")
+
+    def __init__(self, k_actions: int = 6, k_examples: int = 4, actions: Dict[str, str] = None,
+                 examples: List[Tuple[str, Dict]] = None):
+        self.k_actions = k_actions
+        self.k_examples = k_examples
+        self.actions = dict(actions or ACTIONS)
+        self.examples = list(examples or EXAMPLES)
+        self.core_prompt = CORE_PROMPT
+
+        self._action_names = list(self.actions)
+        self._action_index = BM25Index([
+            tokenize(name.replace("_", " ") + " " + description) for name, description in self.actions.items()
+        ])
+        self._example_index = BM25Index([
+            tokenize(utterance + " " + command["action"].replace("_", " ")) for utterance, command in self.examples
+        ])
+
+    def retrieve(self, utterance: str) -> Tuple[List[str], List[Tuple[str, Dict]]]:
+        """
+        Pick the actions and examples to show for an utterance.
+
+        Returns:
+            Tuple of (action names, examples)
+        """
+        query = tokenize(utterance)
+        examples = [self.examples[i] for i, _ in self._example_index.top(query, self.k_examples)]
+        names = [self._action_names[i] for i, _ in self._action_index.top(query, self.k_actions)]
+        for _, command in examples:
+            if command["action"] not in names:
+                names.append(command["action"])
+        for name in self.DEFAULT_ACTIONS:
+            if name not in names:
+                names.append(name)
+        return names, examples
+
+    def build(self, utterance: str) -> Tuple[str, str]:
+        """
+        Build the request text for one utterance.
+
+        Returns:
+            Tuple of (system prompt, prompt); the system prompt never changes
+        """
+        names, examples = self.retrieve(utterance)
+        lines = ["Available actions:"]
+        lines += [f'- "{name}": {self.actions[name]}' for name in names if name in self.actions]
+        if examples:
+            lines.append("")
+            lines.append("Examples:")
+            for example_utterance, command in examples:
+                lines.append(f'User: "{example_utterance}"')
+                lines.append(f"Output: {json.dumps(command)}")
+        lines.append("")
+        lines.append(f"User: {utterance}")
+        lines.append("Output:")
+        return self.core_prompt, "\n".join(lines)
+
+    def fingerprint_parts(self) -> List:
+        """Everything that changes the generated prompts (for cache fingerprints)."""
+        return [self.core_prompt, self.actions, self.examples, self.k_actions, self.k_examples]
@@ -0,0 +1,346 @@
+"""
+Shell Session Pool
+Keeps a few shells (PowerShell on Windows) running and sends them queries
+over stdin, instead of starting `powershell -Command` for every battery,
+CPU, memory, disk, brightness or process query. Starting PowerShell costs
+hundreds of milliseconds, while a query to a running session is answered
+in a few.
+
+    shells = ShellPool("powershell", size=2)
+    result = shells.run("(Get-WmiObject Win32_Battery).EstimatedChargeRemaining", timeout=5)
+    result.stdout   # "87\\n", as from subprocess.run(..., text=True)
+
+Each query is followed by a line printing a random sentinel and its status,
+so the reply ends where the sentinel appears. Queries run in their own
+scope (a script block in PowerShell, a subshell in bash): variables and
+"cd" do not carry over to the next query. A session is replaced when it has
+exited, when it fails the health check it gets after sitting idle, after
+max_uses queries, and when a query times out or is cancelled (its process
+tree is killed, since the query's state is unknown). stderr is discarded.
+
+bash stands in for PowerShell on Linux ("bash" shell), so the pool can be
+exercised anywhere.
+"""
+
+import base64
+import itertools
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+try:
+    from .execution_pool import TaskCancelled, current_task, kill_process_tree
+except ImportError:
+    from execution_pool import TaskCancelled, current_task, kill_process_tree
+
+
+class ShellSessionError(OSError):
+    """
+    A shell session exited or could not be started.
+
+    Args:
+        sent: The query had reached the shell, so it may have run
+    """
+
+    def __init__(self, message: str, sent: bool = False):
+        super().__init__(message)
+        self.sent = sent
+
+
+class _PowerShell:
+    argv = ["-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+    setup = "$ProgressPreference = 'SilentlyContinue'; [Console]::OutputEncoding = [Text.Encoding]::UTF8"
+    ping = "$null"
+
+    @staticmethod
+    def wrap(script: str, token: str) -> str:
+        # One line, whatever the script holds: `-Command -` runs stdin line by line
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        return ("try { & ([scriptblock]::Create([Text.Encoding]::UTF8.GetString("
+                f"[Convert]::FromBase64String('{encoded}')))) | Out-String -Stream; $zx = 0 }} "
+                f"catch {{ $zx = 1 }}; \"{token} $zx\"\n")
+
+
+class _Bash:
+    argv = ["--noprofile", "--norc", "-s"]
+    setup = ":"
+    ping = ":"
+
+    @staticmethod
+    def wrap(script: str, token: str) -> str:
+        # eval turns a syntax error into a status instead of ending the shell
+        quoted = "'" + script.replace("'", "'\\''") + "'"
+        return f"( eval {quoted} ) </dev/null\nprintf '%s %d\\n' '{token}' \"$?\"\n"
+
+
+class ShellSession:
+    """
+    One running shell.
+
+    Args:
+        executable: Shell to start ("powershell", "bash")
+        dialect: How to frame queries for it
+    """
+
+    def __init__(self, executable: str, dialect):
+        self.dialect = dialect
+        self.uses = 0
+        self.last_used = time.monotonic()
+        self._token = f"__zx_{uuid.uuid4().hex}_"
+        self._ids = itertools.count()
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        kwargs = {"start_new_session": True} if os.name != "nt" else {}
+        try:
+            self.process = subprocess.Popen(
+                [executable] + dialect.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, text=True, encoding="utf-8", errors="replace", **kwargs)
+        except OSError as e:
+            raise ShellSessionError(f"could not start {executable}: {e}") from e
+        threading.Thread(target=self._read, name="shell-reader", daemon=True).start()
+
+    def _read(self):
+        try:
+            for line in self.process.stdout:
+                self._lines.put(line)
+        except (OSError, ValueError):
+            pass  # closed while killing the session
+        self._lines.put(None)
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, script: str, deadline: Optional[float], task=None, poll: float = 0.05):
+        """
+        Run one query and wait for its sentinel.
+
+        Returns:
+            (stdout, status)
+
+        Raises:
+            ShellSessionError: the shell exited
+            subprocess.TimeoutExpired: deadline passed
+            TaskCancelled: task was cancelled
+        """
+        token = f"{self._token}{next(self._ids)}__"
+        try:
+            self.process.stdin.write(self.dialect.wrap(script, token))
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ShellSessionError(f"shell exited: {e}", sent=False) from e
+        self.uses += 1
+        output: List[str] = []
+        while True:
+            try:
+                line = self._lines.get(timeout=poll)
+            except queue.Empty:
+                if task is not None and task.cancel_event.is_set():
+                    raise TaskCancelled(f"{task.name} cancelled")
+                if deadline is not None and time.monotonic() > deadline:
+                    raise subprocess.TimeoutExpired(script, 0)
+                continue
+            if line is None:
+                raise ShellSessionError(f"shell exited with {self.process.wait()}", sent=True)
+            index = line.find(token)
+            if index < 0:
+                output.append(line)
+                continue
+            output.append(line[:index])  # the query's last line had no newline
+            self.last_used = time.monotonic()
+            status = line[index + len(token):].strip()
+            return "".join(output), int(status) if status.lstrip("-").isdigit() else 1
+
+    def close(self, grace: float = 0.5, kill: bool = False):
+        """End the shell: ask it to exit (unless kill), then kill its process tree."""
+        if not kill:
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=grace)
+                return
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                pass
+        kill_process_tree(self.process, grace)
+
+
+class ShellPool:
+    """
+    Long-lived shell sessions shared by queries from any thread.
+
+    Args:
+        shell: "powershell" or "bash"
+        size: Sessions at most; a query waits while all are busy
+        executable: Program to start (default: the shell's name)
+        health_interval: Seconds a session may sit idle before it is pinged
+            on its next use
+        max_uses: Queries after which a session is replaced
+    """
+
+    DIALECTS = {"powershell": _PowerShell, "pwsh": _PowerShell, "bash": _Bash}
+    # Seconds between checks of cancel events and deadlines while waiting
+    POLL = 0.05
+    # Seconds a health check or a new session's setup may take
+    READY_TIMEOUT = 10.0
+
+    def __init__(self, shell: str = "powershell", size: int = 2, executable: str = None,
+                 health_interval: float = 30.0, max_uses: int = 500):
+        self.shell = shell
+        self.dialect = self.DIALECTS[shell]
+        self.executable = executable or shell
+        self.size = size
+        self.health_interval = health_interval
+        self.max_uses = max_uses
+        self._idle: List[ShellSession] = []
+        self._open = 0  # sessions idle, busy or starting
+        self._condition = threading.Condition()
+        self._closed = False
+        self.stats = {"queries": 0, "started": 0, "replaced": 0, "health_checks": 0, "timeouts": 0, "cancelled": 0}
+
+    def run(self, script: str, timeout: float = None) -> subprocess.CompletedProcess:
+        """
+        Run a query on an idle session: subprocess.run(..., text=True) for
+        shells. Inside an execution pool task, a cancel or the task's
+        deadline stops it as run_process() would.
+
+        Args:
+            script: Shell code; may span lines
+            timeout: Seconds to wait, including for a free session
+
+        Returns:
+            CompletedProcess with stdout and the query's status (0 or 1 in
+            PowerShell, where 1 means it threw)
+
+        Raises:
+            subprocess.TimeoutExpired, TaskCancelled, ShellSessionError
+        """
+        task = current_task()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if task is not None and task.deadline is not None:
+            deadline = task.deadline if deadline is None else min(deadline, task.deadline)
+        self._count("queries")
+
+        try:
+            for attempt in range(2):
+                session = self._acquire(task, deadline)
+                try:
+                    stdout, status = session.run(script, deadline, task, self.POLL)
+                except ShellSessionError as e:
+                    self._discard(session, kill=True)
+                    if e.sent or attempt:
+                        raise
+                    continue  # it had died while idle; the query never ran, so try a fresh one
+                except BaseException:
+                    # Still running the query, or in an unknown state
+                    self._discard(session, kill=True)
+                    raise
+                self._release(session)
+                return subprocess.CompletedProcess(script, status, stdout, "")
+        except subprocess.TimeoutExpired:
+            self._count("timeouts")
+            raise subprocess.TimeoutExpired(script, timeout if timeout is not None else task.timeout) from None
+        except TaskCancelled:
+            self._count("cancelled")
+            raise
+
+    def _count(self, key: str):
+        # Queries run on several executor threads at once
+        with self._condition:
+            self.stats[key] += 1
+
+    # ---------------- Sessions ----------------
+    def _acquire(self, task, deadline: Optional[float]) -> ShellSession:
+        """An idle, healthy session; starts one if below size."""
+        while True:
+            with self._condition:
+                while not self._idle and self._open >= self.size:
+                    if self._closed:
+                        raise ShellSessionError("shell pool is closed")
+                    if task is not None and task.cancel_event.is_set():
+                        raise TaskCancelled(f"{task.name} cancelled")
+                    if deadline is not None and time.monotonic() > deadline:
+                        raise subprocess.TimeoutExpired(self.shell, 0)
+                    self._condition.wait(self.POLL)
+                if self._closed:
+                    raise ShellSessionError("shell pool is closed")
+                session = self._idle.pop() if self._idle else None
+                if session is None:
+                    self._open += 1
+            if session is None:
+                return self._start()
+            if self._healthy(session):
+                return session
+            self._discard(session, kill=True)
+            self._count("replaced")
+
+    def _start(self) -> ShellSession:
+        """A new session, counted in _open by the caller."""
+        session = None
+        try:
+            session = ShellSession(self.executable, self.dialect)
+            session.run(self.dialect.setup, time.monotonic() + self.READY_TIMEOUT)
+        except BaseException:
+            if session is not None:
+                session.close(kill=True)
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        self._count("started")
+        return session
+
+    def _healthy(self, session: ShellSession) -> bool:
+        if not session.alive():
+            return False
+        if time.monotonic() - session.last_used < self.health_interval:
+            return True
+        self._count("health_checks")
+        try:
+            session.run(self.dialect.ping, time.monotonic() + self.READY_TIMEOUT)
+            return True
+        except (ShellSessionError, subprocess.TimeoutExpired):
+            return False
+
+    def _release(self, session: ShellSession):
+        if session.uses >= self.max_uses:
+            self._discard(session)
+            self._count("replaced")
+            return
+        with self._condition:
+            if not self._closed:
+                self._idle.append(session)
+                self._condition.notify()
+                return
+        self._discard(session)
+
+    def _discard(self, session: ShellSession, kill: bool = False):
+        session.close(kill=kill)
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def warm(self):
+        """Start the sessions in the background, so the first queries find them ready."""
+        def start():
+            while True:
+                with self._condition:
+                    if self._closed or self._open >= self.size:
+                        return
+                    self._open += 1
+                try:
+                    session = self._start()
+                except (OSError, subprocess.SubprocessError) as e:
+                    print(f"⚠️  {self.shell} sessions not started: {e}")
+                    return
+                self._release(session)
+        threading.Thread(target=start, name="shell-warm", daemon=True).start()
+
+    def close(self):
+        """End the idle sessions; busy ones end when their query returns."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for session in idle:
+            self._discard(session)
@@ -0,0 +1,25 @@
+"""
+Zentrax Data Directory
+Location of persistent runtime state (caches, indexes) that should survive
+restarts but is not part of the project tree.
+Override with the ZENTRAX_DATA_DIR environment variable.
+"""
+
+import os
+
+DATA_DIR = os.environ.get("ZENTRAX_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".zentrax")
+
+
+def data_path(*parts: str) -> str:
+    """
+    Build a path inside the data directory, creating the directory if needed.
+
+    Args:
+        *parts: Path components below DATA_DIR (e.g. "intent_cache.sqlite3")
+
+    Returns:
+        The absolute path
+    """
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
@@ -9,13 +9,23 @@ Usage:
     auto.run("open chrome")
     auto.run("search for pdf files")
     auto.run("take a screenshot")
+
+Batch mode resolves a file of utterances concurrently and writes the
+commands as JSONL (dry run unless --execute):
+    python windows_automation.py --batch utterances.txt --output commands.jsonl --concurrency 16
+    type utterances.txt | python windows_automation.py --batch - > commands.jsonl
 """
 
+import argparse
+import asyncio
 import json
-from typing import Optional, Dict, Any, Tuple
+import sys
+import time
+from typing import Optional, Dict, Any, Iterable, List, TextIO, Tuple
 
 from windows_command_generator import WindowsCommandGenerator
 from command_executor import CommandExecutor
+from intent_metrics import IntentMetrics
 
 
 class WindowsAutomation:
@@ -24,16 +34,18 @@ class WindowsAutomation:
     Uses SmolLM2 via Ollama to interpret commands and execute them.
     """
     
-    def __init__(self, model_name: str = "smollm2", ollama_url: str = None):
+    def __init__(self, model_name: str = "smollm2", ollama_url: str = None, **generator_options):
         """
         Initialize the Windows Automation system.
         
         Args:
             model_name: Ollama model name (default: smollm2)
             ollama_url: Ollama API URL (default: http://localhost:11434/api/generate)
+            **generator_options: Passed to WindowsCommandGenerator (use_cache, ...)
         """
-        self.generator = WindowsCommandGenerator(model_name=model_name, ollama_url=ollama_url)
+        self.generator = WindowsCommandGenerator(model_name=model_name, ollama_url=ollama_url, **generator_options)
         self.executor = CommandExecutor()
+        self.executor.add_path_listener(self.generator.on_fs_events)
         self.last_command = None
         self.last_result = None
         
@@ -69,7 +81,8 @@ class WindowsAutomation:
         Returns:
             Tuple of (success, message)
         """
-        self.last_result = self.executor.execute(command)
+        # On the executor's pool, so the action's timeout applies
+        self.last_result = self.executor.submit(command).result()
         return self.last_result
     
     def run(self, natural_language: str) -> Tuple[bool, str]:
@@ -87,9 +100,119 @@ class WindowsAutomation:
         
         if not command:
             return False, "Failed to generate command"
+        if command.get("corrected"):
+            # Heard only approximately ("open world" -> Word); not run on a guess
+            return False, f"Did you mean \"{command['corrected']}\"?"
+        
+        # Execute the command (file lookups start as soon as it is known)
+        self.executor.prepare(command)
+        success, message = self.execute(command)
+        if success:
+            self.generator.confirm(natural_language, command)
+        return success, message
+    
+    def run_batch(self, utterances: Iterable[str], concurrency: int = 8, execute: bool = False,
+                  output: TextIO = None) -> Dict[str, Any]:
+        """
+        Resolve many utterances concurrently (see run_batch_async).
+        
+        Returns:
+            The batch report (see format_batch_report)
+        """
+        return asyncio.run(self.run_batch_async(utterances, concurrency, execute, output))
+    
+    async def run_batch_async(self, utterances: Iterable[str], concurrency: int = 8, execute: bool = False,
+                              output: TextIO = None) -> Dict[str, Any]:
+        """
+        Resolve utterances through the generator's async API, at most
+        `concurrency` at a time, and write one JSON line per utterance in
+        input order: {"line", "text", "tier", "latency_ms", "command"}, plus
+        "success" and "message" when executing.
+        
+        Args:
+            utterances: One command per item; blank items are skipped
+            concurrency: Utterances resolved at once
+            execute: Run the commands (in input order, one at a time);
+                otherwise this is a dry run
+            output: Text stream for the JSONL records (default: none)
+            
+        Returns:
+            Report with utterances/second and per-tier latency percentiles
+        """
+        texts = [text.strip() for text in utterances if text and text.strip()]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        loop = asyncio.get_running_loop()
+        latencies: Dict[str, List[float]] = {}
+        finished: Dict[int, Dict[str, Any]] = {}
+        flush_lock = asyncio.Lock()
+        counts = {"understood": 0, "executed": 0, "failed": 0}
+        next_line = 0
+        
+        async def flush():
+            nonlocal next_line
+            async with flush_lock:
+                while next_line in finished:
+                    record = finished.pop(next_line)
+                    next_line += 1
+                    if execute and record["command"]:
+                        success, message = await loop.run_in_executor(None, self.execute, record["command"])
+                        record["success"], record["message"] = success, message
+                        counts["executed" if success else "failed"] += 1
+                        if success:
+                            self.generator.confirm(record["text"], record["command"])
+                    if output is not None:
+                        output.write(json.dumps(record) + "\n")
         
-        # Execute the command
-        return self.execute(command)
+        async def resolve(line: int, text: str):
+            async with semaphore:
+                start = time.perf_counter()
+                command, tier = await self.generator.resolve_intent_async(text)
+                latency_ms = (time.perf_counter() - start) * 1000
+            if command:
+                command = self.generator.fill_placeholders(command)
+                counts["understood"] += 1
+            latencies.setdefault(tier, []).append(latency_ms)
+            finished[line] = {"line": line + 1, "text": text, "tier": tier,
+                              "latency_ms": round(latency_ms, 3), "command": command}
+            await flush()
+        
+        start = time.perf_counter()
+        await asyncio.gather(*[resolve(line, text) for line, text in enumerate(texts)])
+        elapsed = time.perf_counter() - start
+        if output is not None:
+            output.flush()
+        
+        tiers = {}
+        for tier, samples in sorted(latencies.items(), key=lambda item: -len(item[1])):
+            samples.sort()
+            tiers[tier] = {
+                "count": len(samples),
+                "mean_ms": round(sum(samples) / len(samples), 3),
+                "p50_ms": round(IntentMetrics._percentile(samples, 50), 3),
+                "p95_ms": round(IntentMetrics._percentile(samples, 95), 3),
+                "p99_ms": round(IntentMetrics._percentile(samples, 99), 3),
+            }
+        return dict(counts, utterances=len(texts), concurrency=concurrency, dry_run=not execute,
+                    elapsed_s=round(elapsed, 3),
+                    per_second=round(len(texts) / elapsed, 1) if elapsed > 0 else 0.0,
+                    tiers=tiers)
+    
+    @staticmethod
+    def format_batch_report(report: Dict[str, Any]) -> str:
+        """Human-readable throughput and per-tier latency summary of a batch run."""
+        lines = [
+            f"📦 Batch: {report['utterances']} utterances in {report['elapsed_s']:.2f} s "
+            f"({report['per_second']:.1f}/s, concurrency {report['concurrency']}"
+            f"{', dry run' if report['dry_run'] else ''})",
+            f"   understood {report['understood']}/{report['utterances']}"
+            + ("" if report["dry_run"] else f", executed {report['executed']}, failed {report['failed']}"),
+        ]
+        for tier, stats in report["tiers"].items():
+            lines.append(
+                f"   {tier:<12} {stats['count']:>6}  mean {stats['mean_ms']:8.2f} ms  p50 {stats['p50_ms']:8.2f} ms  "
+                f"p95 {stats['p95_ms']:8.2f} ms  p99 {stats['p99_ms']:8.2f} ms"
+            )
+        return "\n".join(lines)
     
     def get_last_command(self) -> Optional[Dict[str, Any]]:
         """Get the last generated command."""
@@ -100,15 +223,48 @@ class WindowsAutomation:
         return self.last_result
 
 
+def run_batch_mode(args) -> int:
+    """Resolve a file (or stdin) of utterances and print the batch report to stderr."""
+    auto = WindowsAutomation(model_name=args.model, use_cache=not args.no_cache)
+    source = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with source:
+            utterances = source.readlines()
+        report = auto.run_batch(utterances, concurrency=args.concurrency, execute=args.execute, output=output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        auto.generator.close()
+        auto.executor.close()
+    print(auto.format_batch_report(report), file=sys.stderr)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
 def main():
-    """Interactive command line interface."""
+    """Interactive command line interface, or batch mode with --batch."""
+    parser = argparse.ArgumentParser(description="Natural language Windows automation")
+    parser.add_argument("--model", default="smollm2", help="Ollama model name")
+    parser.add_argument("--batch", metavar="FILE", help="resolve utterances from FILE ('-' for stdin), one per line")
+    parser.add_argument("--output", default="-", metavar="FILE", help="JSONL output for --batch (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=8, help="utterances resolved at once in --batch")
+    parser.add_argument("--execute", action="store_true", help="execute batch commands (default: dry run)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the intent cache (for evaluating the tiers)")
+    parser.add_argument("--report", metavar="FILE", help="also write the batch report as JSON")
+    args = parser.parse_args()
+    if args.batch:
+        return run_batch_mode(args)
+    
     print("=" * 60)
     print("   Windows Automation with SmolLM2")
     print("   Natural Language → Windows Commands")
     print("=" * 60)
     print()
     
-    auto = WindowsAutomation()
+    auto = WindowsAutomation(model_name=args.model)
     
     # Check system status
     print("Checking system status...")
@@ -123,6 +279,8 @@ def main():
             input()
         except KeyboardInterrupt:
             return
+    else:
+        auto.generator.preload_model()
     
     print("\n" + "-" * 60)
     print("Ready! Type your commands in natural language.")
@@ -132,7 +290,7 @@ def main():
     print("  - 'take a screenshot'")
     print("  - 'create a folder called Projects on desktop'")
     print("  - 'open task manager'")
-    print("Type 'quit' or 'exit' to stop.")
+    print("Type 'metrics' for intent resolution and execution stats, 'quit' or 'exit' to stop.")
     print("-" * 60 + "\n")
     
     while True:
@@ -158,6 +316,14 @@ def main():
                 auto.check_status()
                 continue
             
+            if user_input.lower() == "metrics":
+                print(auto.generator.metrics.format_report())
+                print(auto.executor.metrics.format_report())
+                backend = auto.generator.get_backend_status()
+                print(f"Ollama circuit: {backend['state']} (timeout {backend['timeout_s']}s, "
+                      f"p95 {backend['p95_s']}s, last failure: {backend['last_reason'] or 'none'})")
+                continue
+            
             # Run the command
             success, message = auto.run(user_input)
             
@@ -172,4 +338,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
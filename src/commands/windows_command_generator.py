@@ -1,27 +1,154 @@
 """
 Windows Command Generator using SmolLM2 via Ollama
 This module converts natural language to executable Windows commands.
-Includes a fallback pattern-matching mode when Ollama is unavailable.
+Confident pattern matches are answered locally; only ambiguous or unmatched
+text is sent to the LLM, and the pattern matcher remains the fallback when
+Ollama is unavailable.
 """
 
+import asyncio
+import copy
 import json
 import os
 import re
 import subprocess
+import threading
+import time
 import requests
-import glob
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    from .keyword_automaton import KeywordAutomaton
+    from .intent_metrics import IntentMetrics
+    from .intent_cache import IntentCache, SingleFlight, cache_fingerprint
+    from .storage import data_path
+    from .ollama_client import OllamaClient, AsyncOllamaClient
+    from .prompt_builder import PromptBuilder
+    from .circuit_breaker import CircuitBreaker, AdaptiveTimeout, HealthProbe
+    from .command_schema import InvalidCommandError, CommandStreamValidator
+    from .command_executor import CommandExecutor
+    from .intent_classifier import IntentClassifier
+    from .fuzzy_vocabulary import FuzzyVocabulary
+except ImportError:
+    from keyword_automaton import KeywordAutomaton
+    from intent_metrics import IntentMetrics
+    from intent_cache import IntentCache, SingleFlight, cache_fingerprint
+    from storage import data_path
+    from ollama_client import OllamaClient, AsyncOllamaClient
+    from prompt_builder import PromptBuilder
+    from circuit_breaker import CircuitBreaker, AdaptiveTimeout, HealthProbe
+    from command_schema import InvalidCommandError, CommandStreamValidator
+    from command_executor import CommandExecutor
+    from intent_classifier import IntentClassifier
+    from fuzzy_vocabulary import FuzzyVocabulary
+
+
+# Normalization patterns (compiled once)
+_TRAILING_PUNCT_RE = re.compile(r'[.,!?:;]+$')
+_FILLER_PREFIX_RE = re.compile(r'^(okay|ok|hey|please|can you|could you|i want to|i need to|so|um|uh)\s+')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class Rule:
+    """
+    One entry of PatternMatcher's ordered rule table.
+
+    A rule fires when any of its patterns matches (re.search) or the text is one
+    of its exact phrases. It then returns a copy of its static result, or the
+    output of its build function; a build returning None lets evaluation fall
+    through to the next rule.
+
+    anchors are literal substrings at least one of which must occur in the
+    text for any pattern to match; exact phrases count as anchors too. They
+    feed the keyword prefilter, so they must be necessary conditions.
+
+    confidence is how much a hit on this rule can be trusted when the match
+    covers the whole utterance; broad rules that fire on a single common
+    word ("next", "back", "power") use lower values.
+    """
+    
+    __slots__ = ("name", "patterns", "anchors", "exact", "result", "build", "confidence")
+    
+    def __init__(self, name: str, patterns=(), anchors=(), exact=(), result: Dict[str, Any] = None, build=None,
+                 confidence: float = 0.95):
+        self.name = name
+        self.patterns = tuple(re.compile(p) if isinstance(p, str) else p for p in patterns)
+        self.exact = frozenset(exact)
+        self.anchors = tuple(anchors) + tuple(self.exact)
+        self.result = result
+        self.build = build
+        self.confidence = confidence
+    
+    def evaluate(self, text: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Apply the rule and measure how much of the text the match explains.
+        
+        Returns:
+            Tuple of (command or None, covered fraction of text in [0, 1])
+        """
+        match = None
+        for pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                break
+        if match is None:
+            if text not in self.exact:
+                return None, 0.0
+            coverage = 1.0
+        else:
+            # Lookahead patterns match zero-width; their groups carry the span
+            end = max([match.end()] + [match.end(g) for g in range(1, len(match.groups()) + 1) if match.end(g) != -1])
+            coverage = (end - match.start()) / len(text)
+        if self.build is not None:
+            return self.build(match, text), coverage
+        # Copy so callers can safely mutate the returned command
+        return {k: (dict(v) if isinstance(v, dict) else v) for k, v in self.result.items()}, coverage
+    
+    def apply(self, text: str) -> Optional[Dict[str, Any]]:
+        return self.evaluate(text)[0]
 
 
 class PatternMatcher:
     """
     Fallback pattern-based command generator when Ollama is unavailable.
     Uses regex patterns and fuzzy matching to handle natural language.
+    
+    Rules live in an ordered table compiled once per matcher (see
+    _compile_rules); the first rule that produces a command wins. A keyword
+    automaton over the rules' anchors selects the candidate rules in one
+    pass, so only those are evaluated (in table order).
+    
+    Misheard names and keywords ("spotfy", "downlods", "minimise") are
+    corrected through a fuzzy vocabulary index over the same mappings. A
+    corrected match carries the phrase it was corrected to ("corrected") and
+    is never trusted enough to run unconfirmed: "open world" may be Word.
     """
     
-    def __init__(self):
+    # Fraction of its coverage a match keeps when it needed keyword correction
+    CORRECTED_COVERAGE = 0.75
+    # Highest confidence of a corrected match; below WindowsCommandGenerator's
+    # threshold, so the LLM or the user has the last word
+    CORRECTED_CONFIDENCE = 0.7
+    
+    # Shortest spoken name the fuzzy "open X" rule will correct
+    FUZZY_MIN_LENGTH = 5
+    
+    # Transcription fixes for spoken file extensions
+    EXTENSION_FIXES = {"tx": ".txt", "txt": ".txt", "pdf": ".pdf", "doc": ".docx", "docx": ".docx"}
+    
+    # Transcription errors too far from the app name for the fuzzy index
+    APP_NAME_FIXES = {"nodepad": "notepad", "hordepad": "notepad", "notpad": "notepad"}
+    
+    SITE_URLS = {
+        "youtube": "youtube.com", "github": "github.com", "gmail": "gmail.com",
+        "google": "google.com", "facebook": "facebook.com", "twitter": "twitter.com",
+        "instagram": "instagram.com", "linkedin": "linkedin.com", "reddit": "reddit.com"
+    }
+    
+    def __init__(self, use_prefilter: bool = True):
         self.username = os.environ.get("USERNAME", "User")
         self.user_home = os.path.expanduser("~")
+        self.use_prefilter = use_prefilter
         
         # App name mappings (with common misspellings/variations)
         self.app_mappings = {
@@ -67,45 +194,23 @@ class PatternMatcher:
             "video": ".mp4", "mp4": ".mp4",
             "music": ".mp3", "audio": ".mp3", "mp3": ".mp3",
         }
+        
+        self._compile_rules()
+    
+    def vocabulary_phrases(self) -> List[str]:
+        """Spoken phrases this matcher knows verbatim (used to bias speech decoding)."""
+        phrases = [f"open {name}" for name in self.app_mappings]
+        phrases += [f"open {name}" for name in self.folder_mappings]
+        return phrases
     
     def _normalize_text(self, text: str) -> str:
         """Clean and normalize input text."""
         text = text.lower().strip()
-        text = re.sub(r'[.,!?:;]+$', '', text)  # Remove trailing punctuation
-        text = re.sub(r'^(okay|ok|hey|please|can you|could you|i want to|i need to|so|um|uh)\s+', '', text)
-        text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+        text = _TRAILING_PUNCT_RE.sub('', text)  # Remove trailing punctuation
+        text = _FILLER_PREFIX_RE.sub('', text)
+        text = _WHITESPACE_RE.sub(' ', text)  # Normalize whitespace
         return text
     
-    def _find_file(self, name: str, extension: str = None) -> Optional[str]:
-        """Find a file by name, with fuzzy matching."""
-        search_locations = [
-            self.folder_mappings["desktop"],
-            self.folder_mappings["documents"],
-            self.folder_mappings["downloads"],
-            self.user_home,
-        ]
-        
-        # Build search pattern
-        name_clean = re.sub(r'[^\w]', '', name)  # Remove special chars
-        patterns = [
-            f"*{name_clean}*{extension}" if extension else f"*{name_clean}*",
-            f"*{name}*{extension}" if extension else f"*{name}*",
-        ]
-        
-        for location in search_locations:
-            for pattern in patterns:
-                matches = glob.glob(os.path.join(location, pattern))
-                if matches:
-                    return matches[0]
-        
-        # Recursive search if not found
-        for pattern in patterns:
-            matches = glob.glob(os.path.join(self.user_home, "**", pattern), recursive=True)
-            if matches:
-                return matches[0]
-        
-        return None
-    
     def _extract_file_info(self, text: str) -> tuple:
         """Extract filename and extension from text."""
         # Look for explicit file extensions
@@ -128,324 +233,466 @@ class PatternMatcher:
         
         return None, None
     
-    def match(self, text: str) -> Optional[Dict[str, Any]]:
-        """Match natural language to a command using patterns."""
-        original_text = text
-        text = self._normalize_text(text)
+    # ============ RULE TABLE ============
+    
+    def _compile_rules(self):
+        """
+        Compile the ordered rule table. Call again after changing
+        app_mappings or folder_mappings.
+        """
+        # Mapping-driven rules: one alternation per mapping instead of one
+        # pattern per entry. The lookahead makes finditer report a candidate at
+        # every position so the earliest mapping entry wins, as in a loop.
+        self._folder_order = {name: i for i, name in enumerate(self.folder_mappings)}
+        self._app_order = {name: i for i, name in enumerate(self.app_mappings)}
+        folder_names = "|".join(re.escape(name) for name in self.folder_mappings)
+        app_names = "|".join(re.escape(name) for name in self.app_mappings)
+        self._open_folder_re = re.compile(rf'(?=open\s+(?:the\s+)?(?:my\s+)?({folder_names}))')
+        self._open_app_re = re.compile(rf'(?=open\s+(?:the\s+)?({app_names})(?:\s|$))')
+        self._known_name_re = re.compile(rf'(?:{app_names}|{folder_names})(?:\s|$)')
+        
+        self.rules = [
+            # ============ SYSTEM INFO COMMANDS ============
+            Rule("battery", [r'battery|power|charge'], anchors=("battery", "power", "charge"),
+                 result={"action": "system_info", "target": "battery"}, confidence=0.7),
+            Rule("datetime", [r'what.*(time|date)|current (time|date)'], anchors=("time", "date"),
+                 result={"action": "system_info", "target": "datetime"}),
+            
+            # ============ WEB SEARCH (in browser) ============
+            # "search for X in chrome/browser" or "google X"
+            Rule("web_search_in_browser",
+                 [r'(?:search|google|look up|find)\s+(?:for\s+)?(.+?)\s+(?:in|on|using)\s+(?:chrome|browser|google|internet|web)'],
+                 anchors=("search", "google", "look up", "find"),
+                 build=lambda m, text: {"action": "web_search", "target": m.group(1).strip()}),
+            Rule("google_prefix", [r'^google '], anchors=("google",),
+                 build=lambda m, text: {"action": "web_search", "target": text[7:].strip()}),
+            
+            # ============ SCREENSHOT ============
+            Rule("screenshot", [r'(take|capture|grab).*(screenshot|screen|snap)'], anchors=("take", "capture", "grab"), exact=["screenshot"],
+                 result={"action": "screenshot"}),
+            
+            # ============ VOLUME CONTROL ============
+            Rule("volume_up", [r'(volume|sound).*(up|increase|raise|higher|louder)', r'(turn|crank|raise).*(up)'], anchors=("volume", "sound", "turn", "crank", "raise"),
+                 result={"action": "volume_up", "extra": {"amount": 10}}),
+            Rule("volume_down", [r'(volume|sound).*(down|decrease|lower|reduce|quieter)', r'(turn|lower).*(down)'], anchors=("volume", "sound", "turn", "lower"),
+                 result={"action": "volume_down", "extra": {"amount": 10}}),
+            Rule("mute", [r'(mute|unmute|silence)'], anchors=("mute", "silence"), result={"action": "mute"}),
+            
+            # ============ WINDOW CONTROL ============
+            Rule("close_window", [r'(close).*(window|this|current|app)'], anchors=("close",), exact=["close"],
+                 result={"action": "close_window", "target": "current"}),
+            Rule("minimize_window", [r'minimize'], anchors=("minimize",), result={"action": "minimize_window", "target": "current"}),
+            Rule("maximize_window", [r'maximize|full\s*screen'], anchors=("maximize", "full"), result={"action": "maximize_window", "target": "current"}),
+            Rule("switch_window", [r'(switch|next|alt.?tab|over next)'], anchors=("switch", "next", "alt"), result={"action": "switch_window", "target": "next"}, confidence=0.6),
+            
+            # ============ SYSTEM ACTIONS ============
+            Rule("lock_screen", [r'lock.*(screen|computer|pc)'], anchors=("lock",), result={"action": "lock_screen"}),
+            Rule("shutdown", [r'shutdown|shut\s*down|power\s*off'], anchors=("shut", "power"), result={"action": "shutdown", "extra": {"delay": 0}}),
+            Rule("restart", [r'restart|reboot'], anchors=("restart", "reboot"), result={"action": "restart", "extra": {"delay": 0}}),
+            Rule("sleep", [r'sleep|hibernate'], anchors=("sleep", "hibernate"), result={"action": "sleep"}),
+            
+            # ============ OPEN MISHEARD APP / FOLDER ============
+            # "open spotfy" / "open downlods" (checked before they are taken for file names)
+            Rule("open_fuzzy", [r'open\s+(?:the\s+)?(?:my\s+)?(\w+(?:\s\w+)?)$'], anchors=("open",),
+                 build=self._build_open_fuzzy, confidence=self.CORRECTED_CONFIDENCE),
+            
+            # ============ OPEN FILE BY NAME (with fuzzy matching) ============
+            # "open linux pdf" / "open harish.txt" / "open the document"
+            Rule("open_file", [r'open\s+(?:the\s+)?(?:file\s+)?(\w+)[\s.]*(pdf|txt|tx|docx?|xlsx?|py|jpg|png)?'], anchors=("open",),
+                 build=self._build_open_file, confidence=0.8),
+            
+            # ============ OPEN FILE IN APP ============
+            # "open harish.txt in notepad" / "open file X with notepad"
+            Rule("open_file_in_app", [r'open\s+(?:the\s+)?(?:file\s+)?(\S+)\s+(?:in|with|using)\s+(\w+)'], anchors=("open",),
+                 build=self._build_open_file_in_app),
+            
+            # ============ CREATE FILE ============
+            # "create a file" / "create file harish.txt" / "new file"
+            Rule("create_file", [r'(create|make|new)\s+(?:a\s+)?file\s*(?:called\s+|named\s+)?(\S+)?'], anchors=("file",),
+                 build=self._build_create_file),
+            
+            # ============ SEARCH FILES ============
+            Rule("search_files", [r'(search|find|look\s*for|locate)\s+(?:for\s+)?(?:my\s+)?(?:all\s+)?(.+?)(?:\s+files?)?$'], anchors=("search", "find", "look", "locate"),
+                 build=self._build_search_files, confidence=0.8),
+            
+            # ============ OPEN FOLDER ============
+            Rule("open_folder", [self._open_folder_re], anchors=("open",), build=self._build_open_folder),
+            
+            # ============ OPEN FOLDER IN VS CODE ============
+            Rule("open_folder_in_vscode", [r'open\s+(\w+)\s+(?:folder\s+)?(?:in|with)\s+(?:vs\s*code|vscode|code)'], anchors=("code",),
+                 build=self._build_open_folder_in_vscode),
+            
+            # ============ OPEN APP ============
+            Rule("open_app", [self._open_app_re], anchors=("open",), build=self._build_open_app),
+            
+            # ============ TASK MANAGER ============
+            Rule("task_manager", [r'task manager|taskmgr'], anchors=("task manager", "taskmgr"), result={"action": "open_app", "target": "taskmgr.exe"}),
+            
+            # ============ ADVANCED FRIDAY COMMANDS ============
+            
+            # Brightness control
+            Rule("brightness_up", [r'(increase|raise|turn up|brighter).*(brightness|screen)', r'brightness.*(up|increase)'], anchors=("brightness", "screen"),
+                 result={"action": "brightness_up", "extra": {"amount": 15}}),
+            Rule("brightness_down", [r'(decrease|lower|turn down|dimmer).*(brightness|screen)', r'brightness.*(down|decrease)'], anchors=("brightness", "screen"),
+                 result={"action": "brightness_down", "extra": {"amount": 15}}),
+            Rule("set_brightness", [r'(set|make).*(brightness|screen).*(\d+)'], anchors=("brightness", "screen"), build=self._build_set_brightness),
+            
+            # WiFi control
+            Rule("wifi_on", [r'(turn|switch).*(on|enable).*(wifi|wi-fi|wireless|internet)', r'(enable|connect).*(wifi|wi-fi|wireless)'], anchors=("wifi", "wi-fi", "wireless", "internet"),
+                 result={"action": "wifi_toggle", "extra": {"state": "on"}}),
+            Rule("wifi_off", [r'(turn|switch).*(off|disable).*(wifi|wi-fi|wireless|internet)', r'(disable|disconnect).*(wifi|wi-fi|wireless)'], anchors=("wifi", "wi-fi", "wireless", "internet"),
+                 result={"action": "wifi_toggle", "extra": {"state": "off"}}),
+            Rule("wifi_toggle", [r'toggle.*(wifi|wi-fi|wireless)'], anchors=("toggle",), result={"action": "wifi_toggle", "extra": {"state": "toggle"}}),
+            
+            # Bluetooth control
+            Rule("bluetooth_toggle", [r'(open|turn|toggle|enable|disable).*(bluetooth)'], anchors=("bluetooth",), result={"action": "bluetooth_toggle"}),
+            
+            # Kill/close process
+            Rule("kill_process", [r'(kill|terminate|end|stop|force\s*close)\s+(?:the\s+)?(?:process\s+)?(\w+)'], anchors=("kill", "terminate", "end", "stop", "force"),
+                 build=lambda m, text: {"action": "kill_process", "target": m.group(2)}, confidence=0.7),
+            
+            # List processes
+            Rule("list_processes", [r'(list|show|what).*(running|process|apps|programs)', r'running\s+(apps|process)'], anchors=("running", "process", "apps", "programs"),
+                 result={"action": "list_processes", "extra": {"count": 10}}, confidence=0.8),
+            
+            # Media controls
+            Rule("media_play_pause", [r'(play|pause|resume|toggle).*(music|media|song|track|video)?'], anchors=("play", "pause", "resume", "toggle"),
+                 build=self._build_media_play_pause, confidence=0.7),
+            Rule("media_next", [r'(next|skip).*(song|track|music)?'], anchors=("next", "skip"), result={"action": "media_next"}, confidence=0.6),
+            Rule("media_previous", [r'(previous|prev|back|last).*(song|track|music)?'], anchors=("prev", "back", "last"), result={"action": "media_previous"}, confidence=0.5),
+            Rule("media_stop", [r'stop.*(music|media|playing)'], anchors=("stop",), result={"action": "media_stop"}),
+            
+            # Open URL
+            Rule("open_url", [r'(open|go to|visit|navigate to)\s+((?:https?://)?(?:www\.)?[\w.-]+\.[a-z]{2,}(?:/\S*)?)'], anchors=(".",),
+                 build=lambda m, text: {"action": "open_url", "target": m.group(2)}),
+            
+            # Common websites
+            Rule("open_website", [r'(open|go to)\s+(youtube|github|gmail|google|facebook|twitter|instagram|linkedin|reddit)'], anchors=("youtube", "github", "gmail", "google", "facebook", "twitter", "instagram", "linkedin", "reddit"),
+                 build=self._build_open_website),
+            
+            # Tab controls
+            Rule("new_tab", [r'(new|open)\s*tab'], anchors=("tab",), result={"action": "new_tab"}),
+            Rule("close_tab", [r'close\s*tab'], anchors=("tab",), result={"action": "close_tab"}),
+            Rule("refresh_page", [r'(refresh|reload)\s*(?:page|tab)?'], anchors=("refresh", "reload"), result={"action": "refresh_page"}),
+            
+            # Show desktop
+            Rule("show_desktop", [r'show\s*desktop|minimize\s*all|go to desktop'], anchors=("desktop", "minimize"), result={"action": "show_desktop"}),
+            
+            # Empty recycle bin
+            Rule("empty_recycle_bin", [r'empty.*(recycle|trash|bin)', r'(clear|clean).*(recycle|trash)'], anchors=("empty", "recycle", "trash"),
+                 result={"action": "empty_recycle_bin"}),
+            
+            # Emoji picker
+            Rule("emoji_picker", [r'(open|show).*(emoji|emoticon)'], anchors=("emoji", "emoticon"), result={"action": "open_emoji_picker"}),
+            
+            # Clipboard history
+            Rule("clipboard_history", [r'(open|show).*(clipboard|paste\s*history)'], anchors=("clipboard", "paste"), result={"action": "open_clipboard_history"}),
+            
+            # Night light / blue light filter
+            Rule("night_light", [r'(night\s*light|blue\s*light|night\s*mode|eye\s*comfort)'], anchors=("night", "blue", "eye"), result={"action": "night_light_toggle"}),
+            
+            # Airplane mode
+            Rule("airplane_mode", [r'airplane\s*mode|flight\s*mode'], anchors=("airplane", "flight"), result={"action": "airplane_mode_toggle"}),
+            
+            # Scroll commands
+            Rule("scroll", [r'scroll\s*(up|down)'], anchors=("scroll",), build=lambda m, text: {
+                "action": "scroll", "extra": {"direction": "up" if "up" in text else "down", "amount": 5}}),
+            
+            # CPU/Memory/Disk info
+            Rule("cpu_info", [r'(cpu|processor).*(usage|info|status)'], anchors=("cpu", "processor"), result={"action": "system_info", "extra": {"type": "cpu"}}),
+            Rule("memory_info", [r'(ram|memory).*(usage|info|status)'], anchors=("ram", "memory"), result={"action": "system_info", "extra": {"type": "memory"}}),
+            Rule("disk_info", [r'(disk|storage|space).*(usage|info|status|left|available)'], anchors=("disk", "storage", "space"),
+                 result={"action": "system_info", "extra": {"type": "disk"}}),
+            Rule("network_info", [r'(wifi|network|internet).*(status|info|connected)'], anchors=("wifi", "network", "internet"),
+                 result={"action": "system_info", "extra": {"type": "network"}}),
+            
+            # General status check
+            Rule("system_status", [r'(system|computer|pc).*(status|info|health)'], anchors=("system", "computer", "pc"), exact=["status", "system info", "how am i doing"],
+                 result={"action": "system_info", "extra": {"type": "all"}}),
+            
+            # Help command
+            Rule("help", exact=["help", "what can you do", "commands", "help me"], result={"action": "help"}),
+            
+            # Thank you response (for FRIDAY personality)
+            Rule("thanks", [r'(thank|thanks|thank you)'], anchors=("thank",), result={"action": "thanks"}),
+            
+            # Who are you?
+            Rule("introduce", [r'(who are you|what is your name|introduce yourself)'], anchors=("who are you", "what is your name", "introduce yourself"), result={"action": "introduce"}),
+            
+            # ============ TYPE TEXT / VOICE TYPING ============
+            # "type hello world" / "write hello world" / "type in notepad: hello"
+            Rule("type_text", [r'(?:type|write|input|enter)\s+(?:in\s+(?:notepad|file)\s*[:\.\-]?\s*)?["\']?(.+?)["\']?$'], anchors=("type", "write", "input", "enter"),
+                 build=self._build_type_text, confidence=0.8),
+            
+            # "voice typing" / "activate voice typing" / "start dictation"
+            Rule("voice_typing", [r'(voice\s*typing|dictation|dictate|start\s*typing|voice\s*input)'], anchors=("voice", "dictat", "typing"), result={"action": "voice_typing"}),
+            
+            # ============ WEB RESEARCH ============
+            # "research about python" / "search the web for AI" / "look up machine learning"
+            Rule("research", [r'(?:research|search\s+(?:the\s+)?(?:web|internet)\s+(?:for|about)?|look\s+up|find\s+(?:info|information)\s+(?:about|on))\s+(.+)'], anchors=("search", "look", "find"),
+                 build=lambda m, text: {"action": "web_search", "target": m.group(1).strip()}, confidence=0.85),
+            
+            # "what is X" / "tell me about X" - treat as web search
+            Rule("what_is", [r'(?:what\s+is|tell\s+me\s+about|explain|define)\s+(.+)'], anchors=("what", "tell", "explain", "define"), build=self._build_what_is, confidence=0.7),
+            
+            # ============ OPEN UNKNOWN NAMES (last resort) ============
+            # Only after every rule above ("open youtube", "open tab") has passed on the text.
+            # "open blender": a file of that name, else blender.exe
+            Rule("open_app_generic", [r'open\s+(?:the\s+)?(\w+)$'], anchors=("open",), build=self._build_open_app_generic, confidence=0.6),
+            # "open linux notes" / "open report now": nothing above knew the name, so it may be a file
+            Rule("open_file_lookup", [r'open\s+(?:up\s+)?(?:the\s+)?(?:(?:file|document)\s+)?(?:(?:called|named)\s+)?(\w+)(?:\.(\w+))?'], anchors=("open",),
+                 build=self._build_open_file_lookup, confidence=0.8),
+        ]
         
-        if not text or len(text) < 2:
+        # Keyword prefilter: anchor -> bitmask of the rules it can trigger.
+        # Rules without anchors are always candidates.
+        anchor_masks = {}
+        self._always_mask = 0
+        for index, rule in enumerate(self.rules):
+            if not rule.anchors:
+                self._always_mask |= 1 << index
+            for anchor in rule.anchors:
+                anchor_masks[anchor] = anchor_masks.get(anchor, 0) | (1 << index)
+        self._automaton = KeywordAutomaton(anchor_masks)
+        
+        # Fuzzy vocabulary: mapping names plus the single-word rule anchors,
+        # so a misheard keyword can be corrected and the table re-run
+        self.vocabulary = FuzzyVocabulary()
+        self.vocabulary.add_all(self.app_mappings, "app")
+        for alias, name in self.APP_NAME_FIXES.items():
+            if name in self.app_mappings:
+                self.vocabulary.add(alias, self.app_mappings[name], "app")
+        self.vocabulary.add_all(self.folder_mappings, "folder")
+        self.vocabulary.add_all(self.file_extensions, "extension")
+        for anchor in anchor_masks:
+            if len(anchor) >= 5 and anchor.isalpha():
+                self.vocabulary.add(anchor, anchor, "keyword")
+    
+    # File intents are symbolic: the executor resolves the name to a path
+    # (PathResolver, with a deadline) so parsing never waits on the disk
+    
+    def _build_open_file(self, m, text):
+        name = m.group(1)
+        # Known apps and folders, multi-word ones included ("open task manager"), are left to their rules
+        if self._open_app_re.match(text, m.start()) or self._open_folder_re.match(text, m.start()):
             return None
-        
-        # ============ SYSTEM INFO COMMANDS ============
-        # Battery percentage
-        if re.search(r'battery|power|charge', text):
-            return {"action": "system_info", "target": "battery"}
-        
-        # Time/Date
-        if re.search(r'what.*(time|date)|current (time|date)', text):
-            return {"action": "system_info", "target": "datetime"}
-        
-        # ============ WEB SEARCH (in browser) ============
-        # "search for X in chrome/browser" or "google X"
-        web_search = re.search(r'(?:search|google|look up|find)\s+(?:for\s+)?(.+?)\s+(?:in|on|using)\s+(?:chrome|browser|google|internet|web)', text)
-        if web_search:
-            query = web_search.group(1).strip()
+        ext = m.group(2)
+        
+        # Map common transcription errors
+        extension = self.EXTENSION_FIXES.get(ext) if ext else None
+        if extension:
+            # Not found -> create it
+            return {"action": "open_file_by_name", "target": name,
+                    "extra": {"extension": extension, "create": True, "app": "notepad.exe"}}
+        
+        if ext:
+            return {"action": "open_file_by_name", "target": name, "extra": {"extension": f".{ext}"}}
+        if re.search(r'\bfile\s', m.group(0)) and not text[m.end():].strip():
+            return {"action": "open_file_by_name", "target": name, "extra": {"extension": ""}}
+        # A bare name is left to the later rules ("open new tab", "open youtube");
+        # open_file_lookup takes it if none of them does
+        return None
+    
+    def _build_open_file_lookup(self, m, text):
+        # Whether a file of that name exists is only known at run time
+        name = m.group(1)
+        if self._known_name_re.match(text, m.start(1)) or name in ("my", "a", "new"):
+            return None
+        return {"action": "open_file_by_name", "target": name, "extra": {"extension": f".{m.group(2)}" if m.group(2) else ""}}
+    
+    def _build_open_file_in_app(self, m, text):
+        filename = m.group(1)
+        app = self.vocabulary.lookup(m.group(2), "app")
+        return {"action": "open_file_by_name", "target": filename,
+                "extra": {"extension": "", "create": True, "app": app.value if app else "notepad.exe"}}
+    
+    def _build_create_file(self, m, text):
+        filename = m.group(2) if m.group(2) else "new_file"
+        if "." not in filename:
+            filename += ".txt"
+        # Fix .tx -> .txt
+        filename = re.sub(r'\.tx$', '.txt', filename)
+        file_path = os.path.join(self.folder_mappings["desktop"], filename)
+        return {"action": "create_and_open_file", "path": file_path, "extra": {"app": "notepad.exe"}}
+    
+    def _build_search_files(self, m, text):
+        query = m.group(2).strip()
+        query = re.sub(r'\s+files?$', '', query)
+        query = re.sub(r'^(all|my|the)\s+', '', query)
+        
+        # Check if it's a file type
+        if query in ["pdf", "pdfs"]:
+            return {"action": "search_and_open", "target": "*.pdf", "path": self.user_home}
+        elif query in ["doc", "docs", "word", "documents"]:
+            return {"action": "search_and_open", "target": "*.docx", "path": self.user_home}
+        elif query in ["text", "txt"]:
+            return {"action": "search_and_open", "target": "*.txt", "path": self.user_home}
+        elif query in ["python", "py"]:
+            return {"action": "search_and_open", "target": "*.py", "path": self.user_home}
+        
+        # A misheard file type ("pyhton", "excell")
+        if len(query) >= self.FUZZY_MIN_LENGTH:
+            kind = self.vocabulary.lookup(query, "extension")
+            if kind and kind.distance:
+                return {"action": "search_and_open", "target": f"*{kind.value}", "path": self.user_home}
+        return {"action": "search", "target": f"*{query}*", "path": self.user_home}
+    
+    @staticmethod
+    def _first_mapping_hit(pattern, order: Dict[str, int], text: str) -> Optional[str]:
+        """The mapping key that appears first in mapping order, wherever it occurs in text."""
+        best = None
+        for m in pattern.finditer(text):
+            name = m.group(1)
+            if best is None or order[name] < order[best]:
+                best = name
+        return best
+    
+    def _build_open_folder(self, m, text):
+        folder_name = self._first_mapping_hit(self._open_folder_re, self._folder_order, text)
+        return {"action": "open_folder", "path": self.folder_mappings[folder_name]}
+    
+    def _build_open_folder_in_vscode(self, m, text):
+        folder_name = m.group(1).lower()
+        folder_path = self.folder_mappings.get(folder_name)
+        if folder_path and os.path.exists(folder_path):
+            return {"action": "run_command", "extra": {"command": f'code "{folder_path}"'}}
+        return None
+    
+    def _build_open_app(self, m, text):
+        app_name = self._first_mapping_hit(self._open_app_re, self._app_order, text)
+        exe_name = self.app_mappings[app_name]
+        if exe_name.endswith(":"):
+            return {"action": "run_command", "extra": {"command": f"start {exe_name}"}}
+        return {"action": "open_app", "target": exe_name}
+    
+    def _build_open_fuzzy(self, m, text):
+        """Misheard app or folder name ("open spotfy", "open downlods"); known names are left to later rules."""
+        name = m.group(1)
+        if len(name) < self.FUZZY_MIN_LENGTH or name in self.app_mappings or name in self.folder_mappings:
+            return None
+        match = self.vocabulary.lookup(name, "app") or self.vocabulary.lookup(name, "folder")
+        if match is None:
+            return None
+        corrected = text[:m.start(1)] + match.term + text[m.end(1):]
+        if match.category == "folder":
+            return {"action": "open_folder", "path": match.value, "corrected": corrected}
+        if match.value.endswith(":"):
+            return {"action": "run_command", "extra": {"command": f"start {match.value}"}, "corrected": corrected}
+        return {"action": "open_app", "target": match.value, "corrected": corrected}
+    
+    def _build_open_app_generic(self, m, text):
+        app_name = m.group(1).lower()
+        if app_name in self.app_mappings:
+            return {"action": "open_app", "target": self.app_mappings[app_name]}
+        # Don't try to open as .exe if it looks like a file
+        if not any(ext in app_name for ext in ['txt', 'pdf', 'doc', 'py']):
+            # A file of that name wins; otherwise it is taken for an app
+            return {"action": "open_file_by_name", "target": app_name,
+                    "extra": {"extension": "", "fallback": {"action": "open_app", "target": f"{app_name}.exe"}}}
+        return None
+    
+    def _build_set_brightness(self, m, text):
+        match = re.search(r'(\d+)', text)
+        level = int(match.group(1)) if match else 50
+        return {"action": "set_brightness", "extra": {"level": level}}
+    
+    def _build_media_play_pause(self, m, text):
+        # "play despacito" is a search; "open resume" is a file
+        if re.search(r'play\s+\w+', text) or text.startswith("open "):
+            return None
+        return {"action": "media_play_pause"}
+    
+    def _build_open_website(self, m, text):
+        site = re.search(r'(youtube|github|gmail|google|facebook|twitter|instagram|linkedin|reddit)', text).group(1)
+        return {"action": "open_url", "target": self.SITE_URLS.get(site, f"{site}.com")}
+    
+    def _build_type_text(self, m, text):
+        text_to_type = m.group(1).strip()
+        if text_to_type and len(text_to_type) > 1:
+            return {"action": "type_text", "extra": {"text": text_to_type}}
+        return None
+    
+    def _build_what_is(self, m, text):
+        query = m.group(1).strip()
+        if len(query) > 2 and query not in ["the time", "time", "date", "battery"]:
             return {"action": "web_search", "target": query}
+        return None
+    
+    def _evaluate_rules(self, text: str) -> Tuple[Optional[Rule], Optional[Dict[str, Any]], float]:
+        """
+        Run the rule table; returns (rule, command, coverage) of the first hit.
+        If nothing matches, misheard keywords are corrected and the table is
+        run once more, with the coverage of a hit scaled down and the
+        corrected text kept in the command ("corrected").
+        """
+        text = self._normalize_text(text)
         
-        # "google something" pattern
-        if text.startswith("google "):
-            query = text[7:].strip()
-            return {"action": "web_search", "target": query}
+        if not text or len(text) < 2:
+            return None, None, 0.0
+        
+        rule, command, coverage = self._first_hit(text)
+        if command is None:
+            corrected = self.vocabulary.correct_words(text, "keyword")
+            if corrected != text:
+                rule, command, coverage = self._first_hit(corrected)
+                coverage *= self.CORRECTED_COVERAGE
+                if command is not None:
+                    command.setdefault("corrected", corrected)
+        return rule, command, coverage
+    
+    def _first_hit(self, text: str) -> Tuple[Optional[Rule], Optional[Dict[str, Any]], float]:
+        """First rule of the table that produces a command for normalized text."""
+        if not self.use_prefilter:
+            for rule in self.rules:
+                command, coverage = rule.evaluate(text)
+                if command is not None:
+                    return rule, command, coverage
+            return None, None, 0.0
+        
+        # Only rules whose anchors occur in the text, lowest index (priority) first
+        candidates = self._automaton.scan(text) | self._always_mask
+        rules = self.rules
+        while candidates:
+            lowest = candidates & -candidates
+            rule = rules[lowest.bit_length() - 1]
+            command, coverage = rule.evaluate(text)
+            if command is not None:
+                return rule, command, coverage
+            candidates ^= lowest
+        return None, None, 0.0
+    
+    def match_rule(self, text: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Match natural language against the rule table.
         
-        # ============ SCREENSHOT ============
-        if re.search(r'(take|capture|grab).*(screenshot|screen|snap)', text) or text == "screenshot":
-            return {"action": "screenshot"}
-        
-        # ============ VOLUME CONTROL ============
-        if re.search(r'(volume|sound).*(up|increase|raise|higher|louder)', text) or re.search(r'(turn|crank|raise).*(up)', text):
-            return {"action": "volume_up", "extra": {"amount": 10}}
-        if re.search(r'(volume|sound).*(down|decrease|lower|reduce|quieter)', text) or re.search(r'(turn|lower).*(down)', text):
-            return {"action": "volume_down", "extra": {"amount": 10}}
-        if re.search(r'(mute|unmute|silence)', text):
-            return {"action": "mute"}
-        
-        # ============ WINDOW CONTROL ============
-        if re.search(r'(close).*(window|this|current|app)', text) or text == "close":
-            return {"action": "close_window", "target": "current"}
-        if re.search(r'minimize', text):
-            return {"action": "minimize_window", "target": "current"}
-        if re.search(r'maximize|full\s*screen', text):
-            return {"action": "maximize_window", "target": "current"}
-        if re.search(r'(switch|next|alt.?tab|over next)', text):
-            return {"action": "switch_window", "target": "next"}
-        
-        # ============ SYSTEM ACTIONS ============
-        if re.search(r'lock.*(screen|computer|pc)', text):
-            return {"action": "lock_screen"}
-        if re.search(r'shutdown|shut\s*down|power\s*off', text):
-            return {"action": "shutdown", "extra": {"delay": 0}}
-        if re.search(r'restart|reboot', text):
-            return {"action": "restart", "extra": {"delay": 0}}
-        if re.search(r'sleep|hibernate', text):
-            return {"action": "sleep"}
-        
-        # ============ OPEN FILE BY NAME (with fuzzy matching) ============
-        # "open linux pdf" / "open harish.txt" / "open the document"
-        open_file_match = re.search(r'open\s+(?:the\s+)?(?:file\s+)?(\w+)[\s.]*(pdf|txt|tx|docx?|xlsx?|py|jpg|png)?', text)
-        if open_file_match and open_file_match.group(1) not in self.app_mappings:
-            name = open_file_match.group(1)
-            ext = open_file_match.group(2)
-            
-            # Map common transcription errors
-            ext_map = {"tx": ".txt", "txt": ".txt", "pdf": ".pdf", "doc": ".docx", "docx": ".docx"}
-            extension = ext_map.get(ext) if ext else None
-            
-            # Try to find the file
-            file_path = self._find_file(name, extension)
-            if file_path:
-                return {"action": "open_file", "path": file_path}
-            
-            # If extension specified, create the file
-            if extension:
-                file_path = os.path.join(self.folder_mappings["desktop"], f"{name}{extension}")
-                return {"action": "create_and_open_file", "path": file_path, "extra": {"app": "notepad.exe"}}
-        
-        # ============ OPEN FILE IN APP ============
-        # "open harish.txt in notepad" / "open file X with notepad"
-        open_in_app = re.search(r'open\s+(?:the\s+)?(?:file\s+)?(\S+)\s+(?:in|with|using)\s+(\w+)', text)
-        if open_in_app:
-            filename = open_in_app.group(1)
-            app_name = open_in_app.group(2).lower()
-            
-            # Fix common transcription errors
-            app_name = {"nodepad": "notepad", "hordepad": "notepad", "notpad": "notepad"}.get(app_name, app_name)
-            
-            # Find the file
-            file_path = self._find_file(filename)
-            if file_path:
-                return {"action": "open_file", "path": file_path}
-            
-            # Create new file
-            if "." not in filename:
-                filename += ".txt"
-            file_path = os.path.join(self.folder_mappings["desktop"], filename)
-            return {"action": "create_and_open_file", "path": file_path, "extra": {"app": self.app_mappings.get(app_name, "notepad.exe")}}
-        
-        # ============ CREATE FILE ============
-        # "create a file" / "create file harish.txt" / "new file"
-        create_file = re.search(r'(create|make|new)\s+(?:a\s+)?file\s*(?:called\s+|named\s+)?(\S+)?', text)
-        if create_file:
-            filename = create_file.group(2) if create_file.group(2) else "new_file"
-            if "." not in filename:
-                filename += ".txt"
-            # Fix .tx -> .txt
-            filename = re.sub(r'\.tx$', '.txt', filename)
-            file_path = os.path.join(self.folder_mappings["desktop"], filename)
-            return {"action": "create_and_open_file", "path": file_path, "extra": {"app": "notepad.exe"}}
-        
-        # ============ SEARCH FILES ============
-        search_match = re.search(r'(search|find|look\s*for|locate)\s+(?:for\s+)?(?:my\s+)?(?:all\s+)?(.+?)(?:\s+files?)?$', text)
-        if search_match:
-            query = search_match.group(2).strip()
-            query = re.sub(r'\s+files?$', '', query)
-            query = re.sub(r'^(all|my|the)\s+', '', query)
-            
-            # Check if it's a file type
-            if query in ["pdf", "pdfs"]:
-                return {"action": "search_and_open", "target": "*.pdf", "path": self.user_home}
-            elif query in ["doc", "docs", "word", "documents"]:
-                return {"action": "search_and_open", "target": "*.docx", "path": self.user_home}
-            elif query in ["text", "txt"]:
-                return {"action": "search_and_open", "target": "*.txt", "path": self.user_home}
-            elif query in ["python", "py"]:
-                return {"action": "search_and_open", "target": "*.py", "path": self.user_home}
-            else:
-                return {"action": "search", "target": f"*{query}*", "path": self.user_home}
-        
-        # ============ OPEN FOLDER ============
-        for folder_name, folder_path in self.folder_mappings.items():
-            if re.search(rf'open\s+(?:the\s+)?(?:my\s+)?{folder_name}', text):
-                return {"action": "open_folder", "path": folder_path}
-        
-        # ============ OPEN FOLDER IN VS CODE ============
-        vscode_folder = re.search(r'open\s+(\w+)\s+(?:folder\s+)?(?:in|with)\s+(?:vs\s*code|vscode|code)', text)
-        if vscode_folder:
-            folder_name = vscode_folder.group(1).lower()
-            folder_path = self.folder_mappings.get(folder_name)
-            if folder_path and os.path.exists(folder_path):
-                return {"action": "run_command", "extra": {"command": f'code "{folder_path}"'}}
-        
-        # ============ OPEN APP ============
-        for app_name, exe_name in self.app_mappings.items():
-            if re.search(rf'open\s+(?:the\s+)?{re.escape(app_name)}(?:\s|$)', text):
-                if exe_name.endswith(":"):
-                    return {"action": "run_command", "extra": {"command": f"start {exe_name}"}}
-                return {"action": "open_app", "target": exe_name}
-        
-        # Generic app open
-        open_app = re.search(r'open\s+(?:the\s+)?(\w+)$', text)
-        if open_app:
-            app_name = open_app.group(1).lower()
-            if app_name in self.app_mappings:
-                return {"action": "open_app", "target": self.app_mappings[app_name]}
-            # Don't try to open as .exe if it looks like a file
-            if not any(ext in app_name for ext in ['txt', 'pdf', 'doc', 'py']):
-                return {"action": "open_app", "target": f"{app_name}.exe"}
-        
-        # ============ TASK MANAGER ============
-        if "task manager" in text or "taskmgr" in text:
-            return {"action": "open_app", "target": "taskmgr.exe"}
-        
-        # ============ ADVANCED FRIDAY COMMANDS ============
-        
-        # Brightness control
-        if re.search(r'(increase|raise|turn up|brighter).*(brightness|screen)', text) or re.search(r'brightness.*(up|increase)', text):
-            return {"action": "brightness_up", "extra": {"amount": 15}}
-        if re.search(r'(decrease|lower|turn down|dimmer).*(brightness|screen)', text) or re.search(r'brightness.*(down|decrease)', text):
-            return {"action": "brightness_down", "extra": {"amount": 15}}
-        if re.search(r'(set|make).*(brightness|screen).*(\d+)', text):
-            match = re.search(r'(\d+)', text)
-            level = int(match.group(1)) if match else 50
-            return {"action": "set_brightness", "extra": {"level": level}}
-        
-        # WiFi control
-        if re.search(r'(turn|switch).*(on|enable).*(wifi|wi-fi|wireless|internet)', text) or re.search(r'(enable|connect).*(wifi|wi-fi|wireless)', text):
-            return {"action": "wifi_toggle", "extra": {"state": "on"}}
-        if re.search(r'(turn|switch).*(off|disable).*(wifi|wi-fi|wireless|internet)', text) or re.search(r'(disable|disconnect).*(wifi|wi-fi|wireless)', text):
-            return {"action": "wifi_toggle", "extra": {"state": "off"}}
-        if re.search(r'toggle.*(wifi|wi-fi|wireless)', text):
-            return {"action": "wifi_toggle", "extra": {"state": "toggle"}}
-        
-        # Bluetooth control
-        if re.search(r'(open|turn|toggle|enable|disable).*(bluetooth)', text):
-            return {"action": "bluetooth_toggle"}
-        
-        # Kill/close process
-        kill_match = re.search(r'(kill|terminate|end|stop|force\s*close)\s+(?:the\s+)?(?:process\s+)?(\w+)', text)
-        if kill_match:
-            process = kill_match.group(2)
-            return {"action": "kill_process", "target": process}
-        
-        # List processes
-        if re.search(r'(list|show|what).*(running|process|apps|programs)', text) or re.search(r'running\s+(apps|process)', text):
-            return {"action": "list_processes", "extra": {"count": 10}}
-        
-        # Media controls
-        if re.search(r'(play|pause|resume|toggle).*(music|media|song|track|video)?', text) and not re.search(r'play\s+\w+', text):
-            return {"action": "media_play_pause"}
-        if re.search(r'(next|skip).*(song|track|music)?', text):
-            return {"action": "media_next"}
-        if re.search(r'(previous|prev|back|last).*(song|track|music)?', text):
-            return {"action": "media_previous"}
-        if re.search(r'stop.*(music|media|playing)', text):
-            return {"action": "media_stop"}
-        
-        # Open URL
-        url_match = re.search(r'(open|go to|visit|navigate to)\s+((?:https?://)?(?:www\.)?[\w.-]+\.[a-z]{2,}(?:/\S*)?)', text)
-        if url_match:
-            url = url_match.group(2)
-            return {"action": "open_url", "target": url}
-        
-        # Common websites
-        if re.search(r'(open|go to)\s+(youtube|github|gmail|google|facebook|twitter|instagram|linkedin|reddit)', text):
-            site = re.search(r'(youtube|github|gmail|google|facebook|twitter|instagram|linkedin|reddit)', text).group(1)
-            urls = {
-                "youtube": "youtube.com", "github": "github.com", "gmail": "gmail.com",
-                "google": "google.com", "facebook": "facebook.com", "twitter": "twitter.com",
-                "instagram": "instagram.com", "linkedin": "linkedin.com", "reddit": "reddit.com"
-            }
-            return {"action": "open_url", "target": urls.get(site, f"{site}.com")}
-        
-        # Tab controls
-        if re.search(r'(new|open)\s*tab', text):
-            return {"action": "new_tab"}
-        if re.search(r'close\s*tab', text):
-            return {"action": "close_tab"}
-        if re.search(r'(refresh|reload)\s*(?:page|tab)?', text):
-            return {"action": "refresh_page"}
-        
-        # Show desktop
-        if re.search(r'show\s*desktop|minimize\s*all|go to desktop', text):
-            return {"action": "show_desktop"}
-        
-        # Empty recycle bin
-        if re.search(r'empty.*(recycle|trash|bin)', text) or re.search(r'(clear|clean).*(recycle|trash)', text):
-            return {"action": "empty_recycle_bin"}
-        
-        # Emoji picker
-        if re.search(r'(open|show).*(emoji|emoticon)', text):
-            return {"action": "open_emoji_picker"}
-        
-        # Clipboard history
-        if re.search(r'(open|show).*(clipboard|paste\s*history)', text):
-            return {"action": "open_clipboard_history"}
-        
-        # Night light / blue light filter
-        if re.search(r'(night\s*light|blue\s*light|night\s*mode|eye\s*comfort)', text):
-            return {"action": "night_light_toggle"}
-        
-        # Airplane mode
-        if re.search(r'airplane\s*mode|flight\s*mode', text):
-            return {"action": "airplane_mode_toggle"}
-        
-        # Scroll commands
-        if re.search(r'scroll\s*(up|down)', text):
-            direction = "up" if "up" in text else "down"
-            return {"action": "scroll", "extra": {"direction": direction, "amount": 5}}
-        
-        # CPU/Memory/Disk info
-        if re.search(r'(cpu|processor).*(usage|info|status)', text):
-            return {"action": "system_info", "extra": {"type": "cpu"}}
-        if re.search(r'(ram|memory).*(usage|info|status)', text):
-            return {"action": "system_info", "extra": {"type": "memory"}}
-        if re.search(r'(disk|storage|space).*(usage|info|status|left|available)', text):
-            return {"action": "system_info", "extra": {"type": "disk"}}
-        if re.search(r'(wifi|network|internet).*(status|info|connected)', text):
-            return {"action": "system_info", "extra": {"type": "network"}}
-        
-        # General status check
-        if re.search(r'(system|computer|pc).*(status|info|health)', text) or text in ["status", "system info", "how am i doing"]:
-            return {"action": "system_info", "extra": {"type": "all"}}
-        
-        # Help command
-        if text in ["help", "what can you do", "commands", "help me"]:
-            return {"action": "help"}
-        
-        # Thank you response (for FRIDAY personality)
-        if re.search(r'(thank|thanks|thank you)', text):
-            return {"action": "thanks"}
-        
-        # Who are you?
-        if re.search(r'(who are you|what is your name|introduce yourself)', text):
-            return {"action": "introduce"}
-        
-        # ============ TYPE TEXT / VOICE TYPING ============
-        # "type hello world" / "write hello world" / "type in notepad: hello"
-        type_match = re.search(r'(?:type|write|input|enter)\s+(?:in\s+(?:notepad|file)\s*[:\.\-]?\s*)?["\']?(.+?)["\']?$', text)
-        if type_match:
-            text_to_type = type_match.group(1).strip()
-            if text_to_type and len(text_to_type) > 1:
-                return {"action": "type_text", "extra": {"text": text_to_type}}
-        
-        # "voice typing" / "activate voice typing" / "start dictation"
-        if re.search(r'(voice\s*typing|dictation|dictate|start\s*typing|voice\s*input)', text):
-            return {"action": "voice_typing"}
-        
-        # ============ WEB RESEARCH ============
-        # "research about python" / "search the web for AI" / "look up machine learning"
-        research_match = re.search(r'(?:research|search\s+(?:the\s+)?(?:web|internet)\s+(?:for|about)?|look\s+up|find\s+(?:info|information)\s+(?:about|on))\s+(.+)', text)
-        if research_match:
-            query = research_match.group(1).strip()
-            return {"action": "web_search", "target": query}
+        Returns:
+            Tuple of (rule name, command) or (None, None) if nothing matched
+        """
+        rule, command, _ = self._evaluate_rules(text)
+        return (rule.name if rule else None), command
+    
+    def match_with_confidence(self, text: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Match natural language and score how much the match can be trusted.
         
-        # "what is X" / "tell me about X" - treat as web search
-        what_is_match = re.search(r'(?:what\s+is|tell\s+me\s+about|explain|define)\s+(.+)', text)
-        if what_is_match:
-            query = what_is_match.group(1).strip()
-            if len(query) > 2 and query not in ["the time", "time", "date", "battery"]:
-                return {"action": "web_search", "target": query}
+        The score is the rule's confidence scaled by how much of the
+        utterance the matched span explains, so "volume up" scores higher
+        than "volume up and then open my tax spreadsheet".
         
-        return None
+        Returns:
+            Tuple of (command, confidence in [0, 1]) or (None, 0.0)
+        """
+        rule, command, coverage = self._evaluate_rules(text)
+        if command is None:
+            return None, 0.0
+        confidence = rule.confidence * (0.6 + 0.4 * coverage)
+        if "corrected" in command:
+            confidence = min(confidence, self.CORRECTED_CONFIDENCE)
+        return command, round(confidence, 3)
+    
+    def match(self, text: str) -> Optional[Dict[str, Any]]:
+        """Match natural language to a command using patterns."""
+        return self.match_rule(text)[1]
 
 
 class WindowsCommandGenerator:
@@ -477,6 +724,7 @@ Your output must ALWAYS be a valid JSON object with this structure:
 Available actions:
 - "open_app": Open an application (target = exe name like "chrome.exe", "notepad.exe", "explorer.exe")
 - "open_file": Open a specific file (path = full path to file)
+- "open_file_by_name": Open a file whose folder is unknown (target = file name, extra.extension = ".pdf" etc. or "")
 - "open_folder": Open a folder in explorer (path = folder path)
 - "search": Search for files (target = search pattern like "*.pdf", "*.docx")
 - "create_file": Create a new file (path = full path, extra.content = optional content)
@@ -560,73 +808,321 @@ User: "turn up the volume"
 Output: {"action": "volume_up", "extra": {"amount": 10}}
 """
 
-    def __init__(self, model_name: str = None, ollama_url: str = None, use_fallback: bool = True):
+    # Pattern matches at or above this confidence skip the LLM entirely
+    CONFIDENCE_THRESHOLD = 0.75
+    
+    # Only answers that do not depend on a transient state are cached:
+    # pattern_low exists because the LLM was down, miss means no answer
+    CACHEABLE_TIERS = ("pattern", "classifier", "llm")
+    
+    # How long Ollama keeps the model (and its prompt cache) loaded after a call
+    KEEP_ALIVE = "30m"
+    
+    # Seconds to wait for a TCP connection; the read timeout adapts to observed latency
+    CONNECT_TIMEOUT = 2
+    
+    # Seconds a background /api/tags health probe may take
+    PROBE_TIMEOUT = 2
+    
+    # Bump when the shape of cached commands changes
+    CACHE_VERSION = 2
+    
+    # Path-based actions whose cached answer is only valid while the path
+    # exists (or, for the create actions, while it does not exist yet)
+    PATH_MUST_EXIST = ("open_file", "open_folder", "search", "search_and_open", "delete", "move", "rename", "copy")
+    PATH_MUST_NOT_EXIST = ("create_file", "create_and_open_file", "create_folder")
+    
+    # Recorded voice transcripts the intent classifier learns from
+    TRANSCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                   "training_data", "voice_commands")
+    
+    def __init__(self, model_name: str = None, ollama_url: str = None, use_fallback: bool = True,
+                 confidence_threshold: float = None, use_cache: bool = True, cache_path: str = None,
+                 retrieval_prompt: bool = False, structured_output: bool = True,
+                 use_classifier: bool = True):
         """
         Initialize the Windows Command Generator.
         
         Args:
             model_name: Ollama model name (default: smollm2)
             ollama_url: Ollama API URL (default: http://localhost:11434/api/generate)
-            use_fallback: Use pattern matching when Ollama is unavailable (default: True)
+            use_fallback: Use pattern matching before/instead of Ollama (default: True)
+            confidence_threshold: Minimum pattern confidence to answer without
+                the LLM (default: 0.75); set above 1 to always ask the LLM first
+            use_cache: Cache resolved commands in memory and on disk (default: True)
+            cache_path: SQLite file for the cache (default: ~/.zentrax/intent_cache.sqlite3)
+            retrieval_prompt: Send a compact prompt with only the most relevant
+                actions/examples instead of the full SYSTEM_PROMPT (default: False).
+                Pays off when Ollama cannot reuse the cached system prompt
+                (cold model, no prompt cache, small context window); with a
+                warm cache the fixed SYSTEM_PROMPT is cheaper per call
+            structured_output: Send a JSON schema of the executor's actions as
+                Ollama's "format" so the model can only produce valid commands
+                (default: True; needs Ollama 0.5+, older servers ignore it)
+            use_classifier: Answer paraphrases of known commands with the local
+                nearest-neighbour classifier before asking the LLM (default: True)
         """
         self.model_name = model_name or self.MODEL_NAME
         self.ollama_url = ollama_url or self.OLLAMA_URL
         self.username = os.environ.get("USERNAME", "User")
         self.use_fallback = use_fallback
         self.pattern_matcher = PatternMatcher() if use_fallback else None
-        self.ollama_available = None  # Will be checked on first use
+        self.confidence_threshold = self.CONFIDENCE_THRESHOLD if confidence_threshold is None else confidence_threshold
+        self.ollama = OllamaClient.from_generate_url(self.ollama_url)
+        self.async_ollama = AsyncOllamaClient.from_generate_url(self.ollama_url)  # for generate_command_async
+        self.breaker = CircuitBreaker()
+        self.request_timeout = AdaptiveTimeout()
+        self.health_probe = HealthProbe(self._probe_ollama, self.breaker)
+        self.prompt_builder = PromptBuilder() if retrieval_prompt else None
+        self.registry = CommandExecutor.ACTIONS
+        self.actions = frozenset(self.registry)
+        self.command_schema = self.registry.json_schema() if structured_output else None
+        self.metrics = IntentMetrics()
+        
+        self.classifier = None
+        if use_classifier:
+            try:
+                examples_path = data_path("intent_examples.jsonl")
+            except OSError:
+                examples_path = None  # learn for this session only
+            self.classifier = IntentClassifier(path=examples_path)
+            if self.pattern_matcher:
+                # Transcript labels are canonical phrases ("minimize", "volume up")
+                self.classifier.load_transcripts(self.TRANSCRIPTS_DIR, self.pattern_matcher.match)
+        
+        self.intent_cache = None
+        self._single_flight = SingleFlight()
+        self._async_flights: Dict[str, "asyncio.Future"] = {}
+        if use_cache:
+            try:
+                path = cache_path or data_path("intent_cache.sqlite3")
+            except OSError:
+                path = None  # memory-only
+            self.intent_cache = IntentCache(path, fingerprint=self._cache_fingerprint(),
+                                            validator=self._cached_command_valid)
+    
+    # ---------------- Intent cache ----------------
+    def _cache_fingerprint(self) -> str:
+        """Everything that can change what an utterance resolves to."""
+        mappings = None
+        if self.pattern_matcher:
+            mappings = [self.pattern_matcher.app_mappings, self.pattern_matcher.folder_mappings]
+        prompt = self.prompt_builder.fingerprint_parts() if self.prompt_builder else self.SYSTEM_PROMPT
+        classifier = self.classifier.threshold if self.classifier else None
+        return cache_fingerprint(self.CACHE_VERSION, self.model_name, prompt,
+                                 mappings, self.confidence_threshold, self.command_schema, classifier)
+    
+    def refresh_cache(self):
+        """Re-fingerprint the cache; call after changing the model, prompt or mappings at runtime."""
+        if self.pattern_matcher:
+            self.pattern_matcher._compile_rules()
+        if self.intent_cache:
+            self.intent_cache.set_fingerprint(self._cache_fingerprint())
+    
+    def _cache_key(self, text: str) -> str:
+        if self.pattern_matcher:
+            return self.pattern_matcher._normalize_text(text)
+        return " ".join(text.lower().split())
+    
+    def _cached_command_valid(self, command: Dict[str, Any]) -> bool:
+        """Refuse to replay a cached command whose path no longer matches the disk."""
+        path = command.get("path")
+        if not path:
+            return True
+        path = self._replace_placeholders(str(path))
+        action = command.get("action")
+        if action in self.PATH_MUST_EXIST:
+            return os.path.exists(path)
+        if action in self.PATH_MUST_NOT_EXIST:
+            return not os.path.exists(path)
+        return True
         
     def _replace_placeholders(self, text: str) -> str:
         """Replace placeholders like {username} with actual values."""
         return text.replace("{username}", self.username)
     
+    def _ollama_payload(self, prompt: str) -> Dict[str, Any]:
+        """Build the /api/generate request body for one utterance."""
+        # The system prompt goes in its own field so the rendered prompt
+        # starts with the same prefix every call and Ollama reuses its
+        # evaluated KV cache; only the per-utterance part is evaluated.
+        system, user_prompt = self._prompt_parts(prompt)
+        payload = {
+            "model": self.model_name,
+            "system": system,
+            "prompt": user_prompt,
+            "keep_alive": self.KEEP_ALIVE,
+            "options": {
+                "temperature": 0.1,  # Low temperature for consistent outputs
+                "num_predict": 500,  # Limit response length
+            }
+        }
+        if self.command_schema:
+            # Constrained decoding: the output can only be a schema-valid command
+            payload["format"] = self.command_schema
+        return payload
+    
+    def _prompt_parts(self, prompt: str) -> Tuple[str, str]:
+        """(system, prompt) for one utterance: retrieved actions/examples, or the full SYSTEM_PROMPT."""
+        if self.prompt_builder:
+            return self.prompt_builder.build(prompt)
+        return self.SYSTEM_PROMPT, f"User: {prompt}\nOutput:"
+    
+    @property
+    def ollama_available(self) -> bool:
+        """False while the circuit breaker is open (Ollama failing)."""
+        return self.breaker.state != CircuitBreaker.OPEN
+    
     def _call_ollama(self, prompt: str) -> Optional[str]:
         """
         Call the Ollama API with the given prompt.
         
+        The outcome is reported to the circuit breaker, and successful
+        latencies tune the timeout of later calls.
+        
         Args:
             prompt: The user's natural language command
             
         Returns:
             The LLM's response text or None if failed
         """
+        timeout = self.request_timeout.current()
+        start = time.perf_counter()
         try:
-            payload = {
-                "model": self.model_name,
-                "prompt": f"{self.SYSTEM_PROMPT}\n\nUser: {prompt}\nOutput:",
-                "stream": False,
-                "options": {
-                    "temperature": 0.1,  # Low temperature for consistent outputs
-                    "num_predict": 500,  # Limit response length
-                }
-            }
-            
-            response = requests.post(
-                self.ollama_url,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "").strip()
+            payload = self._ollama_payload(prompt)
             
+            # Streamed; returns as soon as the first JSON object is complete,
+            # or as soon as the action being written cannot be a valid one
+            response = self.ollama.generate_json(payload, timeout=(self.CONNECT_TIMEOUT, timeout),
+                                                 deadline=timeout, validator=CommandStreamValidator(self.actions))
+        except InvalidCommandError as e:
+            self._rejected_output(e)
+            return None
         except requests.exceptions.ConnectionError:
-            self.ollama_available = False
+            self.breaker.record_failure("connection failed")
             return None
         except requests.exceptions.Timeout:
+            self.breaker.record_failure(f"no answer within {timeout:.1f}s")
             return None
         except Exception as e:
-            self.ollama_available = False
+            self.breaker.record_failure(f"request failed: {type(e).__name__}")
             return None
+        
+        self.request_timeout.record(time.perf_counter() - start)
+        self.breaker.record_success()
+        return response
     
-    def _check_ollama_connection(self) -> bool:
-        """Check if Ollama is available."""
+    async def _call_ollama_async(self, prompt: str) -> Optional[str]:
+        """_call_ollama over the asyncio client; same breaker and timeout bookkeeping."""
+        timeout = self.request_timeout.current()
+        start = time.perf_counter()
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=2)
-            return response.status_code == 200
-        except:
-            return False
+            payload = self._ollama_payload(prompt)
+            response = await self.async_ollama.generate_json(payload, timeout=(self.CONNECT_TIMEOUT, timeout),
+                                                             deadline=timeout,
+                                                             validator=CommandStreamValidator(self.actions))
+        except InvalidCommandError as e:
+            self._rejected_output(e)
+            return None
+        except asyncio.TimeoutError:
+            self.breaker.record_failure(f"no answer within {timeout:.1f}s")
+            return None
+        except (OSError, asyncio.IncompleteReadError):
+            self.breaker.record_failure("connection failed")
+            return None
+        except Exception as e:
+            self.breaker.record_failure(f"request failed: {type(e).__name__}")
+            return None
+        
+        self.request_timeout.record(time.perf_counter() - start)
+        self.breaker.record_success()
+        return response
+    
+    def _rejected_output(self, error: InvalidCommandError):
+        # The server answered, just not usefully: not a backend failure
+        self.breaker.record_success()
+        self.metrics.record_parse(False, str(error))
+        print(f"❌ Rejected LLM output: {error}")
+    
+    def preload_model(self, background: bool = True):
+        """
+        Load the model into Ollama and prime the system-prompt prefix, so the
+        first spoken command does not pay for the model load or for
+        evaluating SYSTEM_PROMPT.
+        
+        Args:
+            background: Run on a daemon thread and return immediately (default: True)
+        """
+        if background:
+            threading.Thread(target=self.preload_model, args=(False,), daemon=True).start()
+            return
+        
+        self.health_probe.start()
+        try:
+            load = self.ollama.preload(self.model_name, keep_alive=self.KEEP_ALIVE)
+            event = self.ollama.generate({
+                "model": self.model_name,
+                "system": self._prompt_parts("")[0],
+                "prompt": "",
+                "keep_alive": self.KEEP_ALIVE,
+                "options": {"num_predict": 1},
+            }, timeout=120)
+            self.breaker.record_success("model preloaded")
+            primed = self.ollama.timings(event)
+            print(f"🔥 Ollama model '{self.model_name}' preloaded "
+                  f"(load {load['load_ms']:.0f} ms, system prompt {primed['prompt_eval_count']} tokens "
+                  f"in {primed['prompt_eval_ms']:.0f} ms)")
+        except requests.exceptions.RequestException as e:
+            self.breaker.record_failure(f"preload failed: {type(e).__name__}")
+    
+    def get_prompt_timings(self) -> Optional[Dict[str, float]]:
+        """Ollama's timing fields (load, prompt eval, eval) for the last call that reported them."""
+        return self.ollama.last_timings
+    
+    def _probe_ollama(self):
+        """Health check run by the background probe; raises if Ollama is unreachable."""
+        self.ollama.tags(timeout=self.PROBE_TIMEOUT)
+    
+    def get_backend_status(self) -> Dict[str, Any]:
+        """
+        Ollama circuit state and timeout tuning.
+        
+        Returns:
+            Dict with state (closed/open/half_open), consecutive failures,
+            the last failure reason, the current request timeout and the
+            observed p95 latency in seconds
+        """
+        status = self.breaker.snapshot()
+        p95 = self.request_timeout.p95()
+        status["timeout_s"] = round(self.request_timeout.current(), 2)
+        status["p95_s"] = round(p95, 3) if p95 is not None else None
+        return status
+    
+    def on_fs_events(self, events):
+        """
+        Drop cached commands that name a deleted or moved path, so they are
+        resolved again instead of replayed. Pass to
+        CommandExecutor.add_path_listener().
+        
+        Args:
+            events: A batch of FsEvents from the executor's file watcher
+        """
+        if self.intent_cache is None:
+            return
+        # After an overflow the validator still evicts stale paths on lookup
+        paths = [event.path for event in events if event.kind in ("deleted", "moved")]
+        if paths:
+            self.intent_cache.invalidate_paths(paths)
+    
+    def close(self):
+        """Stop the health probe and release the HTTP session."""
+        self.health_probe.stop()
+        self.ollama.close()
+    
+    async def aclose(self):
+        """close() for asyncio callers; also drops the async client's idle connections."""
+        await self.async_ollama.close()
+        await asyncio.to_thread(self.close)
     
     def _parse_json_response(self, response: str) -> Optional[Dict[str, Any]]:
         """
@@ -661,6 +1157,195 @@ Output: {"action": "volume_up", "extra": {"amount": 10}}
         print(f"❌ Failed to parse LLM response as JSON: {response[:200]}")
         return None
     
+    def resolve_intent(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Resolve natural language to a raw command, cheapest tier first.
+        
+        Tiers:
+            cache:       answered from the intent cache
+            pattern:     confident local pattern match, no LLM call
+            classifier:  nearest recorded or confirmed paraphrase of a known command
+            llm:         Ollama answer for ambiguous or unmatched text
+            pattern_low: low-confidence pattern match, used when the LLM
+                         is unavailable or fails; if it needed correcting,
+                         command["corrected"] is the phrase to confirm
+            miss:        nothing understood the text
+        
+        Args:
+            natural_language: The user's command in plain English
+            
+        Returns:
+            Tuple of (command or None, tier name)
+        """
+        start = time.perf_counter()
+        command, tier = self._resolve_cached(natural_language)
+        self.metrics.record(tier, (time.perf_counter() - start) * 1000)
+        return command, tier
+    
+    def _resolve_cached(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        if self.intent_cache is None:
+            return self._resolve_tiers(natural_language)
+        
+        key = self._cache_key(natural_language)
+        cached = self.intent_cache.get(key)
+        if cached is not None:
+            return cached[0], "cache"
+        
+        # Identical utterances arriving together share one resolution
+        (command, tier), shared = self._single_flight.do(key, lambda: self._resolve_tiers(natural_language))
+        if shared:
+            # Callers mutate the command (placeholder replacement), so never share the object
+            return copy.deepcopy(command), tier
+        if command and tier in self.CACHEABLE_TIERS:
+            self.intent_cache.put(key, command, tier)
+        return command, tier
+    
+    def _resolve_tiers(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        pattern_command, answer = self._resolve_local(natural_language)
+        if answer is not None:
+            return answer
+        
+        if self._llm_allowed():
+            command = self._llm_command(self._call_ollama(natural_language))
+            if command is not None:
+                return command, "llm"
+        
+        if pattern_command is not None:
+            return pattern_command, "pattern_low"
+        return None, "miss"
+    
+    def _resolve_local(self, natural_language: str):
+        """
+        The tiers that need no I/O (pattern, classifier).
+        
+        Returns:
+            (low-confidence pattern command or None, (command, tier) if answered or None)
+        """
+        pattern_command = None
+        if self.use_fallback and self.pattern_matcher:
+            pattern_command, confidence = self.pattern_matcher.match_with_confidence(natural_language)
+            if pattern_command is not None and confidence >= self.confidence_threshold:
+                return pattern_command, (pattern_command, "pattern")
+        
+        if self.classifier:
+            command, _ = self.classifier.predict(natural_language)
+            if command is not None:
+                return pattern_command, (command, "classifier")
+        return pattern_command, None
+    
+    def _llm_allowed(self) -> bool:
+        # Probing runs in the background; the hot path only asks the breaker
+        self.health_probe.start()
+        return self.breaker.allow_request()
+    
+    def _llm_command(self, response: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Parse and validate an LLM answer, recording the outcome."""
+        if not response:
+            return None
+        command = self._parse_json_response(response)
+        error = self.registry.validate(command) if command is not None else "unparseable JSON"
+        self.metrics.record_parse(error is None, error)
+        if error is None:
+            return command
+        if command is not None:
+            print(f"❌ Rejected LLM output: {error}")
+        return None
+    
+    # ============ ASYNC API ============
+    # For callers on an asyncio event loop (the WebSocket server). The local
+    # tiers take microseconds and run inline; the cache's disk access runs on
+    # a worker thread and the LLM call on the asyncio HTTP client, so many
+    # commands can be resolved at once without blocking the loop.
+    
+    async def resolve_intent_async(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        """resolve_intent() without blocking the event loop."""
+        start = time.perf_counter()
+        command, tier = await self._resolve_cached_async(natural_language)
+        self.metrics.record(tier, (time.perf_counter() - start) * 1000)
+        return command, tier
+    
+    async def _resolve_cached_async(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        if self.intent_cache is None:
+            return await self._resolve_tiers_async(natural_language)
+        
+        key = self._cache_key(natural_language)
+        cached = await asyncio.to_thread(self.intent_cache.get, key)
+        if cached is not None:
+            return cached[0], "cache"
+        
+        # Identical utterances in flight on this loop share one resolution
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            command, tier = await asyncio.shield(flight)
+            return copy.deepcopy(command), tier
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            command, tier = await self._resolve_tiers_async(natural_language)
+            flight.set_result((command, tier))
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved; followers re-raise it
+            raise
+        finally:
+            del self._async_flights[key]
+        if command and tier in self.CACHEABLE_TIERS:
+            await asyncio.to_thread(self.intent_cache.put, key, command, tier)
+        return command, tier
+    
+    async def _resolve_tiers_async(self, natural_language: str) -> Tuple[Optional[Dict[str, Any]], str]:
+        pattern_command, answer = self._resolve_local(natural_language)
+        if answer is not None:
+            return answer
+        
+        if self._llm_allowed():
+            command = self._llm_command(await self._call_ollama_async(natural_language))
+            if command is not None:
+                return command, "llm"
+        
+        if pattern_command is not None:
+            return pattern_command, "pattern_low"
+        return None, "miss"
+    
+    async def generate_command_async(self, natural_language: str) -> Optional[Dict[str, Any]]:
+        """
+        generate_command() for asyncio callers: the same tiers and output,
+        awaiting the LLM instead of blocking on it.
+        
+        Args:
+            natural_language: The user's command in plain English
+            
+        Returns:
+            A structured command dict or None if generation failed
+        """
+        command, tier = await self.resolve_intent_async(natural_language)
+        if not command:
+            return None
+        return self.fill_placeholders(command)
+    
+    def confirm(self, natural_language: str, command: Dict[str, Any]) -> bool:
+        """
+        Teach the intent classifier a phrasing whose command was carried out,
+        so the next paraphrase like it skips the LLM.
+        
+        Args:
+            natural_language: What the user said
+            command: The command that was executed for it
+            
+        Returns:
+            True if the classifier learned something new
+        """
+        if not self.classifier:
+            return False
+        if self.pattern_matcher:
+            _, confidence = self.pattern_matcher.match_with_confidence(natural_language)
+            if confidence >= self.confidence_threshold:
+                return False  # the pattern tier already answers it
+        return self.classifier.confirm(natural_language, command)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-tier hit rate and latency of intent resolution so far."""
+        return self.metrics.snapshot()
+    
     def generate_command(self, natural_language: str) -> Optional[Dict[str, Any]]:
         """
         Convert natural language to a structured command.
@@ -673,28 +1358,29 @@ Output: {"action": "volume_up", "extra": {"amount": 10}}
         """
         print(f"🧠 Processing: \"{natural_language}\"")
         
-        # Check if Ollama is available (cache the result)
-        if self.ollama_available is None:
-            self.ollama_available = self._check_ollama_connection()
+        command, tier = self.resolve_intent(natural_language)
         
-        command = None
-        
-        # Try Ollama first if available
-        if self.ollama_available:
-            response = self._call_ollama(natural_language)
-            if response:
-                command = self._parse_json_response(response)
-        
-        # Fallback to pattern matching if Ollama failed or unavailable
-        if command is None and self.use_fallback and self.pattern_matcher:
+        if tier == "cache":
+            print("⚡ Cached")
+        elif tier == "pattern":
+            print("⚡ Matched locally")
+        elif tier == "classifier":
+            print("⚡ Matched a known phrasing")
+        elif tier == "pattern_low":
             print("📋 Using pattern matching (Ollama unavailable)")
-            command = self.pattern_matcher.match(natural_language)
+            if command and command.get("corrected"):
+                print(f"❓ Heard as \"{command['corrected']}\"; needs confirming")
         
         if not command:
             print("❌ Could not understand command")
             return None
         
-        # Replace placeholders with actual values
+        command = self.fill_placeholders(command)
+        print(f"✅ Generated command: {json.dumps(command, indent=2)}")
+        return command
+    
+    def fill_placeholders(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace placeholders ({username}) in a command's path, target and extra strings, in place."""
         if "path" in command and command["path"]:
             command["path"] = self._replace_placeholders(command["path"])
         if "target" in command and command["target"]:
@@ -703,8 +1389,6 @@ Output: {"action": "volume_up", "extra": {"amount": 10}}
             for key, value in command["extra"].items():
                 if isinstance(value, str):
                     command["extra"][key] = self._replace_placeholders(value)
-        
-        print(f"✅ Generated command: {json.dumps(command, indent=2)}")
         return command
     
     def check_ollama_status(self) -> bool:
@@ -716,14 +1400,10 @@ Output: {"action": "volume_up", "extra": {"amount": 10}}
         """
         try:
             # Check if Ollama is running
-            response = requests.get(
-                "http://localhost:11434/api/tags",
-                timeout=5
-            )
-            response.raise_for_status()
+            tags = self.ollama.tags(timeout=5)
             
             # Check if model is available
-            models = response.json().get("models", [])
+            models = tags.get("models", [])
             model_names = [m.get("name", "").split(":")[0] for m in models]
             
             if self.model_name not in model_names and f"{self.model_name}:latest" not in [m.get("name", "") for m in models]:
@@ -7,14 +7,17 @@ import asyncio
 import websockets
 import json
 import threading
+import itertools
+import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import main
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from main import VoiceGestureControl
+    from main import VoiceGestureControl, WINDOWS_AUTOMATION_AVAILABLE
 except ImportError:
     print("Error: Could not import VoiceGestureControl from main.py")
     print("Make sure main.py is in the parent directory")
@@ -28,6 +31,17 @@ class ZentraxWebSocketServer:
         self.clients = set()
         self.controller = None
         self.controller_thread = None
+        self.loop = None
+        # Text commands: generation is awaited on the loop, execution
+        # (subprocess, pyautogui, file searches) runs on these threads
+        self.command_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="zentrax-command")
+        self.pending = set()
+        # Running file searches by id, so the UI can cancel them
+        self.searches = {}
+        self.search_ids = itertools.count(1)
+        self.generator = None
+        self.executor = None
+        self._automation = None  # task building generator and executor
         
     async def register(self, websocket):
         """Register a new client connection"""
@@ -173,6 +187,20 @@ class ZentraxWebSocketServer:
                     'level': 'warning'
                 })
                 
+        elif command in ('execute', 'text_command'):
+            text = (params.get('command') or params.get('text') or '').strip()
+            if text:
+                # Not awaited: the next message is read while this one runs
+                task = asyncio.create_task(self.run_text_command(text))
+                self.pending.add(task)
+                task.add_done_callback(self.pending.discard)
+                
+        elif command == 'cancel_search':
+            search_id = params.get('search_id')
+            for running_id, future in list(self.searches.items()):
+                if search_id in (None, running_id):
+                    future.cancel()
+                
         elif command == 'stop':
             if self.controller:
                 self.controller.running = False
@@ -182,11 +210,133 @@ class ZentraxWebSocketServer:
                     'level': 'info'
                 })
                 
+    async def automation(self):
+        """(generator, executor) of the running controller, or the server's own."""
+        if self.controller and self.controller.win_command_generator:
+            return self.controller.win_command_generator, self.controller.win_executor
+        if not WINDOWS_AUTOMATION_AVAILABLE:
+            return None, None
+        if self._automation is None:
+            # Loading the classifier and cache and starting the catalog crawls
+            # takes seconds; built on a thread, once, while the loop keeps serving
+            self._automation = asyncio.ensure_future(asyncio.to_thread(self.build_automation))
+        task = self._automation
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if task.done() and self._automation is task:
+                self._automation = None  # the next command tries again
+            raise
+    
+    def build_automation(self):
+        """Create the server's own generator and executor (blocking)."""
+        from main import WindowsCommandGenerator, CommandExecutor
+        generator = WindowsCommandGenerator(use_fallback=True)
+        generator.breaker.add_listener(self.on_backend_state_change)
+        executor = CommandExecutor()
+        executor.add_path_listener(generator.on_fs_events)
+        self.generator, self.executor = generator, executor
+        return generator, executor
+    
+    async def run_text_command(self, text):
+        """Resolve and execute one typed command; a failure is reported to the clients."""
+        try:
+            await self.execute_text_command(text)
+        except Exception as e:
+            print(f"❌ Text command failed: {text}: {e}")
+            await self.broadcast({'type': 'error', 'command': text, 'message': f'Command failed: {e}'})
+    
+    async def execute_text_command(self, text):
+        """Resolve and execute one typed command without blocking the event loop."""
+        generator, executor = await self.automation()
+        if generator is None:
+            await self.broadcast({'type': 'error', 'message': 'Windows automation not available'})
+            return
+        
+        command = await generator.generate_command_async(text)
+        if not command:
+            await self.broadcast({'type': 'command', 'command': text, 'success': False,
+                                  'response': f'Could not understand: {text}'})
+            return
+        if command.get('corrected'):
+            # A corrected name or keyword is not run on a guess; typing it as suggested runs it
+            await self.broadcast({'type': 'command', 'command': text, 'success': False,
+                                  'response': f'Did you mean "{command["corrected"]}"?'})
+            return
+        
+        executor.prepare(command)
+        if command.get('action') == 'search_and_open':
+            success, message = await self.run_search(executor, command)
+        else:
+            success, message = await asyncio.wrap_future(executor.submit(command))
+        if success:
+            await self.loop.run_in_executor(self.command_pool, generator.confirm, text, command)
+        await self.broadcast({
+            'type': 'command',
+            'command': text,
+            'action': command.get('action'),
+            'success': success,
+            'response': message,
+        })
+        
+    async def run_search(self, executor, command):
+        """
+        Execute a search_and_open command, streaming each match to the UI as
+        it is found (search_result messages: start, one hit per match with
+        its rank and time, then done). A cancel_search message stops it.
+        """
+        search_id = f"search-{next(self.search_ids)}"
+        await self.broadcast({
+            'type': 'search_result',
+            'event': 'start',
+            'search_id': search_id,
+            'query': command.get('target', '*'),
+            'path': command.get('path'),
+        })
+        
+        sent = []
+        
+        def on_result(rank, path, elapsed_ms):
+            # Called on the search thread
+            sent.append(asyncio.run_coroutine_threadsafe(self.broadcast({
+                'type': 'search_result',
+                'event': 'hit',
+                'search_id': search_id,
+                'rank': rank,
+                'path': path,
+                'elapsed_ms': round(elapsed_ms, 1),
+            }), self.loop))
+        
+        start = time.perf_counter()
+        future = executor.submit(command, on_result=on_result)
+        self.searches[search_id] = future
+        try:
+            success, message = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+            success, message = False, "search_and_open cancelled"  # before it started
+        finally:
+            self.searches.pop(search_id, None)
+        # Every hit goes out before the search is reported done
+        await asyncio.gather(*[asyncio.wrap_future(future) for future in sent], return_exceptions=True)
+        await self.broadcast({
+            'type': 'search_result',
+            'event': 'done',
+            'search_id': search_id,
+            'count': len(sent),
+            'cancelled': future.cancel_event.is_set(),
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        })
+        return success, message
+        
     def start_controller(self):
         """Start the VoiceGestureControl in a separate thread"""
         if not self.controller or not self.controller.running:
             print("Starting VoiceGestureControl...")
             self.controller = VoiceGestureControl(use_whisper=True, whisper_model="base")
+            if self.controller.win_command_generator:
+                self.controller.win_command_generator.breaker.add_listener(self.on_backend_state_change)
             self.controller_thread = threading.Thread(
                 target=self.controller.run,
                 daemon=True
@@ -194,8 +344,25 @@ class ZentraxWebSocketServer:
             self.controller_thread.start()
             print("VoiceGestureControl started")
             
+    def on_backend_state_change(self, old_state, new_state, reason):
+        """Circuit breaker listener: report Ollama state changes to the UI (called from worker threads)"""
+        if not self.loop:
+            return
+        generator = self.controller.win_command_generator if self.controller else self.generator
+        message = {
+            'type': 'backend_status',
+            'backend': 'ollama',
+            'state': new_state,
+            'previous': old_state,
+            'reason': reason,
+        }
+        if generator:
+            message['timeout'] = generator.get_backend_status()['timeout_s']
+        asyncio.run_coroutine_threadsafe(self.broadcast(message), self.loop)
+        
     async def start(self):
         """Start the WebSocket server"""
+        self.loop = asyncio.get_running_loop()
         print(f"Starting Zentrax WebSocket Server on {self.host}:{self.port}")
         print("Open frontend/index.html in your browser to access the UI")
         
@@ -213,6 +380,10 @@ def main():
         print("\nShutting down server...")
         if server.controller:
             server.controller.running = False
+        if server.generator:
+            server.generator.close()
+            server.executor.close()
+        server.command_pool.shutdown(wait=False)
         print("Server stopped")
 
 